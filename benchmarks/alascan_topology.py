@@ -0,0 +1,209 @@
+"""
+Benchmark of the native topology reuse of alascan.
+
+Builds a complex of at least ``--residues`` residues from copies of a
+complex placed side by side, each chain with its own identifier, and
+scans the first ``--mutations`` interface residues of the first copy
+with the ``alascan`` module twice: regenerating the topology of the
+whole complex for each mutant (the default), and reusing the topology of
+the native model (``reuse_topology = true``). Reports the time of each
+scan and the largest difference between their scores.
+
+This script should be executed from the repository, with the haddock3
+environment activated and the ``CNS_EXEC`` environment variable pointing
+to the CNS executable.
+
+USAGE:
+
+    $ python alascan_topology.py -h
+    $ python alascan_topology.py
+    $ python alascan_topology.py --residues 2000 --mutations 20 --ncores 8
+"""
+import argparse
+import os
+import string
+import sys
+import tempfile
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+
+from haddock.libs.libio import working_directory
+from haddock.libs.libontology import PDBFile
+from haddock.modules.analysis.alascan import DEFAULT_CONFIG
+from haddock.modules.analysis.alascan import HaddockModule as AlascanModule
+from haddock.modules.analysis.alascan.scan import get_scan_residues
+
+from ensemble import DEFAULT_COMPLEX
+
+
+ap = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+ap.add_argument(
+    "--residues",
+    help="Smallest number of residues of the complex (default: %(default)s).",
+    type=int,
+    default=1000,
+    )
+
+ap.add_argument(
+    "--mutations",
+    help="Number of residues scanned (default: %(default)s).",
+    type=int,
+    default=10,
+    )
+
+ap.add_argument(
+    "--ncores",
+    help="Number of cores used by alascan (default: %(default)s).",
+    type=int,
+    default=1,
+    )
+
+ap.add_argument(
+    "--complex",
+    dest="complex_pdb",
+    help="Complex copied to build the large one (default: %(default)s).",
+    type=Path,
+    default=DEFAULT_COMPLEX,
+    )
+
+
+def write_copies(complex_pdb, residues, fname):
+    """
+    Write copies of a complex, side by side, up to `residues` residues.
+
+    Returns
+    -------
+    int
+        The number of residues of the written complex.
+    """
+    lines = [
+        line
+        for line in Path(complex_pdb).read_text().splitlines()
+        if line.startswith(("ATOM", "HETATM"))
+        ]
+    nres = len({line[21:27] for line in lines})
+    ncopies = ceil(residues / nres)
+    chain_ids = iter(string.ascii_uppercase + string.ascii_lowercase)
+    new_ids = {}
+    new_lines = []
+    for copy in range(ncopies):
+        shift = (80.0 * (copy % 5), 80.0 * (copy // 5), 0.0)
+        for line in lines:
+            if (copy, line[21]) not in new_ids:
+                new_ids[copy, line[21]] = next(chain_ids)
+            x, y, z = (
+                float(line[30 + 8 * i:38 + 8 * i]) + shift[i]
+                for i in range(3)
+                )
+            new_lines.append(
+                f"{line[:21]}{new_ids[copy, line[21]]}{line[22:30]}"
+                f"{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+                )
+    new_lines.append("END")
+    Path(fname).write_text(os.linesep.join(new_lines) + os.linesep)
+    return nres * ncopies
+
+
+class PreviousIO:
+    """Give the complex as the models of the previous step."""
+
+    def __init__(self, model):
+        self.model = model
+        self.output = [model]
+
+    def retrieve_models(self, individualize=False):
+        """Give the complex."""
+        return [self.model]
+
+
+def run_scan(model, resdic, ncores, reuse_topology, workdir):
+    """
+    Scan the residues of a model with alascan.
+
+    Returns
+    -------
+    tuple
+        The time of the scan, in seconds, and the scan results.
+    """
+    alascan = AlascanModule(
+        order=0,
+        path=Path(workdir),
+        initial_params=DEFAULT_CONFIG,
+        )
+    alascan.params.update(resdic)
+    alascan.params["ncores"] = ncores
+    alascan.params["plot"] = False
+    alascan.params["reuse_topology"] = reuse_topology
+    alascan.previous_io = PreviousIO(model)
+    start = perf_counter()
+    alascan.run()
+    elapsed = perf_counter() - start
+    df_scan = pd.read_csv(
+        Path(workdir, f"scan_{Path(model.file_name).stem}.csv"),
+        sep="\t",
+        comment="#",
+        )
+    return elapsed, df_scan
+
+
+def main(args):
+    """Run the benchmark."""
+    if "CNS_EXEC" not in os.environ:
+        sys.exit("* ERROR * Set the CNS_EXEC environment variable")
+
+    complex_copied = Path(args.complex_pdb).resolve()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # models are found relative to the sibling step folders
+        input_dir = Path(tmpdir, "input")
+        input_dir.mkdir()
+        nres = write_copies(
+            complex_copied,
+            args.residues,
+            Path(input_dir, "complex.pdb"),
+            )
+        model = PDBFile("complex.pdb", path=input_dir)
+
+        # interface residues of the first copy, chains A and B
+        with working_directory(input_dir):
+            interface = get_scan_residues(model, {"_": []}, 5.0)
+        scan_residues = [
+            (chain, res) for chain, res, _ in interface if chain in "AB"
+            ][:args.mutations]
+        resdic = {}
+        for chain, res in scan_residues:
+            resdic.setdefault(f"resdic_{chain}", []).append(res)
+        print(
+            f"Scanning {len(scan_residues)} residues of a complex of "
+            f"{nres} residues on {args.ncores} cores"
+            )
+
+        results = {}
+        for reuse_topology in (False, True):
+            workdir = Path(tmpdir, f"reuse_topology_{reuse_topology}")
+            workdir.mkdir()
+            results[reuse_topology] = run_scan(
+                model,
+                resdic,
+                args.ncores,
+                reuse_topology,
+                workdir,
+                )
+
+    (time_full, df_full), (time_reuse, df_reuse) = results.values()
+    print(f"reuse_topology = false  {time_full:.1f}s")
+    print(f"reuse_topology = true   {time_reuse:.1f}s")
+    print(f"speedup                 {time_full / time_reuse:.2f}x")
+    for column in ("score", "delta_score"):
+        diff = (df_full[column] - df_reuse[column]).abs().max()
+        print(f"largest {column} difference: {diff:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main(ap.parse_args()))
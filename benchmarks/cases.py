@@ -0,0 +1,368 @@
+"""
+Benchmark cases.
+
+Each case has a setup function. The setup receives the synthetic
+ensemble, prepares the case's inputs in the current working directory
+(not timed) and returns the function to time. Cases only exercise code
+that needs no external binaries (CNS, contact_fcc, fast-rmsdmatrix,
+lovoalign...).
+
+Each case also declares the largest ensemble it runs on. Above that, the
+case is reported as skipped: for example, the RMSD matrix of 50000
+models has more than a billion pairs.
+"""
+import os
+import string
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from haddock.clis import cli_traceback
+from haddock.clis.restraints.restrain_bodies import restrain_bodies
+from haddock.gear.preprocessing import process_pdbs
+from haddock.gear.yaml2cfg import read_from_yaml_config
+from haddock.libs import libplots
+from haddock.libs.libfcc import calculate_pairwise_matrix
+from haddock.libs.libfcc import read_matrix as read_fcc_matrix
+from haddock.libs.libontology import ModuleIO, PDBFile, RMSDFile, TopologyFile
+from haddock.modules.analysis import caprieval, clustfcc, clustrmsd, contactmap
+from haddock.modules.analysis.caprieval.capri import (
+    CAPRI,
+    extract_data_from_capri_class,
+    )
+from haddock.modules.analysis.clustfcc.clustfcc import iterate_clustering
+from haddock.modules.analysis.clustrmsd.clustrmsd import (
+    get_clusters,
+    get_dendrogram,
+    iterate_min_population,
+    )
+from haddock.modules.analysis.clustrmsd.clustrmsd import (
+    read_matrix as read_rmsd_matrix,
+    )
+from haddock.modules.analysis.contactmap.contmap import accumulate_contacts
+
+
+def make_models(ensemble, count=None):
+    """Write the model files and wrap them in `PDBFile` objects."""
+    scores = ensemble.scores()
+    models = []
+    for i, path in enumerate(ensemble.write_models(count)):
+        model = PDBFile(path.name, path=path.parent)
+        model.score = float(scores[i])
+        models.append(model)
+    return models
+
+
+def setup_caprieval(ensemble):
+    """Compute the CAPRI metrics of each model against the reference."""
+    models = make_models(ensemble)
+    params = read_from_yaml_config(caprieval.DEFAULT_CONFIG)
+    params["receptor_chain"] = ensemble.receptor_chain
+    params["ligand_chains"] = [ensemble.ligand_chain]
+
+    def run():
+        jobs = [
+            CAPRI(
+                identificator=i,
+                model=model,
+                path=Path("."),
+                reference=ensemble.reference,
+                params=params,
+                ).run()
+            for i, model in enumerate(models, start=1)
+            ]
+        extract_data_from_capri_class(
+            capri_objects=jobs,
+            output_fname=Path("capri_ss.tsv"),
+            sort_key=params["sortby"],
+            sort_ascending=params["sort_ascending"],
+            )
+
+    return run
+
+
+def setup_fcc_clustering(ensemble):
+    """Compute the FCC matrix from the models contacts, then cluster."""
+    contacts = ensemble.contacts()
+    params = read_from_yaml_config(clustfcc.DEFAULT_CONFIG)
+
+    def run():
+        with open("fcc.matrix", "w") as fout:
+            for i, k, fcc, fcc_v in calculate_pairwise_matrix(contacts, False):
+                fout.write(f"{i} {k} {fcc:.2f} {fcc_v:.3f}{os.linesep}")
+        pool = read_fcc_matrix(
+            "fcc.matrix",
+            params["clust_cutoff"],
+            params["strictness"],
+            )
+        iterate_clustering(pool, params["min_population"])
+
+    return run
+
+
+def setup_rmsd_clustering(ensemble):
+    """Cluster the models from a precomputed RMSD matrix."""
+    matrix = ensemble.rmsd_matrix()
+    rows, cols = np.triu_indices(ensemble.size, k=1)
+    np.savetxt(
+        "rmsd.matrix",
+        np.column_stack([rows + 1, cols + 1, matrix]),
+        fmt=["%d", "%d", "%.3f"],
+        )
+    rmsd_file = RMSDFile("rmsd.matrix", npairs=len(matrix))
+    params = read_from_yaml_config(clustrmsd.DEFAULT_CONFIG)
+
+    def run():
+        rmsd_matrix = read_rmsd_matrix(rmsd_file)
+        dendrogram = get_dendrogram(rmsd_matrix, params["linkage"])
+        cluster_arr = get_clusters(
+            dendrogram,
+            params["clust_cutoff"],
+            params["criterion"],
+            )
+        iterate_min_population(cluster_arr, params["min_population"])
+
+    return run
+
+
+def setup_contactmap(ensemble):
+    """Accumulate the residue and heavy atom contacts of the models."""
+    models = ensemble.write_models()
+    outputs = [path.stem for path in models]
+    params = read_from_yaml_config(contactmap.DEFAULT_CONFIG)
+    params["single_model_analysis"] = False
+
+    def run():
+        accumulate_contacts(models, outputs, params)
+
+    return run
+
+
+def make_module_io(ensemble, path, topologies):
+    """Make the `io.json` content of a step folder."""
+    scores = ensemble.scores()
+    io = ModuleIO()
+    for i, score in enumerate(scores, start=1):
+        model = PDBFile(f"model_{i}.pdb", path=path)
+        model.score = float(score)
+        model.topology = topologies
+        io.output.append(model)
+    return io
+
+
+def setup_io_json(ensemble):
+    """Save and load the `io.json` of a step."""
+    topologies = [TopologyFile(f"mol{i}.psf", path=".") for i in (1, 2)]
+    io = make_module_io(ensemble, ".", topologies)
+
+    def run():
+        io.save()
+        ModuleIO().load("io.json")
+
+    return run
+
+
+def setup_traceback(ensemble):
+    """Trace back the models of a four-step run."""
+    run_dir = Path("run")
+    topo_dir = Path(run_dir, "0_topoaa")
+    topo_dir.mkdir(parents=True)
+    topologies = [TopologyFile(f"mol{i}.psf", path=topo_dir) for i in (1, 2)]
+    rng = np.random.default_rng(ensemble.seed)
+    previous = None
+    steps = ("1_rigidbody", "2_seletop", "3_flexref", "4_emref")
+    for step in steps:
+        step_dir = Path(run_dir, step)
+        step_dir.mkdir()
+        io = make_module_io(ensemble, step_dir, topologies)
+        if step == "2_seletop":
+            # keep the best half of the models
+            best = sorted(previous, key=lambda model: model.score)
+            io.output = io.output[: len(best) // 2 or 1]
+            for model, parent in zip(io.output, best):
+                model.file_name = parent.file_name
+                model.score = parent.score
+                model.ori_name = parent.file_name
+        elif previous is not None:
+            prefix = step.split("_")[1]
+            io.output = io.output[: len(previous)]
+            parents = rng.permutation(len(previous))
+            for i, (model, parent) in enumerate(zip(io.output, parents), 1):
+                model.file_name = f"{prefix}_{i}.pdb"
+                model.ori_name = previous[parent].file_name
+        for model in io.output:
+            Path(step_dir, model.file_name).touch()
+        io.save(step_dir)
+        previous = io.output
+
+    def run():
+        cli_traceback.main(run_dir)
+
+    return run
+
+
+def setup_preprocessing(ensemble):
+    """Process the model files for HADDOCK3 compatibility."""
+    models = ensemble.write_models()
+
+    def run():
+        for model in models:
+            process_pdbs(model)
+
+    return run
+
+
+def setup_preprocessing_ensemble(ensemble):
+    """Process the model files together, one process per available core."""
+    models = ensemble.write_models()
+    ncores = os.cpu_count() or 1
+
+    def run():
+        process_pdbs(*models, ncores=ncores, combine=False)
+
+    return run
+
+
+def setup_preprocessing_ensemble_file(ensemble):
+    """Process a single multi-model file, one process per available core."""
+    path = ensemble.write_ensemble()
+    ncores = os.cpu_count() or 1
+
+    def run():
+        process_pdbs(path, ncores=ncores)
+
+    return run
+
+
+def write_assembly(ensemble, fname, nchains=50):
+    """
+    Write an assembly of `nchains` chains.
+
+    The assembly is made of copies of the complex, side by side, each
+    chain with its own identifier.
+    """
+    chain_ids = iter(string.ascii_uppercase + string.ascii_lowercase)
+    new_ids = {}
+    lines = []
+    for copy in range(nchains // 2):
+        shift = np.array([60.0 * (copy % 5), 60.0 * (copy // 5), 0.0])
+        for line, (x, y, z) in zip(ensemble.lines, ensemble.coords + shift):
+            if (copy, line[21]) not in new_ids:
+                new_ids[copy, line[21]] = next(chain_ids)
+            chain = new_ids[copy, line[21]]
+            lines.append(
+                f"{line[:21]}{chain}{line[22:30]}"
+                f"{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+                )
+    lines.append("END")
+    Path(fname).write_text(os.linesep.join(lines) + os.linesep)
+
+
+def setup_restrain_bodies(ensemble):
+    """
+    Restrain the bodies of a 50-chain assembly.
+
+    The assembly does not depend on the ensemble size.
+    """
+    write_assembly(ensemble, "assembly.pdb")
+
+    def run():
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            restrain_bodies("assembly.pdb")
+
+    return run
+
+
+def write_capri_tables(ensemble, ss_fname, clt_fname):
+    """Write synthetic `capri_ss.tsv` and `capri_clt.tsv` files."""
+    rng = np.random.default_rng(ensemble.seed)
+    lrmsd = ensemble.ligand_rmsd()
+    irmsd = lrmsd * 0.4 + rng.uniform(0, 0.5, ensemble.size)
+    fnat = np.clip(1 - irmsd / 10, 0, 1)
+    ss = pd.DataFrame(
+        {
+            "model": [
+                f"../1_rigidbody/model_{i}.pdb"
+                for i in range(1, ensemble.size + 1)
+                ],
+            "md5": "-",
+            "score": ensemble.scores(),
+            "irmsd": irmsd,
+            "fnat": fnat,
+            "lrmsd": lrmsd,
+            "ilrmsd": (irmsd + lrmsd) / 2,
+            "dockq": (fnat + 1 / (1 + (irmsd / 1.5) ** 2)) / 2,
+            "cluster_id": ensemble.cluster_ids(),
+            }
+        )
+    for term in ("air", "bsa", "desolv", "elec", "total", "vdw"):
+        ss[term] = rng.normal(size=ensemble.size)
+    ss = ss.sort_values("score").reset_index(drop=True)
+    ss.insert(2, "caprieval_rank", np.arange(1, ensemble.size + 1))
+
+    # the columns of the caprieval cluster table, used by the plots
+    metrics = [
+        "score", "irmsd", "fnat", "lrmsd", "dockq", "ilrmsd",
+        "air", "bsa", "desolv", "elec", "total", "vdw",
+        ]
+    grouped = ss.groupby("cluster_id")
+    clt = grouped[metrics].agg(["mean", "std"])
+    clt.columns = [
+        name if stat == "mean" else f"{name}_std" for name, stat in clt.columns
+        ]
+    clt = clt.sort_values("score").reset_index()
+    clt.insert(0, "cluster_rank", np.arange(1, len(clt) + 1))
+    clt.insert(2, "n", grouped.size()[clt["cluster_id"]].to_numpy())
+    clt.insert(3, "under_eval", "-")
+    clt["caprieval_rank"] = clt["cluster_rank"]
+
+    cluster_ranking = dict(zip(clt["cluster_id"], clt["cluster_rank"]))
+    ss.insert(
+        10, "cluster_ranking", ss["cluster_id"].map(cluster_ranking)
+        )
+    ss.insert(
+        11, "model-cluster_ranking", ss.groupby("cluster_id").cumcount() + 1
+        )
+    ss.to_csv(ss_fname, sep="\t", index=False, float_format="%.3f")
+    clt.to_csv(clt_fname, sep="\t", index=False, float_format="%.3f")
+    return cluster_ranking
+
+
+def setup_report(ensemble):
+    """Make the plots, tables and report of `haddock3-analyse`."""
+    cluster_ranking = write_capri_tables(
+        ensemble,
+        "capri_ss.tsv",
+        "capri_clt.tsv",
+        )
+    top_clusters = dict(list(cluster_ranking.items())[:10])
+
+    def run():
+        scatters = libplots.scatter_plot_handler(
+            "capri_ss.tsv", top_clusters, None, None,
+            )
+        boxes = libplots.box_plot_handler(
+            "capri_ss.tsv", top_clusters, None, None,
+            )
+        tables = libplots.clt_table_handler("capri_clt.tsv", "capri_ss.tsv")
+        libplots.report_generator(boxes, scatters, tables, "1_caprieval")
+
+    return run
+
+
+CASES = {
+    "caprieval": (setup_caprieval, 1000),
+    "fcc_clustering": (setup_fcc_clustering, 5000),
+    "rmsd_clustering": (setup_rmsd_clustering, 5000),
+    "contactmap": (setup_contactmap, 500),
+    "io_json": (setup_io_json, 50000),
+    "traceback": (setup_traceback, 50000),
+    "preprocessing": (setup_preprocessing, 1000),
+    "preprocessing_ensemble": (setup_preprocessing_ensemble, 1000),
+    "preprocessing_ensemble_file": (setup_preprocessing_ensemble_file, 1000),
+    "report": (setup_report, 50000),
+    "restrain_bodies": (setup_restrain_bodies, 50000),
+    }
+"""Benchmark cases: the setup function and the largest ensemble size."""
@@ -0,0 +1,304 @@
+"""
+Synthetic docking ensembles for the benchmarks.
+
+An ensemble is made of rigid-body perturbations of a bundled complex: the
+receptor is kept in place and the ligand is rotated around its centre
+and translated. The perturbations are drawn from a seeded random
+generator, so the same size and seed always give the same ensemble.
+
+Only the coordinates needed by the benchmarks are kept in memory (the
+ligand CA atoms). Model PDB files are written on request, and only for
+the number of models a benchmark can handle.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import pdist
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_COMPLEX = Path(
+    BENCHMARKS_DIR.parent,
+    "examples",
+    "docking-protein-protein",
+    "data",
+    "e2a-hpr_1GGR.pdb",
+    )
+"""The complex perturbed to create the ensembles."""
+
+
+def rotation_matrices(rotvecs):
+    """
+    Convert rotation vectors to rotation matrices (Rodrigues' formula).
+
+    Parameters
+    ----------
+    rotvecs : np.ndarray
+        Array of shape (N, 3). The direction is the rotation axis and
+        the norm the angle, in radians.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, 3, 3).
+    """
+    angles = np.linalg.norm(rotvecs, axis=1)
+    axes = rotvecs / np.where(angles == 0, 1, angles)[:, None]
+    x, y, z = axes.T
+    zeros = np.zeros_like(x)
+    cross = np.stack(
+        [
+            np.stack([zeros, -z, y], axis=1),
+            np.stack([z, zeros, -x], axis=1),
+            np.stack([-y, x, zeros], axis=1),
+            ],
+        axis=1,
+        )
+    sin = np.sin(angles)[:, None, None]
+    cos = np.cos(angles)[:, None, None]
+    return np.eye(3) + sin * cross + (1 - cos) * cross @ cross
+
+
+class SyntheticEnsemble:
+    """
+    Rigid-body perturbations of a complex.
+
+    Parameters
+    ----------
+    size : int
+        The number of models.
+
+    workdir : str or pathlib.Path
+        Where the model files are written.
+
+    complex_pdb : str or pathlib.Path
+        The complex to perturb.
+
+    receptor_chain, ligand_chain : str
+        The chains of the complex. The ligand chain is perturbed.
+
+    max_rotation : float
+        Maximum rotation of the ligand, in degrees.
+
+    translation : float
+        Standard deviation of the ligand translation, in Angstrom.
+
+    seed : int
+        Seed of the random generator.
+    """
+
+    def __init__(
+            self,
+            size,
+            workdir,
+            complex_pdb=DEFAULT_COMPLEX,
+            receptor_chain="A",
+            ligand_chain="B",
+            max_rotation=60.0,
+            translation=4.0,
+            seed=0,
+            ):
+        self.size = size
+        self.workdir = Path(workdir)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.receptor_chain = receptor_chain
+        self.ligand_chain = ligand_chain
+        self.seed = seed
+
+        self.lines = [
+            line.rstrip(os.linesep)
+            for line in Path(complex_pdb).read_text().splitlines()
+            if line.startswith(("ATOM", "HETATM"))
+            ]
+        self.coords = np.array(
+            [
+                [float(line[30:38]), float(line[38:46]), float(line[46:54])]
+                for line in self.lines
+                ]
+            )
+        chains = np.array([line[21] for line in self.lines])
+        is_ca = np.array([line[12:16].strip() == "CA" for line in self.lines])
+        self.is_ligand = chains == ligand_chain
+        self.receptor_ca = self.coords[is_ca & (chains == receptor_chain)]
+        self.receptor_ca_resids = np.array(
+            [
+                int(line[22:26])
+                for line, ca, chain in zip(self.lines, is_ca, chains)
+                if ca and chain == receptor_chain
+                ]
+            )
+        self.ligand_ca_mask = is_ca[self.is_ligand]
+        self.ligand_ca_resids = np.array(
+            [
+                int(line[22:26])
+                for line, ca, chain in zip(self.lines, is_ca, chains)
+                if ca and chain == ligand_chain
+                ]
+            )
+        self.ligand_centre = self.coords[self.is_ligand].mean(axis=0)
+
+        rng = np.random.default_rng(seed)
+        axes = rng.normal(size=(size, 3))
+        axes /= np.linalg.norm(axes, axis=1)[:, None]
+        angles = np.radians(rng.uniform(0, max_rotation, size=size))
+        self.rotvecs = axes * angles[:, None]
+        self.translations = rng.normal(scale=translation, size=(size, 3))
+        self.noise = rng.normal(size=size)
+
+        self.reference = Path(self.workdir, "reference.pdb")
+        self._write_pdb(self.reference, self.coords)
+        self._model_paths = []
+
+    def ligand_coords(self, start=0, stop=None, ca_only=True):
+        """
+        Get the ligand coordinates of a range of models.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (models, atoms, 3).
+        """
+        stop = self.size if stop is None else stop
+        ligand = self.coords[self.is_ligand] - self.ligand_centre
+        if ca_only:
+            ligand = ligand[self.ligand_ca_mask]
+        rotations = rotation_matrices(self.rotvecs[start:stop])
+        moved = np.einsum("nij,aj->nai", rotations, ligand)
+        return (
+            moved
+            + self.ligand_centre
+            + self.translations[start:stop, None, :]
+            )
+
+    def iter_ligand_ca(self, chunk=5000):
+        """Yield the ligand CA coordinates by chunks of models."""
+        for start in range(0, self.size, chunk):
+            yield self.ligand_coords(start, min(start + chunk, self.size))
+
+    def ligand_rmsd(self):
+        """
+        RMSD of the ligand CA atoms to the reference, for each model.
+
+        The receptor does not move, so no fitting is needed.
+        """
+        reference = self.coords[self.is_ligand][self.ligand_ca_mask]
+        return np.concatenate(
+            [
+                np.sqrt(((coords - reference) ** 2).sum(axis=2).mean(axis=1))
+                for coords in self.iter_ligand_ca()
+                ]
+            )
+
+    def scores(self):
+        """Synthetic HADDOCK scores, correlated with the ligand RMSD."""
+        return -60.0 + 4.0 * self.ligand_rmsd() + 5.0 * self.noise
+
+    def cluster_ids(self, nclusters=20):
+        """
+        Assign each model to the closest of `nclusters` models.
+
+        Returns
+        -------
+        np.ndarray
+            Cluster ids, from 1 to `nclusters`.
+        """
+        nclusters = min(nclusters, self.size)
+        features = np.hstack([self.rotvecs * 10, self.translations])
+        centres = features[:: max(1, self.size // nclusters)][:nclusters]
+        _, closest = cKDTree(centres).query(features)
+        return closest + 1
+
+    def contacts(self, cutoff=10.0):
+        """
+        Receptor-ligand CA contacts of each model.
+
+        Contacts are encoded as integers, as in the files parsed by
+        :py:func:`haddock.libs.libfcc.parse_contact_file`.
+
+        Returns
+        -------
+        list of set of int
+        """
+        tree = cKDTree(self.receptor_ca)
+        contacts = []
+        for coords in self.iter_ligand_ca():
+            for model in coords:
+                pairs = tree.query_ball_point(model, cutoff)
+                contacts.append(
+                    {
+                        int(self.receptor_ca_resids[r]) * 10000
+                        + int(self.ligand_ca_resids[lig])
+                        for lig, receptor in enumerate(pairs)
+                        for r in receptor
+                        }
+                    )
+        return contacts
+
+    def rmsd_matrix(self):
+        """
+        Condensed matrix of the ligand CA RMSD between models.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (size * (size - 1) / 2,).
+        """
+        coords = np.concatenate(list(self.iter_ligand_ca()))
+        natoms = coords.shape[1]
+        return pdist(coords.reshape(self.size, -1)) / np.sqrt(natoms)
+
+    def write_models(self, count=None):
+        """
+        Write the first `count` models as PDB files.
+
+        Files already written are reused.
+
+        Returns
+        -------
+        list of pathlib.Path
+        """
+        count = self.size if count is None else min(count, self.size)
+        models_dir = Path(self.workdir, "models")
+        models_dir.mkdir(exist_ok=True)
+        start = len(self._model_paths)
+        for i in range(start, count):
+            coords = self.coords.copy()
+            coords[self.is_ligand] = self.ligand_coords(i, i + 1, False)[0]
+            path = Path(models_dir, f"model_{i + 1}.pdb")
+            self._write_pdb(path, coords)
+            self._model_paths.append(path)
+        return self._model_paths[:count]
+
+    def write_ensemble(self, count=None):
+        """
+        Write the first `count` models in a single multi-model PDB file.
+
+        Returns
+        -------
+        pathlib.Path
+        """
+        count = self.size if count is None else min(count, self.size)
+        path = Path(self.workdir, f"ensemble_{count}.pdb")
+        lines = []
+        for i in range(count):
+            coords = self.coords.copy()
+            coords[self.is_ligand] = self.ligand_coords(i, i + 1, False)[0]
+            lines.append(f"MODEL     {i + 1:>4}")
+            lines.extend(
+                f"{line[:30]}{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+                for line, (x, y, z) in zip(self.lines, coords)
+                )
+            lines.append("ENDMDL")
+        lines.append("END")
+        path.write_text(os.linesep.join(lines) + os.linesep)
+        return path
+
+    def _write_pdb(self, path, coords):
+        lines = [
+            f"{line[:30]}{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+            for line, (x, y, z) in zip(self.lines, coords)
+            ]
+        lines.append("END")
+        path.write_text(os.linesep.join(lines) + os.linesep)
@@ -0,0 +1,277 @@
+"""
+Run the HADDOCK3 performance benchmarks.
+
+The benchmarks time the hot paths of HADDOCK3 that need no external
+binaries, on synthetic docking ensembles of configurable size. The
+ensembles are rigid-body perturbations of a bundled complex, generated
+from a fixed seed: the same command gives the same inputs on every
+commit.
+
+Results are saved as JSON. Give the JSON of a previous commit with
+`--compare` to report the ratio of the timings and flag the regressions.
+The exit code is 1 if a case is slower than the tolerance allows.
+
+This script should be executed from the repository, with the haddock3
+environment activated.
+
+USAGE:
+
+    $ python run_benchmarks.py -h
+    $ python run_benchmarks.py  # all cases, 100 and 1000 models
+    $ python run_benchmarks.py --sizes 100 1000 10000 50000
+    $ python run_benchmarks.py --cases io_json traceback --repeat 5
+    $ python run_benchmarks.py -o new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+
+try:
+    import haddock
+    from haddock import log
+    from haddock.libs.libio import working_directory
+    from haddock.libs.liblog import log_levels
+except Exception:
+    print(  # noqa: T201
+        "Haddock3 could not be imported. "
+        "Please activate the haddock3 python environment.",
+        file=sys.stderr,
+        )
+    sys.exit(1)
+
+from cases import CASES
+from ensemble import DEFAULT_COMPLEX, SyntheticEnsemble
+
+
+ap = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+ap.add_argument(
+    "--sizes",
+    help="Number of models of the ensembles (default: %(default)s).",
+    nargs="+",
+    type=int,
+    default=[100, 1000],
+    )
+
+ap.add_argument(
+    "--cases",
+    help="Cases to run (default: all).",
+    nargs="+",
+    choices=list(CASES),
+    default=list(CASES),
+    )
+
+ap.add_argument(
+    "--repeat",
+    help="Number of timings of each case (default: %(default)s).",
+    type=int,
+    default=3,
+    )
+
+ap.add_argument(
+    "--seed",
+    help="Seed of the synthetic ensembles (default: %(default)s).",
+    type=int,
+    default=0,
+    )
+
+ap.add_argument(
+    "--complex",
+    dest="complex_pdb",
+    help="Complex perturbed to create the ensembles (default: %(default)s).",
+    type=Path,
+    default=DEFAULT_COMPLEX,
+    )
+
+ap.add_argument(
+    "-o",
+    "--output",
+    help="JSON file where to save the results (default: %(default)s).",
+    type=Path,
+    default=Path("benchmarks.json"),
+    )
+
+ap.add_argument(
+    "--compare",
+    help="JSON results of a previous run to compare with.",
+    type=Path,
+    default=None,
+    )
+
+ap.add_argument(
+    "--tolerance",
+    help=(
+        "Slowdown tolerated before a case is reported as a regression "
+        "(default: %(default)s, that is, 20%%)."
+        ),
+    type=float,
+    default=0.2,
+    )
+
+ap.add_argument(
+    "--log-level",
+    help="Log level of HADDOCK3 (default: %(default)s).",
+    default="WARNING",
+    choices=list(log_levels),
+    )
+
+ap.add_argument(
+    "--workdir",
+    help="Where to write the ensembles (default: a temporary folder).",
+    type=Path,
+    default=None,
+    )
+
+
+def get_metadata(args):
+    """Describe the environment of the run."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+            check=True,
+            ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "haddock3": haddock.version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "complex": Path(args.complex_pdb).name,
+        "repeat": args.repeat,
+        }
+
+
+def run_case(name, ensemble, workdir, repeat, log_level="WARNING"):
+    """
+    Time a case on an ensemble.
+
+    The log level is set again before each timing, as some clients
+    change it.
+
+    Returns
+    -------
+    dict
+        The timings, in seconds, or the reason the case was skipped.
+    """
+    setup, max_models = CASES[name]
+    result = {"case": name, "models": ensemble.size}
+    if ensemble.size > max_models:
+        result["skipped"] = f"runs up to {max_models} models"
+        return result
+
+    case_dir = Path(workdir, name)
+    case_dir.mkdir()
+    with working_directory(case_dir):
+        log.setLevel(log_levels[log_level])
+        start = perf_counter()
+        func = setup(ensemble)
+        result["setup"] = round(perf_counter() - start, 4)
+        times = []
+        for _ in range(repeat):
+            log.setLevel(log_levels[log_level])
+            start = perf_counter()
+            func()
+            times.append(round(perf_counter() - start, 4))
+    shutil.rmtree(case_dir)
+
+    result["times"] = times
+    result["min"] = min(times)
+    result["median"] = median(times)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the timings with those of a previous run.
+
+    Returns
+    -------
+    list of dict
+        The cases slower than the tolerance allows.
+    """
+    previous = {
+        (res["case"], res["models"]): res
+        for res in baseline["results"]
+        if "min" in res
+        }
+    regressions = []
+    print(f"Comparing with commit {baseline['metadata'].get('commit')}")
+    for res in results:
+        old = previous.get((res["case"], res["models"]))
+        if old is None or "min" not in res:
+            continue
+        ratio = res["min"] / old["min"] if old["min"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(res)
+        print(
+            f"{res['case']:<16} {res['models']:>6} "
+            f"{old['min']:>10.3f}s {res['min']:>10.3f}s {ratio:>6.2f}x{flag}"
+            )
+    return regressions
+
+
+def main(args):
+    """Run the benchmarks."""
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="haddock3-bm-"))
+    results = []
+    try:
+        for size in args.sizes:
+            size_dir = Path(workdir, f"ensemble_{size}")
+            ensemble = SyntheticEnsemble(
+                size,
+                size_dir,
+                complex_pdb=args.complex_pdb,
+                seed=args.seed,
+                )
+            for name in args.cases:
+                result = run_case(
+                    name,
+                    ensemble,
+                    size_dir,
+                    args.repeat,
+                    log_level=args.log_level,
+                    )
+                results.append(result)
+                timing = result.get("skipped") or f"{result['min']:.3f}s"
+                print(f"{name:<16} {size:>6} {timing}")
+            shutil.rmtree(size_dir)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = {"metadata": get_metadata(args), "results": results}
+    args.output.write_text(json.dumps(output, indent=4))
+    print(f"Results saved to {str(args.output)!r}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(ap.parse_args()))
@@ -0,0 +1,262 @@
+"""
+Load test of the restraints webservice.
+
+Starts the webservice with uvicorn on a local port, sends concurrent
+requests to its endpoints and reports the throughput and the latency of
+each endpoint. The test is repeated for several server configurations:
+
+* ``threads``: requests run in the threads of the server process, no
+  cache (``HADDOCK3_WS_WORKERS=0``, ``HADDOCK3_WS_CACHE_SIZE=0``);
+* ``processes``: requests run in the pool of worker processes, no cache;
+* ``processes+cache``: requests run in the pool of worker processes,
+  results are cached.
+
+The gain of each configuration is reported against the first one.
+
+By default, all requests of an endpoint upload the same structure, as
+when a portal fans out many requests for the same upload. Use
+``--unique`` to make the requests differ: with ``--unique 10``, ten
+variants of the structure are uploaded in turn.
+
+This script should be executed from the repository, with the haddock3
+environment activated and uvicorn and httpx installed.
+
+USAGE:
+
+    $ python webservice_load.py -h
+    $ python webservice_load.py
+    $ python webservice_load.py --requests 500 --concurrency 32
+    $ python webservice_load.py --endpoints restrain_bodies --unique 50
+    $ python webservice_load.py --configs threads processes
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import socket
+import subprocess
+import sys
+import time
+from base64 import b64encode
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import httpx
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_STRUCTURE = Path(BENCHMARKS_DIR.parent, "examples", "data", "2oob.pdb")
+
+CONFIGS = {
+    "threads": {"HADDOCK3_WS_WORKERS": "0", "HADDOCK3_WS_CACHE_SIZE": "0"},
+    "processes": {"HADDOCK3_WS_CACHE_SIZE": "0"},
+    "processes+cache": {},
+    }
+"""Environment of the server in each configuration."""
+
+ENDPOINTS = {
+    "passive_from_active": {
+        "active": [930, 931, 932, 933, 934],
+        "chain": "A",
+        },
+    "restrain_bodies": {},
+    "calc_accessibility": {"cutoff": 0.4},
+    "preprocess_pdb": {"from_chain": "A", "to_chain": "A"},
+    }
+"""Parameters of the requests to each endpoint, besides the structure."""
+
+
+ap = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+ap.add_argument(
+    "--endpoints",
+    help="Endpoints to load (default: all).",
+    nargs="+",
+    choices=list(ENDPOINTS),
+    default=list(ENDPOINTS),
+    )
+
+ap.add_argument(
+    "--configs",
+    help="Server configurations to compare (default: all).",
+    nargs="+",
+    choices=list(CONFIGS),
+    default=list(CONFIGS),
+    )
+
+ap.add_argument(
+    "--requests",
+    help="Number of requests to each endpoint (default: %(default)s).",
+    type=int,
+    default=200,
+    )
+
+ap.add_argument(
+    "--concurrency",
+    help="Number of requests in flight (default: %(default)s).",
+    type=int,
+    default=16,
+    )
+
+ap.add_argument(
+    "--unique",
+    help="Number of different structures uploaded (default: %(default)s).",
+    type=int,
+    default=1,
+    )
+
+ap.add_argument(
+    "--workers",
+    help="Number of worker processes of the server (default: the CPUs).",
+    type=int,
+    default=None,
+    )
+
+ap.add_argument(
+    "--structure",
+    help="Structure uploaded, with a chain A (default: %(default)s).",
+    type=Path,
+    default=DEFAULT_STRUCTURE,
+    )
+
+
+def encode_structures(path, unique):
+    """Gzip and base64 encode `unique` variants of a structure."""
+    content = Path(path).read_bytes()
+    return [
+        b64encode(gzip.compress(f"REMARK variant {i}\n".encode() + content))
+        .decode()
+        for i in range(unique)
+        ]
+
+
+def get_free_port():
+    """Get a free local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(config, workers=None, timeout=60):
+    """
+    Start the webservice in a configuration.
+
+    Returns
+    -------
+    tuple
+        The server process and its URL.
+    """
+    port = get_free_port()
+    env = dict(os.environ)
+    if workers is not None:
+        env["HADDOCK3_WS_WORKERS"] = str(workers)
+    env.update(CONFIGS[config])
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "haddock.clis.restraints.webservice:app",
+            ],
+        env=env,
+        )
+    url = f"http://127.0.0.1:{port}"
+    start = perf_counter()
+    while perf_counter() - start < timeout:
+        if server.poll() is not None:
+            raise RuntimeError("The webservice could not be started.")
+        try:
+            httpx.get(f"{url}/openapi.json").raise_for_status()
+            return server, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The webservice did not start in time.")
+
+
+async def load_endpoint(url, endpoint, structures, nrequests, concurrency):
+    """
+    Send concurrent requests to an endpoint.
+
+    Returns
+    -------
+    dict
+        The throughput, in requests per second, and the latencies, in
+        milliseconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def send(client, i):
+        nonlocal errors
+        body = dict(ENDPOINTS[endpoint], structure=structures[i % len(structures)])
+        async with semaphore:
+            start = perf_counter()
+            response = await client.post(f"{url}/{endpoint}", json=body)
+            latencies.append((perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        start = perf_counter()
+        await asyncio.gather(*(send(client, i) for i in range(nrequests)))
+        wall = perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": nrequests / wall,
+        "p50": median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "errors": errors,
+        }
+
+
+def main(args):
+    """Run the load test."""
+    structures = encode_structures(args.structure, args.unique)
+    results = {}
+    for config in args.configs:
+        server, url = start_server(config, workers=args.workers)
+        try:
+            for endpoint in args.endpoints:
+                results[config, endpoint] = asyncio.run(
+                    load_endpoint(
+                        url,
+                        endpoint,
+                        structures,
+                        args.requests,
+                        args.concurrency,
+                        )
+                    )
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(
+        f"{'endpoint':<20} {'config':<16} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'errors':>6} {'gain':>6}"
+        )
+    for endpoint in args.endpoints:
+        reference = results[args.configs[0], endpoint]["throughput"]
+        for config in args.configs:
+            res = results[config, endpoint]
+            print(
+                f"{endpoint:<20} {config:<16} {res['throughput']:>8.1f} "
+                f"{res['p50']:>8.1f} {res['p95']:>8.1f} {res['errors']:>6} "
+                f"{res['throughput'] / reference:>5.1f}x"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(ap.parse_args()))
@@ -72,3 +72,25 @@ def test_alascan_default(alascan_module, mocker):
     assert (
         df_clt.loc[df_clt["full_resname"] == "A-38-ASP"].iloc[0, :]["delta_score"] < 0.0
     )
+
+
+def test_alascan_reuse_topology(alascan_module):
+    """Test reusing the native topologies gives the same scores."""
+    alascan_module.previous_io = MockPreviousIO(path=alascan_module.path)
+    alascan_module.params["resdic_A"] = [38, 39]
+    alascan_module.params["resdic_B"] = [17, 18]
+    csv_fname = Path(alascan_module.path, "scan_protprot_complex_1.csv")
+    alascan_module.run()
+    df_default = pd.read_csv(csv_fname, sep="\t", comment="#")
+
+    alascan_module.params["reuse_topology"] = True
+    alascan_module.run()
+    df_reuse = pd.read_csv(csv_fname, sep="\t", comment="#")
+
+    assert df_reuse.shape == df_default.shape
+    assert df_reuse["ori_resname"].tolist() == df_default["ori_resname"].tolist()
+    # the csv values have two decimals
+    for column in ("score", "delta_score", "delta_vdw", "delta_elec"):
+        assert df_reuse[column].tolist() == pytest.approx(
+            df_default[column].tolist(), abs=0.02
+        ), column
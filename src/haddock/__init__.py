@@ -2,7 +2,6 @@
 import logging
 import sys
 from pathlib import Path
-from importlib.metadata import version as package_version
 
 log = logging.getLogger(__name__)
 log.handlers.clear()
@@ -39,9 +38,19 @@ class EmptyPath:
         return False
 
 
-# version
-version = package_version("haddock3")
+contact_us = 'https://github.com/haddocking/haddock3/issues'
 
-v_major, v_minor, v_patch = version.split('.')
 
-contact_us = 'https://github.com/haddocking/haddock3/issues'
+def __getattr__(name: str) -> str:
+    # the version is read from the package metadata on first access:
+    # importing `importlib.metadata` slows down the start of every CLI
+    # and worker
+    if name == "version":
+        from importlib.metadata import version as package_version
+        globals()["version"] = package_version("haddock3")
+        return globals()["version"]
+    if name in ("v_major", "v_minor", "v_patch"):
+        major, minor, patch = __getattr__("version").split('.')
+        globals().update(v_major=major, v_minor=minor, v_patch=patch)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -46,6 +46,7 @@ from haddock.gear.clean_steps import _unpack_gz
 from haddock.libs.libcli import _ParamsToDict
 from haddock.libs.libio import archive_files_ext
 from haddock.libs.libontology import ModuleIO
+from haddock.libs.libparallel import GenericTask, Scheduler
 from haddock.libs.libplots import (
     ClRank,
     box_plot_handler,
@@ -55,6 +56,7 @@ from haddock.libs.libplots import (
     scatter_plot_handler,
     SUPPORTED_OUTPUT_FORMATS,
     )
+from haddock.libs.libutil import parse_ncores
 from haddock.modules import get_module_steps_folders
 from haddock.modules.analysis.caprieval import (
     DEFAULT_CONFIG as caprieval_params,
@@ -246,13 +248,15 @@ def run_capri_analysis(
         step: str,
         run_dir: FilePath,
         capri_dict: ParamMap,
-        is_cleaned: bool,
         mode: str,
         ncores: int,
         ) -> None:
     """
     Run the caprieval analysis.
 
+    The models of the step must be unpacked, see
+    :py:func:`get_models_folders`.
+
     Parameters
     ----------
     step : str
@@ -266,10 +270,6 @@ def run_capri_analysis(
     io = ModuleIO()
     filename = Path("..", f"{step}/io.json")
     io.load(filename)
-    # unpack the files if they are compressed
-    if is_cleaned:
-        path_to_unpack = io.output[0].path
-        haddock3_unpack(path_to_unpack, ncores=ncores)
     # define step_order. We add one to it, as the caprieval module will
     # interpret itself as being after the selected step
     step_order = int(step.split("_")[0]) + 1
@@ -287,9 +287,67 @@ def run_capri_analysis(
     caprieval_module.previous_io = io
     # run capri module
     caprieval_module._run()
-    # compress files if they should be compressed
-    if is_cleaned:
-        haddock3_clean(path_to_unpack, ncores=ncores)
+
+
+def needs_capri_run(step: str, run_dir: FilePath) -> bool:
+    """
+    Tell whether a caprieval analysis must be run to analyse a step.
+
+    Parameters
+    ----------
+    step : str
+        step name
+    run_dir : str or Path
+        path to run directory
+    """
+    if step.split("_")[1] == "caprieval":
+        return False
+    return not (
+        Path(run_dir, f"{step}/capri_ss.tsv").exists()
+        and Path(run_dir, f"{step}/capri_clt.tsv").exists()
+        )
+
+
+def get_models_folders(
+        steps_to_analyse: list[tuple[str, Path]],
+        run_dir: FilePath,
+        ) -> list[Path]:
+    """
+    Get the folders of the models evaluated by the caprieval analyses.
+
+    Several steps can take their models from the same folder. Folders
+    are given once, so that they can be unpacked before analysing the
+    steps concurrently, and compressed back once all the analyses are
+    done.
+
+    Parameters
+    ----------
+    steps_to_analyse : list of tuples
+        step name and path to the analysis folder of each step
+    run_dir : str or Path
+        path to run directory
+
+    Returns
+    -------
+    folders : list of Path
+        the distinct folders of the models
+    """
+    folders: list[Path] = []
+    for step, target_path in steps_to_analyse:
+        io_file = Path(run_dir, f"{step}/io.json")
+        if not needs_capri_run(step, run_dir) or not io_file.exists():
+            continue
+        io = ModuleIO()
+        io.load(io_file)
+        if not io.output:
+            continue
+        # relative paths are given from the analysis folder
+        folder = Path(os.path.normpath(
+            Path(run_dir, target_path, io.output[0].path)
+            ))
+        if folder not in folders:
+            folders.append(folder)
+    return folders
 
 
 def update_capri_dict(default_capri: ParamDict, kwargs: ParamMap) -> ParamDict:
@@ -419,6 +477,91 @@ def zip_top_ranked(
         log.warning(f"Summary archive {summary_name} not created!")
 
 
+def _run_named_task(name: str, task: GenericTask) -> tuple[str, Any]:
+    """Run a task and label its result with the given name."""
+    return name, task.run()
+
+
+def make_step_plots(
+    ss_file: FilePath,
+    clt_file: FilePath,
+    cluster_ranking: ClRank,
+    format: Optional[ImgFormat],
+    scale: Optional[float],
+    is_cleaned: Optional[bool],
+    offline: bool = False,
+    ncores: int = 1,
+) -> tuple[list, list, list]:
+    """
+    Create the scatter plots, box plots and tables of a step report.
+
+    The three sets are rendered concurrently when more than one core is
+    available. Files are written in the current working directory.
+
+    Parameters
+    ----------
+    ss_file : str or Path
+        capri single structure filename
+    clt_file : str or Path
+        capri cluster filename
+    cluster_ranking : dict
+        {cluster_id : cluster_rank} dictionary
+    format : str
+        Produce images in the selected format.
+    scale : int
+        scale for images.
+    is_cleaned : bool
+        is the directory going to be cleaned?
+    offline : bool
+        Should plots js functions be self-contained?
+    ncores : int
+        number of cores to use
+
+    Returns
+    -------
+    scatters : list
+        list of scatter plots
+    boxes : list
+        list of box plots
+    tables : list
+        list of cluster tables
+    """
+    plot_tasks = {
+        "scatters": GenericTask(
+            scatter_plot_handler,
+            ss_file,
+            cluster_ranking,
+            format,
+            scale,
+            offline=offline,
+            ),
+        "boxes": GenericTask(
+            box_plot_handler,
+            ss_file,
+            cluster_ranking,
+            format,
+            scale,
+            offline=offline,
+            ),
+        "tables": GenericTask(clt_table_handler, clt_file, ss_file, is_cleaned),
+        }
+    if ncores > 1:
+        tasks = [
+            GenericTask(_run_named_task, name, task)
+            for name, task in plot_tasks.items()
+            ]
+        scheduler = Scheduler(tasks, ncores=ncores)
+        scheduler.run()
+        # failed tasks return None
+        results = dict(res for res in scheduler.results if res is not None)
+        missing = [name for name in plot_tasks if name not in results]
+        if missing:
+            raise Exception(f"Could not create the {', '.join(missing)}")
+    else:
+        results = {name: task.run() for name, task in plot_tasks.items()}
+    return results["scatters"], results["boxes"], results["tables"]
+
+
 def analyse_step(
     step: str,
     run_dir: FilePath,
@@ -480,7 +623,7 @@ def analyse_step(
     os.chdir(target_path)
     # if the step is not caprieval, caprieval must be run
     if run_capri == True:
-        run_capri_analysis(step, run_dir, capri_dict, is_cleaned, mode, ncores)
+        run_capri_analysis(step, run_dir, capri_dict, mode, ncores)
 
     log.info("CAPRI files identified")
     # plotting
@@ -492,26 +635,70 @@ def analyse_step(
         raise Exception(f"clustering file {clt_file} does not exist")
     if ss_file.exists():
         log.info("Plotting results..")
-        scatters = scatter_plot_handler(
+        scatters, boxes, tables = make_step_plots(
             ss_file,
+            clt_file,
             cluster_ranking,
             format,
             scale,
+            is_cleaned,
             offline=offline,
+            ncores=ncores,
             )
-        boxes = box_plot_handler(
-            ss_file,
-            cluster_ranking,
-            format,
-            scale,
-            offline=offline,
-            )
-        tables = clt_table_handler(clt_file, ss_file, is_cleaned)
         report_generator(boxes, scatters, tables, step, ".", offline)
         # provide a zipped archive of the top ranked structures
         zip_top_ranked(ss_file, cluster_ranking, Path("summary.tgz"))
 
 
+def _analyse_step_task(
+    step: str,
+    run_dir: FilePath,
+    capri_dict: ParamDict,
+    target_path: Path,
+    *args: Any,
+    **kwargs: Any,
+) -> tuple[Path, bool]:
+    """
+    Analyse a step, recording whether the analysis succeeded.
+
+    Errors are logged instead of raised, and the working directory is
+    restored, so that steps can be analysed one after the other or in
+    separate processes.
+
+    Parameters
+    ----------
+    step : str
+        step name
+    run_dir : str or Path
+        path to run directory
+    capri_dict : dict
+        capri dictionary of parameters
+    target_path : Path
+        path to the output folder
+    *args, **kwargs
+        Other arguments of :py:func:`analyse_step`.
+
+    Returns
+    -------
+    target_path : Path
+        path to the output folder
+    success : bool
+        Whether the analysis succeeded.
+    """
+    cwd = os.getcwd()
+    try:
+        analyse_step(step, run_dir, capri_dict, target_path, *args, **kwargs)
+    except Exception as e:
+        log.warning(
+            f"Could not execute the analysis for step {step}. "
+            f"The following error occurred {e}"
+            )
+        return target_path, False
+    finally:
+        os.chdir(cwd)
+    return target_path, True
+
+
 def validate_format(_format: Optional[ImgFormat]) -> Optional[ImgFormat]:
     """Validate the optional argument `format`.
 
@@ -644,6 +831,7 @@ def main(
     # analysis
     good_folder_paths: list[Path] = []
     bad_folder_paths: list[Path] = []
+    steps_to_analyse: list[tuple[str, Path]] = []
     for step in sel_steps:
         subfolder_name = f"{step}_analysis"
         target_path = Path(Path("./"), subfolder_name)
@@ -660,36 +848,52 @@ def main(
             else:  # subfolder is empty or is interactive, remove it.
                 log.info(f"Removing folder {dest_path}.")
                 shutil.rmtree(dest_path)
-
-        # run the analysis
-        error = False
-        try:
-            analyse_step(
-                step,
-                Path("./"),
-                capri_dict,
-                target_path,
-                top_cluster,
-                format,
-                scale,
-                is_cleaned,
-                offline=offline,
-                mode=mode,
-                ncores=ncores,
+        steps_to_analyse.append((step, target_path))
+
+    # distribute the cores among the steps, each step using the cores left
+    # for its own caprieval run and plots
+    total_ncores = parse_ncores(ncores)
+    nworkers = max(1, min(total_ncores, len(steps_to_analyse)))
+    step_ncores = max(1, total_ncores // nworkers)
+    tasks = [
+        GenericTask(
+            _analyse_step_task,
+            step,
+            Path("./"),
+            capri_dict,
+            target_path,
+            top_cluster,
+            format,
+            scale,
+            is_cleaned,
+            offline=offline,
+            mode=mode,
+            ncores=step_ncores,
             )
-        except Exception as e:
-            error = True
-            log.warning(
-                f"Could not execute the analysis for step {step}. "
-                f"The following error occurred {e}"
-                )
-        if error:
-            bad_folder_paths.append(target_path)
-        else:
+        for step, target_path in steps_to_analyse
+        ]
+    # unpack the models once, steps sharing them run concurrently
+    models_folders: list[Path] = []
+    if is_cleaned:
+        models_folders = get_models_folders(steps_to_analyse, Path("./"))
+        for folder in models_folders:
+            haddock3_unpack(folder, ncores=total_ncores)
+    # run the analysis
+    if nworkers > 1:
+        scheduler = Scheduler(tasks, ncores=nworkers)
+        scheduler.run()
+        results = [res for res in scheduler.results if res is not None]
+    else:
+        results = [task.run() for task in tasks]
+    # compress the models back once all the analyses are done
+    for folder in models_folders:
+        haddock3_clean(folder, ncores=total_ncores)
+    success = dict(results)
+    for _step, target_path in steps_to_analyse:
+        if success.get(target_path, False):
             good_folder_paths.append(target_path)
-
-        # going back
-        os.chdir(rundir_cwd)
+        else:
+            bad_folder_paths.append(target_path)
 
     # moving files into analysis folder
     if good_folder_paths != []:
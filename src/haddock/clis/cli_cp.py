@@ -31,6 +31,12 @@ to copy the folder corresponding to the initial topology creation (the
 `haddock3-copy` will also copy the corresponding files in the `data`
 directory and update the file contents in the copied folder such that
 the information on the run directory and the new step folder names match.
+Only the files referring to the run are rewritten; the others are
+reflinked (copy-on-write copies) when the file system supports it, or
+copied (see ``--link``), and compressed files stay compressed. The files referring to the run are listed in a
+``.references.json`` manifest of each step folder, so that copying a
+copied step needs no new search. The store of the ambiguous restraint
+archives of the run, ``data/restraints``, is duplicated the same way.
 The output result of the above commands is::
 
     run2/
@@ -80,6 +86,19 @@ ap.add_argument(
     required=True,
     )
 
+ap.add_argument(
+    "--link",
+    help=(
+        "How to duplicate the files not referring to the run: `reflink` "
+        "makes copy-on-write copies (on Btrfs, XFS...), `copy` copies them, "
+        "and `auto` tries them in this order (default: %(default)s). "
+        "`hardlink` shares the files with the original run: writing to "
+        "them in one run also modifies the other."
+        ),
+    choices=("auto", "reflink", "hardlink", "copy"),
+    default="auto",
+    )
+
 add_version_arg(ap)
 
 
@@ -103,7 +122,12 @@ def maincli() -> None:
     cli(ap, main)
 
 
-def main(run_dir: FilePath, modules: list[int], output: FilePath) -> None:
+def main(
+        run_dir: FilePath,
+        modules: list[int],
+        output: FilePath,
+        link: str = "auto",
+        ) -> None:
     """
     Copy steps from a run directory to a new run directory.
 
@@ -119,17 +143,31 @@ def main(run_dir: FilePath, modules: list[int], output: FilePath) -> None:
 
     output : str or Path
         The new run directory to create and where to copy the steps.
+
+    link : str
+        How to duplicate the files not referring to the run, see
+        :py:func:`haddock.libs.libio.link_file`.
     """
+    import shutil
+    from functools import partial
     from pathlib import Path
 
-    from haddock.gear.clean_steps import unpack_compressed_and_archived_files
     from haddock.gear.extend_run import (
         copy_renum_step_folders,
-        update_contents_of_new_steps,
+        copy_steps_to_new_run,
         )
+    from haddock.gear.restraints_store import STORE_DIR
+    from haddock.libs.libio import link_file
     from haddock.gear.zerofill import zero_fill
     from haddock.modules import get_module_steps_folders
 
+    if link == "hardlink":
+        log.warning(
+            "The files of the new run are hard links to the files of "
+            f"{str(run_dir)!r}: modifying them in one run modifies them "
+            "in the other."
+            )
+
     log.info("Reading input run directory")
     # get the module folders from the run_dir input
     steps = get_module_steps_folders(run_dir)
@@ -145,9 +183,10 @@ def main(run_dir: FilePath, modules: list[int], output: FilePath) -> None:
         sys.exit(1)
     log.info(f"Created directory: {str(outdir.resolve())}")
 
-    # copy folders over
+    # copy folders over, updating the step names and the run dir name in
+    # the files referring to them
     zero_fill.set_zerofill_number(len(selected_steps))
-    new_step_folder = copy_renum_step_folders(run_dir, outdir, selected_steps)
+    copy_steps_to_new_run(run_dir, outdir, selected_steps, link=link)
 
     # copy data folders
     # `data_steps` are selected to avoid FileNotFoundError because some steps
@@ -161,16 +200,18 @@ def main(run_dir: FilePath, modules: list[int], output: FilePath) -> None:
         Path(run_dir, "data"),
         Path(outdir, "data"),
         data_steps,
+        link=link,
         )
 
-    # update step names in files
-    # update run dir names in files
-    unpack_compressed_and_archived_files(
-        new_step_folder,
-        ncores=1,
-        dec_all=True,
-        )
-    update_contents_of_new_steps(selected_steps, run_dir, outdir)
+    # the indexes of the restraint archives in the data folders refer to
+    # the restraints store of the run
+    store_dir = Path(run_dir, "data", STORE_DIR)
+    if store_dir.exists():
+        shutil.copytree(
+            store_dir,
+            Path(outdir, "data", STORE_DIR),
+            copy_function=partial(link_file, mode=link),
+            )
 
     return
 
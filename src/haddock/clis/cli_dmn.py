@@ -22,7 +22,17 @@ import sys
 import time
 from pathlib import Path
 
-from haddock.core.typing import ArgumentParser, Callable, Namespace, Optional
+from haddock.core.typing import (
+    ArgumentParser,
+    Callable,
+    Namespace,
+    Optional,
+    Union,
+)
+
+
+MTIME_RESOLUTION_NS = 2_000_000_000
+"""modifications more recent than this are not trusted for change detection"""
 
 
 workload_manager_launch = {
@@ -31,6 +41,12 @@ workload_manager_launch = {
 }
 """options for the different job queue systems supported"""
 
+workload_manager_query = {
+    "slurm": (["squeue", "--noheader", "--format=%j"], 0),
+    "torque": (["qstat", "-a"], 3),
+}
+"""command listing the queued jobs, and the column with the job names"""
+
 
 # prepares client arguments
 ap = argparse.ArgumentParser(
@@ -77,6 +93,44 @@ ap.add_argument(
     action="store_true",
 )
 
+ap.add_argument(
+    "--poll-interval",
+    dest="poll_interval",
+    help="Seconds between two checks of the queue. Default: 120",
+    default=120,
+    type=float,
+)
+
+ap.add_argument(
+    "--submit-delay",
+    dest="submit_delay",
+    help="Seconds between two job submissions. Default: 5",
+    default=5,
+    type=float,
+)
+
+ap.add_argument(
+    "--dry-run",
+    dest="dry_run",
+    help=(
+        "Do not submit any job. Simulate the daemon on a fake queue, where "
+        "jobs run for a time proportional to their size, and report the "
+        "makespan (time until all jobs are done)."
+    ),
+    action="store_true",
+)
+
+ap.add_argument(
+    "--sim-cost",
+    dest="sim_cost",
+    help=(
+        "Simulated run time, in seconds per CA atom of the target, used "
+        "with `--dry-run`. Default: 6"
+    ),
+    default=6,
+    type=float,
+)
+
 
 def _ap() -> ArgumentParser:
     return ap
@@ -111,6 +165,10 @@ class Job:
         self.check_available = Path(self.job_run_folder, "AVAILABLE")
         self.check_fail = Path(self.job_run_folder, "FAIL")
         self.status = None
+        # estimated cost of the job, see `calc_size`
+        self.size = 0
+        # modification time of the run folder when the status was read
+        self._status_mtime: Optional[int] = None
 
         self.status_files = [
             self.check_done,
@@ -126,8 +184,24 @@ class Job:
         The job status depends on the present of files: `AVAILABLE`,
         `RUNNING`, `DONE`, and `FAIL` created by `haddock-bm` jobs.
 
-        Status is assigned to `self.status` and returned.
+        Status is assigned to `self.status` and returned. Status files are
+        only checked again if the run folder has been modified since the
+        last check.
         """
+        try:
+            mtime = self.job_run_folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        # a modification within the timestamp resolution could be missed,
+        # so recently modified folders are always checked
+        is_settled = (
+            mtime is not None
+            and time.time_ns() - mtime > MTIME_RESOLUTION_NS
+        )
+        if is_settled and mtime == self._status_mtime:
+            return self.status
+        self._status_mtime = mtime
+
         for _file in self.status_files:
             if _file.exists():
                 self.status = _file.stem  # type: ignore
@@ -156,6 +230,206 @@ class Job:
         self.check_available.touch(exist_ok=True)
 
 
+class WorkloadQueue:
+    """
+    Queue of a workload manager.
+
+    Parameters
+    ----------
+    manager : str
+        A key to the `workload_manager_launch` dictionary.
+
+    grep : str
+        The string identifying the job-names of the benchmark.
+    """
+
+    def __init__(self, manager: str = "slurm", grep: str = "BM5") -> None:
+        self.query_command, self.name_column = workload_manager_query[manager]
+        self.grep = grep
+
+    def count_jobs(self) -> int:
+        """
+        Count the jobs in the queue with the `grep` word in their name.
+
+        The whole queue is listed with a single command.
+        """
+        result = subprocess.run(
+            self.query_command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        njobs = 0
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if len(fields) > self.name_column:
+                njobs += self.grep in fields[self.name_column]
+        print(f"Found {njobs} in the queue.")
+        return njobs
+
+    def submit(self, job: Job) -> None:
+        """Submit a job."""
+        job.submit()
+
+    def is_available(self, job: Job) -> bool:
+        """Check whether a job can still be submitted."""
+        return job.get_status() == "AVAILABLE"
+
+    def sleep(self, seconds: float) -> None:
+        """Wait for some time."""
+        time.sleep(seconds)
+
+    def time(self) -> float:
+        """Get the current time, in seconds."""
+        return time.monotonic()
+
+
+class SimulatedQueue:
+    """
+    Fake queue, to simulate the daemon without submitting jobs.
+
+    Jobs run as soon as they are submitted, for a time proportional to
+    their size. Time is simulated: sleeping advances the clock.
+
+    Parameters
+    ----------
+    cost : float
+        Run time of a job, in seconds per unit of size.
+    """
+
+    def __init__(self, cost: float = 6.0) -> None:
+        self.cost = cost
+        self.clock = 0.0
+        self.end_times: dict[Job, float] = {}
+
+    def count_jobs(self) -> int:
+        """Count the jobs still running."""
+        return sum(end > self.clock for end in self.end_times.values())
+
+    def submit(self, job: Job) -> None:
+        """Start a job."""
+        self.end_times[job] = self.clock + job.size * self.cost
+
+    def is_available(self, job: Job) -> bool:
+        """Check whether a job can still be submitted."""
+        return job not in self.end_times
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock."""
+        self.clock += seconds
+
+    def time(self) -> float:
+        """Get the simulated time, in seconds."""
+        return self.clock
+
+    @property
+    def makespan(self) -> float:
+        """Time when the last job finishes."""
+        return max(self.end_times.values(), default=0.0)
+
+
+def run_daemon(
+    jobs: list[Job],
+    queue: Union[WorkloadQueue, SimulatedQueue],
+    job_limit: int = 10,
+    poll_interval: float = 120,
+    submit_delay: float = 5,
+) -> list[Job]:
+    """
+    Submit the jobs to the queue, keeping at most `job_limit` jobs queued.
+
+    Jobs are submitted in the given order. A submitted job is never
+    submitted again, even while it is still waiting in the queue.
+
+    Parameters
+    ----------
+    jobs : list of Job objects
+        The `AVAILABLE` jobs to submit, in order of submission.
+
+    queue : WorkloadQueue or SimulatedQueue
+        The queue to submit the jobs to.
+
+    job_limit : int
+        The max number of jobs to send to the queue.
+
+    poll_interval : float
+        Seconds between two checks of the queue.
+
+    submit_delay : float
+        Seconds between two job submissions.
+
+    Returns
+    -------
+    list
+        The submitted jobs, in order of submission.
+    """
+    submitted: list[Job] = []
+    pending = list(jobs)
+    while pending:
+        # get the number of available queue slots according to the
+        # job limit parameter
+        #
+        # 0 is added to avoid going to negative values in case a job
+        # had been manually submitted.
+        empty_slots = max(0, job_limit - queue.count_jobs())
+        print("empty slots: ", empty_slots)
+
+        # send jobs if there are empty slots
+        for job in pending[:empty_slots]:
+            queue.submit(job)
+            submitted.append(job)
+            queue.sleep(submit_delay)
+        pending = pending[empty_slots:]
+        if not pending:
+            break
+
+        # chill before repeating the process.
+        print(f"chilling for {poll_interval} seconds...")
+        queue.sleep(poll_interval)
+
+        # drops the jobs that are no longer available (for example, sent
+        # by hand), only folders that changed are inspected
+        pending = [job for job in pending if queue.is_available(job)]
+
+    return submitted
+
+
+def simulate_daemon(
+    jobs: list[Job],
+    job_limit: int = 10,
+    poll_interval: float = 120,
+    submit_delay: float = 5,
+    cost: float = 6.0,
+) -> float:
+    """
+    Simulate the daemon on a fake queue.
+
+    Parameters
+    ----------
+    jobs : list of Job objects
+        The jobs to submit, in order of submission.
+
+    cost : float
+        Run time of a job, in seconds per unit of size.
+
+    Other parameters are the same as in :py:func:`run_daemon`.
+
+    Returns
+    -------
+    float
+        The makespan, in seconds: the time when the last job finishes.
+    """
+    queue = SimulatedQueue(cost=cost)
+    run_daemon(
+        jobs,
+        queue,
+        job_limit=job_limit,
+        poll_interval=poll_interval,
+        submit_delay=submit_delay,
+    )
+    return queue.makespan
+
+
 def get_current_jobs(grep: str = "BM5") -> int:
     """
     Get current number of jobs for which job-name has the `grep` word.
@@ -172,17 +446,7 @@ def get_current_jobs(grep: str = "BM5") -> int:
     int
         The number of jobs with the word `grep` in their name.
     """
-    concurrent_cmd = "qstat -a | awk '{print $4}' | grep " + grep + " | wc -l"
-    p = subprocess.Popen(
-        concurrent_cmd,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-    )
-    output = p.communicate()[0]
-    njobs = int(output.decode("utf-8"))
-    print(f"Found {njobs} in the queue.")
-    return njobs
+    return WorkloadQueue("torque", grep=grep).count_jobs()
 
 
 def calc_size(job_path: Path) -> int:
@@ -245,6 +509,10 @@ def main(
     manager: str = "slurm",
     restart: bool = False,
     sort_first: bool = False,
+    poll_interval: float = 120,
+    submit_delay: float = 5,
+    dry_run: bool = False,
+    sim_cost: float = 6.0,
 ) -> None:
     """
     Execute the benchmark daemon.
@@ -279,6 +547,19 @@ def main(
     sort_first : bool
         Whether to sort jobs by their size in ascending manner. That is,
         the sorted jobs first. Defaults to False, the longer first.
+
+    poll_interval : float
+        Seconds between two checks of the queue.
+
+    submit_delay : float
+        Seconds between two job submissions.
+
+    dry_run : bool
+        Simulate the daemon on a fake queue instead of submitting jobs.
+        Status files are not modified.
+
+    sim_cost : float
+        Simulated run time in seconds per CA atom, used with `dry_run`.
     """
     # lists of all the job files in the benchmark_path folder
     job_list = list(benchmark_path.glob("*/jobs/*.job"))
@@ -287,13 +568,36 @@ def main(
     if not job_list:
         sys.exit("+ ERROR! No jobs found in folder: {str(benchmark_path)!r}")
 
-    # sorts the job list
-    job_list.sort(key=calc_size, reverse=not (sort_first))  # noqa: E275
-
     # create the job objects according to the queue managing systme
     _jobsys = workload_manager_launch[manager]
     jobs = [Job(j, _jobsys) for j in job_list]
 
+    # sorts the job list by size, the estimated cost of each job
+    for _job in jobs:
+        _job.size = calc_size(_job.job_filename)
+    jobs.sort(key=lambda _job: _job.size, reverse=not sort_first)
+
+    if dry_run:
+        statuses = ("AVAILABLE", "RUNNING") if restart else ("AVAILABLE",)
+        available_jobs = [j for j in jobs if j.get_status() in statuses]
+        print(f"Simulating {len(available_jobs)} jobs.")
+        sim_params = {
+            "job_limit": job_limit,
+            "poll_interval": poll_interval,
+            "submit_delay": submit_delay,
+            "cost": sim_cost,
+        }
+        makespan = simulate_daemon(available_jobs, **sim_params)
+        # compare with submitting the jobs in folder order
+        available_jobs.sort(key=lambda _job: _job.job_filename)
+        folder_makespan = simulate_daemon(available_jobs, **sim_params)
+        print(f"Simulated makespan: {makespan / 3600:.2f} h")
+        print(
+            "Simulated makespan in folder order: "
+            f"{folder_makespan / 3600:.2f} h"
+        )
+        return
+
     # restart previously (halted) `RUNNING` jobs - if selected.
     if restart:
         running_jobs = filter_by_status(jobs, status="RUNNING")
@@ -304,26 +608,13 @@ def main(
     available_jobs = filter_by_status(jobs)
 
     # runs the daemon loop, only if there are available jobs :-)
-    while available_jobs:
-        # get the number of available queue slots according to the
-        # job limit parameter
-        #
-        # 0 is added to avoid going to negative values in case a job
-        # had been manually submitted.
-        empty_slots = max(0, job_limit - get_current_jobs())
-        print("empty slots: ", empty_slots)
-
-        # send jobs if there are empty slots
-        for i in range(empty_slots):
-            available_jobs[i].submit()
-            time.sleep(5)
-
-        # chill before repeating the process.
-        print("chilling for 120 seconds...")
-        time.sleep(120)
-
-        # refreshes the available_jobs list
-        available_jobs = filter_by_status(jobs)
+    run_daemon(
+        available_jobs,
+        WorkloadQueue(manager),
+        job_limit=job_limit,
+        poll_interval=poll_interval,
+        submit_delay=submit_delay,
+    )
 
     # done
     return
@@ -6,13 +6,20 @@ This was developed for use of lbimpi but it might be useful in some specific
 
 For more information please refer to the README.md in the examples folder.
 
+The failed jobs are tracked as they finish, see
+:py:class:`haddock.libs.libparallel.FailureTracker`. All processes are
+aborted as soon as the failed jobs of one process exceed the tolerance
+of its own jobs, or after a number of consecutive identical errors.
+
 Usage::
 
     haddock3-mpitask -h
     haddock3-mpitask tasks.pkl
+    haddock3-mpitask tasks.pkl --tolerance 5 --max-consecutive-errors 20
 """
 
 import argparse
+import os
 import pickle
 import sys
 
@@ -22,7 +29,10 @@ from haddock.core.typing import (
     Callable,
     FilePath,
     Namespace,
+    Optional,
 )
+from haddock.libs.libmpi import ABORT_MESSAGE
+from haddock.libs.libparallel import FailureTracker, get_task_error
 from haddock.libs.libsubprocess import CNSJob
 
 
@@ -72,6 +82,23 @@ ap.add_argument(
     help="The input pickled tasks path",
 )
 
+ap.add_argument(
+    "--tolerance",
+    help="Percentage of failed jobs tolerated (default: not checked).",
+    type=float,
+    default=None,
+)
+
+ap.add_argument(
+    "--max-consecutive-errors",
+    help=(
+        "Number of consecutive identical errors that abort the run "
+        "(default: %(default)s, not checked)."
+    ),
+    type=int,
+    default=0,
+)
+
 
 def _ap() -> ArgumentParser:
     return ap
@@ -96,7 +123,11 @@ def maincli() -> None:
 # ========================================================================#
 
 
-def main(pickled_tasks: FilePath) -> None:
+def main(
+        pickled_tasks: FilePath,
+        tolerance: Optional[float] = None,
+        max_consecutive_errors: int = 0,
+        ) -> None:
     """Execute the tasks."""
     MPI, COMM = get_mpi()
     if COMM.rank == 0:
@@ -107,10 +138,27 @@ def main(pickled_tasks: FilePath) -> None:
         mpi_jobs = None
 
     jobs: list[CNSJob] = COMM.scatter(mpi_jobs, root=0)
+    # each process tracks the failure rate of its own jobs
+    failures = FailureTracker(
+        len(jobs),
+        tolerance=tolerance,
+        max_consecutive=max_consecutive_errors,
+    )
 
     results: list[FilePath] = []
     for job in jobs:
-        job.run()
+        try:
+            job.run()
+        except Exception as err:
+            if not failures.active:
+                raise
+            error: Optional[str] = f"{type(err).__name__}: {err}"
+        else:
+            error = get_task_error(job)
+        if reason := failures.add(error):
+            sys.stderr.write(f"{ABORT_MESSAGE}{reason}{os.linesep}")
+            sys.stderr.flush()
+            COMM.Abort(1)
         # check if the job has an input file
         if hasattr(job, "input_file"):
             results.append(job.input_file)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Summarise the performance profiles of an HADDOCK3 run directory.
+
+Each step of a run writes a `perf.json` file in its folder, with the
+time spent in each phase of the module, the distribution of the task
+run times, the utilisation of the workers, the peak memory and the bytes
+read and written. This CLI reads these files and prints one line per
+step, plus the totals of the run.
+
+The phases are: setup (reading the parameters), prep (preparing the
+inputs, before the first engine run), engine (running the tasks), parse
+(reading the outputs, after the last engine run), io (writing
+`io.json`) and proc (module code between engine runs, or the whole
+module when it does not use an engine).
+
+Usage::
+
+    haddock3-perf -h
+    haddock3-perf <run_directory>
+    haddock3-perf run1 --json run1_perf.json
+"""
+import argparse
+import sys
+
+from haddock.core.typing import (
+    Any,
+    ArgumentParser,
+    Callable,
+    FilePath,
+    Namespace,
+    Optional,
+)
+from haddock.libs import libcli
+
+
+# Command line interface parser
+ap = argparse.ArgumentParser(
+    description=__doc__,
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+)
+
+libcli.add_rundir_arg(ap)
+
+ap.add_argument(
+    "--json",
+    dest="json_file",
+    help="Also save the summary to this JSON file.",
+    default=None,
+)
+
+libcli.add_version_arg(ap)
+
+
+COLUMNS = (
+    ("step", "{:<20}"),
+    ("wall", "{:>9}"),
+    ("setup", "{:>8}"),
+    ("prep", "{:>8}"),
+    ("engine", "{:>9}"),
+    ("parse", "{:>8}"),
+    ("io", "{:>7}"),
+    ("proc", "{:>8}"),
+    ("tasks", "{:>6}"),
+    ("task_mean", "{:>9}"),
+    ("task_max", "{:>9}"),
+    ("util", "{:>5}"),
+    ("rss_mb", "{:>8}"),
+    ("read_mb", "{:>9}"),
+    ("write_mb", "{:>9}"),
+    ("files", "{:>7}"),
+)
+"""Columns of the summary table and their format."""
+
+PHASE_COLUMNS = {
+    "setup": "setup",
+    "prep": "input_preparation",
+    "engine": "engine",
+    "parse": "output_parsing",
+    "io": "io_export",
+    "proc": "processing",
+}
+"""Summary table columns of the phases in `perf.json`."""
+
+
+def _ap() -> ArgumentParser:
+    return ap
+
+
+def load_args(ap: ArgumentParser) -> Namespace:
+    """Load argument parser args."""
+    return ap.parse_args()
+
+
+def cli(ap: ArgumentParser, main: Callable[..., None]) -> None:
+    """Command-line interface entry point."""
+    cmd = load_args(ap)
+    main(**vars(cmd))
+
+
+def maincli() -> None:
+    """Execute main client."""
+    cli(ap, main)
+
+
+def summarise_step(step: str, profile: dict[str, Any]) -> dict[str, Any]:
+    """
+    Summarise the profile of a step in one line.
+
+    Parameters
+    ----------
+    step : str
+        The name of the step folder.
+
+    profile : dict
+        The content of the step's `perf.json`.
+
+    Returns
+    -------
+    dict
+        The values of the summary table :py:const:`COLUMNS`.
+    """
+    phases = profile.get("phases", {})
+    tasks = profile.get("tasks", {})
+    workers = profile.get("workers", {})
+    io = profile.get("io", {})
+    row = {"step": step, "wall": profile.get("wall_time", 0.0)}
+    for column, phase in PHASE_COLUMNS.items():
+        row[column] = phases.get(phase, 0.0)
+    row["tasks"] = tasks.get("count", 0)
+    row["task_mean"] = tasks.get("mean")
+    row["task_max"] = tasks.get("max")
+    row["util"] = workers.get("utilisation")
+    row["rss_mb"] = max(profile.get("peak_rss_mb", {}).values(), default=None)
+    row["read_mb"] = io.get("bytes_read", 0) / 1024 ** 2
+    row["write_mb"] = io.get("bytes_written", 0) / 1024 ** 2
+    row["files"] = profile.get("files", {}).get("count", 0)
+    return row
+
+
+def summarise_run(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Aggregate the summaries of the steps of a run.
+
+    Times, tasks, bytes and files are added; the peak memory is the
+    largest of the steps; the task mean and the utilisation are weighted
+    by the number of tasks and the engine time.
+
+    Parameters
+    ----------
+    rows : list of dict
+        The summaries given by :py:func:`summarise_step`.
+
+    Returns
+    -------
+    dict
+        The values of the summary table :py:const:`COLUMNS`.
+    """
+    total: dict[str, Any] = {"step": "total"}
+    for column in (
+        "wall", *PHASE_COLUMNS, "tasks", "read_mb", "write_mb", "files"
+    ):
+        total[column] = sum(row[column] for row in rows)
+
+    timed = [row for row in rows if row["task_mean"] is not None]
+    total["task_mean"] = (
+        sum(row["task_mean"] * row["tasks"] for row in timed) / total["tasks"]
+        if total["tasks"]
+        else None
+    )
+    total["task_max"] = max((row["task_max"] for row in timed), default=None)
+
+    used = [row for row in rows if row["util"] is not None]
+    engine = sum(row["engine"] for row in used)
+    total["util"] = (
+        sum(row["util"] * row["engine"] for row in used) / engine
+        if engine
+        else None
+    )
+    total["rss_mb"] = max(
+        (row["rss_mb"] for row in rows if row["rss_mb"] is not None),
+        default=None,
+    )
+    return total
+
+
+def format_row(row: dict[str, Any]) -> str:
+    """Format a row of the summary table."""
+    cells = []
+    for column, fmt in COLUMNS:
+        value = row[column]
+        if value is None:
+            value = "-"
+        elif column == "util":
+            value = f"{value:.0%}"
+        elif isinstance(value, float):
+            value = f"{value:.2f}"
+        cells.append(fmt.format(value))
+    return " ".join(cells)
+
+
+def main(run_dir: FilePath, json_file: Optional[FilePath] = None) -> None:
+    """
+    Summarise the performance profiles of a run directory.
+
+    Parameters
+    ----------
+    run_dir : str or :external:py:class:`pathlib.Path`.
+        The path to the run directory.
+
+    json_file : str or :external:py:class:`pathlib.Path`, optional
+        Where to save the summary, as JSON.
+    """
+    # anti-pattern to speed up CLI initiation
+    import json
+    from pathlib import Path
+
+    from haddock import log
+    from haddock.core.defaults import PERF_FILE
+    from haddock.modules import get_module_steps_folders
+
+    rows = []
+    for step in get_module_steps_folders(run_dir):
+        fpath = Path(run_dir, step, PERF_FILE)
+        if not fpath.exists():
+            continue
+        rows.append(summarise_step(step, json.loads(fpath.read_text())))
+
+    if not rows:
+        log.warning(f"No {PERF_FILE} files found in {str(run_dir)!r}.")
+        return
+
+    total = summarise_run(rows)
+    print(" ".join(fmt.format(column) for column, fmt in COLUMNS))
+    for row in rows:
+        print(format_row(row))
+    print(format_row(total))
+
+    if json_file:
+        Path(json_file).write_text(
+            json.dumps({"steps": rows, "total": total}, indent=4)
+        )
+        log.info(f"Summary saved to {str(json_file)!r}")
+
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(maincli())  # type: ignore
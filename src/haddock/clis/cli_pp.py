@@ -6,7 +6,9 @@ logic implemented in the :py:mod:`haddock.gear.preprocessing`. See
 documentation pages for more details.
 
 You can use the `--dry` option to report on the performed changes
-without actually performing the changes.
+without actually performing the changes. The number of lines changed by
+each step is logged, and the changes are saved to a JSON report file
+(see `--report`).
 
 Corrected PDBs are saved to new files named after the `--suffix` option.
 Original PDBs are never overwritten, unless `--suffix` is given an empty
@@ -19,6 +21,7 @@ Usage::
     haddock-pp file1.pdb file2.pdb
     haddock-pp file1.pdb file2.pdb --suffix _new
     haddock-pp file1.pdb file2.pdb --dry
+    haddock-pp file1.pdb file2.pdb --dry --report changes.json
 """
 import argparse
 import sys
@@ -38,6 +41,7 @@ from haddock.libs.libio import add_suffix_to_files, save_lines_to_files
 
 
 SUFFIX_DEFAULT = "_processed"
+REPORT_DEFAULT = "preprocessing_report.json"
 
 ap = argparse.ArgumentParser(
     description=__doc__,
@@ -71,6 +75,17 @@ ap.add_argument(
     default=SUFFIX_DEFAULT,
 )
 
+ap.add_argument(
+    "-r",
+    "--report",
+    help=(
+        "JSON file where to save the changes found by a dry run. "
+        f"Defaults to {REPORT_DEFAULT!r} in the output directory."
+    ),
+    type=Path,
+    default=None,
+)
+
 add_output_dir_arg(ap)
 
 
@@ -104,6 +119,7 @@ def main(
     output_directory: Optional[FilePath] = None,
     suffix: str = SUFFIX_DEFAULT,
     topfile: Optional[FilePath] = None,
+    report: Optional[FilePath] = None,
 ) -> None:
     """
     Process PDB files.
@@ -123,16 +139,28 @@ def main(
 
     topfile : str or ``pathlib.Path``
         The path to an additional HADDOCK3 topology file.
+
+    report : str or ``pathlib.Path``
+        The JSON file where to save the changes found by a dry run.
+        Defaults to :py:data:`REPORT_DEFAULT` in the output directory.
     """
     log.info("Starting processing PDB files.")
     log.info(f"Total number of PDB files: {len(pdb_files)}")
 
+    if output_directory is None:
+        output_directory = Path.cwd()
+    else:
+        output_directory = Path(output_directory)
+
     if dry:
+        if report is None:
+            report = Path(output_directory, REPORT_DEFAULT)
         log.info(
-            "You selected the `--dry` option. No new files will be created. "
-            "A report of the changes that would be performed in the PDB files "
-            "will be printed."
+            "You selected the `--dry` option. No new PDB files will be "
+            "created. A report of the changes that would be performed in the "
+            f"PDB files will be saved to {str(report)!r}."
         )
+        Path(report).parent.mkdir(parents=True, exist_ok=True)
 
     new_residues = read_additional_residues(topfile) if topfile else None
 
@@ -142,6 +170,7 @@ def main(
         *pdb_files,
         dry=dry,
         user_supported_residues=new_residues,
+        report_file=report,
     )
 
     if dry:
@@ -149,10 +178,6 @@ def main(
         sys.exit(0)
 
     log.info("Finished processing PDBs. Saving to disk...")
-    if output_directory is None:
-        output_directory = Path.cwd()
-    else:
-        output_directory = Path(output_directory)
     log.info("Output dir: {!r}".format(str(output_directory)))
     output_directory.mkdir(parents=True, exist_ok=True)
 
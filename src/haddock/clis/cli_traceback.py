@@ -11,6 +11,7 @@ USAGE::
 """
 import argparse
 import sys
+from itertools import zip_longest
 from pathlib import Path
 
 import numpy as np
@@ -92,6 +93,25 @@ def get_ori_names(n: int, pdbfile: PDBFile, max_topo_len: int) -> tuple[list, in
     return ori_names, max_topo_len
 
 
+def get_ranks(scores: list[float]) -> np.ndarray:
+    """
+    Get the rank of each score, the lowest score having rank 1.
+
+    Parameters
+    ----------
+    scores : list[float]
+        List of scores.
+
+    Returns
+    -------
+    ranks : np.ndarray
+        Rank of each score, in the same order as the input.
+    """
+    ranks = np.empty(len(scores), dtype=int)
+    ranks[np.argsort(scores)] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
 def traceback_dataframe(
     data_dict: dict, rank_dict: dict, sel_step: list, max_topo_len: int
 ) -> pd.DataFrame:
@@ -116,23 +136,22 @@ def traceback_dataframe(
     """
     # get last step of the workflow
     last_step = sel_step[-1]
-    # data dict to dataframe
-    df_data = pd.DataFrame.from_dict(data_dict, orient="index")
-    df_data.reset_index(inplace=True)
     # assign columns
     data_cols = [el for el in reversed(sel_step)]
     data_cols.extend([f"00_topo{i+1}" for i in range(max_topo_len)])
-    df_data.columns = data_cols
-
-    # same for the rank_dict
-    df_ranks = pd.DataFrame.from_dict(rank_dict, orient="index")
-    df_ranks.reset_index(inplace=True)
-    ranks_col = [last_step]  # the key to merge the dataframes
-    ranks_col.extend([f"{el}_rank" for el in reversed(sel_step)])
-    df_ranks.columns = ranks_col
-
-    # merging the data and ranks dataframes
-    df_merged = pd.merge(df_data, df_ranks, on=last_step)
+    rank_cols = [f"{el}_rank" for el in reversed(sel_step)]
+
+    # build the dataframe column-wise, aligning the ranks with the data
+    # records. Shorter records (fewer topologies) are padded with None.
+    keys = [key for key in data_dict if key in rank_dict]
+    data_columns = zip_longest(*(data_dict[key] for key in keys))
+    rank_columns = zip(*(rank_dict[key] for key in keys))
+    columns = {last_step: keys}
+    for col, values in zip(data_cols[1:], data_columns):
+        columns[col] = list(values)
+    for col, values in zip(rank_cols, rank_columns):
+        columns[col] = list(values)
+    df_merged = pd.DataFrame(columns, columns=data_cols + rank_cols)
     ordered_cols = sorted(df_merged.columns)
     df_ord = df_merged[ordered_cols]
     # last thing: substituting unk records with - in the last step
@@ -284,54 +303,49 @@ def main(run_dir: FilePath, offline: bool = False) -> None:
     for n in range(len(sel_step) - 1, -1, -1):
         log.info(f"Tracing back step {sel_step[n]}")
         # correcting names in the dictionary. The ori_name must be complemented
-        # with the step folder name
-        for key in data_dict.keys():
-            if data_dict[key][-1] != "-":
-                data_dict[key][-1] = f"../{sel_step[n]}/{data_dict[key][-1]}"
+        # with the step folder name. At the same time, index the traced
+        # models by the name of their parent in the current step, so that
+        # each parent is looked up in constant time.
+        parents: dict[str, list[str]] = {}
+        for key, values in data_dict.items():
+            if values[-1] != "-":
+                values[-1] = f"../{sel_step[n]}/{values[-1]}"
+            parents.setdefault(values[-1], []).append(key)
 
         delta = len(sel_step) - n - 1  # how many steps have we gone back?
         # loading the .json file
         json_path = Path(run_dir, sel_step[n], "io.json")
         io = ModuleIO()
         io.load(json_path)
-        # list all the values in the data_dict
-        ls_values = [x for val in data_dict.values() for x in val]
-        # getting and sorting the ranks for the current step folder
-        ranks = [pdbfile.score for pdbfile in io.output]
-        ranks_argsort = np.argsort(ranks)
+        # getting the ranks for the current step folder
+        ranks = get_ranks([pdbfile.score for pdbfile in io.output])
 
         # iterating through the pdbfiles to fill data_dict and rank_dict
-        for i, pdbfile in enumerate(io.output):
-            rank = np.where(ranks_argsort == i)[0][0] + 1
+        for pdbfile, rank in zip(io.output, ranks):
             # getting the original names
             ori_names, max_topo_len = get_ori_names(n, pdbfile, max_topo_len)
+            rel_path = str(pdbfile.rel_path)
             if n != len(sel_step) - 1:
-                if str(pdbfile.rel_path) not in ls_values:
+                if rel_path not in parents:
                     # this is the first step in which the pdbfile appears.
                     # This means that it was discarded for the subsequent steps
                     # We need to add the pdbfile to the data_dict
                     keys = [f"unk{unk_idx}"]
                     data_dict[keys[0]] = ["-" for el in range(delta - 1)]
-                    data_dict[keys[0]].append(str(pdbfile.rel_path))
+                    data_dict[keys[0]].append(rel_path)
                     rank_dict[keys[0]] = ["-" for el in range(delta)]
                     unk_idx += 1
                 else:
                     # we've already seen this pdb before.
-                    idxs = [i for i, el in enumerate(ls_values) if el==str(pdbfile.rel_path)]
-                    keys = [list(data_dict.keys())[idx // delta] for idx in idxs]
+                    keys = parents[rel_path]
 
                 # assignment
-                for el in ori_names:
-                    for key in keys:
-                        data_dict[key].append(el)
                 for key in keys:
+                    data_dict[key].extend(ori_names)
                     rank_dict[key].append(rank)
             else:  # last step of the workflow
-                data_dict[str(pdbfile.rel_path)] = [on for on in ori_names]
-                rank_dict[str(pdbfile.rel_path)] = [rank]
-
-        # print(f"rank_dict {rank_dict}")
-        # print(f"data_dict {data_dict}, maxtopo {max_topo_len}")
+                data_dict[rel_path] = [on for on in ori_names]
+                rank_dict[rel_path] = [rank]
 
     # stripping away relative paths
     final_data_dict = {}
@@ -10,8 +10,8 @@ from haddock.fcc import cluster_fcc
 from haddock.gear.config import load as read_config
 from haddock.gear.config import save as save_config
 from haddock.libs.libclust import (
+    MAX_NB_ENTRY_HTML_MATRIX,
     add_cluster_info,
-    get_cluster_matrix_plot_clt_dt,
     plot_cluster_matrix,
     rank_clusters,
     write_structure_list,
@@ -195,8 +195,6 @@ def reclustfcc(
             final_order_idx.append(models.index(pdb))
             labels.append(pdb.file_name.replace(".pdb", ""))
             cluster_ids.append(pdb.clt_id)
-        # Get custom cluster data
-        matrix_cluster_dt, cluster_limits = get_cluster_matrix_plot_clt_dt(cluster_ids)
         # Define output filename
         html_matrix_basepath = Path(outdir, "fcc_matrix")
         # Plot matrix
@@ -207,8 +205,10 @@ def reclustfcc(
             dttype="FCC",
             diag_fill=1,
             output_fname=html_matrix_basepath,
-            matrix_cluster_dt=matrix_cluster_dt,
-            cluster_limits=cluster_limits,
+            cluster_ids=cluster_ids,
+            max_size=clustfcc_params.get(
+                "plot_matrix_max_size", MAX_NB_ENTRY_HTML_MATRIX
+                ),
         )
         log.info(f"Plotting matrix in {html_matrixpath}")
 
@@ -9,9 +9,9 @@ from haddock.gear.config import load as read_config
 from haddock.gear.config import save as save_config
 from haddock.modules import get_module_steps_folders
 from haddock.libs.libclust import (
+    MAX_NB_ENTRY_HTML_MATRIX,
     add_cluster_info,
     clustrmsd_tolerance_params,
-    get_cluster_matrix_plot_clt_dt,
     plot_cluster_matrix,
     rank_clusters,
     write_structure_list,
@@ -222,10 +222,6 @@ def reclustrmsd(
                 final_order_idx.append(models.index(pdb))
                 labels.append(pdb.file_name.replace('.pdb', ''))
                 cluster_ids.append(pdb.clt_id)
-            # Get custom cluster data
-            matrix_cluster_dt, cluster_limits = get_cluster_matrix_plot_clt_dt(
-                cluster_ids
-                )
             # Define output filename
             html_matrix_basepath = Path(outdir, 'rmsd_matrix')
             # Plot matrix
@@ -237,8 +233,10 @@ def reclustrmsd(
                 reverse=True,
                 diag_fill=0,
                 output_fname=html_matrix_basepath,
-                matrix_cluster_dt=matrix_cluster_dt,
-                cluster_limits=cluster_limits,
+                cluster_ids=cluster_ids,
+                max_size=clustrmsd_params.get(
+                    "plot_matrix_max_size", MAX_NB_ENTRY_HTML_MATRIX
+                    ),
                 )
             log.info(f"Plotting matrix in {html_matrixpath}")
 
@@ -17,10 +17,20 @@ Usage:
 
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
-from freesasa import Structure
 
-from haddock.core.typing import Union
+import numpy as np
+from freesasa import Classifier, Parameters, Structure, calc
+
+from haddock.core.typing import (
+    Callable,
+    FilePath,
+    NDFloat,
+    Optional,
+    Sequence,
+    Union,
+    )
 from haddock.libs.librestraints import DEFAULT_PROBE_RADIUS, REL_ASA
 
 
@@ -93,139 +103,324 @@ VALID_IONS = [
     ]
 
 
-def get_accessibility(
-        pdb_f: Union[Path, str],
+def get_sasa_parameters(
         probe_radius: float = DEFAULT_PROBE_RADIUS,
-        ) -> dict[str, dict[int, dict[str, float]]]:
-    """Compute per-residue accessibility values.
-    
-    Calls `FreeSASA <https://freesasa.github.io/>`_ using its Python API
-    and returns per-residue accessibility values.
+        ) -> Optional[Parameters]:
+    """Build the freesasa parameters for a given probe radius.
 
     Parameters
     ----------
-    pdb_f : Union[Path, str]
-        Path to the PDB file of interest.
-    
+    probe_radius : float
+        Probe radius for the accessibility calculation.
+
     Return
     ------
-    resid_access : dict[str, dict[int, dict[str, float]]]
-        Dictionary containing a list of accessible residues for each chain(s).
+    parameters : Optional[:py:class:`freesasa.Parameters`]
+        The parameters to use, or None if the freesasa defaults apply.
     """
-    naccess_unsupported_aa = ['HEC', 'TIP', 'ACE', 'THP', 'HEB', 'CTN']
-    logging.info("Calculate accessibility...")
-    try:
-        from freesasa import Classifier, calc, Parameters
-    except ImportError as err:
-        logging.error("calc_accessibility requires the 'freesasa' Python API")
-        raise ImportError(err)
-
-    # Initiate data holders
-    asa_data: dict[tuple[str, str, int, str], float] = {}
-    rsa_data: dict[tuple[str, str, int], float] = {}
-    rel_main_chain: dict[tuple[str, str, int], float] = {}
-    rel_side_chain: dict[tuple[str, str, int], float] = {}
-    # Point relative asa data
-    _rsa = REL_ASA['total']
-    _rsa_bb = REL_ASA['bb']
-    _rsa_sc = REL_ASA['sc']
-
-    # Workaround to get relative accessibility values for Nucleic Acids
-    #  -> will always be accessible !
-    for na in VALID_BASES:
-        _rsa[na] = 1
-        _rsa_bb[na] = 1
-        _rsa_sc[na] = 1
+    # if the probe_radius is different from the default value
+    # we need to redefine the parameters
+    if probe_radius == DEFAULT_PROBE_RADIUS:
+        return None
+    return Parameters(
+        {
+            'algorithm': 'LeeRichards',
+            'probe-radius': probe_radius,
+            'n-points': Parameters.defaultParameters['n-points'],
+            'n-slices': Parameters.defaultParameters['n-slices'],
+            'n-threads': Parameters.defaultParameters['n-threads'],
+            }
+        )
 
+
+@lru_cache
+def get_naccess_classifier() -> Classifier:
+    """Load the NACCESS radii classifier, once per process."""
     _script_path = '/'.join(os.path.realpath(__file__).split('/')[:-1])
     config_path = _script_path + '/naccess.config'
-    classifier = Classifier(config_path)
+    return Classifier(config_path)
 
-    struct = Structure(pdb_f, classifier, options={})
-    struct.setRadiiWithClassifier(classifier)
-    # if the probe_radius is different from the default value
-    # we need to redefine the parameters
-    if probe_radius != DEFAULT_PROBE_RADIUS:
-        new_parameters = Parameters(
-            {
-                'algorithm': 'LeeRichards',
-                'probe-radius': probe_radius,
-                'n-points': Parameters.defaultParameters['n-points'],
-                'n-slices': Parameters.defaultParameters['n-slices'],
-                'n-threads': Parameters.defaultParameters['n-threads'],
-                }
+
+class AccessibilityCalculator:
+    """Compute per-residue relative accessibilities.
+
+    The NACCESS classifier, the freesasa parameters and the relative
+    accessibility reference tables are set up once, so that repeated
+    calculations only cost the freesasa computation itself. Use
+    :py:func:`get_accessibility_calculator` to obtain the calculator
+    shared by a process.
+    """
+
+    naccess_unsupported_aa = ['HEC', 'TIP', 'ACE', 'THP', 'HEB', 'CTN']
+
+    def __init__(self, probe_radius: float = DEFAULT_PROBE_RADIUS) -> None:
+        """Initialise the calculator.
+
+        Parameters
+        ----------
+        probe_radius : float
+            Probe radius for the accessibility calculation.
+        """
+        self.probe_radius = probe_radius
+        self.parameters = get_sasa_parameters(probe_radius)
+        self.classifier = get_naccess_classifier()
+        # Point relative asa data
+        self._rsa = REL_ASA['total']
+        self._rsa_bb = REL_ASA['bb']
+        self._rsa_sc = REL_ASA['sc']
+        # Workaround to get relative accessibility values for Nucleic Acids
+        #  -> will always be accessible !
+        for na in VALID_BASES:
+            self._rsa[na] = 1
+            self._rsa_bb[na] = 1
+            self._rsa_sc[na] = 1
+
+    def __call__(
+            self,
+            structure: Union[FilePath, Sequence[str], Structure],
+            atom_areas_func: Optional[
+                Callable[[Structure], Sequence[float]]
+                ] = None,
+            ) -> dict[str, dict[int, dict[str, float]]]:
+        """Compute per-residue accessibility values of a structure.
+
+        Parameters
+        ----------
+        structure : Union[FilePath, Sequence[str], Structure]
+            Path to a PDB file, PDB lines, or an already loaded structure.
+        atom_areas_func : Optional[Callable]
+            Function giving the solvent accessible surface area of each
+            atom of the loaded structure, used instead of freesasa.
+
+        Return
+        ------
+        resid_access : dict[str, dict[int, dict[str, float]]]
+            Dictionary containing a list of accessible residues for each
+            chain(s).
+        """
+        struct = self.load_structure(structure)
+        if atom_areas_func is None:
+            atom_areas_func = self.atom_areas
+        return self.relative_accessibility(struct, atom_areas_func(struct))
+
+    def load_structure(
+            self,
+            structure: Union[FilePath, Sequence[str], Structure],
+            ) -> Structure:
+        """Load a structure with NACCESS radii.
+
+        Parameters
+        ----------
+        structure : Union[FilePath, Sequence[str], Structure]
+            Path to a PDB file, PDB lines, or an already loaded structure.
+            PDB lines are read as freesasa reads PDB files: only ATOM
+            records of the first model, without hydrogens (according to
+            the element column) and alternative locations.
+
+        Return
+        ------
+        struct : :py:class:`freesasa.Structure`
+            The loaded structure, with atomic radii set.
+        """
+        if isinstance(structure, Structure):
+            return structure
+        if isinstance(structure, (str, Path)):
+            struct = Structure(str(structure), self.classifier, options={})
+        else:
+            struct = Structure()
+            for line in structure:
+                if line.startswith('ENDMDL'):
+                    break
+                if not line.startswith('ATOM') or line[16] not in ' A':
+                    continue
+                if line[76:78].strip() in ('H', 'D'):
+                    continue
+                struct.addAtom(
+                    line[12:16],
+                    line[17:20],
+                    line[22:27],
+                    line[21],
+                    float(line[30:38]),
+                    float(line[38:46]),
+                    float(line[46:54]),
+                    )
+            # same failure as freesasa when reading a file without atoms
+            if struct.nAtoms() == 0:
+                raise Exception("Error reading structure: no ATOM lines.")
+        struct.setRadiiWithClassifier(self.classifier)
+        return struct
+
+    def atom_areas(self, struct: Structure) -> NDFloat:
+        """Compute the solvent accessible surface area of each atom."""
+        if self.parameters is not None:
+            result = calc(struct, parameters=self.parameters)
+        else:
+            result = calc(struct)
+        return np.array([result.atomArea(i) for i in range(struct.nAtoms())])
+
+    def relative_accessibility(
+            self,
+            struct: Structure,
+            atom_areas: Sequence[float],
+            ) -> dict[str, dict[int, dict[str, float]]]:
+        """Compute per-residue relative accessibility from atomic areas.
+
+        Parameters
+        ----------
+        struct : :py:class:`freesasa.Structure`
+            The structure of interest.
+        atom_areas : Sequence[float]
+            Solvent accessible surface area of each atom of the structure.
+
+        Return
+        ------
+        resid_access : dict[str, dict[int, dict[str, float]]]
+            Dictionary containing a list of accessible residues for each
+            chain(s).
+        """
+        nb_atoms = struct.nAtoms()
+        atnames = np.array(
+            [struct.atomName(i).strip() for i in range(nb_atoms)]
             )
-        result = calc(struct, parameters=new_parameters)
-    else:
-        result = calc(struct)
-
-    # iterate over all atoms to get SASA and residue name
-    for idx in range(struct.nAtoms()):
-        atname = struct.atomName(idx).strip()
-        resname = struct.residueName(idx).strip()
-        resid = int(struct.residueNumber(idx))
-        chain = struct.chainLabel(idx)
-        at_uid = (chain, resname, resid, atname)
-        res_uid = (chain, resname, resid)
-
-        asa = result.atomArea(idx)
-        asa_data[at_uid] = asa
-        # add asa to residue
-        rsa_data[res_uid] = rsa_data.get(res_uid, 0) + asa
+        res_uids = [
+            (
+                struct.chainLabel(i),
+                struct.residueName(i).strip(),
+                int(struct.residueNumber(i)),
+                )
+            for i in range(nb_atoms)
+            ]
+        # Map residues to integer indices
+        res_indices: dict[tuple[str, str, int], int] = {}
+        atom_resids = np.array(
+            [res_indices.setdefault(uid, len(res_indices)) for uid in res_uids],
+            dtype=np.int64,
+            )
+        uids = list(res_indices)
+        resnames = [uid[1] for uid in uids]
+        for resname in set(resnames):
+            self._check_resname(resname)
+        is_base = np.array([resname in VALID_BASES for resname in resnames])
+        is_ion = np.array([
+            resname not in VALID_AA + VALID_BASES
+            and resname[:2] in VALID_IONS
+            for resname in resnames
+            ])
+
+        # 3 cases: Regular amino-acid, regular nucleic acid, ion
+        atom_is_base = is_base[atom_resids]
+        main_chain = (
+            (~atom_is_base & np.isin(atnames, ('C', 'N', 'O')))
+            | (atom_is_base & np.isin(atnames, ('P', 'C1', 'C9')))
+            )
+        ions = ~main_chain & is_ion[atom_resids]
+        main_chain |= ions
+        side_chain = ~main_chain | ions
 
+        atom_areas = np.asarray(atom_areas, dtype=np.float64)
+        nb_res = len(uids)
+        main_asa = np.bincount(
+            atom_resids[main_chain],
+            weights=atom_areas[main_chain],
+            minlength=nb_res,
+            )
+        side_asa = np.bincount(
+            atom_resids[side_chain],
+            weights=atom_areas[side_chain],
+            minlength=nb_res,
+            )
+        # convert to relative asa
+        rel_main_chain = (
+            main_asa / np.array([self._rsa_bb[rn] for rn in resnames]) * 100
+            ).tolist()
+        rel_side_chain = (
+            side_asa / np.array([self._rsa_sc[rn] for rn in resnames]) * 100
+            ).tolist()
+        has_side_chain = np.bincount(
+            atom_resids[side_chain],
+            minlength=nb_res,
+            ) > 0
+
+        # Residues in order of appearance of their main chain atoms
+        main_atoms = np.nonzero(main_chain)[0]
+        main_resids, first_atoms = np.unique(
+            atom_resids[main_atoms],
+            return_index=True,
+            )
+        ordered_resids = main_resids[np.argsort(main_atoms[first_atoms])]
+
+        # We format to fit the pipeline
+        resid_access: dict[str, dict[int, dict[str, float]]] = {}
+        for ri in ordered_resids:
+            chain, _resname, resnum = uids[ri]
+            if chain not in resid_access:
+                resid_access[chain] = {}
+            resid_access[chain][resnum] = {
+                'side_chain_rel': (
+                    rel_side_chain[ri] if has_side_chain[ri] else 0
+                    ),
+                'main_chain_rel': rel_main_chain[ri],
+                }
+        # Display accessible residues
+        for chain in resid_access:
+            logging.info(
+                f"Chain: {chain} - {len(resid_access[chain])} residues"
+                )
+        return resid_access
+
+    def _check_resname(self, resname: str) -> None:
+        """Set relative accessibility of unknown residues."""
         # If residue name is unknown, this is probably an ion,
         #  set a relative accessibility of -1
-        if resname not in _rsa and (
+        if resname not in self._rsa and (
                 resname not in VALID_AA + VALID_BASES
                 or resname[:2] in VALID_IONS
-                or resname in naccess_unsupported_aa
+                or resname in self.naccess_unsupported_aa
                 ):
             logging.warning(f"UPDATED RSA for {resname}")
-            _rsa[resname] = -1
-            _rsa_bb[resname] = -1
-            _rsa_sc[resname] = -1
+            self._rsa[resname] = -1
+            self._rsa_bb[resname] = -1
+            self._rsa_sc[resname] = -1
 
-        # 3 cases: Regular amino-acid, regular nucleic acid, ion
-        if (resname not in VALID_BASES and atname in ('C', 'N', 'O')) or \
-                (resname in VALID_BASES and atname in ('P', 'C1', 'C9')):
-            rel_main_chain[res_uid] = rel_main_chain.get(res_uid, 0) + asa
-        elif all([
-                resname not in VALID_AA + VALID_BASES,
-                resname[:2] in VALID_IONS,
-                ]):
-            rel_main_chain[res_uid] = rel_main_chain.get(res_uid, 0) + asa
-            rel_side_chain[res_uid] = rel_side_chain.get(res_uid, 0) + asa
-        else:
-            rel_side_chain[res_uid] = rel_side_chain.get(res_uid, 0) + asa
-    # convert total asa to relative asa
-    rsa_data.update(
-        (res_uid, asa / _rsa[res_uid[1]])
-        for res_uid, asa in rsa_data.items()
-        )
-    rel_main_chain.update(
-        (res_uid, asa / _rsa_bb[res_uid[1]] * 100)
-        for res_uid, asa in rel_main_chain.items()
-        )
-    rel_side_chain.update(
-        (res_uid, asa / _rsa_sc[res_uid[1]] * 100)
-        for res_uid, asa in rel_side_chain.items()
-        )
-    # We format to fit the pipeline
-    resid_access: dict[str, dict[int, dict[str, float]]] = {}
-    for res_uid, access in rel_main_chain.items():
-        chain = res_uid[0]
-        # resname = res_uid[1]
-        resnum = res_uid[2]
-        if chain not in resid_access:
-            resid_access[chain] = {}
-        resid_access[chain][resnum] = {
-            'side_chain_rel': rel_side_chain.get(res_uid, 0),
-            'main_chain_rel': access,
-            }
-    # Display accessible residues
-    for chain in resid_access:
-        logging.info(f"Chain: {chain} - {len(resid_access[chain])} residues")
-    return resid_access
+
+@lru_cache
+def get_accessibility_calculator(
+        probe_radius: float = DEFAULT_PROBE_RADIUS,
+        ) -> AccessibilityCalculator:
+    """Get the accessibility calculator of this process for a probe radius."""
+    return AccessibilityCalculator(probe_radius)
+
+
+def get_accessibility(
+        pdb_f: Union[FilePath, Sequence[str]],
+        probe_radius: float = DEFAULT_PROBE_RADIUS,
+        atom_areas_func: Optional[
+            Callable[[Structure], Sequence[float]]
+            ] = None,
+        ) -> dict[str, dict[int, dict[str, float]]]:
+    """Compute per-residue accessibility values.
+    
+    Calls `FreeSASA <https://freesasa.github.io/>`_ using its Python API
+    and returns per-residue accessibility values.
+
+    Parameters
+    ----------
+    pdb_f : Union[FilePath, Sequence[str]]
+        Path to the PDB file of interest, or its lines.
+    probe_radius : float
+        Probe radius for the accessibility calculation.
+    atom_areas_func : Optional[Callable]
+        Function giving the solvent accessible surface area of each atom
+        of the loaded structure, used instead of freesasa.
+    
+    Return
+    ------
+    resid_access : dict[str, dict[int, dict[str, float]]]
+        Dictionary containing a list of accessible residues for each chain(s).
+    """
+    logging.info("Calculate accessibility...")
+    calculator = get_accessibility_calculator(probe_radius)
+    return calculator(pdb_f, atom_areas_func=atom_areas_func)
 
 
 def apply_cutoff(
@@ -6,13 +6,17 @@ surface exposed passive residues within a 6.5A radius from the active residues.
 When provided with a list of surface residues, it will filter the list for those
 that are within 6.5A from the active residues.
 
+Several lists of active residues can be given: the structure is read once and
+the passive residues of each list are printed on a line.
+
 Usage:
-    haddock3-restraints passive_from_active <pdb_file> <active_list> [-c <chain_id>] [-s <surface_list>]
+    haddock3-restraints passive_from_active <pdb_file> <active_list>
+        [<active_list> ...] [-c <chain_id>] [-s <surface_list>]
 """
 
 import sys
 
-from haddock.libs.librestraints import passive_from_active_raw
+from haddock.libs.librestraints import StructureSession
 
 
 def add_pass_from_act_arguments(pass_from_act_subcommand):
@@ -25,8 +29,12 @@ def add_pass_from_act_arguments(pass_from_act_subcommand):
 
     pass_from_act_subcommand.add_argument(
         "active_list",
-        help="List of active residues IDs (int) separated by commas",
+        help=(
+            "List of active residues IDs (int) separated by commas. "
+            "Give several lists to get the passive residues of each."
+            ),
         type=str,
+        nargs="+",
         )
 
     pass_from_act_subcommand.add_argument(
@@ -49,19 +57,23 @@ def add_pass_from_act_arguments(pass_from_act_subcommand):
 
 def passive_from_active(structure, active_list, chain_id=None, surface_list=""):
     """Get the passive residues."""
-
-    active = [int(res) for res in active_list.split(',')]
+    if isinstance(active_list, str):
+        active_list = [active_list]
+    active_sets = [
+        [int(res) for res in active.split(',')]
+        for active in active_list
+        ]
     surface = []
     if surface_list:
         surface = [int(res) for res in surface_list.split(',')]
 
     try:
-        passive = passive_from_active_raw(
-            structure, active, chain_id, surface
-        )
+        session = StructureSession(structure)
+        passive_sets = session.passive_batch(active_sets, chain_id, surface)
     except Exception as e:
         print(e)
         sys.exit(1)
 
-    print(' '.join([str(r) for r in passive]))
+    for passive in passive_sets:
+        print(' '.join([str(r) for r in passive]))
     return
@@ -6,7 +6,7 @@ sequence/numbering gaps.
 
 Usage::
 	
-	haddock3-restraints restrain_bodies <structure> [--exclude] [--verbose]
+	haddock3-restraints restrain_bodies <structure> [--exclude] [--seed] [--verbose]
 """
 
 import logging
@@ -16,7 +16,8 @@ import random
 from haddock.libs.librestraints import read_structure, get_bodies, build_restraints, generate_tbl
 
 # Set random seed to have reproducibility
-random.seed(917)
+DEFAULT_SEED = 917
+random.seed(DEFAULT_SEED)
 
 def add_restrain_bodies_arguments(restraint_bodies_subcommand):
 	restraint_bodies_subcommand.add_argument(
@@ -32,6 +33,15 @@ def add_restrain_bodies_arguments(restraint_bodies_subcommand):
 		type=str,
 		)
 	
+	restraint_bodies_subcommand.add_argument(
+		"-s",
+		"--seed",
+		help="Random seed of the residues picked in each body.",
+		required=False,
+		default=DEFAULT_SEED,
+		type=int,
+		)
+	
 	restraint_bodies_subcommand.add_argument(
 		"-v",
 		"--verbose",
@@ -44,7 +54,7 @@ def add_restrain_bodies_arguments(restraint_bodies_subcommand):
 	restraint_bodies_subcommand
 
 
-def restrain_bodies(structure, exclude=None, verbose=0):  # noqa: E501
+def restrain_bodies(structure, exclude=None, seed=None, verbose=0):  # noqa: E501
 	"""Create distance restraints to lock several chains together.
 	
 	Parameters
@@ -54,6 +64,11 @@ def restrain_bodies(structure, exclude=None, verbose=0):  # noqa: E501
 
 	exclude : str
 		Chains to exclude from the calculation.
+
+	seed : int
+		Random seed of the residues picked in each body. The same structure
+		and seed give the same restraints. If `None`, the picks continue the
+		random sequence seeded when this module is imported.
 	
 	verbose : int
 		Tune verbosity of the output.
@@ -68,5 +83,5 @@ def restrain_bodies(structure, exclude=None, verbose=0):  # noqa: E501
 	# Main logic
 	atom_lst = read_structure(structure, exclude=exclude)
 	bodies = get_bodies(atom_lst)
-	restraints = build_restraints(bodies)
+	restraints = build_restraints(bodies, seed=seed)
 	generate_tbl(atom_lst, restraints)
@@ -30,14 +30,35 @@ To transfer less data we can compress the pdb
 with gzip before base64 encoding.
 For example the 2oob.pdb 74.8Kb becomes 101Kb when base64 encoded
 while first gzip and then base64 encode it is 25.4Kb.
+
+Background for request handling:
+
+The structures are parsed from memory, in a pool of worker processes,
+so that requests are not serialised by the GIL of the server process.
+The size of the pool is set with the ``HADDOCK3_WS_WORKERS`` environment
+variable (default: the number of CPUs). With ``HADDOCK3_WS_WORKERS=0``,
+requests are run in the threads of the server process.
+
+The results are cached, keyed by a hash of the uploaded content and of
+the request parameters. Identical requests are computed once, including
+when they arrive while the first one is still being computed. The
+number of results kept is set with the ``HADDOCK3_WS_CACHE_SIZE``
+environment variable (default: 256, 0 disables the cache).
 """
 
+import asyncio
 import gzip
+import hashlib
 import io
-import tempfile
+import json
+import os
 from base64 import b64decode
-from contextlib import redirect_stdout
-from typing import Annotated
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, redirect_stdout
+from functools import lru_cache, partial
+from typing import Annotated, Any, Awaitable, Callable, Optional, Union
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.gzip import GZipMiddleware
@@ -56,17 +77,148 @@ from haddock.clis.restraints.calc_accessibility import (
     get_accessibility,
 )
 from haddock.clis.restraints.restrain_bodies import (
+    DEFAULT_SEED,
     restrain_bodies as restrain_bodies_raw,
 )
 from haddock.libs.librestraints import (
     active_passive_to_ambig,
     check_parenthesis,
-    passive_from_active_raw,
+    StructureSession,
     validate_tbldata,
 )
 
 
-app = FastAPI()
+WORKERS_ENV = "HADDOCK3_WS_WORKERS"
+CACHE_SIZE_ENV = "HADDOCK3_WS_CACHE_SIZE"
+DEFAULT_CACHE_SIZE = 256
+SESSIONS_CACHE_SIZE = 16
+"""Number of parsed structures kept by each worker."""
+
+
+class ResultCache:
+    """Least recently used cache of the results of the requests.
+
+    While a result is being computed, identical requests wait for it
+    instead of computing it again. Failed computations are not cached.
+
+    Parameters
+    ----------
+    maxsize : int
+        The number of results kept. With 0, nothing is cached or shared.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._results: OrderedDict[str, Any] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def make_key(name: str, content: Union[bytes, str], **params: Any) -> str:
+        """Hash the content and the parameters of a request."""
+        if isinstance(content, str):
+            content = content.encode()
+        digest = hashlib.sha256(content)
+        digest.update(json.dumps([name, params], sort_keys=True).encode())
+        return digest.hexdigest()
+
+    async def get(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the result of a request, computing it if needed."""
+        if self.maxsize < 1:
+            return await compute()
+
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self._pending[key] = future
+            future.add_done_callback(partial(self._store, key))
+        # a client disconnecting does not cancel the shared computation
+        return await asyncio.shield(future)
+
+    def _store(self, key: str, future: asyncio.Future) -> None:
+        del self._pending[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._results[key] = future.result()
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+
+_executor: Optional[Executor] = None
+_cache = ResultCache(int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE)))
+
+
+def get_executor() -> Optional[Executor]:
+    """Get the pool of worker processes, or None to use threads."""
+    global _executor
+    workers = int(os.environ.get(WORKERS_ENV, os.cpu_count() or 1))
+    if workers < 1:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut the pool of worker processes down."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def run_cached(
+    function: Callable[..., Any],
+    content: Union[bytes, str],
+    **params: Any,
+) -> Any:
+    """Run a request in the worker pool, or get its result from the cache.
+
+    Parameters
+    ----------
+    function : callable
+        A module-level function, called with the content and the
+        parameters.
+    content : bytes or str
+        The uploaded content of the request.
+    **params
+        The other parameters of the request, JSON serialisable.
+    """
+
+    async def compute() -> Any:
+        global _executor
+        executor = get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor,
+                partial(function, content, **params),
+            )
+        except BrokenProcessPool:
+            # a worker died, start a new pool for the next requests
+            if _executor is executor:
+                _executor = None
+            raise
+
+    key = ResultCache.make_key(function.__name__, content, **params)
+    return await _cache.get(key, compute)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the worker pool with the server and stop it on shutdown."""
+    get_executor()
+    yield
+    shutdown_executor()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
@@ -105,29 +257,92 @@ class PassiveFromActiveRequest(BaseModel):
     radius: float = Field(default=6.5, description="The radius from active.")
 
 
+@lru_cache(maxsize=SESSIONS_CACHE_SIZE)
+def _get_session(structure: bytes) -> StructureSession:
+    # the KD-trees and the surface residues are reused by the next requests
+    return StructureSession(io.StringIO(structure.decode("latin_1")))
+
+
+def _passive_from_active(
+    structure: bytes,
+    active: list[int],
+    chain: str,
+    surface: list[int],
+    radius: float,
+) -> list[int]:
+    return _get_session(structure).passive(
+        active,
+        chain_id=chain,
+        surface=surface,
+        radius=radius,
+    )
+
+
 @app.post("/passive_from_active", tags=["restraints"])
-def calculate_passive_from_active(
+async def calculate_passive_from_active(
     request: PassiveFromActiveRequest,
 ) -> list[int]:
     """Calculate active restraints to passive restraints."""
     structure = unpacked_structure(request.structure)
+    try:
+        return await run_cached(
+            _passive_from_active,
+            structure,
+            active=request.active,
+            chain=request.chain,
+            surface=request.surface,
+            radius=request.radius,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        ) from e
 
-    with tempfile.NamedTemporaryFile() as structure_file:
-        structure_file.write(structure)
 
-        try:
-            passive = passive_from_active_raw(
-                structure=structure_file.name,
-                active=request.active,
-                chain_id=request.chain,
-                surface=request.surface,
-                radius=request.radius,
-            )
-            return passive
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
-            ) from e
+class PassiveFromActiveBatchRequest(BaseModel):
+    structure: Structure
+    active_sets: list[list[int]] = Field(
+        description="Lists of active residues.", examples=[[[1, 2, 3], [4, 5]]]
+    )
+    chain: str = Field(default="A", description="The chain identifier.")
+    surface: list[int] = Field(default=[], description="List of surface restraints.")
+    radius: float = Field(default=6.5, description="The radius from active.")
+
+
+def _passive_from_active_batch(
+    structure: bytes,
+    active_sets: list[list[int]],
+    chain: str,
+    surface: list[int],
+    radius: float,
+) -> list[list[int]]:
+    return _get_session(structure).passive_batch(
+        active_sets,
+        chain_id=chain,
+        surface=surface,
+        radius=radius,
+    )
+
+
+@app.post("/passive_from_active_batch", tags=["restraints"])
+async def calculate_passive_from_active_batch(
+    request: PassiveFromActiveBatchRequest,
+) -> list[list[int]]:
+    """Calculate the passive residues of several lists of active residues."""
+    structure = unpacked_structure(request.structure)
+    try:
+        return await run_cached(
+            _passive_from_active_batch,
+            structure,
+            active_sets=request.active_sets,
+            chain=request.chain,
+            surface=request.surface,
+            radius=request.radius,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        ) from e
 
 
 class ActPassToAmbigRequest(BaseModel):
@@ -178,21 +393,34 @@ class RestrainBodiesRequest(BaseModel):
     )
 
 
-@app.post("/restrain_bodies", response_class=PlainTextResponse, tags=["restraints"])
-def restrain_bodies(request: RestrainBodiesRequest) -> str:
-    """Create distance restraints to lock several chains together."""
-    structure = unpacked_structure(request.structure)
-    with tempfile.NamedTemporaryFile() as structure_file:
-        structure_file.write(structure)
-
-        output = io.StringIO()
+def _restrain_bodies(structure: bytes, exclude: list[str]) -> str:
+    output = io.StringIO()
+    try:
         with redirect_stdout(output):
             restrain_bodies_raw(
-                structure=structure_file.name,
-                exclude=request.exclude,
+                structure=structure.decode("latin_1").splitlines(),
+                exclude=exclude,
+                seed=DEFAULT_SEED,
             )
-        tbl = output.getvalue()
-        return tbl.strip()
+    except SystemExit as e:
+        raise ValueError("PDB File seems empty or no CA/P atoms found") from e
+    return output.getvalue().strip()
+
+
+@app.post("/restrain_bodies", response_class=PlainTextResponse, tags=["restraints"])
+async def restrain_bodies(request: RestrainBodiesRequest) -> str:
+    """Create distance restraints to lock several chains together."""
+    structure = unpacked_structure(request.structure)
+    try:
+        return await run_cached(
+            _restrain_bodies,
+            structure,
+            exclude=request.exclude,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        ) from e
 
 
 class CalcAccessibilityRequest(BaseModel):
@@ -202,25 +430,25 @@ class CalcAccessibilityRequest(BaseModel):
     )
 
 
+def _accessibility(structure: bytes) -> dict[str, dict[int, dict[str, float]]]:
+    return get_accessibility(structure.decode("latin_1").splitlines())
+
+
 @app.post("/calc_accessibility", tags=["restraints"])
-def calculate_accessibility(
+async def calculate_accessibility(
     request: CalcAccessibilityRequest,
 ) -> dict[str, list[int]]:
     """Calculate the accessibility of the side chains and apply a cutoff."""
     structure = unpacked_structure(request.structure)
-
-    with tempfile.NamedTemporaryFile() as structure_file:
-        structure_file.write(structure)
-
-        try:
-            access_dic = get_accessibility(structure_file.name)
-            # Filter residues based on accessibility cutoff
-            result_dict = apply_cutoff(access_dic, request.cutoff)
-            return result_dict
-        except AssertionError as e:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
-            ) from e
+    try:
+        # the accessibility is cached for all cutoffs
+        access_dic = await run_cached(_accessibility, structure)
+    except AssertionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        ) from e
+    # Filter residues based on accessibility cutoff
+    return apply_cutoff(access_dic, request.cutoff)
 
 
 class ValidateTblRequest(BaseModel):
@@ -244,15 +472,24 @@ class ValidateTblRequest(BaseModel):
     )
 
 
+def _validate_tbl(tbl: str, pcs: bool, quick: bool) -> str:
+    if quick:
+        check_parenthesis(tbl)
+    return validate_tbldata(tbl, pcs)
+
+
 @app.post("/validate_tbl", response_class=PlainTextResponse, tags=["restraints"])
-def validate_tbl(
+async def validate_tbl(
     request: ValidateTblRequest,
 ) -> str:
     tbl = unpacked_tbl(request.tbl)
     try:
-        if request.quick:
-            check_parenthesis(tbl)
-        return validate_tbldata(tbl, request.pcs)
+        return await run_cached(
+            _validate_tbl,
+            tbl,
+            pcs=request.pcs,
+            quick=request.quick,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
@@ -267,8 +504,29 @@ class PDBPreprocessRequest(BaseModel):
     keepcoord: bool = Field(description="Remove all non-coordinate records", examples=[True], default=False)
 
 
+def _preprocess_pdb(
+    structure: bytes,
+    from_chain: str,
+    to_chain: str,
+    delhetatm: bool,
+    keepcoord: bool,
+) -> str:
+    lines = structure.decode("latin_1").splitlines()
+    lines = list(tidy_pdbfile(lines, strict=True))
+    lines = list(select_chain(lines, from_chain))
+    lines = list(alter_chain(lines, to_chain))
+    if delhetatm:
+        lines = list(remove_hetatm(lines))
+    lines = list(fix_insertions(lines, []))
+    if keepcoord:
+        lines = list(keep_coordinates(lines))
+    lines = list(select_by_occupancy(lines))
+    lines = list(tidy_pdbfile(lines, strict=True))
+    return "".join(lines)
+
+
 @app.post("/preprocess_pdb", response_class=PlainTextResponse, tags=["pdb"])
-def preprocess_pdb(request: PDBPreprocessRequest) -> str:
+async def preprocess_pdb(request: PDBPreprocessRequest) -> str:
     """Preprocess a PDB file.
 
     Runs the following [pdbtools](http://www.bonvinlab.org/pdb-tools/) pipeline:
@@ -285,16 +543,12 @@ def preprocess_pdb(request: PDBPreprocessRequest) -> str:
     ```
 
     """
-    structure = unpacked_structure(request.structure).decode("latin_1")
-    lines = structure.splitlines()
-    lines = list(tidy_pdbfile(lines, strict=True))
-    lines = list(select_chain(lines, request.from_chain))
-    lines = list(alter_chain(lines, request.to_chain))
-    if request.delhetatm:
-        lines = list(remove_hetatm(lines))
-    lines = list(fix_insertions(lines, []))
-    if request.keepcoord:
-        lines = list(keep_coordinates(lines))
-    lines = list(select_by_occupancy(lines))
-    lines = list(tidy_pdbfile(lines, strict=True))
-    return "".join(lines)
+    structure = unpacked_structure(request.structure)
+    return await run_cached(
+        _preprocess_pdb,
+        structure,
+        from_chain=request.from_chain,
+        to_chain=request.to_chain,
+        delhetatm=request.delhetatm,
+        keepcoord=request.keepcoord,
+    )
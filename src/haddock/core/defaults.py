@@ -3,26 +3,47 @@
 import os
 import string
 import sys
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
 
-import yaml
-
 import haddock
 from haddock import core_path, log
 
 
-cns_exec = Path(files(haddock).joinpath("bin/cns"))  # type: ignore
-if not cns_exec.exists():
-    log.warning("CNS executable not found at %s", cns_exec)
-    _cns_exec = os.environ.get("CNS_EXEC")
-    if _cns_exec is None:
-        log.error(
-            "Please define the location the CNS binary by setting a CNS_EXEC system variable"
-        )
-        sys.exit(1)
-    else:
-        cns_exec = Path(_cns_exec)
+@lru_cache
+def get_cns_exec() -> Path:
+    """
+    Get the CNS executable.
+
+    The executable shipped in ``haddock/bin`` is used if it exists,
+    otherwise the one defined by the ``CNS_EXEC`` environment variable.
+    Exits if there is none. The executable is looked up on first use,
+    not when this module is imported.
+    """
+    cns_exec = Path(files(haddock).joinpath("bin/cns"))  # type: ignore
+    if not cns_exec.exists():
+        log.warning("CNS executable not found at %s", cns_exec)
+        _cns_exec = os.environ.get("CNS_EXEC")
+        if _cns_exec is None:
+            log.error(
+                "Please define the location the CNS binary by setting a CNS_EXEC system variable"
+            )
+            sys.exit(1)
+        else:
+            cns_exec = Path(_cns_exec)
+    return cns_exec
+
+
+@lru_cache
+def get_max_molecules_allowed() -> int:
+    """Get the maximum number of input molecules, from `mandatory.yaml`."""
+    import yaml
+
+    with open(Path(core_path, "mandatory.yaml"), "r") as fin:
+        _ycfg = yaml.safe_load(fin)
+    return _ycfg["molecules"]["maxitems"]
+
 
 CONTACT_FCC_EXEC = Path(files("haddock").joinpath("bin/contact_fcc"))  # type: ignore
 FAST_RMSDMATRIX_EXEC = Path(files("haddock").joinpath("bin/fast-rmsdmatrix"))  # type: ignore
@@ -35,6 +56,12 @@ this prefix"""
 MODULE_IO_FILE = "io.json"
 """Default name for exchange module information file"""
 
+PERF_FILE = "perf.json"
+"""Default name for the performance profile of a module"""
+
+REFERENCES_FILE = ".references.json"
+"""Default name for the files of a step referring to its run directory"""
+
 MAX_NUM_MODULES = 10000
 """Temptative number of max allowed number of modules to execute"""
 
@@ -53,7 +80,12 @@ CNS_MODULES = ["rigidbody", "flexref", "emscoring", "mdscoring", "mdref", "emref
 """List of CNS modules available in HADDOCK3."""
 
 
-with open(Path(core_path, "mandatory.yaml"), "r") as fin:
-    _ycfg = yaml.safe_load(fin)
-max_molecules_allowed = _ycfg["molecules"]["maxitems"]
-del _ycfg
+def __getattr__(name: str) -> object:
+    # `cns_exec` and `max_molecules_allowed` are resolved on first access:
+    # looking up CNS exits when it is missing, which must not happen to
+    # the clients and workers that never run it
+    if name == "cns_exec":
+        return get_cns_exec()
+    if name == "max_molecules_allowed":
+        return get_max_molecules_allowed()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
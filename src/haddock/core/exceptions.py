@@ -34,6 +34,12 @@ class JobRunningError(HaddockError):
     pass
 
 
+class EngineAbortError(JobRunningError):
+    """The engine aborted a run doomed by the failures of its tasks."""
+
+    pass
+
+
 class CNSRunningError(HaddockError):
     """CNS run error."""
 
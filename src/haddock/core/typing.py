@@ -16,10 +16,14 @@ They are defined to
 Don't import other classes, type aliases or type variables defined
 in `haddock` into this module.
 This may lead to circular import problem.
+
+The aliases of numpy, pandas and plotly types are imported on first
+access, so that importing this module stays cheap.
 """
 
 
 from argparse import ArgumentParser, Namespace
+from importlib import import_module
 from logging import FileHandler, Handler, StreamHandler
 from pathlib import Path
 from typing import (
@@ -33,6 +37,7 @@ from typing import (
     Literal,
     Mapping,
     MutableMapping,
+    NamedTuple,
     Optional,
     Protocol,
     Sequence,
@@ -41,16 +46,21 @@ from typing import (
     TextIO,
     Type,
     TypedDict,
+    TYPE_CHECKING,
     TypeVar,
     Union,
     runtime_checkable,
     )
 
-from numpy import float64
-from numpy.typing import NDArray
-from pandas import DataFrame
-from pandas.core.groupby.generic import DataFrameGroupBy
-from plotly.graph_objects import Figure
+
+if TYPE_CHECKING:
+    from numpy import float64
+    from numpy.typing import NDArray
+    from pandas import DataFrame
+    from pandas.core.groupby.generic import DataFrameGroupBy
+    from plotly.graph_objects import Figure
+
+    NDFloat = NDArray[float64]
 
 
 AnyT = TypeVar('AnyT')
@@ -128,8 +138,6 @@ SupportsRunT = TypeVar("SupportsRunT", bound=SupportsRun)
 """TypeVar of SupportsRun for Generic type check."""
 
 # other type alias and type variables
-NDFloat = NDArray[float64]
-
 FilePath = Union[str, Path]
 
 FilePathT = TypeVar("FilePathT", bound=FilePath)
@@ -195,3 +203,45 @@ Key is residue name, value is a list of the residue's atom types.
 
 StreamHandlerT = TypeVar('StreamHandlerT',
                          bound=Union[StreamHandler, FileHandler])
+
+
+def _ndfloat() -> Any:
+    from numpy import float64
+    from numpy.typing import NDArray
+    return NDArray[float64]
+
+
+def _import_from(module: str, name: str) -> Callable[[], Any]:
+    def _import() -> Any:
+        return getattr(import_module(module), name)
+    return _import
+
+
+_lazy_aliases: dict[str, Callable[[], Any]] = {
+    "DataFrame": _import_from("pandas", "DataFrame"),
+    "DataFrameGroupBy": _import_from(
+        "pandas.core.groupby.generic",
+        "DataFrameGroupBy",
+        ),
+    "Figure": _import_from("plotly.graph_objects", "Figure"),
+    "NDArray": _import_from("numpy.typing", "NDArray"),
+    "NDFloat": _ndfloat,
+    "float64": _import_from("numpy", "float64"),
+    }
+"""
+Type aliases of the scientific and plotting libraries.
+
+They are imported on first access, so that importing this module does
+not import numpy, pandas and plotly.
+"""
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        value = _lazy_aliases[name]()
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    globals()[name] = value
+    return value
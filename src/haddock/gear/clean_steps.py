@@ -10,25 +10,40 @@ The two main functions of this module are:
 * :py:func:`clean_output`
 * :py:func:`unpack_compressed_and_archived_files`
 
+:py:class:`BackgroundCleaner` runs :py:func:`clean_output` in a background
+process, so that a workflow can clean its steps while it runs.
+
 See also the command-line clients ``haddock3-clean`` and
 ``haddock3-unpack``.
 """
 import gzip
+import os
 import shutil
 import tarfile
 
 from functools import partial
-from multiprocessing import Pool
+from multiprocessing import Pool, Process, Value
 from pathlib import Path
+from time import time
 
 from haddock import log
-from haddock.core.typing import FilePath, FilePathT, Iterable
+from haddock.core.defaults import MODULE_IO_FILE
+from haddock.core.typing import (
+    Any,
+    FilePath,
+    FilePathT,
+    Iterable,
+    Iterator,
+    Optional,
+    )
 from haddock.libs.libio import (
     archive_files_ext,
     compress_files_ext,
     glob_folder,
     remove_files_with_ext,
     )
+from haddock.libs.libontology import ModuleIO
+from haddock.libs.libtimer import convert_seconds_to_min_sec
 
 
 UNPACK_FOLDERS: list[FilePath] = []
@@ -110,6 +125,162 @@ def _archive_and_remove_files(fta: str, path: FilePath) -> None:
         remove_files_with_ext(path, fta)
 
 
+def get_referenced_folders(step_folder: FilePath) -> Optional[set[str]]:
+    """
+    Get the folders holding the files a step passes to the next one.
+
+    The next step only reads the output models of ``step_folder``
+    (and their topologies), as listed in its ``io.json`` file.
+
+    Parameters
+    ----------
+    step_folder : str or pathlib.Path
+        The step folder.
+
+    Returns
+    -------
+    set of str, or None
+        The names of the folders, including ``step_folder`` itself.
+        ``None`` if the step has no ``io.json`` file.
+    """
+    io_file = Path(step_folder, MODULE_IO_FILE)
+    if not io_file.exists():
+        return None
+    io = ModuleIO()
+    io.load(io_file)
+    folders = set(_get_persistent_folders(io.output))
+    folders.add(Path(step_folder).name)
+    return folders
+
+
+def _get_persistent_folders(element: Any) -> Iterator[str]:
+    if isinstance(element, dict):
+        element = list(element.values())
+    if isinstance(element, (list, tuple)):
+        for sub_element in element:
+            yield from _get_persistent_folders(sub_element)
+    elif hasattr(element, "path"):
+        yield Path(element.path).name
+        yield from _get_persistent_folders(getattr(element, "topology", None))
+
+
+def get_folder_size(path: FilePath) -> int:
+    """Get the size in bytes of the files in a folder and its subfolders."""
+    size = 0
+    for root, _dirs, files in os.walk(path):
+        for file_ in files:
+            size += os.lstat(Path(root, file_)).st_size
+    return size
+
+
+def _clean_outputs_timed(paths: list[FilePath], elapsed: Any) -> None:
+    start = time()
+    for path in paths:
+        clean_output(path, ncores=1)
+    elapsed.value = time() - start
+
+
+class BackgroundCleaner:
+    """
+    Clean step folders in a background process.
+
+    A single process cleans the folders one after the other, with one
+    core, so that the cleaning takes at most one core on top of the
+    ``ncores`` of the steps running. The folders given while it runs are
+    cleaned by the next process, started once it ends.
+
+    Also records the disk usage of the steps, to report its peak. Only
+    the folder of the step just finished, or just cleaned, is measured:
+    the cost does not grow with the size of the run.
+    """
+
+    def __init__(self) -> None:
+        self.process: Optional[tuple[Process, Any, list[FilePath]]] = None
+        self.pending: list[FilePath] = []
+        self.cleaning_time = 0.0
+        self.nb_cleaned = 0
+        self.step_sizes: dict[str, int] = {}
+        self.peak_size = 0
+
+    def clean(self, path: FilePath) -> None:
+        """
+        Clean a step folder in the background process.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            The step folder to clean.
+        """
+        log.info(f"Cleaning {str(path)!r} in the background.")
+        self.pending.append(path)
+        self._start()
+
+    def _join(self) -> None:
+        process, elapsed, paths = self.process  # type: ignore
+        process.join()
+        self.cleaning_time += elapsed.value
+        self.nb_cleaned += len(paths)
+        self.process = None
+        for path in paths:
+            if str(path) in self.step_sizes:
+                self.step_sizes[str(path)] = get_folder_size(path)
+
+    def _start(self) -> None:
+        """Clean the pending folders, unless the process is still running."""
+        if self.process is not None:
+            if self.process[0].is_alive():
+                return
+            self._join()
+        if not self.pending:
+            return
+        elapsed = Value("d", 0.0)
+        process = Process(
+            target=_clean_outputs_timed,
+            args=(self.pending, elapsed),
+            )
+        process.start()
+        self.process = (process, elapsed, self.pending)
+        self.pending = []
+
+    def record_disk_usage(self, path: FilePath) -> int:
+        """
+        Log the disk usage of a step folder, and of the steps so far.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            The folder of the step just finished.
+
+        Returns
+        -------
+        int
+            The disk usage of the steps recorded so far, in bytes, with
+            the sizes of the cleaned steps measured after their cleaning.
+        """
+        self.step_sizes[str(path)] = get_folder_size(path)
+        size = sum(self.step_sizes.values())
+        self.peak_size = max(self.peak_size, size)
+        log.info(
+            f"Disk usage of {str(path)!r}: "
+            f"{self.step_sizes[str(path)] / 1024**3:.2f} GB, of the steps: "
+            f"{size / 1024**3:.2f} GB (peak: {self.peak_size / 1024**3:.2f} GB)"
+            )
+        return size
+
+    def wait(self) -> None:
+        """Wait for the background cleaning to finish, and log its time."""
+        if self.process is None and not self.pending:
+            return
+        while self.process is not None or self.pending:
+            if self.process is not None:
+                self._join()
+            self._start()
+        log.info(
+            f"Background cleaning of {self.nb_cleaned} step(s) took "
+            f"{convert_seconds_to_min_sec(self.cleaning_time)}"
+            )
+
+
 # eventually this function can be moved to `libs.libio` in case of future need.
 def unpack_compressed_and_archived_files(folders: Iterable[FilePathT],
                                          ncores: int = 1,
@@ -75,13 +75,14 @@ import itertools as it
 from copy import deepcopy
 from functools import partial
 
-from haddock.core.defaults import max_molecules_allowed
+from haddock.core.defaults import get_max_molecules_allowed
 from haddock.core.exceptions import ConfigurationError
 from haddock.core.typing import (
     Any,
     AnyT,
     Callable,
     Iterable,
+    NamedTuple,
     Optional,
     ParamMap,
     Sequence,
@@ -379,7 +380,7 @@ def is_mol_parameter(param: str) -> bool:
 def read_mol_parameters(
     user_config: ParamMap,
     default_groups: Iterable[str],
-    max_mols: int = max_molecules_allowed,
+    max_mols: Optional[int] = None,
 ) -> set[str]:
     """
     Read the mol parameters in the user_config following expectations.
@@ -397,7 +398,7 @@ def read_mol_parameters(
         HADDOCK3 has a limit in the number of different molecules it
         accepts for a calculation. Expandable parameters affecting molecules
         should not be allowed to go beyond that number. Defaults to
-        `core.default.max_molecules_allowed`.
+        `core.defaults.get_max_molecules_allowed()`.
 
     Returns
     -------
@@ -405,6 +406,8 @@ def read_mol_parameters(
         The allowed parameters according to the default config and the
         max allowed molecules.
     """
+    if max_mols is None:
+        max_mols = get_max_molecules_allowed()
     # removes the integer suffix from the default mol parameters
     default_names = [remove_trail_idx(p) for p in default_groups]
 
@@ -891,6 +894,47 @@ set
 """
 
 
+class DefaultGroups(NamedTuple):
+    """
+    The expandable parameters defined in a default configuration.
+
+    See :py:func:`get_default_groups`.
+    """
+
+    single_index: GroupDict
+    multiple_index: GroupDict
+    mol: set[str]
+
+
+def get_default_groups(defaults: ParamMap) -> DefaultGroups:
+    """
+    Identify all the expandable parameters of a default configuration.
+
+    The result only depends on the parameter names of the defaults. It
+    can be computed once per module and reused to read any number of
+    user configurations.
+
+    Parameters
+    ----------
+    defaults : dict
+        The default configuration of a module, where keys are the
+        parameter names.
+
+    Returns
+    -------
+    DefaultGroups
+        The single indexed groups, as given by `get_single_index_groups`,
+        the multiple indexed groups, as given by
+        `get_multiple_index_groups`, and the `mol` parameters, as given
+        by `get_mol_parameters`.
+    """
+    return DefaultGroups(
+        single_index=get_single_index_groups(defaults),
+        multiple_index=get_multiple_index_groups(defaults),
+        mol=get_mol_parameters(defaults),
+    )
+
+
 def populate_mol_parameters_in_module(
     params: ParamMap, num_mols: int, defaults: ParamMap
 ) -> None:
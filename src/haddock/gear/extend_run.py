@@ -1,21 +1,33 @@
 """Gear for ``haddock3-copy`` CLI and `--extend-run`` flag."""
+import gzip
+import json
+import os
+import re
 import shutil
+import tarfile
+from collections import Counter
+from functools import partial
 from pathlib import Path
 
 from haddock import log
-from haddock.core.defaults import MODULE_IO_FILE
-from haddock.core.exceptions import HaddockTermination
+from haddock.core.defaults import MODULE_IO_FILE, REFERENCES_FILE
 from haddock.core.typing import (
     Any,
     ArgumentParser,
+    Callable,
     FilePath,
     FilePathT,
     Iterable,
     ModuleParams,
     Optional,
     )
-from haddock.gear.clean_steps import UNPACK_FOLDERS, clean_output
+from haddock.gear.clean_steps import (
+    UNPACK_FOLDERS,
+    BackgroundCleaner,
+    clean_output,
+    )
 from haddock.gear.zerofill import zero_fill
+from haddock.libs.libio import LinkMode, link_file
 from haddock.libs.libontology import ModuleIO
 from haddock.libs.libtimer import log_time
 from haddock.libs.libworkflow import Workflow, WorkflowManager
@@ -38,15 +50,11 @@ class WorkflowManagerExtend(WorkflowManager):
         # `exit` module. If the `exit` module is removed in the future,
         # you can also remove and clean the `terminate` part here.
         self._terminated = 0
+        self.cleaner = BackgroundCleaner()
 
     def run(self) -> None:
         """High level workflow composer."""
-        for i, step in enumerate(self.recipe.steps, start=0):
-            try:
-                step.execute()
-            except HaddockTermination:
-                self._terminated = i
-                break
+        self.run_steps(self.recipe.steps, start=0)
 
     def clean(self) -> None:
         """Clean the step output."""
@@ -119,12 +127,13 @@ def read_num_molecules_from_folder(folder: FilePath) -> int:
 
 
 def copy_renum_step_folders(indir: FilePath, destdir: FilePath,
-                            steps: list[FilePathT]) -> list[Path]:
+                            steps: list[FilePathT],
+                            link: LinkMode = "copy") -> list[Path]:
     """
     Copy step folders renumbering them sequentially in the run directory.
 
     The content of the files is not modified.
-    See :py:func:`rename_step_contents`.
+    See :py:func:`copy_steps_to_new_run`.
 
     py:`gear.zerofill.zero_fill`: must be previously calibrated.
 
@@ -161,6 +170,10 @@ def copy_renum_step_folders(indir: FilePath, destdir: FilePath,
     steps : list of (str or Path)
         The list of the folder names in `indir` to copy.
 
+    link : str
+        How to duplicate the files, see
+        :py:func:`haddock.libs.libio.link_file`.
+
     Returns
     -------
     list
@@ -172,7 +185,7 @@ def copy_renum_step_folders(indir: FilePath, destdir: FilePath,
         ori = Path(indir, step)
         _modname = step.split("_")[-1]
         dest = Path(destdir, zero_fill.fill(_modname, i))
-        shutil.copytree(ori, dest)
+        shutil.copytree(ori, dest, copy_function=partial(link_file, mode=link))
         log.info(f"Copied {str(ori)} -> {str(dest)}")
         new_steps.append(dest)
     return new_steps
@@ -281,3 +294,308 @@ def update_contents_of_new_steps(selected_steps: Iterable[str],
             file_.write_text(text)
 
     log.info("File references updated correctly.")
+
+
+def replace_references(
+        text: str,
+        steps: Iterable[tuple[str, str]],
+        olddir: str,
+        newdir: str,
+        ) -> str:
+    """
+    Replace the references to step folders and to the run directory.
+
+    Parameters
+    ----------
+    text : str
+        The text to update.
+
+    steps : list of tuple of str
+        The old and new names of the step folders.
+
+    olddir, newdir : str
+        The old and new names of the run directory.
+
+    Returns
+    -------
+    str
+        The updated text.
+    """
+    for s1, s2 in steps:
+        text = text.replace(s1, s2)
+    return text.replace(olddir, newdir)
+
+
+def get_folder_fingerprint(folder: FilePath) -> dict[str, int]:
+    """
+    Summarise the files of a folder, to know if they have changed.
+
+    Returns
+    -------
+    dict
+        The number of files, their total size, and the most recent
+        modification time, in nanoseconds.
+    """
+    count = 0
+    size = 0
+    mtime = 0
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            if name == REFERENCES_FILE:
+                continue
+            stat = os.stat(Path(root, name))
+            count += 1
+            size += stat.st_size
+            mtime = max(mtime, stat.st_mtime_ns)
+    return {"files": count, "bytes": size, "mtime_ns": mtime}
+
+
+def _has_references(path: Path, regex: re.Pattern) -> bool:
+    if path.name.endswith(".tgz"):
+        with tarfile.open(path) as tar:
+            for member in tar:
+                fin = tar.extractfile(member) if member.isfile() else None
+                if fin is not None and regex.search(fin.read()):
+                    return True
+        return False
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as fin:
+        return regex.search(fin.read()) is not None
+
+
+def scan_references(folder: FilePath, patterns: Iterable[str]) -> list[str]:
+    """
+    Find the files of a step folder referring to the run.
+
+    Compressed files (``.gz``) and archives (``.tgz``) are read without
+    unpacking them.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The step folder.
+
+    patterns : list of str
+        The names of the run directory and of the step folders.
+
+    Returns
+    -------
+    list of str
+        The paths, relative to `folder`, of the files containing any of
+        the `patterns`.
+    """
+    regex = re.compile(b"|".join(re.escape(p.encode()) for p in patterns))
+    found: list[str] = []
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            path = Path(root, name)
+            if name == REFERENCES_FILE:
+                continue
+            try:
+                has_references = _has_references(path, regex)
+            except (OSError, EOFError, tarfile.TarError) as err:
+                log.warning(f"Failed to read file {path}. Error is {err}")
+                has_references = True
+            if has_references:
+                found.append(path.relative_to(folder).as_posix())
+    return sorted(found)
+
+
+def save_references_manifest(
+        folder: FilePath,
+        patterns: Iterable[str],
+        files: Iterable[str],
+        ) -> Path:
+    """
+    Save the files of a step folder referring to the run.
+
+    The manifest lets :py:func:`find_step_references` skip the scan of
+    the folder while its files do not change.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The step folder.
+
+    patterns : list of str
+        The names of the run directory and of the step folders, as
+        given to :py:func:`scan_references`.
+
+    files : list of str
+        The paths, relative to `folder`, of the files referring to the
+        run.
+
+    Returns
+    -------
+    Path
+        The path to the manifest.
+    """
+    manifest = {
+        "patterns": sorted(patterns),
+        "files": sorted(files),
+        "fingerprint": get_folder_fingerprint(folder),
+        }
+    fpath = Path(folder, REFERENCES_FILE)
+    fpath.write_text(json.dumps(manifest, indent=4))
+    return fpath
+
+
+def find_step_references(
+        folder: FilePath,
+        patterns: Iterable[str],
+        ) -> list[str]:
+    """
+    Find the files of a step folder referring to the run.
+
+    Reads the manifest of the folder if it is up to date, and was made
+    for the same `patterns`; otherwise, scans the folder.
+
+    See Also
+    --------
+    :py:func:`scan_references`
+    """
+    patterns = set(patterns)
+    manifest_path = Path(folder, REFERENCES_FILE)
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            if (
+                    patterns <= set(manifest["patterns"])
+                    and manifest["fingerprint"]
+                    == get_folder_fingerprint(folder)
+                    ):
+                return manifest["files"]
+        except (ValueError, KeyError, TypeError) as err:
+            log.warning(f"Ignoring {str(manifest_path)!r}: {err}")
+    log.info(f"Scanning {str(folder)!r} for references to the run")
+    return scan_references(folder, patterns)
+
+
+def _rewrite_file(
+        src: Path,
+        dest: Path,
+        replace: Callable[[str], str],
+        ) -> list[Path]:
+    """Write `src` to `dest`, with its references replaced."""
+    if src.name.endswith(".tgz"):
+        # as when unpacking a step, the archive is replaced by its files
+        with tarfile.open(src) as tar:
+            members = [member for member in tar if member.isfile()]
+            tar.extractall(dest.parent, members=members)
+        rewritten = []
+        for member in members:
+            path = Path(dest.parent, member.name)
+            rewritten.extend(_rewrite_file(path, path, replace))
+        return rewritten
+
+    opener: Callable[..., Any] = gzip.open if src.suffix == ".gz" else open
+    with opener(src, "rb") as fin:
+        data = fin.read()
+    try:
+        text = data.decode()
+    except UnicodeDecodeError as err:
+        log.warning(f"Failed to read file {src}. Error is {err}")
+        if src != dest:
+            shutil.copy2(src, dest)
+        return []
+    with opener(dest, "wb") as fout:
+        fout.write(replace(text).encode())
+    return [dest]
+
+
+def copy_steps_to_new_run(
+        run_dir: FilePath,
+        new_run_dir: FilePath,
+        steps: list[str],
+        link: LinkMode = "auto",
+        ) -> list[Path]:
+    """
+    Copy step folders to a new run, and update their references to it.
+
+    Steps are renumbered sequentially, as in
+    :py:func:`copy_renum_step_folders`. Only the files referring to the
+    run directory or to its step folders (``io.json``, ``params.cfg``,
+    CNS inputs...) are rewritten, with
+    :py:func:`replace_references`. The other files are duplicated with
+    :py:func:`haddock.libs.libio.link_file`, and compressed files stay
+    compressed.
+
+    The files to rewrite are found with :py:func:`find_step_references`.
+    Each new step folder gets a manifest of its references, so that
+    copying it again needs no scan.
+
+    py:`gear.zerofill.zero_fill`: must be previously calibrated.
+
+    Parameters
+    ----------
+    run_dir : str or Path
+        The original run directory.
+
+    new_run_dir : str or Path
+        The new run directory.
+
+    steps : list of str
+        The names of the step folders in `run_dir` to copy.
+
+    link : str
+        How to duplicate the files, see
+        :py:func:`haddock.libs.libio.link_file`.
+
+    Returns
+    -------
+    list
+        The new paths created.
+    """
+    run_name = Path(run_dir).resolve().name
+    new_run_name = Path(new_run_dir).resolve().name
+    steps = [Path(step).name for step in steps]
+    new_steps = [
+        zero_fill.fill(step.split("_")[-1], i)
+        for i, step in enumerate(steps)
+        ]
+    replace = partial(
+        replace_references,
+        steps=list(zip(steps, new_steps)),
+        olddir=run_name,
+        newdir=new_run_name,
+        )
+    run_steps = get_module_steps_folders(run_dir)
+
+    new_paths: list[Path] = []
+    for i, (step, new_step) in enumerate(zip(steps, new_steps)):
+        ori = Path(run_dir, step)
+        dest = Path(new_run_dir, new_step)
+        # a step can only refer to itself and to the steps before it
+        order = int(step.split("_")[0])
+        patterns = [run_name] + [
+            name for name in run_steps if int(name.split("_")[0]) <= order
+            ]
+        references = set(find_step_references(ori, patterns))
+
+        methods: Counter = Counter()
+        rewritten: list[Path] = []
+        for root, _dirs, files in os.walk(ori):
+            folder = Path(dest, Path(root).relative_to(ori))
+            folder.mkdir(parents=True, exist_ok=True)
+            for name in files:
+                src = Path(root, name)
+                if name == REFERENCES_FILE:
+                    continue
+                if src.relative_to(ori).as_posix() in references:
+                    rewritten.extend(
+                        _rewrite_file(src, Path(folder, name), replace)
+                        )
+                else:
+                    methods[link_file(src, Path(folder, name), link)] += 1
+        save_references_manifest(
+            dest,
+            [new_run_name, *new_steps[: i + 1]],
+            [path.relative_to(dest).as_posix() for path in rewritten],
+            )
+        linked = ", ".join(f"{n} {method}" for method, n in methods.items())
+        log.info(
+            f"Copied {str(ori)} -> {str(dest)}: {len(rewritten)} file(s) "
+            f"rewritten, {linked or 'no other files'}"
+            )
+        new_paths.append(dest)
+    return new_paths
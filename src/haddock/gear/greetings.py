@@ -7,7 +7,7 @@ from datetime import datetime
 from functools import partial
 from typing import Callable, Sequence
 
-from haddock import contact_us, version
+from haddock import contact_us
 
 
 international_good_byes = [
@@ -46,6 +46,8 @@ DISCLAIMER = (
 
 def get_initial_greeting() -> str:
     """Create initial greeting message."""
+    from haddock import version
+
     now = datetime.now().replace(second=0, microsecond=0)
     python_version = sys.version
     message = (
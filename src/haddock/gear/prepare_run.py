@@ -8,14 +8,13 @@ import os
 import shutil
 import string
 import sys
-import tarfile
 from contextlib import contextmanager, suppress
 from copy import copy, deepcopy
-from functools import lru_cache, wraps
+from functools import wraps
 from pathlib import Path, PosixPath
 
 from haddock import EmptyPath, contact_us, haddock3_source_path, log
-from haddock.core.defaults import RUNDIR, max_molecules_allowed
+from haddock.core.defaults import RUNDIR, get_max_molecules_allowed
 from haddock.core.exceptions import ConfigurationError, ModuleError
 from haddock.core.typing import (
     Any,
@@ -37,9 +36,8 @@ from haddock.gear.config import get_module_name
 from haddock.gear.config import load as read_config
 from haddock.gear.config import save as save_config
 from haddock.gear.expandable_parameters import (
-    get_mol_parameters,
-    get_multiple_index_groups,
-    get_single_index_groups,
+    DefaultGroups,
+    get_default_groups,
     is_mol_parameter,
     read_mol_parameters,
     read_multiple_idx_groups_user_config,
@@ -60,12 +58,12 @@ from haddock.gear.parameters import (
 )
 from haddock.gear.preprocessing import process_pdbs, read_additional_residues
 from haddock.gear.restart_run import remove_folders_after_number
-from haddock.gear.validations import (
-    v_rundir,
-    validate_defaults_yaml,
-    )
+from haddock.gear.restraints_store import STORE_DIR as RESTRAINTS_STORE_DIR
+from haddock.gear.restraints_store import index_archive
+from haddock.gear.validations import v_rundir
 from haddock.gear.yaml2cfg import (
-    read_from_yaml_config,
+    CompiledDefaults,
+    compile_defaults,
     find_incompatible_parameters,
     )
 from haddock.gear.zerofill import zero_fill
@@ -73,6 +71,7 @@ from haddock.libs.libfunc import not_none
 from haddock.libs.libio import make_writeable_recursive
 from haddock.libs.libutil import (
     extract_keys_recursive,
+    parse_ncores,
     recursive_convert_paths_to_strings,
     recursive_dict_update,
     remove_dict_keys,
@@ -161,7 +160,6 @@ def with_config_error(func: Callable[..., Any]) -> Callable[..., Any]:
     return wrapper
 
 
-@lru_cache
 def _read_defaults(module_name, default_only=True):
     """Read the defaults.yaml given a module name.
 
@@ -181,11 +179,17 @@ def _read_defaults(module_name, default_only=True):
         Else a dict of dict, contraining all information present in the
         default.yaml file of the module.
     """
+    compiled = _compile_defaults(module_name)
+    if default_only:
+        return compiled.defaults
+    return compiled.config
+
+
+def _compile_defaults(module_name: str) -> CompiledDefaults:
+    """Read and validate the defaults.yaml of a module, once per process."""
     module_name_ = get_module_name(module_name)
     pdef = gen_defaults_module_param_path(module_name_)
-    validate_defaults_yaml(pdef)
-    mod_default_config = read_from_yaml_config(pdef, default_only=default_only)
-    return mod_default_config
+    return compile_defaults(pdef, validate=True)
 
 
 def gen_defaults_module_param_path(module_name_: str) -> Path:
@@ -365,6 +369,7 @@ def setup_run(
             modules_params["topoaa.1"],
         )
 
+        max_molecules_allowed = get_max_molecules_allowed()
         if len(modules_params["topoaa.1"]["molecules"]) > max_molecules_allowed:
             raise ConfigurationError(
                 f"Too many molecules defined, max is {max_molecules_allowed}."
@@ -404,6 +409,7 @@ def setup_run(
             data_dir,
             modules_params["topoaa.1"],
             preprocess=general_params["preprocess"],
+            ncores=parse_ncores(general_params["ncores"]),
         )
 
     if starting_from_copy:
@@ -565,13 +571,14 @@ def validate_modules_params(modules_params: ParamMap, max_mols: int) -> None:
     """
     for module_name, args in modules_params.items():
         module_name = get_module_name(module_name)
-        defaults = _read_defaults(module_name)
+        compiled = _compile_defaults(module_name)
+        defaults = compiled.defaults
         if not defaults:
             continue
 
         # Check for parameter incompatibilities
         module_incompatibilities = find_incompatible_parameters(
-            gen_defaults_module_param_path(module_name)
+            compiled.path
             )
         try:
             validate_parameters_are_not_incompatible(
@@ -592,6 +599,7 @@ def validate_modules_params(modules_params: ParamMap, max_mols: int) -> None:
             defaults,
             module_name,
             max_mols,
+            compiled=compiled,
         )
 
         all_parameters = set.union(
@@ -946,7 +954,10 @@ def copy_molecules_to_topology(
 
 
 def copy_molecules_to_data_dir(
-    data_dir: Path, topoaa_params: ParamMap, preprocess: bool = True
+    data_dir: Path,
+    topoaa_params: ParamMap,
+    preprocess: bool = True,
+    ncores: int = 1,
 ) -> None:
     """
     Copy molecules to data directory and to topoaa parameters.
@@ -963,6 +974,10 @@ def copy_molecules_to_data_dir(
     preprocess : bool
         Whether to preprocess input molecules. Defaults to ``True``.
         See :py:mod:`haddock.gear.preprocessing`.
+
+    ncores : int
+        The number of processes used to preprocess the molecules.
+        Defaults to ``1``.
     """
     topoaa_dir = zero_fill.fill("topoaa", 0)
 
@@ -972,25 +987,34 @@ def copy_molecules_to_data_dir(
     rel_data_topoaa_dir = Path(data_dir.name, topoaa_dir)
     original_mol_dir = Path(data_dir, "original_molecules")
 
-    new_molecules: list[Path] = []
-    for molecule in copy(topoaa_params["molecules"]):
+    molecules = copy(topoaa_params["molecules"])
+    for molecule in molecules:
         check_if_path_exists(molecule)
 
-        mol_name = Path(molecule).name
+    if preprocess:  # preprocess PDB files
+        top_fname = topoaa_params.get("ligand_top_fname", False)
+        new_residues = read_additional_residues(top_fname) if top_fname else None
 
-        if preprocess:  # preprocess PDB files
-            top_fname = topoaa_params.get("ligand_top_fname", False)
-            new_residues = read_additional_residues(top_fname) if top_fname else None
+        # molecules are processed independently
+        processed_molecules = process_pdbs(
+            *molecules,
+            user_supported_residues=new_residues,
+            ncores=ncores,
+            combine=False,
+        )
 
-            new_pdbs = process_pdbs(molecule, user_supported_residues=new_residues)
+    new_molecules: list[Path] = []
+    for i, molecule in enumerate(molecules):
+        mol_name = Path(molecule).name
 
+        if preprocess:
             # copy the original molecule
             original_mol_dir.mkdir(parents=True, exist_ok=True)
             original_mol = Path(original_mol_dir, mol_name)
             shutil.copy(molecule, original_mol)
 
             # write the new processed molecule
-            new_pdb = os.linesep.join(new_pdbs[0])
+            new_pdb = os.linesep.join(processed_molecules[i])
             Path(data_topoaa_dir, mol_name).write_text(new_pdb)
 
         else:
@@ -1007,6 +1031,11 @@ def copy_input_files_to_data_dir(
     """
     Copy input files to data directory.
 
+    The restraint files of `.tgz` archives are not extracted in the
+    module folders: each archive is indexed and its distinct restraint
+    files are stored once in the run restraints store, see
+    :py:mod:`haddock.gear.restraints_store`.
+
     Parameters
     ----------
     data_dir : Path
@@ -1039,9 +1068,10 @@ def copy_input_files_to_data_dir(
                     modules_params[module][parameter] = _p
                     # account for input .tgz files
                     if name.endswith("tgz"):
-                        log.info(f"Uncompressing tar {value}")
-                        with tarfile.open(target_path) as fin:
-                            fin.extractall(pf)
+                        index_archive(
+                            target_path,
+                            Path(data_dir, RESTRAINTS_STORE_DIR),
+                            )
 
 
 def check_run_dir_exists(run_dir: FilePath) -> None:
@@ -1155,7 +1185,11 @@ def check_specific_validations(params: ParamMap) -> None:
 
 
 def get_expandable_parameters(
-    user_config: ParamMap, defaults: ParamMap, module_name: str, max_mols: int
+    user_config: ParamMap,
+    defaults: ParamMap,
+    module_name: str,
+    max_mols: int,
+    compiled: Optional[CompiledDefaults] = None,
 ) -> set[str]:
     """
     Get configuration expandable blocks.
@@ -1173,6 +1207,10 @@ def get_expandable_parameters(
 
     max_mols : int
         The max number of molecules allowed.
+
+    compiled : :py:class:`haddock.gear.yaml2cfg.CompiledDefaults`, optional
+        The compiled `defaults`. Its expandable groups are reused instead
+        of being identified again from `defaults`.
     """
     # the topoaa module is an exception because it has subdictionaries
     # for the `mol` parameter. Instead of defining a general recursive
@@ -1180,7 +1218,15 @@ def get_expandable_parameters(
     # no other module should have subdictionaries has parameters
     if get_module_name(module_name) == "topoaa":
         ap: set[str] = set()  # allowed_parameters
-        ap.update(_get_expandable(user_config, defaults, module_name, max_mols))
+        ap.update(
+            _get_expandable(
+                user_config,
+                defaults,
+                module_name,
+                max_mols,
+                groups=compiled and compiled.expandable(),
+            )
+        )
         for i in range(1, max_mols + 1):
             key = f"mol{i}"
             with suppress(KeyError):
@@ -1190,40 +1236,52 @@ def get_expandable_parameters(
                         defaults["mol1"],
                         module_name,
                         max_mols,
+                        groups=compiled and compiled.expandable("mol1"),
                     )
                 )
 
         return ap
 
-    elif module_name in modules_using_resdic:
-        ep = _get_expandable(user_config, defaults, module_name, max_mols)
+    groups = compiled and compiled.expandable()
+    if module_name in modules_using_resdic:
+        ep = _get_expandable(
+            user_config, defaults, module_name, max_mols, groups=groups
+        )
         for _param in user_config.keys():
             if _param.startswith("resdic_"):
                 ep.add(_param)
         return ep
 
     else:
-        return _get_expandable(user_config, defaults, module_name, max_mols)
+        return _get_expandable(
+            user_config, defaults, module_name, max_mols, groups=groups
+        )
 
 
 # reading parameter blocks
 def _get_expandable(
-    user_config: ParamMap, defaults: ParamMap, module_name: str, max_mols: int
+    user_config: ParamMap,
+    defaults: ParamMap,
+    module_name: str,
+    max_mols: int,
+    groups: Optional[DefaultGroups] = None,
 ) -> set[str]:
+    if groups is None:
+        groups = get_default_groups(defaults)
     # Set parsing vars
     allowed_params: set[str] = set()
     all_counts: dict[str, int] = {}
     # Read single indexed groups (terminating by `_X`)
     news_t1, counts_t1 = read_single_idx_groups_user_config(
         user_config,
-        get_single_index_groups(defaults),
+        groups.single_index,
         )
     allowed_params.update(news_t1)
     all_counts.update(counts_t1)
     # Read multiple indexed groups (terminating by `_X_Y`)
     news_t2, counts_t2 = read_multiple_idx_groups_user_config(
         user_config,
-        get_multiple_index_groups(defaults),
+        groups.multiple_index,
         )
     allowed_params.update(news_t2)
     all_counts.update(counts_t2)
@@ -1237,7 +1295,7 @@ def _get_expandable(
     # Read molecule paramters (starting by `mol_`)
     _ = read_mol_parameters(
         user_config,
-        get_mol_parameters(defaults),
+        groups.mol,
         max_mols=max_mols,
         )
     allowed_params.update(_)
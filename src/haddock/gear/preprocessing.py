@@ -44,6 +44,16 @@ The following actions are perfomed sequentially over all PDBs:
 #. from ``pdb-tools``: ``pdb_reatom``, start from ``1``.
 #. from ``pdb-tools``: ``pdb_tidy`` with ``strict=True``
 
+Outside dry runs, these corrections are applied by
+:py:func:`process_pdb_lines` in a single pass over the lines: each
+``ATOM``/``HETATM`` record is edited once, and the edits of each distinct
+record label (record, atom name, residue name, element and charge) are
+computed once with the functions above and reused. The result is the
+same as applying the functions one after the other. Dry runs apply the
+functions one after the other to report the changes of each one.
+Independent PDBs are processed in parallel when ``ncores`` is given to
+:py:func:`process_pdbs`.
+
 Corrections performed on 2)
 ---------------------------
 
@@ -85,9 +95,13 @@ https://github.com/haddocking/haddock3/projects/16
 """
 import io
 import itertools as it
+import json
 import re
 import string
-from functools import partial, wraps
+import textwrap
+from collections import Counter
+from functools import lru_cache, partial, wraps
+from multiprocessing import Pool
 from os import linesep
 from pathlib import Path
 
@@ -119,6 +133,7 @@ from haddock.core.typing import (
     Any,
     Callable,
     Container,
+    FilePath,
     Generator,
     Iterable,
     LineIterSource,
@@ -149,17 +164,133 @@ class ModelsDifferError(HaddockError):
     pass
 
 
+REPORT_MAX_LINES = 10
+"""Default number of added and removed lines reported for each function."""
+
+
+def diff_lines(
+    before: Iterable[str], after: Iterable[str]
+) -> tuple[list[str], list[str]]:
+    """
+    Compare the lines of a PDB before and after a change.
+
+    Lines are compared as multisets: a line repeated three times before
+    and twice after counts as one removed line. Runs in linear time.
+
+    Parameters
+    ----------
+    before, after : list of str
+        The lines before and after the change.
+
+    Returns
+    -------
+    tuple of two lists of str
+        The added lines, in the order of ``after``, and the removed
+        lines, in the order of ``before``.
+    """
+    before = list(before)
+    counts = Counter(before)
+    added: list[str] = []
+    for line in after:
+        if counts[line]:
+            counts[line] -= 1
+        else:
+            added.append(line)
+
+    removed: list[str] = []
+    for line in before:
+        if counts[line]:
+            counts[line] -= 1
+            removed.append(line)
+
+    return added, removed
+
+
+class ChangeReport:
+    """
+    Changes made to a PDB by the preprocessing functions.
+
+    Give it as the ``report`` parameter of the functions decorated with
+    :py:func:`_report` to collect the changes made by each function.
+
+    Parameters
+    ----------
+    max_lines : int
+        The number of added and removed lines kept as examples for each
+        function. Defaults to :py:data:`REPORT_MAX_LINES`.
+    """
+
+    def __init__(self, max_lines: int = REPORT_MAX_LINES) -> None:
+        self.max_lines = max_lines
+        self.stages: list[dict[str, Any]] = []
+
+    def add(
+        self, stage: str, before: Iterable[str], after: Iterable[str]
+    ) -> dict[str, Any]:
+        """
+        Add the changes made by a function.
+
+        Returns
+        -------
+        dict
+            The function name, the number of added and removed lines,
+            and the first added and removed lines.
+        """
+        added, removed = diff_lines(before, after)
+        changes = {
+            "stage": stage,
+            "added": len(added),
+            "removed": len(removed),
+            "added_lines": added[: self.max_lines],
+            "removed_lines": removed[: self.max_lines],
+        }
+        self.stages.append(changes)
+        return changes
+
+    def merge(self, reports: Iterable["ChangeReport"]) -> None:
+        """
+        Add the changes of reports made by the same functions.
+
+        The stages of each report are summed to the stages with the same
+        index, so that the changes made to each model of an ensemble are
+        reported once for the whole ensemble.
+        """
+        for report in reports:
+            if not self.stages:
+                self.stages = [
+                    {**changes, "added_lines": [], "removed_lines": []}
+                    for changes in report.stages
+                ]
+            for total, changes in zip(self.stages, report.stages):
+                for key in ("added", "removed"):
+                    total[key] += changes[key]
+                    examples = total[f"{key}_lines"]
+                    limit = self.max_lines - len(examples)
+                    examples.extend(changes[f"{key}_lines"][:limit])
+
+    def summary(self) -> str:
+        """Summarise the number of lines changed by each function."""
+        return linesep.join(
+            f"[{changes['stage']}] + {changes['added']} "
+            f"- {changes['removed']} lines"
+            for changes in self.stages
+            if changes["added"] or changes["removed"]
+        )
+
+
 def _report(log_msg: str) -> Callable[..., Any]:
     """
     Add report functionality to the function (decorator).
 
-    Functions decorated with `_report` log the difference between the
-    input and the output. Decorated functions gain an additional boolean
+    Functions decorated with `_report` report the difference between the
+    input and the output. Decorated functions gain an additional
     parameter `report` to activate or deactivate the report
-    functionality; defaults to ``False``.
+    functionality; defaults to ``False``. If ``True``, the number of
+    added and removed lines and the first of them are logged. If a
+    :py:class:`ChangeReport` is given, the changes are added to it.
 
     Note that a generator decorated with ``_report`` no longer behaves
-    as a generator if ``report=True`` is given. Instead, it returns a
+    as a generator if ``report`` is given. Instead, it returns a
     list from the exhausted generator.
 
     **Important:** Do NOT use ``_report`` with infinite generators,
@@ -169,32 +300,26 @@ def _report(log_msg: str) -> Callable[..., Any]:
     def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(function)
         def wrapper(
-            lines: Iterable[Any], *args: Any, report: bool = False, **kwargs: Any
+            lines: Iterable[Any],
+            *args: Any,
+            report: Union[bool, ChangeReport] = False,
+            **kwargs: Any,
         ) -> Any:
             if report:
                 in_lines = list(lines)
                 result = list(function(in_lines, *args, **kwargs))
 
-                # Here we could use sets to increase speed, but for the size
-                # of the systems, we can actually use lists and get a sorted
-                # result by default. I tried using difflib from STD but it is
-                # just too slow.
-
-                # _ is line
-                additions = [_ for _ in result if _ not in in_lines]
-                deletions = [_ for _ in in_lines if _ not in result]
-
-                la = len(additions)
-                ld = len(deletions)
-
-                add_lines = linesep.join(f"+ {_}" for _ in additions)
-                del_lines = linesep.join(f"- {_}" for _ in deletions)
-
                 log_msg_ = log_msg.format(*args, *kwargs.values())
+                if isinstance(report, ChangeReport):
+                    report.add(log_msg_, in_lines, result)
+                    return result
+
+                changes = ChangeReport().add(log_msg_, in_lines, result)
                 extended_log = (
-                    f"[{log_msg_}] + {la} - {ld} lines",
-                    add_lines,
-                    del_lines,
+                    f"[{log_msg_}] + {changes['added']} "
+                    f"- {changes['removed']} lines",
+                    *(f"+ {_}" for _ in changes["added_lines"]),
+                    *(f"- {_}" for _ in changes["removed_lines"]),
                 )
 
                 log.info(linesep.join(extended_log))
@@ -327,6 +452,10 @@ def process_pdbs(
     *inputdata: LineIterSource,
     dry: bool = False,
     user_supported_residues: Optional[Iterable[str]] = None,
+    ncores: int = 1,
+    combine: bool = True,
+    report_file: Optional[FilePath] = None,
+    report_max_lines: int = REPORT_MAX_LINES,
 ) -> list[list[str]]:
     """
     Process PDB file contents for compatibility with HADDOCK3.
@@ -351,11 +480,30 @@ def process_pdbs(
 
     dry : bool
         Perform a dry run. That is, does not change anything, and just
-        report.
+        report. The number of lines changed by each function is logged,
+        and the changes are saved to ``report_file``, if given.
 
     user_supported_residues : list, tuple, or set
         The new residues that are allowed.
 
+    ncores : int
+        The number of processes used to correct the PDBs, or the models
+        of the ensembles, line-by-line. Defaults to ``1``.
+
+    combine : bool
+        Whether to correct the PDBs together, see
+        :py:func:`correct_equal_chain_segids`. If ``False``, the result
+        is the same as processing each PDB separately. Defaults to
+        ``True``.
+
+    report_file : str or pathlib.Path
+        The JSON file where to save the changes made to each PDB by each
+        function, in dry runs. Defaults to ``None``, not saved.
+
+    report_max_lines : int
+        The number of added and removed lines saved as examples for each
+        function, in dry runs. Defaults to :py:data:`REPORT_MAX_LINES`.
+
     Returns
     -------
     list of (list of str)
@@ -364,45 +512,6 @@ def process_pdbs(
     """
     structures = _open_or_give(inputdata)
 
-    # these are the processing or checking functions that should (if needed)
-    # modify the input PDB and return the corrected lines.
-    # Follows the same style as for pdb-tools.
-    # these functions yield line-by-line.
-    line_by_line_processing_steps = [
-        wrep_pdb_keepcoord,  # also discards ANISOU
-        # tidy is important before some other corrections
-        wrep_pdb_tidy_strict,
-        wrep_pdb_element,
-        wrep_pdb_selaltloc,
-        partial(wrep_pdb_occ, occupancy=1.00),
-        replace_MSE_to_MET,
-        replace_HSD_to_HIS,
-        replace_HSE_to_HIS,
-        replace_HID_to_HIS,
-        replace_HIE_to_HIS,
-        add_charges_to_ions,
-        partial(
-            convert_ATOM_to_HETATM,
-            residues=set.union(
-                supported_HETATM,
-                user_supported_residues or set(),
-            ),
-        ),
-        convert_HETATM_to_ATOM,
-        partial(wrep_pdb_fixinsert, option_list=[]),
-        #####
-        partial(
-            remove_unsupported_hetatm, user_defined=user_supported_residues
-        ),  # noqa: E501
-        partial(remove_unsupported_atom),
-        ####
-        # partial(wrep_pdb_shiftres, shifting_factor=0),
-        partial(wrep_pdb_reatom, starting_value=1),
-        wrep_pdb_tidy,
-        ###
-        wrep_rstrip,
-    ]
-
     # these functions take the whole PDB content, evaluate it, and
     # modify it if needed.
     whole_pdb_processing_steps = [
@@ -419,24 +528,539 @@ def process_pdbs(
 
     # START THE ACTUAL PROCESSING
 
+    reports: list[Union[bool, ChangeReport]] = [
+        ChangeReport(report_max_lines) if dry else False for _ in structures
+    ]
+
     # individual processing (line-by-line)
+    # the models of ensembles are processed independently, and in
+    # parallel, as if each were a PDB on its own
+    ensembles = [split_models(structure) for structure in structures]
+    models = [
+        ensemble or [structure]
+        for structure, ensemble in zip(structures, ensembles)
+    ]
+    if dry:
+        line_by_line_processing_steps = get_line_by_line_steps(
+            user_supported_residues
+        )
+        processed_models = []
+        for structure_models, report in zip(models, reports):
+            model_reports = [
+                ChangeReport(report_max_lines) for _ in structure_models
+            ]
+            processed_models.append([
+                list(chainf(model, *line_by_line_processing_steps, report=r))
+                for model, r in zip(structure_models, model_reports)
+            ])
+            report.merge(model_reports)  # type: ignore
+
+    else:
+        process_lines = partial(
+            process_pdb_lines,
+            user_supported_residues=user_supported_residues,
+        )
+        flat_models = list(it.chain.from_iterable(models))
+        ncores = min(ncores, len(flat_models))
+        if ncores > 1:
+            with Pool(ncores) as pool:
+                flat_processed = iter(pool.map(process_lines, flat_models))
+        else:
+            flat_processed = map(process_lines, flat_models)
+        processed_models = [
+            list(it.islice(flat_processed, len(structure_models)))
+            for structure_models in models
+        ]
+
     result_1 = [
-        list(chainf(structure, *line_by_line_processing_steps, report=dry))
-        for structure in structures
+        join_models(structure_models) if ensemble else structure_models[0]
+        for structure_models, ensemble in zip(processed_models, ensembles)
     ]
 
     # whole structure processing
+    # not parallel: `solve_no_chainID_no_segID` assigns chain IDs in order
     result_2 = [
-        list(chainf(structure, *whole_pdb_processing_steps, report=dry))
-        for structure in result_1
+        list(chainf(structure, *whole_pdb_processing_steps, report=report))
+        for structure, report in zip(result_1, reports)
     ]
 
+    if dry:
+        _save_reports(inputdata, reports, report_file)  # type: ignore
+
+    if not combine:
+        return result_2
+
     # combined processing
     final_result = chainf(result_2, *processed_combined_steps)
 
     return final_result
 
 
+def _save_reports(
+    inputdata: Iterable[LineIterSource],
+    reports: Iterable[ChangeReport],
+    report_file: Optional[FilePath] = None,
+) -> None:
+    """Log the changes made to each PDB and save them to a JSON file."""
+    structures = []
+    for i, (idata, report) in enumerate(zip(inputdata, reports), start=1):
+        if isinstance(idata, (Path, str)):
+            name = str(idata)
+        else:
+            name = getattr(idata, "name", f"input {i}")
+        log.info(f"Changes to {name}:{linesep}{report.summary()}")
+        structures.append({"input": name, "stages": report.stages})
+
+    if report_file is not None:
+        Path(report_file).write_text(json.dumps(structures, indent=4))
+        log.info(f"Changes saved to {str(report_file)!r}")
+
+
+def split_models(lines: Iterable[str]) -> list[list[str]]:
+    """
+    Split the lines of an ensemble into its models.
+
+    Parameters
+    ----------
+    lines : list of str
+        The lines of the PDB.
+
+    Returns
+    -------
+    list of (list of str)
+        The lines between each ``MODEL`` and ``ENDMDL`` record. Empty if
+        the PDB has no models, or has coordinates outside the models.
+    """
+    models: list[list[str]] = []
+    model: Optional[list[str]] = None
+    for line in lines:
+        if line.startswith("MODEL"):
+            if model is not None:
+                return []
+            model = []
+        elif line.startswith("ENDMDL"):
+            if model is None:
+                return []
+            models.append(model)
+            model = None
+        elif model is not None:
+            model.append(line)
+        elif line.startswith(("ATOM", "HETATM")):
+            return []
+
+    if model is not None:
+        return []
+    return models
+
+
+def join_models(models: Iterable[list[str]]) -> list[str]:
+    """
+    Join the processed models of an ensemble, as ``pdb_tidy``.
+
+    Parameters
+    ----------
+    models : list of (list of str)
+        The processed lines of each model, ending with ``END``.
+
+    Returns
+    -------
+    list of str
+        The lines of the ensemble.
+    """
+    lines = []
+    for num_model, model in enumerate(models, start=1):
+        lines.append(f"{'MODEL ' + '    ' + str(num_model).rjust(4):<80}")
+        lines.extend(line for line in model if line.rstrip() != "END")
+        lines.append(f"{'ENDMDL':<80}")
+    lines.append(f"{'END':<80}")
+    return lines
+
+
+def get_line_by_line_steps(
+    user_supported_residues: Optional[Iterable[str]] = None,
+) -> list[Callable[..., Any]]:
+    """
+    Get the functions correcting PDBs line-by-line, in order.
+
+    Parameters
+    ----------
+    user_supported_residues : list, tuple, or set
+        The new residues that are allowed.
+
+    Returns
+    -------
+    list of callables
+        The processing or checking functions that should (if needed)
+        modify the input PDB and return the corrected lines. Follows the
+        same style as for pdb-tools: these functions yield line-by-line.
+    """
+    element, *record_edits = _get_record_edits(user_supported_residues)
+    return [
+        wrep_pdb_keepcoord,  # also discards ANISOU
+        # tidy is important before some other corrections
+        wrep_pdb_tidy_strict,
+        element,
+        wrep_pdb_selaltloc,
+        *record_edits,
+        partial(wrep_pdb_fixinsert, option_list=[]),
+        *_get_record_filters(user_supported_residues),
+        # partial(wrep_pdb_shiftres, shifting_factor=0),
+        partial(wrep_pdb_reatom, starting_value=1),
+        wrep_pdb_tidy,
+        wrep_rstrip,
+    ]
+
+
+def _get_record_edits(
+    user_supported_residues: Optional[Iterable[str]] = None,
+) -> list[Callable[..., Any]]:
+    """
+    Get the line-by-line functions editing each record independently.
+
+    These functions only read and write the record, atom name, residue
+    name, occupancy, element and charge fields.
+    """
+    return [
+        wrep_pdb_element,
+        partial(wrep_pdb_occ, occupancy=1.00),
+        replace_MSE_to_MET,
+        replace_HSD_to_HIS,
+        replace_HSE_to_HIS,
+        replace_HID_to_HIS,
+        replace_HIE_to_HIS,
+        add_charges_to_ions,
+        partial(
+            convert_ATOM_to_HETATM,
+            residues=set.union(
+                supported_HETATM,
+                user_supported_residues or set(),
+            ),
+        ),
+        convert_HETATM_to_ATOM,
+    ]
+
+
+def _get_record_filters(
+    user_supported_residues: Optional[Iterable[str]] = None,
+) -> list[Callable[..., Any]]:
+    """Get the line-by-line functions removing unsupported records."""
+    return [
+        partial(remove_unsupported_hetatm, user_defined=user_supported_residues),
+        remove_unsupported_atom,
+    ]
+
+
+class _FallbackError(Exception):
+    """The single-pass processing does not handle the PDB."""
+
+    pass
+
+
+def process_pdb_lines(
+    lines: Iterable[str],
+    user_supported_residues: Optional[Iterable[str]] = None,
+) -> list[str]:
+    """
+    Correct the lines of a PDB in a single pass.
+
+    Gives the same result as applying the functions of
+    :py:func:`get_line_by_line_steps` one after the other, which is done
+    instead for PDBs with alternative locations and for PDBs the single
+    pass does not handle (for example, with more than 99999 atoms).
+
+    Parameters
+    ----------
+    lines : list of str
+        The lines of the PDB, without line separators.
+
+    user_supported_residues : list, tuple, or set
+        The new residues that are allowed.
+
+    Returns
+    -------
+    list of str
+        The corrected lines.
+    """
+    lines = list(lines)
+    residues = frozenset(user_supported_residues or ())
+    try:
+        _check_single_pass(lines)
+        return list(
+            _tidy_lines(
+                _edit_records(
+                    _tidy_lines(lines, strict=True, keepcoord=True),
+                    residues,
+                ),
+                strict=False,
+            )
+        )
+    except _FallbackError as err:
+        log.info(f"Correcting the PDB with the line-by-line steps: {err}")
+        steps = get_line_by_line_steps(user_supported_residues)
+        return list(chainf(lines, *steps))
+
+
+def _check_single_pass(lines: Iterable[str]) -> None:
+    """
+    Check the single pass gives the same result as the line-by-line steps.
+
+    The single pass skips ``pdb_selaltloc``, which, besides selecting
+    alternative locations, sorts the atoms of each residue by number and
+    keeps only one atom per name in each residue.
+
+    Raises
+    ------
+    _FallbackError
+        If the PDB has alternative locations, atoms ``pdb_selaltloc``
+        would sort or remove, or records the single pass does not parse.
+    """
+    atoms: set[tuple[str, int, str, str]] = set()
+    prev_serial: Optional[int] = None
+    for line in lines:
+        if line.startswith(("ATOM  ", "HETATM")):
+            if line[16:17] not in ("", " "):
+                raise _FallbackError("alternative locations")
+            try:
+                serial = int(line[6:11])
+                float(line[54:60])  # as pdb_selaltloc
+                atom = (
+                    line[21],
+                    int(line[22:26]),
+                    line[17:20].strip(),
+                    line[12:16],
+                )
+            except (ValueError, IndexError) as err:
+                # for example, hybrid-36 atom numbers or short lines
+                raise _FallbackError(f"unexpected record {line!r}") from err
+            if atom in atoms or (prev_serial is not None and serial <= prev_serial):
+                raise _FallbackError("repeated or unsorted atoms")
+            atoms.add(atom)
+            prev_serial = serial
+
+        elif line.startswith("MODEL "):
+            atoms.clear()
+            prev_serial = None
+
+
+@lru_cache(maxsize=8192)
+def _compile_record(
+    record: str,
+    name: str,
+    resname: str,
+    tail: str,
+    residues: frozenset[str],
+) -> tuple[str, str, str, str, str, bool]:
+    """
+    Compute the edits of a record label.
+
+    Applies the functions of :py:func:`_get_record_edits` and
+    :py:func:`_get_record_filters` to a line holding only the label.
+
+    Returns
+    -------
+    tuple
+        The new record, atom name, residue name, occupancy and columns
+        from the element on, and whether the record is kept.
+    """
+    line = f"{record}{'':6}{name} {resname}{'':56}{tail}"
+    (new,) = chainf([line], *_get_record_edits(residues))
+    kept = bool(list(chainf([new], *_get_record_filters(residues))))
+    return new[:6], new[12:16], new[17:20], new[54:60], new[76:], kept
+
+
+def _edit_records(
+    lines: Iterable[str],
+    residues: frozenset[str],
+) -> Generator[str, None, None]:
+    """
+    Edit, renumber, and filter the records of tidy PDB lines.
+
+    Same as the functions of :py:func:`get_line_by_line_steps` between
+    ``pdb_tidy`` with ``strict=True`` and the last ``pdb_tidy``:
+    the edits of :py:func:`_compile_record`, ``pdb_fixinsert`` and
+    ``pdb_reatom``, all at once.
+    """
+    # pdb_fixinsert state
+    offset = 0
+    prev_resi = None
+    seen_ids: set[str] = set()
+    clean_icode = False
+    # pdb_reatom state
+    serial = 1
+
+    for line in lines:
+        if not line.startswith(("ATOM", "HETATM", "TER")):
+            if line.startswith("MODEL"):
+                serial = 1
+            yield line
+            continue
+
+        record, name, resname, occ, tail, kept = _compile_record(
+            line[:6], line[12:16], line[17:20], line[76:], residues
+        )
+
+        res_uid = resname + line[20:27]
+        id_res = line[21] + line[22:26].strip()
+        if prev_resi != res_uid:
+            # new residue: remove insertion codes and shift the
+            # residues of insertions without code
+            clean_icode = bool(line[26].strip()) or id_res in seen_ids
+            prev_resi = res_uid
+            if id_res in seen_ids:
+                offset += 1
+        resid = f"{int(line[22:26]) + offset:>4}"
+        icode = " " if clean_icode else line[26]
+        seen_ids.add(id_res)
+        if record.startswith("TER"):
+            offset = 0
+
+        if not kept:
+            continue
+
+        if serial > 99999 and not record.startswith("TER"):
+            raise _FallbackError("more than 99999 atoms")
+
+        yield (
+            f"{record}{serial:>5}{line[11]}{name}{line[16]}{resname}"
+            f"{line[20:22]}{resid}{icode}{line[27:54]}{occ}{line[60:76]}{tail}"
+        )
+        serial += 1
+
+
+def _tidy_lines(
+    lines: Iterable[str],
+    strict: bool = False,
+    keepcoord: bool = False,
+) -> Generator[str, None, None]:
+    """
+    Tidy PDB lines, as ``pdb_tidy``.
+
+    Adds ``TER``, ``ENDMDL`` and ``END`` lines, renumbers the models
+    and the atoms, and pads the lines to 80 characters.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        The PDB lines.
+
+    strict : bool
+        If ``True``, does not add ``TER`` lines at chain breaks.
+
+    keepcoord : bool
+        If ``True``, first keeps only the coordinate lines, as
+        ``pdb_keepcoord``. The line separators are kept when
+        ``keepcoord`` is ``True`` and removed otherwise, as
+        in :py:func:`get_line_by_line_steps`.
+    """
+    end = "\n" if keepcoord else ""
+    records = ("ATOM", "HETATM")
+    ignored = ("TER", "END", "CONECT", "MASTER", "ENDMDL")
+
+    def make_TER(prev_line: str, serial: int) -> str:
+        return (
+            f"TER  {serial:>6d}      {prev_line[17:20]:3s} "
+            f"{prev_line[21]:1s}{prev_line[22:26]:>4s}{prev_line[26]:1s}"
+            f"{'':53}{end}"
+        )
+
+    lines = iter(lines)
+    if keepcoord:
+        lines = (
+            line
+            for line in lines
+            if line.startswith(
+                ("MODEL ", "ATOM  ", "HETATM", "ENDMDL", "END   ", "TER   ", "CONECT")
+            )
+        )
+
+    # up to the first ATOM/HETATM line
+    prev_line = ""
+    prev_serial = 0
+    num_models = 1
+    in_model = False
+    for line in lines:
+        line = line.strip()
+        if line.startswith("MODEL"):
+            line = "MODEL " + "    " + str(num_models).rjust(4)
+            num_models += 1
+            in_model = True
+
+        if line.startswith(ignored):
+            continue
+
+        prefix = re.match(r"\S+\s*", line).group(0)  # type: ignore
+        content = line[len(prefix):].lstrip()
+        line = "".join(
+            f"{prefix}{part:<{80 - len(prefix)}}\n"
+            for part in textwrap.wrap(content, width=80 - len(prefix))
+        )
+        yield line if keepcoord else line.rstrip(linesep)
+
+        if line.startswith(records):
+            prev_line = line
+            prev_serial = int(line[6:11])
+            break
+
+    atom_section = False
+    serial_offset = 0
+    for line in lines:
+        line = line.strip()
+
+        if line.startswith(ignored):
+            continue
+
+        if line.startswith("ATOM"):
+            if atom_section and (
+                line[21] != prev_line[21]
+                or (
+                    not strict
+                    and int(line[22:26]) - int(prev_line[22:26]) > 1
+                )
+            ):
+                serial_offset += 1
+                yield make_TER(prev_line, prev_serial + 1)
+            prev_serial = int(line[6:11]) + serial_offset
+            if prev_serial > 99999:
+                raise _FallbackError("more than 99999 atoms")
+            prev_line = line
+            atom_section = True
+
+        elif line.startswith("HETATM"):
+            if atom_section:
+                atom_section = False
+                serial_offset += 1
+                yield make_TER(prev_line, prev_serial + 1)
+            prev_serial = int(line[6:11]) + serial_offset
+            if prev_serial > 99999:
+                raise _FallbackError("more than 99999 atoms")
+            prev_line = line
+
+        else:
+            if atom_section:
+                atom_section = False
+                yield make_TER(prev_line, prev_serial + 1)
+            if in_model:
+                yield f"{'ENDMDL':<80}{end}"
+                in_model = False
+
+            if line.startswith("MODEL"):
+                line = "MODEL " + "    " + str(num_models).rjust(4)
+                num_models += 1
+                in_model = True
+                serial_offset = 0
+
+        if line.startswith(records):
+            line = line[:6] + str(prev_serial).rjust(5) + line[11:]
+        yield f"{line:<80}{end}"
+
+    if atom_section:
+        yield make_TER(prev_line, prev_serial + 1)
+    if in_model:
+        yield f"{'ENDMDL':<80}{end}"
+
+    yield f"{'END':<80}{end}"
+
+
 # Functions operating line-by-line
 
 # make pdb-tools reportable
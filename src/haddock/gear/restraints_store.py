@@ -0,0 +1,176 @@
+"""
+Store of the ambiguous restraint archives of a run.
+
+An ``ambig_fname`` ending in ``.tgz`` is an archive with one restraint
+file per model, ``<prefix>_1.tbl``, ``<prefix>_2.tbl``..., for an archive
+named ``<prefix>.tbl.tgz``. Archives often hold thousands of files, many
+of them identical.
+
+When the run is prepared, each archive is read once, as a stream:
+
+* each distinct restraint file is written once in the store, the
+  ``restraints`` folder of the run data, in a subfolder named after the
+  archive checksum. Modules given the same archive share that subfolder;
+* an index, saved next to the copy of the archive in the module data
+  folder, lists the store file of each restraint file of the archive, in
+  the order the models use them.
+
+The CNS modules read the index (:py:func:`read_archive_index`) instead of
+extracting the archive and searching the restraint files.
+"""
+import hashlib
+import json
+import os
+import tarfile
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from haddock import log
+from haddock.core.typing import FilePath, Optional
+from haddock.libs.libutil import sort_numbered_paths
+
+
+STORE_DIR = "restraints"
+"""Folder of the store, in the run data folder."""
+
+INDEX_SUFFIX = ".index.json"
+"""Suffix of the archive indexes."""
+
+STORE_INDEX = "index.json"
+"""Index of an archive in the store, written once all its files are."""
+
+
+def get_archive_prefix(archive: FilePath) -> str:
+    """Get the prefix of the restraint files of an archive."""
+    return Path(archive).name.split(".tbl.tgz")[0]
+
+
+def get_index_path(archive: FilePath) -> Path:
+    """Get the path of the index of an archive."""
+    archive = Path(archive)
+    return archive.with_name(archive.name + INDEX_SUFFIX)
+
+
+def get_file_checksum(path: FilePath, chunk_size: int = 1 << 20) -> str:
+    """Get the sha256 checksum of a file, read by chunks."""
+    checksum = hashlib.sha256()
+    with open(path, "rb") as fin:
+        for chunk in iter(lambda: fin.read(chunk_size), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def _write_json(path: Path, content: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(content, indent=2))
+    os.replace(tmp, path)
+
+
+def store_archive(archive: FilePath, store_dir: FilePath) -> dict[str, str]:
+    """
+    Store the distinct restraint files of an archive.
+
+    Only the restraint files at the root of the archive and named
+    ``<prefix>*tbl`` are read. An archive already in the store is not
+    read again.
+
+    Parameters
+    ----------
+    archive : str or pathlib.Path
+        The ``.tbl.tgz`` archive.
+
+    store_dir : str or pathlib.Path
+        The store folder.
+
+    Returns
+    -------
+    dict
+        The path of the store file of each restraint file of the
+        archive, relative to the store folder, in the order the models
+        use them.
+    """
+    checksum = get_file_checksum(archive)
+    archive_dir = Path(store_dir, checksum[:16])
+    store_index = Path(archive_dir, STORE_INDEX)
+    if store_index.exists():
+        return json.loads(store_index.read_text())
+
+    log.info(f"Storing the restraint files of {str(archive)!r}")
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    pattern = f"{get_archive_prefix(archive)}*tbl"
+    stored: dict[str, str] = {}
+    files: dict[str, str] = {}
+    with tarfile.open(archive) as tar:
+        for member in tar:
+            name = os.path.normpath(member.name)
+            if (
+                    not member.isfile()
+                    or os.sep in name
+                    or not fnmatchcase(name, pattern)
+                    ):
+                continue
+            content = tar.extractfile(member).read()  # type: ignore
+            digest = hashlib.sha256(content).hexdigest()
+            # identical files are stored under the name of the first one
+            if digest not in stored:
+                Path(archive_dir, name).write_bytes(content)
+                stored[digest] = name
+            files[name] = str(Path(archive_dir.name, stored[digest]))
+
+    index = {name: files[name] for name in sort_numbered_paths(*files)}
+    log.info(
+        f"Found {len(index)} compatible tbl files, "
+        f"{len(stored)} distinct"
+        )
+    _write_json(store_index, index)
+    return index
+
+
+def index_archive(archive: FilePath, store_dir: FilePath) -> Path:
+    """
+    Index an archive, storing its distinct restraint files.
+
+    The index is saved next to the archive. It maps each restraint file
+    of the archive to its store file, with paths relative to the
+    archive folder.
+
+    Returns
+    -------
+    pathlib.Path
+        The path of the index.
+    """
+    archive = Path(archive)
+    store_index = store_archive(archive, store_dir)
+    rel_store_dir = os.path.relpath(store_dir, archive.parent)
+    index = {
+        "archive": archive.name,
+        "files": {
+            name: str(Path(rel_store_dir, path))
+            for name, path in store_index.items()
+            },
+        }
+    index_path = get_index_path(archive)
+    _write_json(index_path, index)
+    return index_path
+
+
+def read_archive_index(archive: FilePath) -> Optional[list[Path]]:
+    """
+    Read the restraint files of an archive from its index.
+
+    Returns
+    -------
+    list of pathlib.Path or None
+        The store file of each restraint file of the archive, in the
+        order the models use them, relative to the folder the archive
+        path is relative to. ``None`` if the archive is not indexed.
+    """
+    archive = Path(archive)
+    index_path = get_index_path(archive)
+    if not index_path.exists():
+        return None
+    index = json.loads(index_path.read_text())
+    return [
+        Path(os.path.normpath(Path(archive.parent, path)))
+        for path in index["files"].values()
+        ]
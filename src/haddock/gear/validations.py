@@ -2,7 +2,7 @@
 from haddock import config_expert_levels, _hidden_level
 from haddock.core.defaults import RUNDIR, valid_run_dir_chars
 from haddock.core.exceptions import ConfigurationError
-from haddock.core.typing import FilePath, Any, ParamDict
+from haddock.core.typing import FilePath, Any, Optional, ParamDict, ParamMap
 from haddock.libs.libio import read_from_yaml, check_yaml_duplicated_parameters
 
 _allowed_expert_levels = config_expert_levels + ("all", _hidden_level)
@@ -30,15 +30,21 @@ def v_rundir(rundir: FilePath) -> None:
         raise ConfigurationError(emsg)
 
 
-def validate_yaml_params_scheme(yaml_fpath: FilePath) -> None:
+def validate_yaml_params_scheme(
+        yaml_fpath: FilePath,
+        ycfg: Optional[ParamMap] = None,
+        ) -> None:
     """Validate a defaults.yaml file module parameters schemes.
 
     Parameters
     ----------
     yaml_fpath : str
         Path to the defaults.yaml file to check.
+    ycfg : dict, optional
+        The content of the defaults.yaml file, if already read.
     """
-    ycfg = read_from_yaml(yaml_fpath)
+    if ycfg is None:
+        ycfg = read_from_yaml(yaml_fpath)
     # Loop over parameters
     for param_name, parameters in ycfg.items():
         try:
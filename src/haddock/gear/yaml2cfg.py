@@ -4,25 +4,47 @@ Parse data from HADDOCK3 to YAML and YAML to HADDOCK3 and related.
 Accross this file you will see references to "yaml" as variables and
 function names. In these cases, we always mean the HADDOCK3 YAML
 configuration files which have specific keys.
+
+Reading the modules' `defaults.yaml` files is slow, and the same files
+are read many times: once per step to validate a workflow, and again by
+each module and client. :py:func:`compile_defaults` parses, validates and
+flattens each file only once per process. Set the
+``HADDOCK3_DEFAULTS_CACHE`` environment variable to a folder to also keep
+the parsed files on disk, keyed by their content hash and the haddock3
+version, for the next processes (for example, repeated ``haddock3-score``
+calls).
 """
 
+import hashlib
 import os
+import pickle
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Union
 
-from haddock import _hidden_level, config_expert_levels
+import haddock
+from haddock import _hidden_level, config_expert_levels, log
 from haddock.core.exceptions import ConfigurationError
 from haddock.core.typing import (
+    Any,
     ExpertLevel,
     FilePath,
     Optional,
     ParamDict,
     ParamMap,
 )
+from haddock.gear.expandable_parameters import DefaultGroups, get_default_groups
+from haddock.gear.validations import validate_yaml_params_scheme
 from haddock.libs.libio import read_from_yaml
 
 
+DEFAULTS_CACHE_ENV = "HADDOCK3_DEFAULTS_CACHE"
+"""Environment variable with the folder where compiled defaults are kept."""
+
+# increase the version when the content of the cache files changes
+_DEFAULTS_CACHE_VERSION = "1"
+
+
 def yaml2cfg_text(
     ymlcfg: dict,
     module: str,
@@ -224,13 +246,10 @@ def read_from_yaml_config(
     cfg : dict
         A dictionary containing only the default parameters values
     """
-    ycfg = read_from_yaml(cfg_file)
+    compiled = compile_defaults(cfg_file)
     if default_only:
-        # there's no need to make a deep copy here, a shallow copy suffices.
-        cfg = {}
-        cfg.update(flat_yaml_cfg(ycfg))
-        return cfg
-    return ycfg
+        return compiled.defaults
+    return compiled.config
 
 
 def flat_yaml_cfg(cfg: ParamMap) -> ParamDict:
@@ -277,7 +296,7 @@ def find_incompatible_parameters(yaml_file: Path) -> dict[str, ParamDict]:
         A dictionary with node names as keys and their corresponding
         'incompatible' parameters as values.
     """
-    config = read_from_yaml(yaml_file=yaml_file)
+    config = compile_defaults(yaml_file).config
 
     # Go over each node and see which contains the `incompatible` key
     incompatible_parameters = {}
@@ -285,3 +304,185 @@ def find_incompatible_parameters(yaml_file: Path) -> dict[str, ParamDict]:
         if "incompatible" in values:
             incompatible_parameters[node] = values["incompatible"]
     return incompatible_parameters
+
+
+class CompiledDefaults:
+    """
+    A YAML configuration file, read once.
+
+    The configuration and its flat default values are kept pickled: each
+    access returns a new copy that the caller is free to edit. The flat
+    defaults and the expandable groups are computed on first use.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The YAML file.
+
+    digest : str
+        The hash of the file content.
+
+    config : dict
+        The content of the file.
+
+    validated : bool
+        Whether the parameters scheme was validated.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        digest: str,
+        config: ParamMap,
+        validated: bool = False,
+    ) -> None:
+        self.path = path
+        self.digest = digest
+        self.validated = validated
+        self.stat: Optional[tuple[int, int]] = None
+        self._config = pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+        self._defaults: Optional[bytes] = None
+        self._groups: dict[Optional[str], DefaultGroups] = {}
+
+    @property
+    def config(self) -> ParamDict:
+        """A copy of the full configuration."""
+        return pickle.loads(self._config)
+
+    @property
+    def defaults(self) -> ParamDict:
+        """A copy of the default value of each parameter."""
+        if self._defaults is None:
+            defaults = flat_yaml_cfg(pickle.loads(self._config))
+            self._defaults = pickle.dumps(defaults, pickle.HIGHEST_PROTOCOL)
+        return pickle.loads(self._defaults)
+
+    def expandable(self, section: Optional[str] = None) -> DefaultGroups:
+        """
+        Get the expandable groups of the defaults.
+
+        Parameters
+        ----------
+        section : str, optional
+            Read the groups of a subdictionary of parameters, for
+            example, ``mol1`` in ``topoaa``.
+
+        Returns
+        -------
+        :py:class:`haddock.gear.expandable_parameters.DefaultGroups`
+            Shared between calls, do not edit.
+        """
+        if section not in self._groups:
+            defaults = self.defaults
+            if section is not None:
+                defaults = defaults[section]
+            self._groups[section] = get_default_groups(defaults)
+        return self._groups[section]
+
+
+_compiled_defaults: dict[Path, CompiledDefaults] = {}
+
+
+def compile_defaults(
+    yaml_file: FilePath,
+    validate: bool = False,
+) -> CompiledDefaults:
+    """
+    Read a YAML configuration file once per process.
+
+    The file is read again only if it changes. When the
+    ``HADDOCK3_DEFAULTS_CACHE`` environment variable is set, the files
+    parsed are also saved in that folder, and the next processes load
+    them from there.
+
+    Parameters
+    ----------
+    yaml_file : str or pathlib.Path
+        Path to the YAML file.
+
+    validate : bool
+        Validate the parameters scheme, as done by
+        :py:func:`haddock.gear.validations.validate_defaults_yaml`. Each
+        file is validated only once.
+
+    Returns
+    -------
+    CompiledDefaults
+
+    Raises
+    ------
+    ConfigurationError
+        If `validate` is true and the file is not valid.
+    """
+    path = Path(yaml_file).resolve()
+    fstat = path.stat()
+    stat = (fstat.st_mtime_ns, fstat.st_size)
+    compiled = _compiled_defaults.get(path)
+    try:
+        if compiled is None or compiled.stat != stat:
+            compiled = _load_compiled_defaults(path)
+            compiled.stat = stat
+            _compiled_defaults[path] = compiled
+        if validate and not compiled.validated:
+            validate_yaml_params_scheme(path, compiled.config)
+            compiled.validated = True
+            _save_compiled_defaults(compiled)
+    except AssertionError as error:
+        if validate:
+            raise ConfigurationError(error)
+        raise
+    return compiled
+
+
+def clear_compiled_defaults() -> None:
+    """Forget the YAML files read in this process."""
+    _compiled_defaults.clear()
+
+
+def _get_cache_file(digest: str) -> Optional[Path]:
+    folder = os.environ.get(DEFAULTS_CACHE_ENV)
+    if not folder:
+        return None
+    # files cached by another version of haddock3, or in another format,
+    # are never read
+    key = f"{_DEFAULTS_CACHE_VERSION}:{haddock.version}:{digest}"
+    key_hex = hashlib.sha256(key.encode()).hexdigest()
+    return Path(folder, f"{key_hex}.pickle")
+
+
+def _load_compiled_defaults(path: Path) -> CompiledDefaults:
+    digest = hashlib.sha256(path.read_bytes())
+    digest_hex = digest.hexdigest()
+    cache_file = _get_cache_file(digest_hex)
+    if cache_file is not None and cache_file.exists():
+        try:
+            cached: dict[str, Any] = pickle.loads(cache_file.read_bytes())
+            return CompiledDefaults(
+                path,
+                digest_hex,
+                cached["config"],
+                validated=cached["validated"],
+            )
+        except Exception as err:
+            # a corrupted or unreadable cache file, including unpickling
+            # errors, is a cache miss: the YAML file is read again
+            log.debug(f"Could not read the cached defaults {cache_file}: {err}")
+
+    compiled = CompiledDefaults(path, digest_hex, read_from_yaml(path))
+    _save_compiled_defaults(compiled)
+    return compiled
+
+
+def _save_compiled_defaults(compiled: CompiledDefaults) -> None:
+    cache_file = _get_cache_file(compiled.digest)
+    if cache_file is None:
+        return
+    cached = {"config": compiled.config, "validated": compiled.validated}
+    # write to a temporary file first, other processes may be reading
+    temp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file.write_bytes(pickle.dumps(cached, pickle.HIGHEST_PROTOCOL))
+        os.replace(temp_file, cache_file)
+    except OSError as err:
+        log.debug(f"Could not cache the defaults in {cache_file}: {err}")
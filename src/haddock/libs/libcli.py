@@ -3,7 +3,6 @@ from argparse import Action, ArgumentParser, ArgumentTypeError
 from functools import partial
 from pathlib import Path
 
-from haddock import version
 from haddock.libs.libio import file_exists, folder_exists
 
 
@@ -20,14 +19,31 @@ arg_folder_exist = partial(
 )
 
 
+class _VersionAction(Action):
+    """
+    Print the HADDOCK3 version and exit.
+
+    The version is read only when the option is given, to keep the
+    start of the clients fast.
+    """
+
+    def __init__(self, option_strings, dest, help=None):
+        super().__init__(option_strings, dest, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Execute."""
+        from haddock import version
+
+        parser.exit(message=f"{parser.prog} - {version}\n")
+
+
 def add_version_arg(ap: ArgumentParser) -> None:
     """Add version `-v` argument to client."""
     ap.add_argument(
         "-v",
         "--version",
         help="show version",
-        action="version",
-        version=f"{ap.prog} - {version}",
+        action=_VersionAction,
     )
 
 
@@ -9,18 +9,29 @@ Main functions
 """
 
 import os
+from itertools import islice
 from pathlib import Path
 
 from haddock import log
-from haddock.core.typing import FilePath, Union, ParamDictT, Optional
+from haddock.core.typing import (
+    Any,
+    FilePath,
+    NDArray,
+    NDFloat,
+    Optional,
+    ParamDictT,
+    Union,
+    )
 from haddock.libs.libontology import PDBFile
 from haddock.libs.libplots import heatmap_plotly
 
 import numpy as np
-from scipy.spatial.distance import squareform
 
 
+# maximum number of rows (and columns) of a cluster matrix plot
 MAX_NB_ENTRY_HTML_MATRIX = 3100
+# number of lines of a matrix file read at once
+MATRIX_READ_CHUNK = 1000000
 
 
 def write_structure_list(input_models: list[PDBFile],
@@ -59,6 +70,126 @@ def write_structure_list(input_models: list[PDBFile],
         out_fh.write(output_str)
 
 
+def get_matrix_bins(nb_entries: int, max_size: int) -> NDArray[np.int64]:
+    """Assign the ordered entries of a matrix to contiguous blocks.
+
+    Parameters
+    ----------
+    nb_entries : int
+        Number of entries (rows) of the matrix.
+    max_size : int
+        Maximum number of blocks.
+
+    Returns
+    -------
+    bins : np.ndarray
+        Block index of each entry. Each entry has its own block when
+        `nb_entries` is not greater than `max_size`.
+    """
+    nb_bins = min(nb_entries, max_size)
+    return np.arange(nb_entries) * nb_bins // nb_entries
+
+
+def read_binned_matrix(
+        matrix_path: Union[Path, FilePath, str],
+        final_order_idx: list[int],
+        bins: NDArray[np.int64],
+        diag_fill: Union[int, float] = 1,
+        chunk_size: int = MATRIX_READ_CHUNK,
+        ) -> NDFloat:
+    """Read a half-matrix file, averaging the values over blocks of entries.
+
+    The file is read by chunks and only the block sums are kept, so memory
+    is bounded by the number of blocks and not by the number of entries.
+
+    Parameters
+    ----------
+    matrix_path : Union[Path, FilePath, str]
+        Path to a half-matrix
+    final_order_idx : list[int]
+        Index orders
+    bins : np.ndarray
+        Block index of each ordered entry, see :py:func:`get_matrix_bins`.
+    diag_fill : Union[int, float]
+        Value of the diagonal
+    chunk_size : int
+        Number of lines read at once.
+
+    Return
+    ------
+    matrix : np.ndarray
+        Square matrix with the average value of each block.
+    """
+    nb_bins = int(bins[-1]) + 1
+    # block of each entry of the matrix file, -1 if not selected
+    entry_bins = np.full(max(final_order_idx) + 1, -1)
+    entry_bins[final_order_idx] = bins
+    sums = np.zeros(nb_bins * nb_bins)
+    counts = np.zeros(nb_bins * nb_bins)
+    # the diagonal blocks contain the self-pairs
+    bin_sizes = np.bincount(bins, minlength=nb_bins)
+    diag = np.arange(nb_bins) * (nb_bins + 1)
+    sums[diag] += diag_fill * bin_sizes
+    counts[diag] += bin_sizes
+    with open(matrix_path, "r") as f:
+        while lines := list(islice(f, chunk_size)):
+            data = np.loadtxt(lines, ndmin=2)
+            # entries are 1-indexed in the matrix file
+            idx_i = data[:, 0].astype(int) - 1
+            idx_j = data[:, 1].astype(int) - 1
+            upper = data[:, 2]
+            lower = data[:, 3] if data.shape[1] == 4 else upper
+            # discard pairs of non-selected entries
+            valid = (idx_i < entry_bins.size) & (idx_j < entry_bins.size)
+            bin_i = np.full(idx_i.size, -1)
+            bin_j = np.full(idx_j.size, -1)
+            bin_i[valid] = entry_bins[idx_i[valid]]
+            bin_j[valid] = entry_bins[idx_j[valid]]
+            valid &= (bin_i >= 0) & (bin_j >= 0)
+            bin_i, bin_j = bin_i[valid], bin_j[valid]
+            # upper value at (i, j), lower value at (j, i)
+            for flat_idx, values in (
+                    (bin_i * nb_bins + bin_j, upper[valid]),
+                    (bin_j * nb_bins + bin_i, lower[valid]),
+                    ):
+                sums += np.bincount(
+                    flat_idx,
+                    weights=values,
+                    minlength=sums.size,
+                    )
+                counts += np.bincount(flat_idx, minlength=counts.size)
+    with np.errstate(invalid="ignore"):
+        matrix = sums / counts
+    return matrix.reshape(nb_bins, nb_bins)
+
+
+def get_binned_labels(
+        labels: list[str],
+        bins: NDArray[np.int64],
+        ) -> list[str]:
+    """Build the label of each block of entries.
+
+    Parameters
+    ----------
+    labels : list[str]
+        Ordered labels
+    bins : np.ndarray
+        Block index of each ordered entry.
+
+    Return
+    ------
+    bin_labels : list[str]
+        Label of each block: the label of its entry, or the range of labels
+        of its first and last entries.
+    """
+    starts = np.flatnonzero(np.diff(bins, prepend=-1))
+    ends = np.append(starts[1:], len(bins)) - 1
+    return [
+        labels[start] if start == end else f"{labels[start]} to {labels[end]}"
+        for start, end in zip(starts, ends)
+        ]
+
+
 def plot_cluster_matrix(
         matrix_path: Union[Path, FilePath, str],
         final_order_idx: list[int],
@@ -68,11 +199,15 @@ def plot_cluster_matrix(
         color_scale: str = "Blues",
         reverse: bool = False,
         output_fname: Union[str, Path, FilePath] = 'clust_matrix',
-        matrix_cluster_dt: Optional[list[list[list[int]]]] = None,
-        cluster_limits: Optional[list[dict[str, float]]] = None,
+        cluster_ids: Optional[list[int]] = None,
+        max_size: int = MAX_NB_ENTRY_HTML_MATRIX,
         ) -> Optional[str]:
     """Plot a plotly heatmap of a matrix file.
 
+    When there are more than `max_size` entries, consecutive entries are
+    grouped in blocks and the average value of each block is drawn, so that
+    the size of the figure does not depend on the number of models.
+
     Parameters
     ----------
     matrix_path : Union[Path, FilePath, str]
@@ -89,46 +224,28 @@ def plot_cluster_matrix(
         Should the color scale be reversed ?, by default False
     output_fname : Union[str, Path, FilePath], optional
         Name of the output file to generate, by default 'clust_matrix.html'
-    matrix_cluster_dt: Optional[list[list[list[int]]]]
-        A matrix of cluster ids, used for extra hover annotation in plotly.
-    cluster_limits: Optional[list[dict[str, float]]]
-        A list of dict enabling to draw lines separating cluster ids.
+    cluster_ids: Optional[list[int]]
+        Ordered cluster ids, used to delineate and annotate the clusters.
+    max_size: int
+        Maximum number of rows and columns of the drawn matrix.
 
     Return
     ------
     output_fname_ext : str
         Path to the generated file containing the figure.
     """
-    # Check that we will be able to generate a functional interactive plot
-    if len(final_order_idx) > MAX_NB_ENTRY_HTML_MATRIX:
+    # Check that there is something to plot
+    if not final_order_idx:
         return None
 
-    upper_diag, lower_diag = [], []
-    # Read matrix
-    with open(matrix_path, 'r') as f:
-        # Loop over lines
-        for _ in f:
-            # Split line
-            s_ = _.strip().split()
-            # Point first value
-            uv = float(s_[2])
-            # Point second value (if exists)
-            lv = float(s_[3]) if len(s_) == 4 else uv
-            # Hold them
-            upper_diag.append(uv)
-            lower_diag.append(lv)
-
-    # Genereate full matrix from N*(N-1)/2 vector
-    upper_matrix = squareform(upper_diag)
-    lower_matrix = squareform(lower_diag)
-    # Update diagonal with data
-    np.fill_diagonal(upper_matrix, diag_fill)
-
-    # Full matrix (lower triangle + upper triangle)
-    full_matrix = np.tril(lower_matrix, k=-1) + np.triu(upper_matrix)
-
-    # Extract submatrix of selected models and re-order them
-    submat = full_matrix[np.ix_(final_order_idx, final_order_idx)]
+    bins = get_matrix_bins(len(final_order_idx), max_size)
+    submat = read_binned_matrix(matrix_path, final_order_idx, bins, diag_fill)
+    is_binned = submat.shape[0] < len(final_order_idx)
+    if is_binned:
+        log.info(
+            f"Drawing the average {dttype} of {submat.shape[0]} blocks "
+            f"of models for the {len(final_order_idx)} clustered models"
+            )
 
     # Check if must reverse the colorscale
     if reverse:
@@ -138,35 +255,35 @@ def plot_cluster_matrix(
             color_scale += '_r'
 
     # Define hovering tempalte string
-    if matrix_cluster_dt:
-        hovertemplate = (
-            f'                                {dttype}: %{{z}} <br>'
-            f' Model1: %{{x}}    ClusterID: %{{customdata[0]}} <br>'
-            f' Model2: %{{y}}    ClusterID: %{{customdata[1]}} '
-            '<extra></extra>'
+    value_name = f"mean {dttype}" if is_binned else dttype
+    hovertemplate = (
+        f'                       {value_name}: %{{z}} <br>'
+        f' Model1: %{{x}} <br>'
+        f' Model2: %{{y}} '
+        '<extra></extra>'
+        )
+    if cluster_ids:
+        annotations, cluster_limits = get_cluster_matrix_plot_clt_dt(
+            cluster_ids,
+            bins,
             )
     else:
-        hovertemplate = (
-            f'                       {dttype}: %{{z}} <br>'
-            f' Model1: %{{x}} <br>'
-            f' Model2: %{{y}} '
-            '<extra></extra>'
-            )
+        annotations, cluster_limits = None, None
 
     # Generate file name
     output_fname_ext = f"{output_fname}.html"
     # Draw heatmap
     heatmap_plotly(
-        submat,
+        np.round(submat, 3),
         labels={'color': dttype},
-        xlabels=labels,
-        ylabels=labels,
+        xlabels=get_binned_labels(labels, bins),
+        ylabels=get_binned_labels(labels, bins),
         color_scale=color_scale,
         title=f"{dttype} clustering matrix",
         output_fname=output_fname_ext,
         hovertemplate=hovertemplate,
-        customdata=matrix_cluster_dt,
         delineation_traces=cluster_limits,
+        annotations=annotations,
         )
     # Return generated filepath
     return output_fname_ext
@@ -174,42 +291,52 @@ def plot_cluster_matrix(
 
 def get_cluster_matrix_plot_clt_dt(
         cluster_ids: list[int],
-        ) -> tuple[list[list[list[int]]], list[dict[str, float]]]:
+        bins: Optional[NDArray[np.int64]] = None,
+        ) -> tuple[list[dict[str, Any]], list[dict[str, float]]]:
     """Generate cluster matrix data for plotly.
 
     Parameters
     ----------
     cluster_ids : list[int]
         List containing ordered cluster ids.
+    bins : Optional[np.ndarray]
+        Block index of each ordered entry, see :py:func:`get_matrix_bins`.
+        By default each entry has its own block.
 
     Returns
     -------
-    matrix_cluster_dt: list[list[list[int]]]
-        A matrix of cluster ids, used for plotly.
-    
+    annotations: list[dict[str, Any]]
+        Cluster labels, placed on the diagonal at the center of each cluster.
+
     cluster_limits: list[dict[str, float]]]
         Boundaries to draw lines between clusters with plotly.
     """
-    # Set custom data
-    matrix_cluster_dt = [
-        [[clix, cliy] for clix in cluster_ids]
-        for cliy in cluster_ids
+    if bins is None:
+        bins = np.arange(len(cluster_ids))
+    nb_bins = int(bins[-1]) + 1
+    # Find the first entry of each cluster
+    starts = [
+        i for i, clid in enumerate(cluster_ids)
+        if i == 0 or clid != cluster_ids[i - 1]
+        ]
+    ends = starts[1:] + [len(cluster_ids)]
+    annotations = [
+        {
+            "x": float(bins[start] + bins[end - 1]) / 2,
+            "y": float(bins[start] + bins[end - 1]) / 2,
+            "text": f"Cluster {cluster_ids[start]}",
+            "showarrow": False,
+            }
+        for start, end in zip(starts, ends)
         ]
-    # Build delineation lines
-    del_ind = -0.5
-    del_posi = []
-    current_clid = cluster_ids[0]
-    for clid in cluster_ids:
-        if clid != current_clid:
-            del_posi.append(del_ind)
-            current_clid = clid
-        del_ind += 1
+    # Build delineation lines, on the border of the block of each first entry
+    del_posi = [float(bins[start]) - 0.5 for start in starts[1:]]
     cluster_limits = [
         {
             "x0": delpos,
             "x1": delpos,
             "y0": -0.5,
-            "y1": len(cluster_ids) - 0.5,
+            "y1": nb_bins - 0.5,
             }
         for delpos in del_posi
         ] + [
@@ -217,11 +344,11 @@ def get_cluster_matrix_plot_clt_dt(
                 "y0": delpos,
                 "y1": delpos,
                 "x0": -0.5,
-                "x1": len(cluster_ids) - 0.5,
+                "x1": nb_bins - 0.5,
                 }
             for delpos in del_posi
         ]
-    return matrix_cluster_dt, cluster_limits
+    return annotations, cluster_limits
 
 
 def rank_clusters(clt_dic, threshold):
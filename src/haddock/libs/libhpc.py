@@ -8,8 +8,11 @@ import time
 from pathlib import Path
 
 from haddock import log, modules_defaults_path
+from haddock.core.exceptions import EngineAbortError
 from haddock.core.typing import Any, Container, FilePath, Optional
 from haddock.gear.yaml2cfg import read_from_yaml_config
+from haddock.libs.libparallel import FailureTracker
+from haddock.libs.libperf import record_engine_run
 from haddock.libs.libsubprocess import CNSJob
 
 
@@ -125,6 +128,29 @@ class HPCWorker:
 
         return self.job_status
 
+    def find_task_errors(self, tail_size: int = 24000) -> list[Optional[str]]:
+        """
+        Find the error of each task, in its CNS output file.
+
+        Only the end of the output files is read, as in
+        :py:meth:`haddock.libs.libsubprocess.CNSJob.find_cns_stdout_error`.
+
+        Returns
+        -------
+        list of str or None
+            The error of each task, `None` for the tasks that succeeded.
+        """
+        errors: list[Optional[str]] = []
+        for task in self.tasks:
+            output = Path(self.moddir, task.output_file)  # type: ignore
+            if not output.exists():
+                errors.append("CNS output file not found")
+                continue
+            with open(output, "rb") as fin:
+                fin.seek(max(output.stat().st_size - tail_size, 0))
+                errors.append(CNSJob.find_cns_stdout_error(fin.read()))
+        return errors
+
     def cancel(self, bypass_statuses: Container[str] = ("finished", "failed")) -> None:
         """Cancel the execution."""
         if self.update_status() not in bypass_statuses:
@@ -142,10 +168,17 @@ class HPCScheduler:
         target_queue: str = HPCWorker_QUEUE_DEFAULT,
         queue_limit: int = HPCWorker_QUEUE_LIMIT_DEFAULT,
         concat: int = HPCScheduler_CONCAT_DEFAULT,
+        tolerance: Optional[float] = None,
+        max_consecutive_errors: int = 0,
     ) -> None:
         self.num_tasks = len(task_list)
         self.queue_limit = queue_limit
         self.concat = concat
+        self.failures = FailureTracker(
+            self.num_tasks,
+            tolerance=tolerance,
+            max_consecutive=max_consecutive_errors,
+        )
 
         # split tasks according to concat level
         if concat > 1:
@@ -172,6 +205,7 @@ class HPCScheduler:
             for i in range(0, len(self.worker_list), self.queue_limit)
         ]
         total_batches = len(batch)
+        run_start = time.perf_counter()
         try:
             for batch_num, worker_list in enumerate(batch, start=1):
                 log.info(f"> Running batch {batch_num}/{total_batches}")
@@ -187,7 +221,9 @@ class HPCScheduler:
                     terminated_count: int = 0
                     # Loop over workers
                     for worker in worker_list:
-                        worker.update_status()
+                        was_terminated = worker.job_status in TERMINATED_STATUS
+                        if not was_terminated:
+                            worker.update_status()
                         # Log status if not finished
                         if worker.job_status != "finished":
                             log.info(
@@ -196,6 +232,8 @@ class HPCScheduler:
                         # Increment number of terminated works
                         if worker.job_status in TERMINATED_STATUS:
                             terminated_count += 1
+                            if not was_terminated:
+                                self.check_failures(worker)
 
                     # Check if all terminated
                     if terminated_count == len(worker_list):
@@ -220,10 +258,29 @@ class HPCScheduler:
                     f"{elapsed:.2f}s to finish, {per:.2f}% complete"
                 )
 
+            # the jobs run in the queue: only the total time is known
+            record_engine_run(run_start, time.perf_counter())
+
         except KeyboardInterrupt as err:
             self.terminate()
             raise err
 
+    def check_failures(self, worker: HPCWorker) -> None:
+        """
+        Track the failed tasks of a terminated worker.
+
+        Raises
+        ------
+        :py:class:`haddock.core.exceptions.EngineAbortError`
+            If the run is doomed, after removing the jobs from the queue.
+        """
+        if not self.failures.active:
+            return
+        for error in worker.find_task_errors():
+            if reason := self.failures.add(error):
+                self.terminate()
+                raise EngineAbortError(f"Run aborted: {reason}")
+
     def terminate(self) -> None:
         """Terminate all jobs in the queue in a controlled way."""
         log.info("Terminate signal received, removing jobs from the queue...")
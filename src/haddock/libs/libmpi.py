@@ -4,38 +4,63 @@ import shlex
 import subprocess
 import sys
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Optional
 
 from haddock import log
+from haddock.core.exceptions import EngineAbortError
+from haddock.libs.libperf import record_engine_run
+
+
+ABORT_MESSAGE = "Run aborted: "
+"""Prefix of the error of the haddock3-mpitask runner when it aborts."""
 
 
 class MPIScheduler:
     """Schedules tasks to be executed via MPI."""
 
-    def __init__(self, tasks: list[Any], ncores: Optional[int] = None) -> None:
+    def __init__(
+            self,
+            tasks: list[Any],
+            ncores: Optional[int] = None,
+            tolerance: Optional[float] = None,
+            max_consecutive_errors: int = 0,
+            ) -> None:
         self.tasks = tasks
         self.cwd = Path.cwd()
         self.ncores = ncores
+        self.tolerance = tolerance
+        self.max_consecutive_errors = max_consecutive_errors
 
     def run(self) -> None:
         """Send it to the haddock3-mpitask runner."""
         pkl_tasks = self._pickle_tasks()
         cmd = f"mpirun -np {self.ncores} haddock3-mpitask {pkl_tasks}"
+        # the runner aborts all processes when the run is doomed
+        if self.tolerance is not None:
+            cmd += f" --tolerance {self.tolerance}"
+        if self.max_consecutive_errors:
+            cmd += f" --max-consecutive-errors {self.max_consecutive_errors}"
         log.debug(f"MPI cmd is {cmd}")
 
         log.info(
             f"Executing tasks with the haddock3-mpitask runner using "
             f"{self.ncores} processors..."
             )
+        start = perf_counter()
         p = subprocess.run(
             shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE
             )
+        record_engine_run(start, perf_counter())
 
         # out = p.stdout.decode("utf-8")
         err = p.stderr.decode("utf-8")
 
         if err:
             log.error(err)
+            for line in err.splitlines():
+                if line.startswith(ABORT_MESSAGE):
+                    raise EngineAbortError(line)
             sys.exit()
 
     def _pickle_tasks(self) -> Path:
@@ -2,13 +2,11 @@
 
 import datetime
 import itertools
+import os
 from enum import Enum
 from os import linesep
 from pathlib import Path
 
-
-import jsonpickle
-
 from haddock.core.defaults import MODULE_IO_FILE
 from haddock.core.typing import FilePath, Literal, Optional, TypeVar, Union
 from typing import List, Any
@@ -140,15 +138,25 @@ class ModuleIO:
 
     def save(self, path: FilePath = ".", filename: FilePath = MODULE_IO_FILE) -> Path:
         """Save Input/Output needed files by this module to disk."""
+        # jsonpickle reads its version from the package metadata, which
+        # is slow: import it only when `io.json` is written or read
+        import jsonpickle
+
         fpath = Path(path, filename)
-        with open(fpath, "w") as output_handler:
+        # the file is renamed once written: the workflow can start the
+        # next step as soon as it exists
+        tmp_fpath = fpath.with_name(f".{fpath.name}.tmp")
+        with open(tmp_fpath, "w") as output_handler:
             to_save = {"input": self.input, "output": self.output}
             jsonpickle.set_encoder_options("json", sort_keys=True, indent=4)
             output_handler.write(jsonpickle.encode(to_save))  # type: ignore
+        os.replace(tmp_fpath, fpath)
         return fpath
 
     def load(self, filename: FilePath) -> None:
         """Load the content of a given IO filename."""
+        import jsonpickle
+
         with open(filename) as json_file:
             content = jsonpickle.decode(json_file.read())
             self.input = content["input"]  # type: ignore
@@ -1,9 +1,12 @@
 """Module in charge of parallelizing the execution of tasks."""
 
 import math
+from collections import defaultdict
 from multiprocessing import Process, Queue
+from time import perf_counter
 
 from haddock import log
+from haddock.core.exceptions import EngineAbortError
 from haddock.core.typing import (
     AnyT,
     FilePath,
@@ -13,6 +16,7 @@ from haddock.core.typing import (
     SupportsRunT,
     Union,
 )
+from haddock.libs.libperf import record_engine_run
 from haddock.libs.libutil import parse_ncores
 
 
@@ -72,6 +76,141 @@ class GenericTask:
         return self.function(*self.args, **self.kwargs)
 
 
+class WorkerTimes:
+    """
+    Run times of the tasks executed by a worker.
+
+    Tasks can report the time spent in their own phases in a `timings`
+    dictionary, see :py:meth:`haddock.libs.libsubprocess.CNSJob.run`.
+    """
+
+    def __init__(self) -> None:
+        self.task_times: list[float] = []
+        self.task_phases: dict[str, float] = defaultdict(float)
+
+    def add(self, task: SupportsRunT, seconds: float) -> None:
+        """Add the run time of a task."""
+        self.task_times.append(seconds)
+        for phase, phase_seconds in getattr(task, "timings", {}).items():
+            self.task_phases[phase] += phase_seconds
+
+    @property
+    def busy_time(self) -> float:
+        """Time spent running tasks."""
+        return sum(self.task_times)
+
+
+def get_task_error(task: SupportsRunT) -> Optional[str]:
+    """
+    Get the error of a task that finished without raising.
+
+    Tasks can report an error in an `error` attribute, see
+    :py:meth:`haddock.libs.libsubprocess.CNSJob.run`.
+    """
+    return getattr(task, "error", None)
+
+
+class TaskOutcome:
+    """Outcome of a task, sent by the workers as soon as the task ends."""
+
+    def __init__(self, error: Optional[str] = None) -> None:
+        self.error = error
+
+
+class FailureTracker:
+    """
+    Track the failed tasks of a run, as they finish.
+
+    A run is doomed, and should be aborted, when:
+
+    * the failed tasks exceed the `tolerance` percentage of all tasks:
+      the module would fail once all tasks finished, see
+      :py:meth:`haddock.modules.BaseHaddockModule.export_io_models`;
+    * the last `max_consecutive` tasks failed with the same error, as
+      when the CNS executable, the parameter files or a restraint file
+      are faulty.
+
+    Parameters
+    ----------
+    num_tasks : int
+        The number of tasks of the run.
+
+    tolerance : float or None
+        The percentage of failed tasks tolerated. If `None`, the failure
+        rate is not checked.
+
+    max_consecutive : int
+        The number of consecutive identical errors that abort the run.
+        If 0, or if `tolerance` is 100 or more, consecutive errors are not
+        checked.
+    """
+
+    def __init__(
+        self,
+        num_tasks: int,
+        tolerance: Optional[float] = None,
+        max_consecutive: int = 0,
+    ) -> None:
+        self.num_tasks = num_tasks
+        if tolerance is not None and tolerance >= 100:
+            # all tasks may fail, the run is never doomed
+            tolerance = None
+            max_consecutive = 0
+        self.tolerance = tolerance
+        self.max_consecutive = max_consecutive
+        self.failed = 0
+        self.first_error: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.consecutive = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether a check is enabled."""
+        return self.tolerance is not None or self.max_consecutive > 0
+
+    def add(self, error: Optional[str]) -> Optional[str]:
+        """
+        Add the outcome of a task.
+
+        Parameters
+        ----------
+        error : str or None
+            The error of the task, `None` if the task succeeded.
+
+        Returns
+        -------
+        str or None
+            Why the run is doomed, or `None` if it is not.
+        """
+        if error is None:
+            self.last_error = None
+            self.consecutive = 0
+            return None
+
+        self.failed += 1
+        if self.first_error is None:
+            self.first_error = error
+        if error == self.last_error:
+            self.consecutive += 1
+        else:
+            self.last_error = error
+            self.consecutive = 1
+
+        failed_percent = 100 * self.failed / self.num_tasks
+        if self.tolerance is not None and failed_percent > self.tolerance:
+            return (
+                f"{self.failed} of {self.num_tasks} tasks failed "
+                f"({failed_percent:.2f}%) and tolerance was set to "
+                f"{self.tolerance:.2f}%. First error: {self.first_error}"
+            )
+        if self.max_consecutive and self.consecutive >= self.max_consecutive:
+            return (
+                f"The last {self.consecutive} tasks failed with the same "
+                f"error: {error}"
+            )
+        return None
+
+
 class Worker(Process):
     """Work on tasks."""
 
@@ -84,17 +223,25 @@ class Worker(Process):
     def run(self) -> None:
         """Execute tasks."""
         results = []
+        times = WorkerTimes()
         for task in self.tasks:
             r = None
+            start = perf_counter()
             try:
                 r = task.run()
             except Exception as e:
                 log.warning(f"Exception in task execution: {e}")
+                error = f"{type(e).__name__}: {e}"
+            else:
+                error = get_task_error(task)
 
+            times.add(task, perf_counter() - start)
             results.append(r)
+            self.result_queue.put(TaskOutcome(error))
 
         # Put results into the queue
         self.result_queue.put(results)
+        self.result_queue.put(times)
 
         # Signal completion by putting a unique identifier into the queue
         self.result_queue.put(f"{self.name}_done")
@@ -110,6 +257,8 @@ class Scheduler:
         tasks: list[SupportsRunT],
         ncores: Optional[int] = None,
         max_cpus: bool = False,
+        tolerance: Optional[float] = None,
+        max_consecutive_errors: int = 0,
     ) -> None:
         """
         Schedule tasks to a defined number of processes.
@@ -123,9 +272,22 @@ class Scheduler:
             The number of cores to use. If `None` is given uses the
             maximum number of CPUs allowed by
             `libs.libututil.parse_ncores` function.
+
+        tolerance : None or float
+            The percentage of failed tasks tolerated. The run is aborted
+            as soon as more tasks failed, see :py:class:`FailureTracker`.
+
+        max_consecutive_errors : int
+            Abort the run when that many consecutive tasks failed with
+            the same error. If 0, the run is not aborted.
         """
         self.max_cpus = max_cpus
         self.num_tasks = len(tasks)
+        self.failures = FailureTracker(
+            self.num_tasks,
+            tolerance=tolerance,
+            max_consecutive=max_consecutive_errors,
+        )
         self.num_processes = ncores  # first parses num_cores
         self.queue: Queue = Queue()
         self.results: list = []
@@ -169,18 +331,26 @@ class Scheduler:
         """Run tasks in parallel."""
 
         try:
+            start = perf_counter()
             for w in self.worker_list:
                 w.start()
 
             # Collect results until all workers have signaled completion
             all_results = []
+            worker_times: list[WorkerTimes] = []
             num_workers = len(self.worker_list)
             completed_workers = 0
 
             while completed_workers < num_workers:
                 result = self.queue.get()
-                if isinstance(result, str) and result.endswith("_done"):
+                if isinstance(result, TaskOutcome):
+                    if reason := self.failures.add(result.error):
+                        self.terminate()
+                        raise EngineAbortError(f"Run aborted: {reason}")
+                elif isinstance(result, str) and result.endswith("_done"):
                     completed_workers += 1
+                elif isinstance(result, WorkerTimes):
+                    worker_times.append(result)
                 else:
                     all_results.append(result)
 
@@ -189,6 +359,20 @@ class Scheduler:
 
             self.results = [item for sublist in all_results for item in sublist]
 
+            task_times: list[float] = []
+            task_phases: dict[str, float] = defaultdict(float)
+            for times in worker_times:
+                task_times.extend(times.task_times)
+                for phase, seconds in times.task_phases.items():
+                    task_phases[phase] += seconds
+            record_engine_run(
+                start,
+                perf_counter(),
+                task_times=task_times,
+                worker_busy=[times.busy_time for times in worker_times],
+                task_phases=task_phases,
+                )
+
             log.info(f"{self.num_tasks} tasks finished")
 
         except KeyboardInterrupt as err:
@@ -0,0 +1,411 @@
+"""
+Performance profile of the workflow steps.
+
+Each module run is profiled by :py:func:`profile_step`, which writes a
+``perf.json`` file in the step folder. The profile contains:
+
+* the time spent in each phase of the module: ``setup`` (reading the
+  parameters), ``input_preparation`` (before the first engine run),
+  ``engine`` (the scheduler running the tasks), ``output_parsing``
+  (after the last engine run), ``io_export`` (writing ``io.json``) and
+  ``processing`` (between engine runs, or the whole module when it does
+  not use an engine);
+* the distribution of the task run times, and the time spent by the
+  tasks in their own phases (for example, CNS and compression);
+* the utilisation of the workers;
+* the peak resident memory of the main process and of its children;
+* the bytes read and written, and the files in the step folder.
+
+The timers are cheap: they only record times and counters. Code outside
+a profiled module (for example, the command-line clients) records
+nothing.
+
+Use ``haddock3-perf`` to summarise the profiles of a run.
+"""
+import json
+import os
+import resource
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from haddock import log
+from haddock.core.defaults import PERF_FILE
+from haddock.core.typing import (
+    Any,
+    FilePath,
+    Generator,
+    Iterable,
+    Mapping,
+    Optional,
+    )
+
+
+PHASES = (
+    "setup",
+    "input_preparation",
+    "engine",
+    "output_parsing",
+    "io_export",
+    "processing",
+    )
+"""Phases of a module run, in the order they happen."""
+
+_current_profile: Optional["StepProfile"] = None
+
+
+def read_io_counters() -> dict[str, int]:
+    """
+    Read the bytes read and written by this process.
+
+    On Linux, the counters include the children already waited for
+    (workers and subprocesses). Elsewhere, block counts from
+    :py:func:`resource.getrusage` are used.
+
+    Returns
+    -------
+    dict
+        With keys ``bytes_read`` and ``bytes_written``.
+    """
+    try:
+        with open("/proc/self/io") as fin:
+            counters = dict(
+                line.split(":") for line in fin.read().splitlines()
+                )
+        return {
+            "bytes_read": int(counters["rchar"]),
+            "bytes_written": int(counters["wchar"]),
+            }
+    except (OSError, KeyError, ValueError):
+        usage = [
+            resource.getrusage(who)
+            for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+            ]
+        return {
+            "bytes_read": sum(u.ru_inblock for u in usage) * 512,
+            "bytes_written": sum(u.ru_oublock for u in usage) * 512,
+            }
+
+
+def read_peak_rss() -> dict[str, float]:
+    """
+    Read the peak resident memory, in MB.
+
+    Returns
+    -------
+    dict
+        With keys ``main`` (this process) and ``children`` (the largest
+        child waited for).
+    """
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    unit = 1024 ** 2 if sys.platform == "darwin" else 1024
+    return {
+        "main": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 2
+            ),
+        "children": round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 2
+            ),
+        }
+
+
+def count_files(folder: FilePath) -> dict[str, int]:
+    """
+    Count the files in a folder, and their size, recursively.
+
+    Parameters
+    ----------
+    folder : str or pathlib.Path
+        The folder to inspect.
+
+    Returns
+    -------
+    dict
+        With keys ``count`` and ``bytes``.
+    """
+    count = 0
+    size = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            try:
+                size += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+            count += 1
+    return {"count": count, "bytes": size}
+
+
+def summarise_times(times: Iterable[float]) -> dict[str, float]:
+    """
+    Summarise a distribution of run times.
+
+    Parameters
+    ----------
+    times : iterable of float
+        The run times, in seconds.
+
+    Returns
+    -------
+    dict
+        The number of times, their total, minimum, mean, median, 90th
+        percentile and maximum. Empty if there are no times.
+    """
+    times = sorted(times)
+    if not times:
+        return {}
+    total = sum(times)
+    p90 = times[min(len(times) - 1, int(0.9 * len(times)))]
+    return {
+        "count": len(times),
+        "total": round(total, 4),
+        "min": round(times[0], 4),
+        "mean": round(total / len(times), 4),
+        "median": round(median(times), 4),
+        "p90": round(p90, 4),
+        "max": round(times[-1], 4),
+        }
+
+
+class StepProfile:
+    """
+    Timers and counters of a module run.
+
+    Parameters
+    ----------
+    name : str
+        The name of the module.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = perf_counter()
+        self.end: Optional[float] = None
+        self.phases: dict[str, float] = defaultdict(float)
+        self.module_span: Optional[tuple[float, float]] = None
+        self.engine_runs: list[tuple[float, float]] = []
+        self.task_times: list[float] = []
+        self.task_phases: dict[str, float] = defaultdict(float)
+        self.workers = 0
+        self.worker_busy = 0.0
+        self.worker_capacity = 0.0
+        self._io_start = read_io_counters()
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Add the time taken by the code under the context to a phase."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += perf_counter() - start
+
+    @contextmanager
+    def module(self) -> Generator[None, None, None]:
+        """
+        Time the module's own code.
+
+        That time is split between input preparation, engine, output
+        parsing and processing when the profile is summarised.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.module_span = (start, perf_counter())
+
+    def add_engine_run(
+        self,
+        start: float,
+        end: float,
+        task_times: Iterable[float] = (),
+        worker_busy: Iterable[float] = (),
+        task_phases: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Record an engine run.
+
+        Parameters
+        ----------
+        start, end : float
+            The :py:func:`time.perf_counter` values when the engine
+            started and finished.
+
+        task_times : iterable of float
+            The run time of each task.
+
+        worker_busy : iterable of float
+            The time each worker spent running tasks.
+
+        task_phases : dict
+            The time spent by the tasks in their own phases.
+        """
+        self.engine_runs.append((start, end))
+        self.task_times.extend(task_times)
+        worker_busy = list(worker_busy)
+        self.workers = max(self.workers, len(worker_busy))
+        self.worker_busy += sum(worker_busy)
+        self.worker_capacity += len(worker_busy) * (end - start)
+        for name, seconds in (task_phases or {}).items():
+            self.task_phases[name] += seconds
+
+    def get_phases(self) -> dict[str, float]:
+        """Split the run time in the module phases."""
+        phases = dict.fromkeys(PHASES, 0.0)
+        phases.update(self.phases)
+        if self.module_span is None:
+            return phases
+        module_start, module_end = self.module_span
+        module_time = module_end - module_start - phases["io_export"]
+        if not self.engine_runs:
+            phases["processing"] += module_time
+            return phases
+        engine = sum(end - start for start, end in self.engine_runs)
+        first_start = min(start for start, _ in self.engine_runs)
+        last_end = max(end for _, end in self.engine_runs)
+        phases["engine"] += engine
+        phases["input_preparation"] += first_start - module_start
+        # `io.json` is exported after the engine runs
+        phases["output_parsing"] += max(
+            0.0,
+            module_end - last_end - phases["io_export"],
+            )
+        phases["processing"] += max(
+            0.0,
+            module_time
+            - engine
+            - phases["input_preparation"]
+            - phases["output_parsing"],
+            )
+        return phases
+
+    def summary(self, path: Optional[FilePath] = None) -> dict[str, Any]:
+        """
+        Summarise the profile.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            The step folder, whose files are counted.
+
+        Returns
+        -------
+        dict
+            The profile, ready to be saved as JSON.
+        """
+        end = self.end if self.end is not None else perf_counter()
+        io_end = read_io_counters()
+        utilisation = (
+            self.worker_busy / self.worker_capacity
+            if self.worker_capacity
+            else None
+            )
+        return {
+            "module": self.name,
+            "wall_time": round(end - self.start, 4),
+            "phases": {
+                phase: round(seconds, 4)
+                for phase, seconds in self.get_phases().items()
+                },
+            "tasks": summarise_times(self.task_times),
+            "task_phases": {
+                phase: round(seconds, 4)
+                for phase, seconds in self.task_phases.items()
+                },
+            "workers": {
+                "count": self.workers,
+                "busy_time": round(self.worker_busy, 4),
+                "utilisation": (
+                    None if utilisation is None else round(utilisation, 4)
+                    ),
+                },
+            "peak_rss_mb": read_peak_rss(),
+            "io": {
+                key: io_end[key] - self._io_start[key]
+                for key in io_end
+                },
+            "files": count_files(path) if path is not None else {},
+            }
+
+    def save(self, path: FilePath) -> Path:
+        """
+        Save the profile to the step folder.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            The step folder.
+
+        Returns
+        -------
+        pathlib.Path
+            The path to the profile file.
+        """
+        fpath = Path(path, PERF_FILE)
+        summary = self.summary(path)
+        fpath.write_text(json.dumps(summary, indent=4))
+        return fpath
+
+
+@contextmanager
+def profile_step(
+        name: str,
+        path: FilePath,
+        ) -> Generator[StepProfile, None, None]:
+    """
+    Profile a module run and save the profile in the step folder.
+
+    The profile is saved even if the module fails. While the context is
+    active, :py:func:`record_engine_run` and :py:func:`phase` record in
+    this profile.
+
+    Parameters
+    ----------
+    name : str
+        The name of the module.
+
+    path : str or pathlib.Path
+        The step folder.
+    """
+    global _current_profile
+    profile = StepProfile(name)
+    previous = _current_profile
+    _current_profile = profile
+    try:
+        yield profile
+    finally:
+        _current_profile = previous
+        profile.end = perf_counter()
+        try:
+            profile.save(path)
+        except OSError as err:
+            log.warning(f"Could not save the performance profile: {err}")
+
+
+def get_current_profile() -> Optional[StepProfile]:
+    """Get the profile of the module being run, if any."""
+    return _current_profile
+
+
+@contextmanager
+def phase(name: str) -> Generator[None, None, None]:
+    """Time a phase of the module being run, if any."""
+    if _current_profile is None:
+        yield
+    else:
+        with _current_profile.phase(name):
+            yield
+
+
+def record_engine_run(start: float, end: float, **kwargs: Any) -> None:
+    """
+    Record an engine run in the profile of the module being run, if any.
+
+    See Also
+    --------
+    :py:meth:`StepProfile.add_engine_run`
+    """
+    if _current_profile is not None:
+        _current_profile.add_engine_run(start, end, **kwargs)
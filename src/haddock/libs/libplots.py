@@ -1,5 +1,6 @@
 """Plotting functionalities."""
 
+import base64
 import json
 import shutil
 
@@ -9,6 +10,7 @@ import plotly.colors as px_colors
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.io._utils import plotly_cdn_url
+from plotly.io.json import to_json_plotly
 from plotly.offline.offline import get_plotlyjs
 from plotly.subplots import make_subplots
 
@@ -100,12 +102,128 @@ value(int): cluster's rank
 HEATMAP_DEFAULT_PATH = Path('contacts.html')
 SUPPORTED_OUTPUT_FORMATS = ('png', 'jpeg', 'webp', 'svg', 'pdf', 'eps', )
 
+# trace attributes stored as binary typed arrays in the html files
+TYPED_ARRAY_KEYS = ("x", "y", "z", "customdata")
+# per-step table of models, shared by the plots of a step
+MODELS_DATA_JS = "models.js"
+MODELS_HOVER_META = "models"
+
+# builds the hover text of the traces pointing to the rows of the table
+MODELS_HOVER_JS = """
+window.setModelsHover = function (traces) {
+    const models = window.HADDOCK_MODELS;
+    for (const trace of traces) {
+        if (trace.meta !== "%s" || !trace.customdata) {
+            continue;
+        }
+        let rows = trace.customdata;
+        if (rows.bdata !== undefined) {
+            const bytes = Uint8Array.from(
+                atob(rows.bdata), (c) => c.charCodeAt(0)
+            );
+            rows = new Int32Array(bytes.buffer);
+        }
+        trace.text = Array.from(rows, (i) => (
+            "Model: " + models.model[i]
+            + "<br>Score: " + models.score[i]
+            + "<br>Caprieval rank: " + models.caprieval_rank[i]
+        ));
+    }
+};
+""" % MODELS_HOVER_META
+
+
+def encode_typed_array(values: Any) -> Optional[dict[str, str]]:
+    """Encode numerical values as a plotly base64 typed array.
+
+    Floats are stored in double precision, so that unformatted hover values
+    such as ``%{z}`` show the original numbers (single precision would show
+    0.3 as 0.30000001), and integers as 32 bits integers.
+
+    Parameters
+    ----------
+    values : array-like
+        1D or 2D array of values.
+
+    Returns
+    -------
+    typed_array : dict or None
+        The plotly typed array specification, None if the values are not
+        a 1D or 2D numerical array.
+    """
+    try:
+        array = np.asarray(values)
+    except ValueError:  # ragged nested sequences
+        return None
+    if array.size == 0 or array.ndim > 2 or array.dtype.kind not in "iuf":
+        return None
+    if array.dtype.kind == "f" or np.abs(array).max() >= 2 ** 31:
+        dtype = "f8"
+    else:
+        dtype = "i4"
+    array = np.ascontiguousarray(array, dtype=f"<{dtype}")
+    typed_array = {
+        "dtype": dtype,
+        "bdata": base64.b64encode(array.tobytes()).decode("ascii"),
+        }
+    if array.ndim == 2:
+        typed_array["shape"] = f"{array.shape[0]},{array.shape[1]}"
+    return typed_array
+
+
+def figure_to_json(fig: Figure) -> str:
+    """Serialize a figure, storing its data arrays as binary typed arrays.
+
+    Parameters
+    ----------
+    fig : Figure
+        The plotly Figure object
+
+    Returns
+    -------
+    json_content : str
+        plotly json content
+    """
+    fig_dict = fig.to_dict()
+    for trace in fig_dict["data"]:
+        for key in TYPED_ARRAY_KEYS:
+            typed_array = encode_typed_array(trace.get(key))
+            if typed_array:
+                trace[key] = typed_array
+    return to_json_plotly(fig_dict)
+
+
+def write_models_data(capri_df: pd.DataFrame, fpath: FilePath) -> None:
+    """Write the table of models used to build the hover text of the plots.
+
+    Traces referring to the table have `meta` set to `MODELS_HOVER_META`
+    and hold the table row of each point in `customdata`.
+
+    Parameters
+    ----------
+    capri_df : pandas DataFrame
+        dataframe of capri values, its index gives the table rows
+    fpath : FilePath
+        Path to the javascript file to write.
+    """
+    models = {
+        "model": [model.split("/")[-1] for model in capri_df["model"]],
+        "score": capri_df["score"].tolist(),
+        "caprieval_rank": capri_df["caprieval_rank"].tolist(),
+        }
+    Path(fpath).write_text(
+        f"window.HADDOCK_MODELS = {json.dumps(models)};{MODELS_HOVER_JS}"
+        )
+
+
 def create_html(
         json_content: str,
         plot_id: int = 1,
         plotly_js_import: Optional[str] = None,
         figure_height: int = 800,
         figure_width: int = 1000,
+        data_js: Optional[FilePath] = None,
+        include_plotlyjs: bool = True,
         ) -> str:
     """Create html content given a plotly json.
 
@@ -122,20 +240,36 @@ def create_html(
     
     figure_width : int
         figure width (in pixels)
-    
+
+    data_js : str or Path
+        shared data script (see :py:func:`write_models_data`) to load
+        before the plot
+
+    include_plotlyjs : bool
+        load the plotly javascript, set to False if already loaded in the page
+
     Returns
     -------
     html_content : str
         html content
     """
     # Check if plotly javascript must be flushed in this file
-    if not plotly_js_import:
+    if not include_plotlyjs:
+        plotly_js_import = ""
+    elif not plotly_js_import:
         plotly_js_import = f'<script src="{plotly_cdn_url()}"></script>'
+    if include_plotlyjs:
+        plotly_js_import = (
+            "<script type=\"text/javascript\">"
+            "window.PlotlyConfig = { MathJaxConfig: 'local' };</script>"
+            f"{plotly_js_import}"
+            )
+    if data_js:
+        plotly_js_import += f'<script src="{data_js}"></script>'
 
     # Write HTML content
     html_content = f"""
     <div>
-    <script type="text/javascript">window.PlotlyConfig = {{ MathJaxConfig: 'local' }};</script>
     {plotly_js_import}
     <div id="plot{plot_id}" class="plotly-graph-div" style="height:{figure_height}px; width:{figure_width}px;">
     </div>
@@ -145,6 +279,9 @@ def create_html(
     <script type="text/javascript">
         const dat{plot_id} = JSON.parse(document.getElementById("data{plot_id}").text)
         window.PLOTLYENV = window.PLOTLYENV || {{}};
+        if (window.setModelsHover) {{
+            window.setModelsHover(dat{plot_id}.data);
+        }}
         if (document.getElementById("plot{plot_id}")) {{
             Plotly.newPlot(
                 "plot{plot_id}",
@@ -312,7 +449,7 @@ def box_plot_plotly(
     update_layout_plotly(fig, "Cluster Rank", AXIS_NAMES[y_ax])
     # save figure
     px_fpath = Path(f"{y_ax}_clt.html")
-    json_content = fig.to_json()
+    json_content = figure_to_json(fig)
     html_content = create_html(
         json_content,
         plotly_js_import=offline_js_manager(px_fpath, offline),
@@ -438,19 +575,6 @@ def scatter_plot_plotly(
         an instance of plotly.graph_objects.Figure
     """
 
-    def _build_hover_text(df):
-        """Build a nice text for hover text."""
-        text_list = []
-        for _, row in df.iterrows():
-            model_text = f"Model: {row['model'].split('/')[-1]}"
-            score_text = f"Score: {row['score']}"
-            caprieval_rank_text = f"Caprieval rank: {row['caprieval_rank']}"
-            text_list.append(
-                f"{model_text}<br>{score_text}"
-                f"<br>{caprieval_rank_text}"
-                )
-        return text_list
-
     fig = go.Figure(layout={"width": 1000, "height": 800})
     traces: list[go.Scatter] = []
     n_colors = len(colors)
@@ -472,7 +596,9 @@ def scatter_plot_plotly(
                     y=cl_df[y_ax],
                     name=cl_name,
                     mode="markers",
-                    text=_build_hover_text(cl_df),
+                    # hover text built from the table of models
+                    customdata=cl_df.index.to_numpy(),
+                    meta=MODELS_HOVER_META,
                     legendgroup=cl_name,
                     marker_color=colors[color_idx],
                     hoverlabel=dict(
@@ -529,7 +655,8 @@ def scatter_plot_plotly(
                 y=gb_other[y_ax],
                 name="Other",
                 mode="markers",
-                text=_build_hover_text(gb_other),
+                customdata=gb_other.index.to_numpy(),
+                meta=MODELS_HOVER_META,
                 legendgroup="Other",
                 marker=dict(
                     color="white",
@@ -551,10 +678,11 @@ def scatter_plot_plotly(
         TITLE_NAMES[y_ax],
         title=f"{TITLE_NAMES[x_ax]} vs {TITLE_NAMES[y_ax]}",
         )
-    json_content = fig.to_json()
+    json_content = figure_to_json(fig)
     html_content = create_html(
         json_content,
         plotly_js_import=offline_js_manager(px_fpath, offline),
+        data_js=MODELS_DATA_JS,
         )
     # write html_content to px_fname
     Path(px_fpath).write_text(html_content)
@@ -623,6 +751,8 @@ def scatter_plot_handler(
         a list of figures
     """
     capri_df = read_capri_table(capri_filename, comment="#")
+    # the hover text of all the scatter plots is built from this table
+    write_models_data(capri_df, MODELS_DATA_JS)
     gb_cluster, gb_other = scatter_plot_data(capri_df, cl_rank)
 
     # defining colors
@@ -1163,6 +1293,8 @@ def _generate_html_body(
     body = "<body>"
     table_index: int = 1
     fig_index: int = 1
+    # the table of models is shared by all the plots
+    models_data = Path(Path(report_path).parent, MODELS_DATA_JS)
     for figure in figures:
         if isinstance(figure, pd.DataFrame):  # tables
             table_index += 1
@@ -1180,13 +1312,20 @@ def _generate_html_body(
             else:
                 inner_html = _generate_clustered_table_html(table_id, figure, bundle_url)
         else:  # plots
-            inner_json = figure.to_json()
+            inner_json = figure_to_json(figure)
+            # plotly and the table of models are loaded with the first plot
+            is_first = fig_index == 1
             inner_html = create_html(
                 inner_json,
                 fig_index,
                 plotly_js_import=offline_js_manager(report_path, offline),
                 figure_height=figure.layout.height,
                 figure_width=figure.layout.width,
+                data_js=(
+                    MODELS_DATA_JS
+                    if is_first and models_data.exists() else None
+                    ),
+                include_plotlyjs=is_first,
                 )
             fig_index += 1  # type: ignore
         body += "<br>"  # add a break between tables and plots
@@ -1255,6 +1394,7 @@ def heatmap_plotly(
         hovertemplate: Optional[str] = None,
         customdata: Optional[list[list[Any]]] = None,
         delineation_traces: Optional[list[dict[str, float]]] = None,
+        annotations: Optional[list[dict[str, Any]]] = None,
         ) -> Path:
     """Generate a `plotly heatmap` based on matrix content.
 
@@ -1280,6 +1420,8 @@ def heatmap_plotly(
         A matrix of cluster ids, used for extra hover annotation in plotly.
     delineation_traces: Optional[list[dict[str, float]]]
         A list of dict enabling to draw lines separating cluster ids.
+    annotations: Optional[list[dict[str, Any]]]
+        A list of plotly annotations (e.g. cluster labels) to add.
 
     Return
     ------
@@ -1314,6 +1456,10 @@ def heatmap_plotly(
                 y0=trace["y0"],
                 y1=trace["y1"],
             )
+    # Add annotations
+    if annotations:
+        for annotation in annotations:
+            fig.add_annotation(**annotation)
 
     # Compute pixels
     nb_entries = matrix.shape[0]
@@ -1500,7 +1646,7 @@ def fig_to_html(
         for the rendering.
     """
     # Convert to json
-    json_content = fig.to_json()
+    json_content = figure_to_json(fig)
     # Create custom html file
     html_content = create_html(
         json_content,
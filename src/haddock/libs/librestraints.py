@@ -5,8 +5,10 @@ import re
 import random
 import sys
 
-from Bio.PDB import PDBParser, NeighborSearch
+import numpy as np
+from Bio.PDB import PDBParser
 from freesasa import Classifier, structureFromBioPDB, calc
+from scipy.spatial import cKDTree
 
 # Scaling factors for relative ASA
 # Calculated using extended ALA-X-ALA peptides
@@ -145,10 +147,13 @@ REL_ASA = {
     }
 DEFAULT_PROBE_RADIUS = 1.4
 
-def get_surface_resids(structure, cutoff=15):
+
+def get_residue_accessibility(structure):
     """
-    Calls freesasa using its Python API and returns
-    per-residue accessibilities.
+    Get the per-residue relative accessibilities.
+
+    Calls freesasa using its Python API and returns the relative
+    accessibilities of the main and side chains of each residue.
     """
     asa_data, rsa_data, rel_main_chain, rel_side_chain = {}, {}, {}, {}
     _rsa = REL_ASA['total']
@@ -189,11 +194,33 @@ def get_surface_resids(structure, cutoff=15):
     resid_access = {}
     for res_uid, access in rel_main_chain.items():
         resid_access[res_uid[2]] = {'side_chain_rel': rel_side_chain.get(res_uid), 'main_chain_rel': access}
-    surface_resids = [r for r, v in resid_access.items() if v['side_chain_rel'] >= cutoff or
-                      v['main_chain_rel'] >= cutoff]
+    return resid_access
+
+
+def select_surface_resids(resid_access, cutoff=15):
+    """
+    Select the residues exposed to the solvent.
+
+    The main or side chain relative accessibility of the selected
+    residues is above the cutoff.
+    """
+    surface_resids = [
+        r for r, v in resid_access.items()
+        if v['side_chain_rel'] >= cutoff or v['main_chain_rel'] >= cutoff
+        ]
     return surface_resids
 
 
+def get_surface_resids(structure, cutoff=15):
+    """
+    Get the residues exposed to the solvent.
+
+    Calls freesasa using its Python API to get the per-residue
+    accessibilities.
+    """
+    return select_surface_resids(get_residue_accessibility(structure), cutoff)
+
+
 def parse_actpass_file(actpass_file):
     """Parse actpass file
     
@@ -285,7 +312,7 @@ def calc_euclidean(i, j):
 
 def read_structure(pdbf, exclude=None):
 	"""
-	Reads a PDB file and returns a list of parsed atoms
+	Reads a PDB file, or its lines, and returns a list of parsed atoms
 	"""
 	_atoms = {'CA', 'P'}  # Alpha-Carbon (Prot), Backbone Phosphorous (DNA)
 	_altloc = {' ', 'A'}
@@ -295,19 +322,27 @@ def read_structure(pdbf, exclude=None):
 	else:
 		exclude = set(exclude)
 
+	if isinstance(pdbf, (str, Path)):
+		with open(pdbf, 'r') as pdb_handle:
+			lines = pdb_handle.readlines()
+	else:
+		lines = pdbf
+		pdbf = '<PDB lines>'
+
 	res_list = []
-	with open(pdbf, 'r') as pdb_handle:
-		for line in pdb_handle:
-			field = line[0:4]
-			if field != 'ATOM':
-				continue
-
-			aname = line[12:16].strip()
-			chain = line[21] if line[21].strip() else line[72:76].strip()  # chain ID or segID
-			if chain not in exclude and aname in _atoms and line[16] in _altloc:
-				resi = int(line[22:26])
-				coords = (float(line[30:38]), float(line[38:46]), float(line[46:54]))
-				res_list.append((chain, resi, aname, coords))
+	for line in lines:
+		field = line[0:4]
+		if field != 'ATOM':
+			continue
+
+		aname = line[12:16].strip()
+		if aname not in _atoms or line[16] not in _altloc:
+			continue
+		chain = line[21] if line[21].strip() else line[72:76].strip()  # chain ID or segID
+		if chain not in exclude:
+			resi = int(line[22:26])
+			coords = (float(line[30:38]), float(line[38:46]), float(line[46:54]))
+			res_list.append((chain, resi, aname, coords))
 
 	if not res_list:
 		logging.critical('[!] PDB File seems empty or no CA/P atoms found: {0}'.format(pdbf))
@@ -321,43 +356,35 @@ def get_bodies(atom_lst, prot_threshold=4.0, dna_threshold=7.5):
 	Determines gaps in an atom list following simple distance based criteria.
 	Returns continuous fragments.
 	"""
-
-	bodies = []
-
-	threshold = {'CA': prot_threshold, 'P': dna_threshold}
-
-	body_start = 0
-	i = None
-	for i, atom in enumerate(atom_lst[1:], start=1):
-		p_atom = atom_lst[i-1]
-
-		chain, resi, aname, xyz = atom
-		p_chain, p_resi, p_aname, p_xyz = p_atom
-
-		if (chain == p_chain) and (aname == p_aname):  # Internal Gap
-			d_xyz = calc_euclidean(xyz, p_xyz)
-			if d_xyz >= threshold[aname]:
-				logging.debug('[+++] (Internal) Body: {0}:{1}'.format(body_start, i-1))
-				bodies.append((body_start, i-1))
-				body_start = i  # Set new beginning
-
-		elif (chain != p_chain) or (aname != p_aname):  # Different molecules/types
-			logging.debug('[+++] Body: {0}:{1}'.format(body_start, i-1))
-			bodies.append((body_start, i-1))
-			body_start = i  # Set new beginning
-
-	if not bodies:  # Single continuous molecule
-		bodies.append((0, len(atom_lst)))
+	if len(atom_lst) < 2:
+		return [(0, len(atom_lst))]
+
+	chains = np.array([atom[0] for atom in atom_lst])
+	anames = np.array([atom[2] for atom in atom_lst])
+	xyz = np.array([atom[3] for atom in atom_lst], dtype=float)
+
+	# compare each atom with the previous one
+	same_molecule = (chains[1:] == chains[:-1]) & (anames[1:] == anames[:-1])
+	threshold = np.where(anames[1:] == 'CA', prot_threshold, dna_threshold)
+	d_xyz = np.sqrt(((xyz[1:] - xyz[:-1]) ** 2).sum(axis=1))
+	# Internal gaps, and different molecules/types
+	body_starts = np.flatnonzero(~same_molecule | (d_xyz >= threshold)) + 1
+
+	if not body_starts.size:  # Single continuous molecule
+		bodies = [(0, len(atom_lst))]
 	else:
-		logging.debug('[+++] Body: {0}:{1}'.format(body_start, i))
-		bodies.append((body_start, i))  # Last body
+		starts = [0] + body_starts.tolist()
+		ends = (body_starts - 1).tolist() + [len(atom_lst) - 1]
+		bodies = list(zip(starts, ends))
 
+	for body_start, body_end in bodies:
+		logging.debug('[+++] Body: %s:%s', body_start, body_end)
 	logging.info('[++] Found {0} bodies'.format(len(bodies)))
 
 	return bodies
 
 
-def build_restraints(bodies):
+def build_restraints(bodies, seed=None):
 	"""
 	Generates distance restraints to maintain the relative
 	orientation of the different bodies during the simulations.
@@ -366,7 +393,10 @@ def build_restraints(bodies):
 
 	Each restraint is created using two random atoms on each body
 	and using their exact euclidean distance as target distance.
+	The same bodies and `seed` give the same restraints. If `seed` is
+	`None`, the residues are picked with the global random generator.
 	"""
+	rng = random if seed is None else random.Random(seed)
 
 	def pick_residues(body, max_trials=10):
 		# Pick two random residues in each body
@@ -374,7 +404,7 @@ def build_restraints(bodies):
 		n_trials = 0
 		while 1:
 			try:
-				res_i, res_ii = random.sample(body, 2)
+				res_i, res_ii = rng.sample(body, 2)
 			except ValueError:
 				# Likely, sample size is 1
 				logging.warning('[!] One-sized body found. This may lead to problems..')
@@ -424,16 +454,20 @@ def generate_tbl(atom_lst, restraints):
     restraints : list
         List of restraints in the form (res_i, res_j)
 	"""
+	if not restraints:
+		return
 
-	for r in restraints:
-		i, j = r
-		atom_i, atom_j = atom_lst[i], atom_lst[j]
-		dist_ij = calc_euclidean(atom_i[3], atom_j[3])
+	xyz = np.array([atom[3] for atom in atom_lst], dtype=float)
+	pairs = np.array(restraints, dtype=int)
+	dist_ij = np.sqrt(((xyz[pairs[:, 1]] - xyz[pairs[:, 0]]) ** 2).sum(axis=1))
 
-		tbl = "assign (segid {0[0]} and resi {0[1]} and name {0[2]}) ".format(atom_i)
-		tbl += "(segid {0[0]} and resi {0[1]} and name {0[2]}) ".format(atom_j)
-		tbl += "{0:3.3f} 0.0 0.0".format(dist_ij)
-		print(tbl)
+	tbl = [
+		"assign (segid {0[0]} and resi {0[1]} and name {0[2]}) "
+		"(segid {1[0]} and resi {1[1]} and name {1[2]}) "
+		"{2:3.3f} 0.0 0.0".format(atom_lst[i], atom_lst[j], dist)
+		for (i, j), dist in zip(restraints, dist_ij.tolist())
+		]
+	print("\n".join(tbl))
 
 
 def check_parenthesis(file):
@@ -690,14 +724,165 @@ def validate_tbldata(restraints, pcs=False):
         output = output.replace("\n", "", 1)
     return output
 
+
+class StructureSession:
+    """
+    A structure parsed once, to get the passive residues of many active sets.
+
+    The atoms of the selected chains are indexed in a KD-tree, and the
+    surface residues are computed once per cutoff.
+
+    Parameters
+    ----------
+    structure : str, pathlib.Path or file-like
+        Path to the PDB file, or a text stream of its content.
+    """
+
+    def __init__(self, structure):
+        # Parse the PDB file
+        if isinstance(structure, (str, Path)) and not Path(structure).exists():
+            raise FileNotFoundError('File not found: {0}'.format(structure))
+        self.name = structure
+        self.structure = PDBParser(QUIET=True).get_structure('pdb', structure)
+        self._atoms = {}
+        self._accessibility = None
+        self._surfaces = {}
+
+    def get_atoms(self, chain_id=None):
+        """
+        Get the atoms of a chain, or of all chains if `chain_id` is None.
+
+        Returns
+        -------
+        tuple
+            The coordinates and residue numbers of the atoms, and the
+            KD-tree of the coordinates.
+        """
+        chain_id = chain_id or None
+        if chain_id not in self._atoms:
+            try:
+                if chain_id:
+                    atom_list = list(self.structure[0][chain_id].get_atoms())
+                else:
+                    atom_list = list(self.structure[0].get_atoms())
+            except KeyError as e:
+                raise KeyError(
+                    'Chain {0} does not exist in the PDB file {1}, '
+                    'please enter a proper chain id'.format(
+                        chain_id, self.name)
+                    ) from e
+            coords = np.array(
+                [a.get_coord() for a in atom_list],
+                dtype=float,
+                ).reshape(-1, 3)
+            resids = np.array([a.parent.id[1] for a in atom_list], dtype=int)
+            self._atoms[chain_id] = (coords, resids, cKDTree(coords))
+        return self._atoms[chain_id]
+
+    def get_surface_resids(self, cutoff=15):
+        """Get the surface residues, computed once per cutoff."""
+        if cutoff not in self._surfaces:
+            if self._accessibility is None:
+                self._accessibility = get_residue_accessibility(
+                    self.structure)
+            self._surfaces[cutoff] = select_surface_resids(
+                self._accessibility, cutoff)
+        return self._surfaces[cutoff]
+
+    def passive_batch(
+            self,
+            active_sets,
+            chain_id=None,
+            surface=None,
+            radius=6.5,
+            ):
+        """Get the passive residues of several sets of active residues.
+
+        The neighbours of the active atoms of all sets are searched in a
+        single query of the KD-tree.
+
+        Parameters
+        ----------
+        active_sets : list of list
+            Lists of active residues
+
+        chain_id : str
+            Chain ID
+
+        surface : list
+           List of surface residues. If empty, the surface residues of
+           the structure are used.
+
+        radius : float
+            Radius from active residues
+
+        Returns
+        -------
+        list of list
+            The sorted passive residues of each active set.
+        """
+        coords, resids, tree = self.get_atoms(chain_id)
+
+        try:
+            if not surface:
+                surface = self.get_surface_resids()
+        except Exception as e:
+            raise Exception(
+                "There was an error while calculating surface "
+                "residues: {}".format(e)
+                ) from e
+
+        active_sets = [
+            np.unique(np.asarray(active, dtype=int))
+            for active in active_sets
+            ]
+        act_atoms = [
+            np.flatnonzero(np.isin(resids, active))
+            for active in active_sets
+            ]
+        # each active atom is searched once, whatever the number of sets
+        query_atoms, query_index = np.unique(
+            np.concatenate(act_atoms + [np.empty(0, dtype=int)]),
+            return_inverse=True,
+            )
+        # HADDOCK used 6.5A as default
+        neighbors = tree.query_ball_point(coords[query_atoms], radius)
+
+        surface = np.unique(np.asarray(surface, dtype=int))
+        passive_sets = []
+        start = 0
+        for active, atoms in zip(active_sets, act_atoms):
+            queries = query_index[start:start + len(atoms)]
+            start += len(atoms)
+            near_atoms = np.concatenate(
+                [np.empty(0, dtype=int)] + [neighbors[q] for q in queries]
+                ).astype(int)
+            near_resids = np.unique(resids[near_atoms])
+            passive = np.setdiff1d(
+                np.intersect1d(near_resids, surface),
+                active,
+                )
+            passive_sets.append(passive.tolist())
+        return passive_sets
+
+    def passive(self, active, chain_id=None, surface=None, radius=6.5):
+        """Get the passive residues of a set of active residues.
+
+        See Also
+        --------
+        :py:meth:`passive_batch`
+        """
+        return self.passive_batch([active], chain_id, surface, radius)[0]
+
+
 def passive_from_active_raw(structure, active, chain_id=None, surface=None, radius=6.5):
     """Get the passive residues.
     
     Parameters
     ----------
 
-    structure : str
-        path to the PDB file
+    structure : str or file-like
+        path to the PDB file, or a text stream of its content
 
     active : list
         List of active residues
@@ -710,41 +895,11 @@ def passive_from_active_raw(structure, active, chain_id=None, surface=None, radi
 
     radius : float
         Radius from active residues
-    """
-
-    # Parse the PDB file
-    if Path(structure).exists():
-        p = PDBParser(QUIET=True)
-        s = p.get_structure('pdb', structure)
-    else:
-        raise FileNotFoundError('File not found: {0}'.format(structure))
 
-    try:
-        if chain_id:
-            atom_list = [a for a in s[0][chain_id].get_atoms()]
-        else:
-            atom_list = [a for a in s[0].get_atoms()]
-    except KeyError as e:
-        raise KeyError('Chain {0} does not exist in the PDB file {1}, please enter a proper chain id'.
-              format(chain_id, structure)) from e
-
-    act_atoms = [a.get_coord() for a in atom_list if a.parent.id[1] in active]
-
-    try:
-        if not surface:
-            surface = get_surface_resids(s)
-    except Exception as e:
-        raise Exception("There was an error while calculating surface residues: {}".format(e)) from e
-
-    ns = NeighborSearch(atom_list)
-    neighbors = []
-    for a in act_atoms:
-        neighbors.append(ns.search(a, radius, "R"))  # HADDOCK used 6.5A as default
-
-    passive_list = set()
-    for n in neighbors:
-        for r in n:
-            passive_list.add(r.id[1])
-    tmp = passive_list & set(surface)
-    passive_list = tmp - set(active)
-    return sorted(passive_list)
+    See Also
+    --------
+    :py:class:`StructureSession` to get the passive residues of many active
+    sets.
+    """
+    session = StructureSession(structure)
+    return session.passive(active, chain_id, surface, radius)
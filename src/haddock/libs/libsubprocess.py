@@ -5,8 +5,9 @@ import shlex
 import subprocess
 from contextlib import suppress
 from pathlib import Path
+from time import perf_counter
 
-from haddock.core.defaults import cns_exec as global_cns_exec
+from haddock.core.defaults import get_cns_exec
 from haddock.core.exceptions import (
     CNSRunningError,
     JobRunningError,
@@ -130,6 +131,8 @@ class CNSJob:
         self.error_file = error_file
         self.envvars = envvars
         self.cns_exec = cns_exec
+        self.timings: dict[str, float] = {}
+        self.error: Optional[str] = None
 
     def __repr__(self) -> str:
         _input_file = self.input_file
@@ -167,7 +170,7 @@ class CNSJob:
     @cns_exec.setter
     def cns_exec(self, cns_exec_path: Optional[FilePath]) -> None:
         if not cns_exec_path:
-            cns_exec_path = global_cns_exec  # global cns_exec
+            cns_exec_path = get_cns_exec()  # global cns_exec
 
         if not os.access(cns_exec_path, mode=os.X_OK):
             raise ValueError(
@@ -200,8 +203,16 @@ class CNSJob:
         compress_seed : bool
             Compress the *.seed file to '.gz' after the run. Defaults to
             ``False``.
-        """
 
+        Notes
+        -----
+        The time spent running CNS and compressing its files is stored
+        in :py:attr:`timings`, for the performance profile of the step.
+        The CNS error found in the standard output, if any, is stored in
+        :py:attr:`error`, for the engines to track the failed jobs.
+        """
+        self.error = None
+        start = perf_counter()
         if isinstance(self.input_file, str):
             p = subprocess.Popen(
                 self.cns_exec,
@@ -213,6 +224,7 @@ class CNSJob:
             )
             out, error = p.communicate(input=self.input_file.encode())
             p.kill()
+            self.timings["cns"] = perf_counter() - start
 
         elif isinstance(self.input_file, Path) and self.output_file is not None:
             with open(self.input_file) as inp:
@@ -230,6 +242,9 @@ class CNSJob:
                 with open(self.output_file, "wb+") as outf:
                     outf.write(out)
 
+            cns_end = perf_counter()
+            self.timings["cns"] = cns_end - start
+
             if compress_inp:
                 gzip_files(self.input_file, remove_original=True)
 
@@ -243,8 +258,11 @@ class CNSJob:
                         remove_original=True,
                     )
 
+            self.timings["compress"] = perf_counter() - cns_end
+
         # If undetected error or detect an error in the STDOUT
-        if error or self.contains_cns_stdout_error(out):
+        self.error = self.find_cns_stdout_error(out)
+        if error or self.error:
             # Write .err file
             with open(self.error_file, "wb+") as errf:
                 errf.write(out)
@@ -259,6 +277,20 @@ class CNSJob:
 
     @staticmethod
     def contains_cns_stdout_error(out: bytes) -> bool:
+        """Check if the CNS standard output contains an error."""
+        return CNSJob.find_cns_stdout_error(out) is not None
+
+    @staticmethod
+    def find_cns_stdout_error(out: bytes) -> Optional[str]:
+        """
+        Find the last error in the CNS standard output.
+
+        Returns
+        -------
+        str or None
+            The known CNS error, or ``"unknown CNS error"``. ``None`` if
+            no error is found.
+        """
         # Decode end of STDOUT
         # Search in last 24000 characters (300 lines * 80 characters)
         sout = out[-24000:].split(bytes(os.linesep, "utf-8"))
@@ -268,8 +300,9 @@ class CNSJob:
             # This checks for an unknown CNS error
             # triggered when CNS is about to crash due to internal error
             if "^^^^^" in line:
-                return True
+                return "unknown CNS error"
             # Check if a known error is found
-            elif any([error in line for error in KNOWN_CNS_ERRORS.keys()]):
-                return True
-        return False
+            for error in KNOWN_CNS_ERRORS:
+                if error in line:
+                    return error
+        return None
@@ -1,15 +1,35 @@
-"""HADDOCK3 workflow logic."""
+"""
+HADDOCK3 workflow logic.
+
+Each step reads the ``io.json`` of the step before it, and only that
+file: the ``io.json`` is the input a step depends on. Modules that pass
+their input models on, unchanged (for example ``caprieval`` or
+``contactmap``), can run in a background process. They then save their
+``io.json`` before their own analysis, and the next step starts at once
+with the cores left. A step runs in the background if its ``ncores`` is
+lower than the ``ncores`` of the workflow, or if the next step is an
+analysis step too (for example ``rmsdmatrix`` after ``caprieval``): both
+steps then share the cores. The other steps run one after the other, in
+the main process. Step folders and ``io.json`` files are the same as in
+a sequential run.
+"""
 import importlib
+import pickle
 import sys
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
 from pathlib import Path
 from time import time
 
 from haddock import log
-from haddock.clis.cli_analyse import main as cli_analyse
-from haddock.clis.cli_traceback import main as cli_traceback
+from haddock.core.defaults import MODULE_IO_FILE
 from haddock.core.exceptions import HaddockError, HaddockTermination, StepError
-from haddock.core.typing import Any, ModuleParams, Optional
-from haddock.gear.clean_steps import clean_output
+from haddock.core.typing import Any, ModuleParams, Optional, ParamDict
+from haddock.gear.clean_steps import (
+    BackgroundCleaner,
+    clean_output,
+    get_referenced_folders,
+    )
 from haddock.gear.config import get_module_name
 from haddock.gear.zerofill import zero_fill
 from haddock.libs.libtimer import convert_seconds_to_min_sec, log_time
@@ -35,15 +55,154 @@ class WorkflowManager:
         # `exit` module. If the `exit` module is removed in the future,
         # you can also remove and clean the `terminate` part here.
         self._terminated = None
+        self.cleaner = BackgroundCleaner()
 
     def run(self) -> None:
         """High level workflow composer."""
-        for i, step in enumerate(self.recipe.steps[self.start :], start=self.start):
-            try:
-                step.execute()
-            except HaddockTermination:
-                self._terminated = i  # type: ignore
+        self.run_steps(self.recipe.steps[self.start :], start=self.start)
+
+    def run_steps(
+        self,
+        steps: list["Step"],
+        start: int = 0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Execute steps, starting each one as soon as it can.
+
+        A step starts once the step before it has saved its ``io.json``
+        and a core is left by the steps running in the background. Its
+        ``ncores`` is reduced to the cores left, if needed. The step
+        runs in the background if its module passes its models on and
+        cores are left for the next step, see
+        :py:func:`get_background_cores`, otherwise in the main process.
+
+        If a step fails, no other step is started, the steps running in
+        the background are waited for, and the error is raised.
+
+        Parameters
+        ----------
+        steps : list of :py:class:`Step`
+            The steps to execute, in order.
+
+        start : int
+            The index of the first step, used to record where the
+            `exit` module terminated the workflow.
+
+        poll_interval : float
+            Seconds between the checks of the background steps.
+        """
+        budget = max((step.ncores for step in steps), default=1)
+        background: list[BackgroundStep] = []
+        last_step: Optional[Step] = None
+        error: Optional[BaseException] = None
+
+        def wait_background(clean: bool = True) -> None:
+            nonlocal error
+            wait([bg_step.sentinel for bg_step in background], poll_interval)
+            for bg_step in list(background):
+                if bg_step.is_alive():
+                    continue
+                background.remove(bg_step)
+                bg_error = bg_step.finish()
+                if bg_error is not None and error is None:
+                    error = bg_error
+            # clean only when no step reads the folders anymore
+            if clean and not background and error is None:
+                self.clean_consumed_steps(last_step)  # type: ignore
+
+        def free_cores() -> int:
+            return budget - sum(bg_step.step.ncores for bg_step in background)
+
+        def can_start() -> bool:
+            released = all(
+                bg_step.released()
+                for bg_step in background
+                if bg_step.step is last_step
+            )
+            return released and free_cores() > 0
+
+        try:
+            for i, step in enumerate(steps, start=start):
+                while background and error is None and not can_start():
+                    wait_background()
+                if error is not None:
+                    break
+
+                if background and step.ncores > free_cores():
+                    log.info(
+                        f"Step {step.working_path.name} uses {free_cores()} "
+                        "cores, the others are used by the steps running "
+                        "in the background."
+                    )
+                    step.config["ncores"] = free_cores()
+
+                following = steps[i - start + 1:]
+                next_step = following[0] if following else None
+                bg_cores = get_background_cores(step, next_step, free_cores())
+                if bg_cores:
+                    step.config["ncores"] = bg_cores
+                    log.info(
+                        f"Running step {step.working_path.name} in the "
+                        f"background on {bg_cores} cores: the next step can "
+                        "start while it runs."
+                    )
+                    background.append(BackgroundStep(step))
+                    last_step = step
+                    continue
+
+                try:
+                    step.execute()
+                except HaddockTermination:
+                    self._terminated = i  # type: ignore
+                    break
+                last_step = step
+                if not background:
+                    self.clean_consumed_steps(step)
+        except BaseException:
+            # let the background steps end, but do not clean
+            while background:
+                wait_background(clean=False)
+            raise
+
+        if background:
+            log.info(
+                f"Waiting for {len(background)} step(s) running in the "
+                "background."
+            )
+        while background:
+            wait_background(clean=error is None)
+        if error is not None:
+            raise error
+
+    def clean_consumed_steps(self, last_step: "Step") -> None:
+        """
+        Clean the steps whose files will not be read anymore.
+
+        The next step only reads the files referenced by the output of
+        ``last_step``. Steps executed before, and holding none of these
+        files, are cleaned in the background.
+
+        Parameters
+        ----------
+        last_step : :py:class:`Step`
+            The step that has just been executed.
+        """
+        self.cleaner.record_disk_usage(last_step.working_path)
+        referenced_folders = get_referenced_folders(last_step.working_path)
+        if referenced_folders is None:
+            return
+        for step in self.recipe.steps:
+            if step is last_step:
                 break
+            # only the steps executed by this workflow
+            params = step.module_params
+            if params is None or not params["clean"]:
+                continue
+            if step.cleaned or step.working_path.name in referenced_folders:
+                continue
+            step.cleaned = True
+            self.cleaner.clean(step.working_path)
 
     def clean(self, terminated: Optional[int] = None) -> None:
         """
@@ -56,11 +215,19 @@ class WorkflowManager:
             uses the internal class configuration.
         """
         terminated = self._terminated if terminated is None else terminated
+        self.cleaner.wait()
         for step in self.recipe.steps[:terminated]:
             step.clean()
 
     def postprocess(self) -> None:
         """Postprocess the workflow."""
+        # the analysis clients import pandas, plotly and the analysis
+        # modules: import them only when the run is over
+        from haddock.clis.cli_analyse import main as cli_analyse
+        from haddock.clis.cli_traceback import main as cli_traceback
+
+        # the analysis can read files of steps being cleaned
+        self.cleaner.wait()
         # is the workflow going to be cleaned?
         is_cleaned = self.recipe.steps[0].config['clean']
         # Is the workflow supposed to run offline
@@ -84,6 +251,45 @@ class WorkflowManager:
             log.warning(f"Error running traceback: {e}")
 
 
+def get_background_cores(
+    step: "Step",
+    next_step: Optional["Step"],
+    free_cores: int,
+) -> int:
+    """
+    Get the cores of a step run in the background.
+
+    A step can run in the background if its module passes its models on
+    and a step follows it. It keeps its ``ncores`` if this leaves cores
+    for the next step. Otherwise, if the next step is an analysis step,
+    which only reads the models, the two steps share the free cores.
+
+    Parameters
+    ----------
+    step : :py:class:`Step`
+        The step to start.
+
+    next_step : :py:class:`Step` or None
+        The step after it, ``None`` if it is the last step.
+
+    free_cores : int
+        The cores not used by the steps running in the background.
+
+    Returns
+    -------
+    int
+        The cores of the step in the background, ``0`` if the step must
+        run in the main process.
+    """
+    if next_step is None or not step.passes_models():
+        return 0
+    if step.ncores < free_cores:
+        return step.ncores
+    if free_cores > 1 and modules_category[next_step.module_name] == "analysis":
+        return free_cores // 2
+    return 0
+
+
 class Workflow:
     """Represent a set of stages to be executed by HADDOCK."""
 
@@ -142,17 +348,59 @@ class Step:
         self.order = order
         self.working_path = Path(zero_fill.fill(self.module_name, self.order))  # type: ignore
         self.module = None
+        self.cleaned = False
+        # parameters of the module, when executed in a background process
+        self._module_params: Optional[ParamDict] = None
 
-    def execute(self) -> None:
-        """Execute simulation step."""
-        self.working_path.resolve().mkdir(parents=False, exist_ok=False)
+    @property
+    def ncores(self) -> int:
+        """Number of cores of the step."""
+        ncores = self.config.get(
+            "ncores",
+            non_mandatory_general_parameters_defaults["ncores"],
+        )
+        return max(1, ncores or 1)
 
-        # Import the module given by the mode or default
+    @property
+    def module_params(self) -> Optional[ParamDict]:
+        """Parameters of the module, once the step is executed."""
+        if self.module is not None:
+            return self.module.params
+        return self._module_params
+
+    def import_module(self) -> Any:
+        """Import the module of the step."""
         module_name = ".".join(
-            ["haddock", "modules", modules_category[self.module_name], self.module_name]
+            [
+                "haddock",
+                "modules",
+                modules_category[self.module_name],
+                self.module_name,
+            ]
         )
-        module_lib = importlib.import_module(module_name)
+        return importlib.import_module(module_name)
+
+    def passes_models(self) -> bool:
+        """Whether the module sends its input models on, unchanged."""
+        module = self.import_module().HaddockModule
+        return module.passes_models_with(self.config)
+
+    def execute(self, background: bool = False) -> None:
+        """
+        Execute simulation step.
+
+        Parameters
+        ----------
+        background : bool
+            Whether the step runs in a background process, alongside the
+            next step.
+        """
+        self.working_path.resolve().mkdir(parents=False, exist_ok=False)
+
+        # Import the module given by the mode or default
+        module_lib = self.import_module()
         self.module = module_lib.HaddockModule(order=self.order, path=self.working_path)
+        self.module.runs_in_background = background  # type: ignore
 
         # Run module
         start = time()
@@ -171,9 +419,95 @@ class Step:
 
     def clean(self) -> None:
         """Clean step output."""
-        if self.module is None and self.config["clean"]:
+        if self.cleaned:
+            return
+        self.cleaned = True
+        params = self.module_params
+        if params is None and self.config["clean"]:
             with log_time("cleaning output files took"):
                 clean_output(self.working_path, self.config["ncores"])
 
         elif self.module is not None and self.module.params["clean"]:
             self.module.clean_output()
+
+        elif params is not None and params["clean"]:
+            with log_time("cleaning output files took"):
+                clean_output(self.working_path, params["ncores"])
+
+
+def _execute_step(step: Step, connection: Connection) -> None:
+    """Execute a step and send its module parameters, or its error."""
+    try:
+        step.execute(background=True)
+    except Exception as err:
+        try:
+            # the error must be rebuilt in the main process
+            pickle.loads(pickle.dumps(err))
+        except Exception:
+            err = StepError(f"{type(err).__name__}: {err}")
+        connection.send(err)
+    else:
+        connection.send(step.module_params)
+    finally:
+        connection.close()
+
+
+class BackgroundStep:
+    """
+    A step executed in a background process.
+
+    Parameters
+    ----------
+    step : :py:class:`Step`
+        The step to execute.
+    """
+
+    def __init__(self, step: Step) -> None:
+        self.step = step
+        self._connection, child_connection = Pipe(duplex=False)
+        self.process = Process(
+            target=_execute_step,
+            args=(step, child_connection),
+        )
+        self.process.start()
+        child_connection.close()
+        self.sentinel = self.process.sentinel
+        self._message: Any = None
+
+    def is_alive(self) -> bool:
+        """Whether the step is still running."""
+        # receive the message before the process ends, so that sending
+        # it never blocks
+        if self._message is None and self._connection.poll():
+            self._message = self._connection.recv()
+        return self.process.is_alive()
+
+    def released(self) -> bool:
+        """Whether the step has saved its `io.json`."""
+        return (
+            not self.process.is_alive()
+            or Path(self.step.working_path, MODULE_IO_FILE).exists()
+        )
+
+    def finish(self) -> Optional[BaseException]:
+        """
+        Wait for the step to end.
+
+        Returns
+        -------
+        Exception or None
+            The error of the step, if it failed.
+        """
+        if self._message is None and self._connection.poll():
+            self._message = self._connection.recv()
+        self.process.join()
+        self._connection.close()
+        if isinstance(self._message, BaseException):
+            return self._message
+        if self.process.exitcode != 0:
+            return StepError(
+                f"Step {self.step.working_path.name} failed "
+                f"(exit code {self.process.exitcode})."
+            )
+        self.step._module_params = self._message
+        return None
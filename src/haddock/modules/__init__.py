@@ -20,6 +20,7 @@ from haddock.core.typing import (
     Literal,
     Optional,
     ParamDict,
+    ParamMap,
     Union,
 )
 from haddock.gear import config
@@ -32,6 +33,7 @@ from haddock.libs.libio import folder_exists, working_directory
 from haddock.libs.libmpi import MPIScheduler
 from haddock.libs.libontology import ModuleIO, PDBFile
 from haddock.libs.libparallel import Scheduler
+from haddock.libs.libperf import phase, profile_step
 from haddock.libs.libtimer import log_time
 from haddock.libs.libutil import recursive_dict_update
 
@@ -116,6 +118,25 @@ class BaseHaddockModule(ABC):
 
     name: str
 
+    passes_models: bool = False
+    """
+    Whether the module sends its input models to the next step unchanged.
+
+    When such a module runs in the background, see
+    :py:attr:`runs_in_background`, it exports its ``io.json`` before its
+    own analysis: the workflow can start the next step as soon as the
+    file is saved. See :py:meth:`passes_models_with`.
+    """
+
+    runs_in_background: bool = False
+    """
+    Whether the step runs in a background process, alongside the next step.
+
+    Set by the workflow. Otherwise, the ``io.json`` is only saved once
+    the module has finished, so that it is never found for a step that
+    did not complete.
+    """
+
     def __init__(self, order: int, path: Path, params_fname: FilePath) -> None:
         """
         HADDOCK3 modules base class.
@@ -238,11 +259,13 @@ class BaseHaddockModule(ABC):
         """Execute the module."""
         log.info(f"Running [{self.name}] module")
 
-        self.update_params(**params)
-        self.add_parent_to_paths()
+        with profile_step(self.name, self.path) as profile:
+            with profile.phase("setup"):
+                self.update_params(**params)
+                self.add_parent_to_paths()
 
-        with working_directory(self.path):
-            self._run()
+            with working_directory(self.path), profile.module():
+                self._run()
 
         log.info(f"Module [{self.name}] finished.")
 
@@ -257,6 +280,16 @@ class BaseHaddockModule(ABC):
         with log_time("cleaning output files took"):
             clean_output(self.path, self.params["ncores"])
 
+    @classmethod
+    def passes_models_with(cls, params: ParamMap) -> bool:
+        """
+        Whether the module passes its input models on with these parameters.
+
+        Modules whose parameters can make them write new models override
+        it; the others return :py:attr:`passes_models`.
+        """
+        return cls.passes_models
+
     @classmethod
     @abstractmethod
     def confirm_installation(cls) -> None:
@@ -285,15 +318,17 @@ class BaseHaddockModule(ABC):
         """
         self.output_models: Union[list[PDBFile], dict[int, PDBFile]]
         assert self.output_models, "`self.output_models` cannot be empty."
-        io = ModuleIO()
-        # add the input models
-        io.add(self.previous_io.output, "i")
-        # add the output models
-        io.add(self.output_models, "o")
-        # Removes un-generated outputs and compute percentage of ungenerated
-        faulty = io.check_faulty()
-        # Save outputs
-        io.save()
+        with phase("io_export"):
+            io = ModuleIO()
+            # add the input models
+            io.add(self.previous_io.output, "i")
+            # add the output models
+            io.add(self.output_models, "o")
+            # Removes un-generated outputs and compute percentage of
+            # ungenerated
+            faulty = io.check_faulty()
+            # Save outputs
+            io.save()
         # Check if number of generated outputs is under the tolerance threshold
         if faulty > faulty_tolerance:
             _msg = (
@@ -411,7 +446,20 @@ def get_engine(
         A dictionary containing parameters for the engine.
         `get_engine` will retrieve from `params` only those parameters
         needed and ignore the others.
+
+    Notes
+    -----
+    The engines of modules with a `tolerance` parameter abort the run
+    as soon as the failed jobs exceed the tolerance, or after
+    `max_consecutive_errors` consecutive identical errors.
     """
+    failures = {}
+    if "tolerance" in params:
+        failures = {
+            "tolerance": params["tolerance"],
+            "max_consecutive_errors": params["max_consecutive_errors"],
+        }
+
     # a bit of a factory pattern here
     # this might end up in another module but for now its fine here
     if mode == "batch":
@@ -420,6 +468,7 @@ def get_engine(
             target_queue=params["queue"],
             queue_limit=params["queue_limit"],
             concat=params["concat"],
+            **failures,
         )
 
     elif mode == "local":
@@ -427,9 +476,14 @@ def get_engine(
             Scheduler,
             ncores=params["ncores"],
             max_cpus=params["max_cpus"],
+            **failures,
         )
     elif mode == "mpi":
-        return partial(MPIScheduler, ncores=params["ncores"])  # type: ignore
+        return partial(  # type: ignore
+            MPIScheduler,
+            ncores=params["ncores"],
+            **failures,
+        )
 
     else:
         available_engines = ("batch", "local", "mpi")
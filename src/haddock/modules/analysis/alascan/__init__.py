@@ -13,17 +13,16 @@ from pathlib import Path
 
 from haddock import log
 from haddock.core.defaults import MODULE_DEFAULT_YAML
-from haddock.libs.libparallel import get_index_list
 from haddock.libs.libutil import parse_ncores
 from haddock.modules import BaseHaddockModule
 from haddock.modules import get_engine
 from haddock.modules.analysis import get_analysis_exec_mode
 from haddock.modules.analysis.alascan.scan import (
-    Scan,
-    ScanJob,
     alascan_cluster_analysis,
     create_alascan_plots,
+    create_scan_tasks,
     generate_alascan_output,
+    merge_scan_tasks,
     )
 
 
@@ -35,11 +34,18 @@ class HaddockModule(BaseHaddockModule):
     """HADDOCK3 module for alanine scan."""
 
     name = RECIPE_PATH.name
+    passes_models = True
 
     def __init__(self, order, path, *ignore, init_params=DEFAULT_CONFIG,
                  **everything):
         super().__init__(order, path, init_params)
 
+    @classmethod
+    def passes_models_with(cls, params):
+        """Whether the input models are passed on, unless `output` is set."""
+        # with `output`, the mutated models are sent once the scan is done
+        return params.get("output") is not True
+
     @classmethod
     def confirm_installation(cls):
         """Confirm if module is installed."""
@@ -52,40 +58,45 @@ class HaddockModule(BaseHaddockModule):
             models = self.previous_io.retrieve_models(individualize=True)
         except Exception as e:
             self.finish_with_error(e)
-        # Parallelisation : optimal dispatching of models
-        nmodels = len(models)
-        ncores = parse_ncores(n=self.params['ncores'], njobs=nmodels)
-
-        log.info(f"Running on {ncores} cores")
-
-        index_list = get_index_list(nmodels, ncores)
-
-        alascan_jobs = []
-        for core in range(ncores):
-            output_name = "alascan_" + str(core) + ".scan"
-            scan_obj = Scan(
-                model_list=models[index_list[core]:index_list[core + 1]],
-                output_name=output_name,
-                core=core,
-                path=Path("."),
-                params=self.params,
-                )
-            # running now the ScanJob
-            job_f = Path(output_name)
-            # init ScanJob
-            job = ScanJob(
-                job_f,
-                self.params,
-                scan_obj,
-                )
-            alascan_jobs.append(job)
+        if self.runs_in_background and self.params["output"] is not True:
+            self.output_models = models
+            self.export_io_models()
+        # Parallelisation : each model and each of its mutations is an
+        #  independent task, so that few models still use all the cores
+        scan_tasks, scan_plan = create_scan_tasks(
+            models,
+            self.params,
+            Path("."),
+            )
+        ncores = parse_ncores(n=self.params['ncores'], njobs=len(scan_tasks))
+
+        log.info(
+            f"Running {len(scan_tasks)} scoring tasks for {len(models)} "
+            f"models on {ncores} cores"
+            )
+
+        if self.params["reuse_topology"]:
+            # native topologies are built before their mutants are scored
+            native_tasks = [native_task for _, native_task, _ in scan_plan]
+            native_set = set(native_tasks)
+            task_batches = [
+                native_tasks,
+                [task for task in scan_tasks if task not in native_set],
+                ]
+        else:
+            task_batches = [scan_tasks]
 
         exec_mode = get_analysis_exec_mode(self.params["mode"])
 
         Engine = get_engine(exec_mode, self.params)
-        engine = Engine(alascan_jobs)
-        engine.run()
-        
+        for task_batch in task_batches:
+            if task_batch:
+                engine = Engine(task_batch)
+                engine.run()
+
+        # gather the results of each model, in a deterministic order
+        merge_scan_tasks(scan_plan, self.params["scan_residue"], Path("."))
+
         # cluster-based analysis
         clt_alascan = alascan_cluster_analysis(models)
         # now plot the data
@@ -99,8 +110,9 @@ class HaddockModule(BaseHaddockModule):
         if self.params["output"] is True:
             models_to_export = generate_alascan_output(models, self.path)
             self.output_models = models_to_export
-        else:
+            self.export_io_models()
+        elif not self.runs_in_background:
             # Send models to the next step,
             #  no operation is done on them
             self.output_models = models
-        self.export_io_models()
+            self.export_io_models()
@@ -1,4 +1,5 @@
 """alascan module."""
+import logging
 import os
 from pathlib import Path
 import shutil
@@ -9,12 +10,17 @@ import io
 from contextlib import redirect_stdout
 
 from haddock import log
+from haddock.core.defaults import MODULE_IO_FILE
 from haddock.libs.libalign import get_atoms, load_coords
+from haddock.libs.libio import working_directory
+from haddock.libs.libontology import ModuleIO, PDBFile, TopologyFile
 from haddock.libs.libplots import make_alascan_plot
 from haddock.modules.analysis.caprieval.capri import CAPRI
 from haddock.clis import cli_score
 
 ATOMS_TO_BE_MUTATED = ['C', 'N', 'CA', 'O', 'CB']
+# default `disulphide_dist` of topoaa
+DISULPHIDE_DIST = 2.2
 
 RES_CODES = dict([
     ("CYS", "C"),
@@ -398,6 +404,593 @@ def create_alascan_plots(clt_alascan, scan_residue, offline = False):
     return
 
 
+def get_filter_resdic(params):
+    """Get the residues to be mutated from the module parameters.
+
+    Parameters
+    ----------
+    params : dict
+        The alascan parameters.
+
+    Returns
+    -------
+    filter_resdic : dict
+        Residues to be mutated for each chain, `{'_': []}` if none was
+        given.
+    """
+    return {
+        key[-1]: value for key, value in params.items()
+        if key.startswith("resdic")
+        }
+
+
+def get_scan_residues(native, filter_resdic, int_cutoff):
+    """Get the residues of a model to be scanned.
+
+    Parameters
+    ----------
+    native : PDBFile
+        The model to be scanned.
+    filter_resdic : dict
+        Residues to be mutated for each chain, `{'_': []}` to mutate all
+        the interface residues.
+    int_cutoff : float
+        Distance cutoff used to define interface contacts.
+
+    Returns
+    -------
+    scan_residues : list
+        List of (chain, resnum, resname) tuples, in scanning order.
+    """
+    # check if the user wants to mutate only some residues
+    if filter_resdic != {'_': []}:
+        interface = filter_resdic
+    else:
+        interface = CAPRI.identify_interface(
+            native.rel_path,
+            cutoff=int_cutoff
+            )
+
+    atoms = get_atoms(native.rel_path)
+    coords, _chain_ranges = load_coords(native.rel_path,
+                                        atoms,
+                                        add_resname=True
+                                        )
+    resname_dict = {}
+    for chain, resid, _atom, resname in coords.keys():
+        key = f"{chain}-{resid}"
+        if key not in resname_dict:
+            resname_dict[key] = resname
+    return [
+        (chain, res, resname_dict[f"{chain}-{res}"])
+        for chain in interface
+        for res in interface[chain]
+        ]
+
+
+def write_scan_csv(scan_data, native, n_score, path):
+    """Write the alascan results of a model.
+
+    Parameters
+    ----------
+    scan_data : list
+        One list of scan values per mutated residue.
+    native : PDBFile
+        The scanned model.
+    n_score : float
+        The score of the native model.
+    path : Path
+        Path to the output directory.
+
+    Returns
+    -------
+    df_scan : pandas.DataFrame
+        Dataframe with the scan results for the model.
+    """
+    df_columns = ['chain', 'res', 'ori_resname', 'end_resname',
+                  'score', 'vdw', 'elec', 'desolv', 'bsa',
+                  'delta_score', 'delta_vdw', 'delta_elec',
+                  'delta_desolv', 'delta_bsa']
+    df_scan = pd.DataFrame(scan_data, columns=df_columns)
+    alascan_fname = Path(path, f"scan_{native.file_name.rstrip('.pdb')}.csv")
+    # add zscore
+    df_scan = add_zscores(df_scan, 'delta_score')
+
+    df_scan.to_csv(
+        alascan_fname,
+        index=False,
+        float_format='%.2f',
+        sep="\t"
+        )
+
+    fl_content = open(alascan_fname, 'r').read()
+    with open(alascan_fname, 'w') as f:
+        f.write(f"##########################################################{os.linesep}")  # noqa E501
+        f.write(f"# `alascan` results for {native.file_name}{os.linesep}")  # noqa E501
+        f.write(f"#{os.linesep}")
+        f.write(f"# native score = {n_score}{os.linesep}")
+        f.write(f"#{os.linesep}")
+        f.write(f"# z_score is calculated with respect to the other residues")  # noqa E501
+        f.write(f"{os.linesep}")
+        f.write(f"##########################################################{os.linesep}")  # noqa E501
+        f.write(fl_content)
+    return df_scan
+
+
+def read_chains(pdb_f):
+    """Read the atom lines of each chain of a PDB file.
+
+    Parameters
+    ----------
+    pdb_f : str or Path
+        Path to the pdb file.
+
+    Returns
+    -------
+    chain_lines : dict
+        Atom lines of each chain, in order of appearance.
+    """
+    chain_lines = {}
+    with open(pdb_f, 'r') as fh:
+        for line in fh:
+            if line.startswith(('ATOM', 'HETATM')):
+                chain_lines.setdefault(line[21], []).append(line)
+    return chain_lines
+
+
+def has_interchain_disulphides(pdb_f, cutoff=DISULPHIDE_DIST):
+    """Check if cysteines of different chains form disulphide bridges.
+
+    Parameters
+    ----------
+    pdb_f : str or Path
+        Path to the pdb file.
+    cutoff : float
+        Largest distance between the SG atoms of a bridge.
+
+    Returns
+    -------
+    bool
+        Whether two SG atoms of different chains are within `cutoff`.
+    """
+    chains = []
+    coords = []
+    with open(pdb_f, 'r') as fh:
+        for line in fh:
+            if (line.startswith('ATOM')
+                    and line[17:20] == 'CYS'
+                    and line[12:16].strip() == 'SG'):
+                chains.append(line[21])
+                coords.append(
+                    [float(line[30:38]), float(line[38:46]), float(line[46:54])]
+                    )
+    if len(set(chains)) < 2:
+        return False
+    chains = np.array(chains)
+    coords = np.array(coords)
+    dist = np.linalg.norm(coords[:, None] - coords[None, :], axis=-1)
+    return bool(np.any((dist < cutoff) & (chains[:, None] != chains[None, :])))
+
+
+def write_chain(lines, pdb_f):
+    """Write the atom lines of a chain to a PDB file."""
+    with open(pdb_f, 'w') as fh:
+        fh.write(''.join(lines) + 'END' + os.linesep)
+    return Path(pdb_f).resolve()
+
+
+def generate_chain_topologies(chain_pdbs, run_dir):
+    """Generate the topology of each chain, as a separate molecule.
+
+    Parameters
+    ----------
+    chain_pdbs : list
+        Paths to the chain files.
+    run_dir : Path
+        Folder where `topoaa` is run. It is created, or overwritten.
+
+    Returns
+    -------
+    chain_models : list
+        The processed chains (PDBFile with their topology), in the order
+        of `chain_pdbs`.
+    """
+    from haddock.gear.prepare_run import populate_topology_molecule_params
+    from haddock.gear.zerofill import zero_fill
+    from haddock.libs.libworkflow import WorkflowManager
+
+    run_dir = Path(run_dir)
+    if run_dir.exists():
+        shutil.rmtree(run_dir)
+    run_dir.mkdir()
+    zero_fill.set_zerofill_number(2)
+    topoaa_params = {"molecules": list(chain_pdbs)}
+    populate_topology_molecule_params(topoaa_params)
+    with working_directory(run_dir):
+        workflow = WorkflowManager(
+            workflow_params={"topoaa": topoaa_params},
+            start=0,
+            run_dir=run_dir,
+            )
+        workflow.run()
+    io = ModuleIO()
+    io.load(Path(run_dir, "0_topoaa", MODULE_IO_FILE))
+    return io.retrieve_models(individualize=True)
+
+
+def score_chain_models(chain_models, run_dir):
+    """Score a complex made of processed chains with `emscoring`.
+
+    The chains and their topologies are gathered in the `0_topoaa` folder
+    of `run_dir`, as the single model of this step, and scored as
+    ``haddock3-score`` does.
+
+    Parameters
+    ----------
+    chain_models : list
+        The processed chains of the complex (PDBFile with their topology),
+        in the order of the complex.
+    run_dir : Path
+        The scoring run folder. Its `0_topoaa` folder is created if needed.
+
+    Returns
+    -------
+    score : float
+        Haddock score.
+    vdw : float
+        Van der Waals energy.
+    elec : float
+        Electrostatic energy.
+    desolv : float
+        Desolvation energy.
+    bsa : float
+        Buried surface area.
+    """
+    from haddock.gear.haddockmodel import HaddockModel
+    from haddock.gear.yaml2cfg import read_from_yaml_config
+    from haddock.gear.zerofill import zero_fill
+    from haddock.libs.libworkflow import WorkflowManager
+    from haddock.modules.scoring.emscoring import DEFAULT_CONFIG
+
+    topo_dir = Path(run_dir, "0_topoaa")
+    topo_dir.mkdir(parents=True, exist_ok=True)
+    complex_lines = []
+    topologies = []
+    for chain_model in chain_models:
+        with open(Path(chain_model.path, chain_model.file_name), 'r') as fh:
+            complex_lines.extend(
+                line for line in fh if line.startswith(('ATOM', 'HETATM'))
+                )
+        psf = Path(chain_model.topology.path, chain_model.topology.file_name)
+        if psf.parent.resolve() != topo_dir.resolve():
+            shutil.copy(psf, topo_dir)
+        topologies.append(TopologyFile(psf.name, path=topo_dir))
+    complex_pdb = Path(topo_dir, "alascan_complex.pdb")
+    complex_pdb.write_text(''.join(complex_lines) + 'END' + os.linesep)
+    io = ModuleIO()
+    io.add(PDBFile(complex_pdb.name, topology=topologies, path=topo_dir), "o")
+    io.save(topo_dir)
+
+    ems_params = read_from_yaml_config(DEFAULT_CONFIG)
+    zero_fill.set_zerofill_number(2)
+    with working_directory(run_dir):
+        workflow = WorkflowManager(
+            workflow_params={"topoaa": {}, "emscoring": ems_params},
+            start=1,
+            run_dir=run_dir,
+            )
+        workflow.run()
+
+    energies = HaddockModel(
+        Path(run_dir, "1_emscoring", "emscoring_1.pdb")
+        ).energies
+    shutil.rmtree(run_dir)
+    haddock_score = sum(
+        ems_params[f"w_{term}"] * energies[term]
+        for term in ("vdw", "elec", "desolv", "air", "bsa")
+        )
+    # same precision as the `haddock3-score` output
+    return (
+        float(f"{haddock_score:.4f}"),
+        energies["vdw"],
+        energies["elec"],
+        energies["desolv"],
+        energies["bsa"],
+        )
+
+
+class NativeTopology:
+    """Topology of a native model, reused to score its mutants.
+
+    Each chain of the model gets its own topology, generated once. The
+    topology of a mutant is then obtained by regenerating the topology of
+    its mutated chain only.
+    """
+
+    def __init__(self, native, path):
+        """Initialise NativeTopology class.
+
+        Parameters
+        ----------
+        native : PDBFile
+            The native model.
+        path : Path
+            Folder holding the native topology.
+        """
+        self.native = native
+        self.path = Path(path)
+
+    def build(self):
+        """Generate the topology of each chain of the native model."""
+        self.path.mkdir(exist_ok=True)
+        model_name = Path(self.native.file_name).stem
+        chain_pdbs = [
+            write_chain(lines, Path(self.path, f"{model_name}_{chain}.pdb"))
+            for chain, lines in read_chains(self.native.rel_path).items()
+            ]
+        generate_chain_topologies(chain_pdbs, Path(self.path, "topology"))
+        return
+
+    def chain_models(self):
+        """Load the processed chains of the native model, by chain."""
+        io = ModuleIO()
+        io.load(Path(self.path, "topology", "0_topoaa", MODULE_IO_FILE))
+        return dict(zip(
+            read_chains(self.native.rel_path),
+            io.retrieve_models(individualize=True),
+            ))
+
+    def score(self, run_dir):
+        """Score the native model with the topology of its chains."""
+        if Path(run_dir).exists():
+            shutil.rmtree(run_dir)
+        chain_models = self.chain_models()
+        return score_chain_models(list(chain_models.values()), run_dir)
+
+    def score_mutant(self, mut_pdb_f, mut_chain, run_dir):
+        """Score a mutant, regenerating only its mutated chain topology.
+
+        Parameters
+        ----------
+        mut_pdb_f : Path
+            Path to the mutant pdb file.
+        mut_chain : str
+            Chain of the mutated residue.
+        run_dir : str
+            Name of the temporary scoring folder.
+        """
+        chain_models = self.chain_models()
+        mut_chain_pdb = write_chain(
+            read_chains(mut_pdb_f)[mut_chain],
+            Path(mut_pdb_f).name.replace('.pdb', '_chain.pdb'),
+            )
+        chain_models[mut_chain], = generate_chain_topologies(
+            [mut_chain_pdb],
+            run_dir,
+            )
+        os.remove(mut_chain_pdb)
+        return score_chain_models(list(chain_models.values()), run_dir)
+
+    def clean(self):
+        """Remove the native topology."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class ScanTask:
+    """Score a model, or one of its mutants, in an independent task.
+
+    Tasks of the same model can run on different cores: each of them uses
+    its own scoring folder and writes its scores to its own output file.
+    """
+
+    def __init__(
+            self,
+            native,
+            output,
+            run_dir,
+            chain=None,
+            res=None,
+            mut_resname=None,
+            native_topology=None,
+            ):
+        """Initialise ScanTask class.
+
+        Parameters
+        ----------
+        native : PDBFile
+            The model to be scanned.
+        output : Path
+            Path to the file where the scores are written.
+        run_dir : str
+            Name of the temporary scoring folder.
+        chain : str, optional
+            Chain of the residue to be mutated, None to score the native
+            model.
+        res : int, optional
+            Residue number of the residue to be mutated.
+        mut_resname : str, optional
+            Residue name of the mutant.
+        native_topology : NativeTopology, optional
+            If given, the native task builds this topology and the mutant
+            tasks reuse it, instead of generating the topology of the whole
+            complex with `haddock3-score`.
+        """
+        self.native = native
+        self.output = output
+        self.run_dir = run_dir
+        self.chain = chain
+        self.res = res
+        self.mut_resname = mut_resname
+        self.native_topology = native_topology
+
+    def run(self):
+        """Score the model and write down the scores."""
+        if self.native_topology is None:
+            scores = self.score()
+        else:
+            # as haddock3-score, do not log the scoring workflows
+            log_level = log.level
+            log.setLevel(logging.ERROR)
+            try:
+                scores = self.score()
+            finally:
+                log.setLevel(log_level)
+        with open(self.output, 'w') as fh:
+            fh.write("\t".join(str(value) for value in scores))
+        return self.output
+
+    def score(self):
+        """Score the native model or the mutant."""
+        if self.chain is None and self.native_topology is None:
+            return calc_score(self.native.rel_path, run_dir=self.run_dir)
+        if self.chain is None:
+            self.native_topology.build()
+            return self.native_topology.score(self.run_dir)
+        mut_pdb_name = mutate(self.native.rel_path,
+                              self.chain,
+                              self.res,
+                              self.mut_resname)
+        if self.native_topology is None:
+            scores = calc_score(mut_pdb_name, run_dir=self.run_dir)
+        else:
+            scores = self.native_topology.score_mutant(
+                mut_pdb_name,
+                self.chain,
+                self.run_dir,
+                )
+        os.remove(mut_pdb_name)
+        return scores
+
+
+def read_scan_task(task):
+    """Read the scores written by a ScanTask, None if it failed."""
+    if not Path(task.output).exists():
+        return None
+    with open(task.output, 'r') as fh:
+        scores = tuple(float(value) for value in fh.read().split())
+    os.remove(task.output)
+    return scores
+
+
+def create_scan_tasks(models, params, path):
+    """Split the scanning of models into (model, residue) tasks.
+
+    Parameters
+    ----------
+    models : list
+        List of models to be scanned.
+    params : dict
+        The alascan parameters.
+    path : Path
+        Path to the output directory.
+
+    Returns
+    -------
+    scan_tasks : list
+        List of ScanTask objects, to be run in any order, unless native
+        topologies are reused: the native tasks must then be run first.
+    scan_plan : list
+        For each model, the model, its native ScanTask and the list of
+        (chain, resnum, resname, ScanTask) of its mutations, in scanning
+        order.
+    """
+    scan_res = params["scan_residue"]
+    filter_resdic = get_filter_resdic(params)
+    scan_tasks = []
+    scan_plan = []
+    for model_idx, native in enumerate(models):
+        model_name = Path(native.file_name).stem
+        native_topology = None
+        if params["reuse_topology"]:
+            if has_interchain_disulphides(native.rel_path):
+                # separate molecules would lose the bridges
+                log.warning(
+                    f"{native.file_name} has inter-chain disulphide "
+                    "bridges: the topology of the whole complex is "
+                    "generated for each of its mutants."
+                    )
+            else:
+                native_topology = NativeTopology(
+                    native,
+                    Path(path, f"alascan-topology-{model_idx}"),
+                    )
+        native_task = ScanTask(
+            native,
+            Path(path, f"scan_{model_name}-native.out"),
+            run_dir=f"haddock3-score-{len(scan_tasks)}",
+            native_topology=native_topology,
+            )
+        scan_tasks.append(native_task)
+        mutations = []
+        scan_residues = get_scan_residues(
+            native,
+            filter_resdic,
+            params["int_cutoff"],
+            )
+        for chain, res, ori_resname in scan_residues:
+            # we do not re-score equal residues (e.g. ALA = ALA),
+            # nor residues that cannot be mutated
+            if ori_resname == scan_res or ori_resname not in RES_CODES:
+                continue
+            task = ScanTask(
+                native,
+                Path(path, f"scan_{model_name}-{chain}_{res}.out"),
+                run_dir=f"haddock3-score-{len(scan_tasks)}",
+                chain=chain,
+                res=res,
+                mut_resname=scan_res,
+                native_topology=native_topology,
+                )
+            scan_tasks.append(task)
+            mutations.append((chain, res, ori_resname, task))
+        scan_plan.append((native, native_task, mutations))
+    return scan_tasks, scan_plan
+
+
+def merge_scan_tasks(scan_plan, scan_res, path):
+    """Write the alascan results of each model from its ScanTasks.
+
+    Models are processed in the order of the scan plan, and residues in
+    their scanning order, so that the output does not depend on the order
+    in which the tasks were run.
+
+    Parameters
+    ----------
+    scan_plan : list
+        The scan plan, as returned by `create_scan_tasks`.
+    scan_res : str
+        Residue name of the mutants.
+    path : Path
+        Path to the output directory.
+    """
+    for native, native_task, mutations in scan_plan:
+        native_scores = read_scan_task(native_task)
+        mutants_scores = [read_scan_task(task) for *_, task in mutations]
+        if native_task.native_topology is not None:
+            native_task.native_topology.clean()
+        if native_scores is None:
+            log.warning(f"Could not score {native.file_name}, skipping it.")
+            continue
+        n_score, n_vdw, n_elec, n_des, n_bsa = native_scores
+        scan_data = []
+        for (chain, res, ori_resname, _), scores in zip(
+                mutations, mutants_scores):
+            if scores is None:
+                log.warning(
+                    f"Could not score mutant {chain}-{res} "
+                    f"of {native.file_name}, skipping it."
+                    )
+                continue
+            c_score, c_vdw, c_elec, c_des, c_bsa = scores
+            # now the deltas (wildtype - mutant)
+            scan_data.append([chain, res, ori_resname, scan_res,
+                              c_score, c_vdw, c_elec, c_des,
+                              c_bsa, n_score - c_score,
+                              n_vdw - c_vdw, n_elec - c_elec, n_des - c_des,
+                              n_bsa - c_bsa])
+        write_scan_csv(scan_data, native, n_score, path)
+
+
 class ScanJob:
     """A Job dedicated to the parallel alanine scanning of models."""
 
@@ -440,12 +1033,7 @@ class Scan:
         self.int_cutoff = params["params"]["int_cutoff"]
         # initialising resdic
         if "params" in params.keys():
-            self.filter_resdic = {
-                key[-1]: value for key, value
-                in params["params"].items()
-                if key.startswith("resdic")
-                }
-
+            self.filter_resdic = get_filter_resdic(params["params"])
 
     def run(self):
         """Run alascan calculations."""
@@ -456,92 +1044,49 @@ class Scan:
             n_score, n_vdw, n_elec, n_des, n_bsa = calc_score(native.rel_path,
                                                               run_dir=sc_dir)
             scan_data = []
-            # check if the user wants to mutate only some residues
-            if self.filter_resdic != {'_': []}:
-                interface = self.filter_resdic
-            else:
-                interface = CAPRI.identify_interface(
-                    native.rel_path,
-                    cutoff=self.int_cutoff
-                    )
-                    
-            atoms = get_atoms(native.rel_path)
-            coords, chain_ranges = load_coords(native.rel_path,
-                                               atoms,
-                                               add_resname=True
-                                               )
-            resname_dict = {}
-            for chain, resid, _atom, resname in coords.keys():
-                key = f"{chain}-{resid}"
-                if key not in resname_dict:
-                    resname_dict[key] = resname
+            scan_residues = get_scan_residues(
+                native,
+                self.filter_resdic,
+                self.int_cutoff,
+                )
             # self.log(f'Mutating interface of {native.file_name}...')
-            # self.log(f"Interface: {interface}")
-            for chain in interface:
-                for res in interface[chain]:
-                    ori_resname = resname_dict[f"{chain}-{res}"]
-                    end_resname = self.scan_res
-                    if ori_resname == self.scan_res:
-                        # we do not re-score equal residues (e.g. ALA = ALA)
-                        c_score = n_score
-                        c_vdw = n_vdw
-                        c_elec = n_elec
-                        c_des = n_des
-                        c_bsa = n_bsa
-                    else:
-                        try:
-                            mut_pdb_name = mutate(native.rel_path,
-                                                  chain,
-                                                  res,
-                                                  end_resname)
-                        except KeyError:
-                            continue
-                        # now we score the mutated model
-                        c_score, c_vdw, c_elec, c_des, c_bsa = calc_score(
-                            mut_pdb_name,
-                            run_dir=sc_dir)
-                        # now the deltas (wildtype - mutant)
-                        delta_score = n_score - c_score
-                        delta_vdw = n_vdw - c_vdw
-                        delta_elec = n_elec - c_elec
-                        delta_desolv = n_des - c_des
-                        delta_bsa = n_bsa - c_bsa
- 
-                        scan_data.append([chain, res, ori_resname, end_resname,
-                                          c_score, c_vdw, c_elec, c_des,
-                                          c_bsa, delta_score,
-                                          delta_vdw, delta_elec, delta_desolv,
-                                          delta_bsa])
-                        os.remove(mut_pdb_name)
+            for chain, res, ori_resname in scan_residues:
+                end_resname = self.scan_res
+                if ori_resname == self.scan_res:
+                    # we do not re-score equal residues (e.g. ALA = ALA)
+                    continue
+                try:
+                    mut_pdb_name = mutate(native.rel_path,
+                                          chain,
+                                          res,
+                                          end_resname)
+                except KeyError:
+                    continue
+                # now we score the mutated model
+                c_score, c_vdw, c_elec, c_des, c_bsa = calc_score(
+                    mut_pdb_name,
+                    run_dir=sc_dir)
+                # now the deltas (wildtype - mutant)
+                delta_score = n_score - c_score
+                delta_vdw = n_vdw - c_vdw
+                delta_elec = n_elec - c_elec
+                delta_desolv = n_des - c_des
+                delta_bsa = n_bsa - c_bsa
+
+                scan_data.append([chain, res, ori_resname, end_resname,
+                                  c_score, c_vdw, c_elec, c_des,
+                                  c_bsa, delta_score,
+                                  delta_vdw, delta_elec, delta_desolv,
+                                  delta_bsa])
+                os.remove(mut_pdb_name)
             # write output
-            df_columns = ['chain', 'res', 'ori_resname', 'end_resname',
-                          'score', 'vdw', 'elec', 'desolv', 'bsa',
-                          'delta_score', 'delta_vdw', 'delta_elec',
-                          'delta_desolv', 'delta_bsa']
-            self.df_scan = pd.DataFrame(scan_data, columns=df_columns)
-            alascan_fname = Path(self.path, f"scan_{native.file_name.rstrip('.pdb')}.csv")
-            # add zscore
-            self.df_scan = add_zscores(self.df_scan, 'delta_score')
-
-            self.df_scan.to_csv(
-                alascan_fname,
-                index=False,
-                float_format='%.2f',
-                sep="\t"
+            self.df_scan = write_scan_csv(
+                scan_data,
+                native,
+                n_score,
+                self.path,
                 )
 
-            fl_content = open(alascan_fname, 'r').read()
-            with open(alascan_fname, 'w') as f:
-                f.write(f"##########################################################{os.linesep}")  # noqa E501
-                f.write(f"# `alascan` results for {native.file_name}{os.linesep}")  # noqa E501
-                f.write(f"#{os.linesep}")
-                f.write(f"# native score = {n_score}{os.linesep}")
-                f.write(f"#{os.linesep}")
-                f.write(f"# z_score is calculated with respect to the other residues")  # noqa E501
-                f.write(f"{os.linesep}")
-                f.write(f"##########################################################{os.linesep}")  # noqa E501
-                f.write(fl_content)
-    
     def output(self):
         """Write down unique contacts to file."""
         output_fname = Path(self.path, self.output_name)
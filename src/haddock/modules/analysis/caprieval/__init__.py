@@ -48,6 +48,7 @@ class HaddockModule(BaseHaddockModule):
     """HADDOCK3 module to calculate the CAPRI metrics."""
 
     name = RECIPE_PATH.name
+    passes_models = True
 
     def __init__(
         self,
@@ -87,6 +88,11 @@ class HaddockModule(BaseHaddockModule):
 
         # Sort by score to find the "best"
         models.sort()
+
+        if self.runs_in_background:
+            self.output_models = models  # type: ignore # ignore this here only if we are checking the return type of `retrieve_models` is not nested!!
+            self.export_io_models()
+
         best_model = models[0]
         assert isinstance(best_model, PDBFile), "Best model is not a PDBFile"
         best_model_fname = best_model.rel_path
@@ -150,5 +156,6 @@ class HaddockModule(BaseHaddockModule):
 
         # Send models to the next step,
         #  no operation is done on them
-        self.output_models = models  # type: ignore # ignore this here only if we are checking the return type of `retrieve_models` is not nested!!
-        self.export_io_models()
+        if not self.runs_in_background:
+            self.output_models = models  # type: ignore # ignore this here only if we are checking the return type of `retrieve_models` is not nested!!
+            self.export_io_models()
@@ -17,7 +17,6 @@ from haddock.core.typing import Union
 from haddock.fcc import calc_fcc_matrix, cluster_fcc
 from haddock.libs.libclust import (
     add_cluster_info,
-    get_cluster_matrix_plot_clt_dt,
     plot_cluster_matrix,
     rank_clusters,
     write_structure_list,
@@ -181,10 +180,6 @@ class HaddockModule(BaseHaddockModule):
                 final_order_idx.append(models_to_clust.index(pdb))
                 labels.append(pdb.file_name.replace(".pdb", ""))
                 cluster_ids.append(pdb.clt_id)
-            # Get custom cluster data
-            matrix_cluster_dt, cluster_limits = get_cluster_matrix_plot_clt_dt(
-                cluster_ids
-            )
 
             # Define output filename
             html_matrix_basepath = "fcc_matrix"
@@ -196,8 +191,8 @@ class HaddockModule(BaseHaddockModule):
                 dttype="FCC",
                 diag_fill=1,
                 output_fname=html_matrix_basepath,
-                matrix_cluster_dt=matrix_cluster_dt,
-                cluster_limits=cluster_limits,
+                cluster_ids=cluster_ids,
+                max_size=self.params["plot_matrix_max_size"],
             )
             if html_matrixpath:
                 log.info(f"Plotting matrix in {html_matrixpath}")
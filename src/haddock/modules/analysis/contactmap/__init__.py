@@ -14,10 +14,12 @@ connecting with *chords* the two residues that are contacting.
 """
 
 from copy import deepcopy
+from math import ceil
 from pathlib import Path
 
 from haddock.core.defaults import MODULE_DEFAULT_YAML
 from haddock.core.typing import Any, FilePath, SupportsRunT
+from haddock.libs.libparallel import GenericTask
 from haddock.modules import BaseHaddockModule
 from haddock.modules import get_engine
 from haddock.modules.analysis import get_analysis_exec_mode
@@ -28,6 +30,7 @@ from haddock.modules.analysis.contactmap.contmap import (
     get_clusters_sets,
     make_contactmap_report,
     topX_models,
+    write_partial_contacts,
     )
 
 
@@ -39,6 +42,7 @@ class HaddockModule(BaseHaddockModule):
     """HADDOCK3 module to compute complexes contacts and generate heatmap."""
 
     name = RECIPE_PATH.name
+    passes_models = True
 
     def __init__(
             self,
@@ -67,9 +71,55 @@ class HaddockModule(BaseHaddockModule):
         except AttributeError as e:
             self.finish_with_error(e)
 
+        if self.runs_in_background:
+            self.output_models = models
+            self.export_io_models()
+
         # Obtain clusters
         clusters_sets = get_clusters_sets(models)
 
+        # Find execution engine
+        exec_mode = get_analysis_exec_mode(self.params["mode"])
+        Engine = get_engine(exec_mode, self.params)
+
+        # Accumulate contacts of large clusters by chunks, so that their
+        # members are spread over all the workers
+        clustered = [
+            clt_models
+            for clustid, clt_models in clusters_sets.items()
+            if clustid is not None
+            ]
+        chunk_size = max(
+            1,
+            ceil(sum(map(len, clustered)) / self.params["ncores"]),
+            )
+        chunk_tasks: list[SupportsRunT] = []
+        clusters_partials: dict[Any, list[Path]] = {}
+        for clustid, clt_models in clusters_sets.items():
+            if clustid is None or len(clt_models) <= chunk_size:
+                continue
+            for start in range(0, len(clt_models), chunk_size):
+                chunk = [
+                    Path(model.rel_path)
+                    for model in clt_models[start:start + chunk_size]
+                    ]
+                partial = Path(f"cluster{clustid}_contmap.part{start}.pkl")
+                outputs = [
+                    f"cluster{clustid}_contmap_{model.stem}"
+                    for model in chunk
+                    ]
+                chunk_tasks.append(GenericTask(
+                    write_partial_contacts,
+                    chunk,
+                    outputs,
+                    self.params,
+                    partial,
+                    ))
+                clusters_partials.setdefault(clustid, []).append(partial)
+        if chunk_tasks:
+            engine = Engine(chunk_tasks)
+            engine.run()
+
         # Initiate holder of all jobs to be run by the `Scheduler`
         contact_jobs: list[SupportsRunT] = []
         # Loop over clusters
@@ -112,13 +162,11 @@ class HaddockModule(BaseHaddockModule):
                         [Path(model.rel_path) for model in clt_models],
                         Path(f"cluster{clustid}_contmap"),
                         self.params,
+                        partials=clusters_partials.get(clustid),
                         ),
                     )
                 contact_jobs.append(contmap_job)
 
-        # Find execution engine
-        exec_mode = get_analysis_exec_mode(self.params["mode"])
-        Engine = get_engine(exec_mode, self.params)
         engine = Engine(contact_jobs)
         engine.run()
 
@@ -126,5 +174,6 @@ class HaddockModule(BaseHaddockModule):
         make_contactmap_report(contact_jobs, "ContactMapReport.html")
 
         # Send models to the next step, no operation is done on them
-        self.output_models = models
-        self.export_io_models()
+        if not self.runs_in_background:
+            self.output_models = models
+            self.export_io_models()
@@ -7,6 +7,7 @@ https://plotly.com/python/v3/filled-chord-diagram/
 
 import os
 import glob
+import pickle
 from pathlib import Path
 
 import numpy as np
@@ -193,6 +194,39 @@ class ContactsMap():
 
     def run(self):
         """Process analysis of contacts of a PDB structure."""
+        # Compute contacts
+        contacts = self.compute_contacts()
+        # Convert them to list of dictionaries
+        res_res_contacts, all_heavy_interchain_contacts = contacts_to_records(
+            contacts,
+            )
+
+        # generate outputs for single models
+        if self.params['single_model_analysis']:
+            self.generate_output(
+                res_res_contacts, all_heavy_interchain_contacts,
+                )
+
+        return res_res_contacts, all_heavy_interchain_contacts
+
+    def compute_contacts(self) -> dict[str, Any]:
+        """Compute residue-residue and interchain heavy atoms contacts.
+
+        Return
+        ------
+        contacts : dict[str, Any]
+            Dictionary holding the contacts data as numpy arrays:
+
+            - 'resid_keys': ordered list of residues keys.
+            - 'resnames': ordered list of residues names.
+            - 'has_ca': boolean array, True if the residue holds a CA.
+            - 'ca-ca-dist': rounded Ca-Ca distances of the residues
+              half-matrix (upper triangle, row-major order).
+            - 'shortest-dist': rounded shortest distances of the residues
+              half-matrix (upper triangle, row-major order).
+            - 'heavy_atoms': tuple of (atom1 keys, atom2 keys, distances)
+              of the interchain heavy atoms contacts.
+        """
         # Load pdb
         pdb_dt = extract_pdb_dt(self.model)
         # Extract all cordinates
@@ -200,41 +234,73 @@ class ContactsMap():
         # Compute distance matrix
         full_dist_matrix = compute_distance_matrix(all_coords)
 
-        res_res_contacts = []
-        all_heavy_interchain_contacts = []
-        # First loop over residues
-        for ri, reskey_1 in enumerate(resid_keys):
-            # Second loop over residues (half matrix only)
-            for _rj, reskey_2 in enumerate(resid_keys[ri + 1:], start=ri + 1):
-                # Extract data
-                contact_dt = gen_contact_dt(
-                    full_dist_matrix,
-                    resid_dt,
-                    reskey_1,
-                    reskey_2,
-                    )
-                res_res_contacts.append(contact_dt)
+        # Residues data
+        resnames = [resid_dt[reskey]['resname'] for reskey in resid_keys]
+        nb_atoms = np.array([
+            len(resid_dt[reskey]['atoms_indices'])
+            for reskey in resid_keys
+            ])
+        res_starts = np.concatenate(([0], np.cumsum(nb_atoms)[:-1]))
+        ca_indices = np.array([
+            resid_dt[reskey].get('CA', -1)
+            for reskey in resid_keys
+            ])
+        has_ca = ca_indices >= 0
+        # Indices of the residues half-matrix
+        res_i, res_j = np.triu_indices(len(resid_keys), k=1)
+
+        # Ca-Ca distances
+        ca_ca_dist = np.full(res_i.shape, 9999.0)
+        both_ca = has_ca[res_i] & has_ca[res_j]
+        ca_ca_dist[both_ca] = full_dist_matrix[
+            ca_indices[res_i[both_ca]],
+            ca_indices[res_j[both_ca]],
+            ]
 
-                # Extract interchain heavy atoms data
-                if reskey_2.split('-')[0] == reskey_1.split('-')[0]:
-                    continue
-                heavy_atoms_contacts = extract_heavyatom_contacts(
-                    full_dist_matrix,
-                    resid_dt,
-                    reskey_1,
-                    reskey_2,
-                    contact_distance=self.params['shortest_dist_threshold'],
-                    )
-                all_heavy_interchain_contacts += heavy_atoms_contacts
+        # Shortest distances between residues atoms, using the fact
+        # that atoms of a residue are contiguous in the matrix
+        res_min_dist = np.minimum.reduceat(
+            np.minimum.reduceat(full_dist_matrix, res_starts, axis=0),
+            res_starts,
+            axis=1,
+            )
+        shortest_dist = res_min_dist[res_i, res_j]
+
+        # Interchain heavy atoms contacts
+        atom_resid = np.repeat(np.arange(len(resid_keys)), nb_atoms)
+        chainids = np.array([reskey.split('-')[0] for reskey in resid_keys])
+        atom_chain = chainids[atom_resid]
+        contact_mask = np.triu(
+            full_dist_matrix <= self.params['shortest_dist_threshold'],
+            k=1,
+            )
+        contact_mask &= atom_chain[:, None] != atom_chain[None, :]
+        atm_i, atm_j = np.nonzero(contact_mask)
+        # Order contacts by residue pairs first, then by atoms
+        order = np.lexsort((atm_j, atm_i, atom_resid[atm_j], atom_resid[atm_i]))
+        atm_i = atm_i[order]
+        atm_j = atm_j[order]
+        atom_keys = [
+            f'{reskey}-{atname}'
+            for reskey in resid_keys
+            for atname in resid_dt[reskey]['atoms_order']
+            ]
+        heavy_atoms = (
+            [atom_keys[i] for i in atm_i],
+            [atom_keys[j] for j in atm_j],
+            full_dist_matrix[atm_i, atm_j],
+            )
 
-        # generate outputs for single models
-        if self.params['single_model_analysis']:
-            self.generate_output(
-                res_res_contacts, all_heavy_interchain_contacts,
-                )
+        contacts = {
+            'resid_keys': resid_keys,
+            'resnames': resnames,
+            'has_ca': has_ca,
+            'ca-ca-dist': np.round(ca_ca_dist, 1),
+            'shortest-dist': np.round(shortest_dist, 1),
+            'heavy_atoms': heavy_atoms,
+            }
+        return contacts
 
-        return res_res_contacts, all_heavy_interchain_contacts
-    
     def generate_output(
             self,
             res_res_contacts: list[dict],
@@ -311,6 +377,183 @@ class ContactsMap():
         self.files['atom-atom-interchain-contacts'] = fpath2
 
 
+class ContactsAccumulator():
+    """Running sums of the contacts of a set of models.
+
+    Residues are mapped to integer indices, in order of appearance, and the
+    distances of each residue pair are summed (in tenth of Angstrom) into
+    square matrices indexed by these residues, so that the memory used does
+    not depend on the number of models.
+    """
+
+    def __init__(self, params: dict) -> None:
+        self.thresholds = {
+            'ca-ca-dist': params['ca_ca_dist_threshold'],
+            'shortest-dist': params['shortest_dist_threshold'],
+            }
+        self.res_indices: dict[str, int] = {}
+        self.res_names: list[str] = []
+        # Residue pairs, in order of appearance
+        self.pairs_res1 = np.array([], dtype=np.int64)
+        self.pairs_res2 = np.array([], dtype=np.int64)
+        # Matrices indexed by (lowest, highest) residue index
+        self.observed = np.zeros((0, 0), dtype=np.int32)
+        self.sums = {
+            data_key: np.zeros((0, 0), dtype=np.int64)
+            for data_key in self.thresholds
+            }
+        self.nb_under = {
+            data_key: np.zeros((0, 0), dtype=np.int32)
+            for data_key in self.thresholds
+            }
+        # Interchain heavy atoms contacts of each model
+        self.heavy_atoms: list[tuple] = []
+
+    def _index_residues(
+            self,
+            resid_keys: list[str],
+            resnames: list[str],
+            ) -> NDArray:
+        """Map residues keys to integer indices, adding new residues."""
+        for reskey, resname in zip(resid_keys, resnames):
+            if reskey not in self.res_indices:
+                self.res_indices[reskey] = len(self.res_indices)
+                self.res_names.append(resname)
+        # Grow matrices to hold new residues
+        nb_new = len(self.res_indices) - len(self.observed)
+        if nb_new > 0:
+            self.observed = np.pad(self.observed, (0, nb_new))
+            for data_key in self.thresholds:
+                self.sums[data_key] = np.pad(self.sums[data_key], (0, nb_new))
+                self.nb_under[data_key] = np.pad(
+                    self.nb_under[data_key],
+                    (0, nb_new),
+                    )
+        return np.array(
+            [self.res_indices[reskey] for reskey in resid_keys],
+            dtype=np.int64,
+            )
+
+    def _add_pairs(
+            self,
+            first: NDArray,
+            second: NDArray,
+            observed: Union[int, NDArray],
+            sums: dict[str, NDArray],
+            nb_under: dict[str, NDArray],
+            ) -> None:
+        """Add the data of distinct residue pairs."""
+        low = np.minimum(first, second)
+        high = np.maximum(first, second)
+        new_pairs = self.observed[low, high] == 0
+        self.pairs_res1 = np.concatenate((self.pairs_res1, first[new_pairs]))
+        self.pairs_res2 = np.concatenate((self.pairs_res2, second[new_pairs]))
+        self.observed[low, high] += observed
+        for data_key in self.thresholds:
+            self.sums[data_key][low, high] += sums[data_key]
+            self.nb_under[data_key][low, high] += nb_under[data_key]
+
+    def add(self, contacts: dict[str, Any]) -> None:
+        """Add the contacts of a model.
+
+        Parameters
+        ----------
+        contacts : dict[str, Any]
+            Contacts of the model, as returned by
+            `ContactsMap.compute_contacts()`.
+        """
+        resids = self._index_residues(
+            contacts['resid_keys'],
+            contacts['resnames'],
+            )
+        res_i, res_j = np.triu_indices(len(resids), k=1)
+        tenths = {
+            data_key: np.rint(contacts[data_key] * 10).astype(np.int64)
+            for data_key in self.thresholds
+            }
+        self._add_pairs(
+            resids[res_i],
+            resids[res_j],
+            1,
+            tenths,
+            {
+                data_key: tenths[data_key] / 10 <= threshold
+                for data_key, threshold in self.thresholds.items()
+                },
+            )
+        self.heavy_atoms.append(contacts['heavy_atoms'])
+
+    def merge(self, other: "ContactsAccumulator") -> None:
+        """Add the contacts accumulated from other models.
+
+        Merging the contacts of consecutive sets of models, in order, gives
+        the same residues and residue pairs order as adding each model.
+        """
+        resids = self._index_residues(list(other.res_indices), other.res_names)
+        low = np.minimum(other.pairs_res1, other.pairs_res2)
+        high = np.maximum(other.pairs_res1, other.pairs_res2)
+        self._add_pairs(
+            resids[other.pairs_res1],
+            resids[other.pairs_res2],
+            other.observed[low, high],
+            {
+                data_key: sums[low, high]
+                for data_key, sums in other.sums.items()
+                },
+            {
+                data_key: nb_under[low, high]
+                for data_key, nb_under in other.nb_under.items()
+                },
+            )
+        self.heavy_atoms.extend(other.heavy_atoms)
+
+    def res_contacts(self) -> list[dict]:
+        """Summarize the residue-residue contacts of all models.
+
+        Return
+        ------
+        combined_clusters_list : list[dict]
+            Aggregated residue-residue contacts data.
+        """
+        low = np.minimum(self.pairs_res1, self.pairs_res2)
+        high = np.maximum(self.pairs_res1, self.pairs_res2)
+        nb_observed = self.observed[low, high]
+        # Averages rounded to the tenth of Angstrom, half up, using
+        # integer arithmetic so that ties do not depend on float errors
+        averages = {
+            data_key: (2 * sums[low, high] + nb_observed)
+            // (2 * nb_observed) / 10
+            for data_key, sums in self.sums.items()
+            }
+        probabilities = {
+            data_key: nb_under[low, high] / nb_observed
+            for data_key, nb_under in self.nb_under.items()
+            }
+
+        reskeys = list(self.res_indices)
+        combined_clusters_list = []
+        for slot, (ri, rj) in enumerate(zip(self.pairs_res1, self.pairs_res2)):
+            combined_clusters_list.append({
+                'res1': reskeys[ri],
+                'res2': reskeys[rj],
+                'ca-ca-dist': averages['ca-ca-dist'][slot],
+                'ca-ca-cont-probability': round(
+                    probabilities['ca-ca-dist'][slot],
+                    2,
+                    ),
+                'shortest-dist': averages['shortest-dist'][slot],
+                'shortest-cont-probability': round(
+                    probabilities['shortest-dist'][slot],
+                    2,
+                    ),
+                'contact-type': get_cont_type(
+                    self.res_names[ri],
+                    self.res_names[rj],
+                    ),
+                })
+        return combined_clusters_list
+
+
 class ClusteredContactMap():
     """ContactMap analysis for set of clustered structures."""
 
@@ -319,102 +562,95 @@ class ClusteredContactMap():
             models: list[Path],
             output: Path,
             params: dict,
+            partials: Optional[list[Path]] = None,
             ) -> None:
         self.models = models
         self.output = output
         self.params = params
+        self.partials = partials
         self.files: dict[str, Union[str, Path]] = {}
         self.terminated = False
 
     @staticmethod
-    def aggregate_contacts(
-            contacts_holder: dict,
-            contact_keys: list[str],
-            contacts: list[dict],
-            key1: str,
-            key2: str,
-            ) -> None:
-        """Aggregate single models data belonging to a cluster.
+    def aggregate_heavyatoms_contacts(
+            models_heavy_atoms: list[tuple],
+            ) -> list[dict]:
+        """Aggregate interchain heavy atoms contacts of the cluster members.
 
         Parameters
         ----------
-        contacts_holder : dict
-            Dictionnary holding list of contact data
-        contact_keys : list[str]
-            Order of the keys to access the dictionnary
-        contacts : list[dict]
-            Singel model contact data.
-        key1 : str
-            Name of the key to access first entry in data.
-        key2 : str
-            Name of the key to access second entry in data.
+        models_heavy_atoms : list[tuple]
+            Interchain heavy atoms contacts of each model, as the
+            'heavy_atoms' of `ContactsMap.compute_contacts()`.
+
+        Return
+        ------
+        heavy_atm_clust_list : list[dict]
+            Cluster aggregated interchain atom-atom contacts data.
         """
-        # Parse outputs to aggregate contacts in `clusters_contacts`
-        for cont in contacts:
-            # Check key
-            combined_key = f'{cont[key2]}/{cont[key1]}'  # resversed
-            if combined_key not in contacts_holder.keys():
-                combined_key = f'{cont[key1]}/{cont[key2]}'  # normal
-                if combined_key not in contacts_holder.keys():
-                    # Add key order
-                    contact_keys.append(combined_key)
-                    # Initiate key
-                    contacts_holder[combined_key] = {
-                        k: []
-                        for k in cont.keys()
-                        if k not in [key1, key2]
-                        }
-            # Add data
-            for dtk in contacts_holder[combined_key].keys():
-                contacts_holder[combined_key][dtk].append(cont[dtk])
-
-    def run(self):
-        """Process analysis of contacts of a set of PDB structures."""
-        # initiate holding variables
-        clusters_contacts = {}  # Residue-residue contacts
-        resres_keys_list = []  # Ordered residue-residue contacts keys
-        clusters_heavyatm_contacts = {}  # Interchain atom-atom contacts
-        atat_keys_list = []  # Ordered interchain atom-atom contacts keys
-
-        # loop over models/structures
-        for pdb_path in self.models:
-            # initiate object
-            contact_map_obj = ContactsMap(
-                pdb_path,
-                f'{self.output}_{pdb_path.stem}',
-                self.params,
-                )
-            # Run it
-            pdb_contacts, interchain_heavy_contacts = contact_map_obj.run()
-
-            # Parse outputs to aggregate contacts in `clusters_contacts`
-            self.aggregate_contacts(
-                clusters_contacts, resres_keys_list,
-                pdb_contacts,
-                "res1", "res2",
-                )
-
-            # Parse outputs for heavy atoms contacts
-            self.aggregate_contacts(
-                clusters_heavyatm_contacts, atat_keys_list,
-                interchain_heavy_contacts,
-                "atom1", "atom2",
-                )
+        # Map atoms keys to integer indices
+        atom_indices: dict[str, int] = {}
+        atoms1: list[int] = []
+        atoms2: list[int] = []
+        all_dists: list[NDFloat] = []
+        for atom1_keys, atom2_keys, dists in models_heavy_atoms:
+            for atkey1, atkey2 in zip(atom1_keys, atom2_keys):
+                for atkey, atoms in ((atkey1, atoms1), (atkey2, atoms2)):
+                    if atkey not in atom_indices:
+                        atom_indices[atkey] = len(atom_indices)
+                    atoms.append(atom_indices[atkey])
+            all_dists.append(dists)
+        first = np.array(atoms1, dtype=np.int64)
+        second = np.array(atoms2, dtype=np.int64)
+        dists = np.concatenate(all_dists) if all_dists else np.array([])
+
+        # Identify atom pairs regardless of atoms order
+        pair_codes = (
+            np.minimum(first, second) * len(atom_indices)
+            + np.maximum(first, second)
+            )
+        _, first_seen, pair_ids, counts = np.unique(
+            pair_codes,
+            return_index=True,
+            return_inverse=True,
+            return_counts=True,
+            )
+        # Group distances by atom pairs, keeping models order
+        grouped_dists = np.split(
+            dists[np.argsort(pair_ids, kind='stable')],
+            np.cumsum(counts)[:-1],
+            )
 
-        # Initiate heavy atoms contact cluster aggrated data
+        # Summerize it, in order of appearance
+        atkeys = list(atom_indices)
         heavy_atm_clust_list = []
-        for atatk in atat_keys_list:
-            at1, at2 = atatk.split('/')
-            # point corresponding list of distances
-            h_dists = clusters_heavyatm_contacts[atatk]['dist']
-            # Summerize it
+        for pair_id in np.argsort(first_seen):
+            h_dists = grouped_dists[pair_id]
             heavy_atm_clust_list.append({
-                "atom1": at1,
-                "atom2": at2,
+                "atom1": atkeys[first[first_seen[pair_id]]],
+                "atom2": atkeys[second[first_seen[pair_id]]],
                 "nb_dists": len(h_dists),
                 "avg_dist": round(np.mean(h_dists), 2),
                 "std_dist": round(np.std(h_dists), 2),
                 })
+        return heavy_atm_clust_list
+
+    def run(self):
+        """Process analysis of contacts of a set of PDB structures."""
+        # Accumulate contacts of the models, unless it was done by chunks
+        if self.partials is None:
+            contacts = accumulate_contacts(
+                self.models,
+                [f'{self.output}_{pdb_path.stem}' for pdb_path in self.models],
+                self.params,
+                )
+        else:
+            contacts = merge_partial_contacts(self.partials)
+
+        # Initiate heavy atoms contact cluster aggrated data
+        heavy_atm_clust_list = self.aggregate_heavyatoms_contacts(
+            contacts.heavy_atoms,
+            )
         # write contacts
         header = ['atom1', 'atom2']
         header += [
@@ -429,57 +665,8 @@ class ClusteredContactMap():
         log.info(f'Generated heavy atoms interchain contacts file: {hfpath}')
         
         # Initiate cluster aggregated data holder
-        combined_clusters_list = []
-        # Loop over ordered keys
-        for combined_key in resres_keys_list:
-            # point data
-            dt = clusters_contacts[combined_key]
-
-            # Compute averages Ca-Ca distances
-            avg_ca_ca_dist = np.mean(dt['ca-ca-dist'])
-            # Compute nb. times cluster members holds a value under threshold
-            ca_ca_under_thresh = [
-                v for v in dt['ca-ca-dist']
-                if v <= self.params['ca_ca_dist_threshold']
-                ]
-            nb_under = len(ca_ca_under_thresh)
-            # Compute probability
-            ca_ca_cont_probability = nb_under / len(dt['ca-ca-dist'])
-
-            # Compute averages for shortest distances
-            avg_shortest = np.mean(dt['shortest-dist'])
-            # Generate list of shortest distances observed between two residues
-            short_under_threshold = [
-                v for v in dt['shortest-dist']
-                if v <= self.params['shortest_dist_threshold']
-                ]
-            short_nb_und = len(short_under_threshold)
-            # Compute nb. time the cluster members holds a value under threshold
-            short_cont_proba = short_nb_und / len(dt['shortest-dist'])
-
-            # Find most representative contact type
-            cont_ts = list(set(dt['contact-type']))
-            # Decreasing sorting of cluster contact types and pick highest one
-            cont_t = sorted(
-                cont_ts,
-                key=lambda k: cont_ts.count(k),
-                reverse=True,
-                )[0]
-
-            # Split key to recover resiudes names
-            res1, res2 = combined_key.split('/')
-
-            # Hold summary data for cluster
-            combined_clusters_list.append({
-                'res1': res1,
-                'res2': res2,
-                'ca-ca-dist': round(avg_ca_ca_dist, 1),
-                'ca-ca-cont-probability': round(ca_ca_cont_probability, 2),
-                'shortest-dist': round(avg_shortest, 1),
-                'shortest-cont-probability': round(short_cont_proba, 2),
-                'contact-type': cont_t,
-                })
-        
+        combined_clusters_list = contacts.res_contacts()
+
         # write contacts
         header = ['res1', 'res2']
         header += [
@@ -664,6 +851,166 @@ def topX_models(models: list[PDBFile], topX: int = 10) -> list[Any]:
 ####################
 # Define functions #
 ####################
+def extract_model_contacts(
+        model: Path,
+        output: Union[str, Path],
+        params: dict,
+        ) -> dict[str, Any]:
+    """Compute contacts of a single model of a cluster.
+
+    Parameters
+    ----------
+    model : Path
+        Path to the pdb file of the model.
+    output : Union[str, Path]
+        Basename of the single model analysis output files.
+    params : dict
+        The module parameters.
+
+    Return
+    ------
+    contacts : dict[str, Any]
+        Contacts data, as returned by `ContactsMap.compute_contacts()`.
+    """
+    contact_map_obj = ContactsMap(model, output, params)
+    contacts = contact_map_obj.compute_contacts()
+    # generate outputs for single models
+    if params['single_model_analysis']:
+        contact_map_obj.generate_output(*contacts_to_records(contacts))
+    return contacts
+
+
+def accumulate_contacts(
+        models: list[Path],
+        outputs: list[str],
+        params: dict,
+        ) -> ContactsAccumulator:
+    """Accumulate the contacts of a set of models, one model at a time.
+
+    Parameters
+    ----------
+    models : list[Path]
+        Paths to the pdb files of the models.
+    outputs : list[str]
+        Basename of the single model analysis output files of each model.
+    params : dict
+        The module parameters.
+
+    Return
+    ------
+    contacts : :py:class:`ContactsAccumulator`
+        Running sums of the contacts of the models.
+    """
+    contacts = ContactsAccumulator(params)
+    for model, output in zip(models, outputs):
+        contacts.add(extract_model_contacts(model, output, params))
+    return contacts
+
+
+def write_partial_contacts(
+        models: list[Path],
+        outputs: list[str],
+        params: dict,
+        partial: Path,
+        ) -> Path:
+    """Accumulate the contacts of a chunk of a cluster into a file.
+
+    Parameters
+    ----------
+    models : list[Path]
+        Paths to the pdb files of the models of the chunk.
+    outputs : list[str]
+        Basename of the single model analysis output files of each model.
+    params : dict
+        The module parameters.
+    partial : Path
+        Path to the file where the accumulated contacts are pickled.
+
+    Return
+    ------
+    partial : Path
+        Path to the written file.
+    """
+    contacts = accumulate_contacts(models, outputs, params)
+    with open(partial, 'wb') as fout:
+        pickle.dump(contacts, fout)
+    return partial
+
+
+def merge_partial_contacts(partials: list[Path]) -> ContactsAccumulator:
+    """Merge, in order, the contacts accumulated by chunks of a cluster.
+
+    Files are removed once read.
+
+    Parameters
+    ----------
+    partials : list[Path]
+        Files written by :py:func:`write_partial_contacts`, in the order of
+        the models of the cluster.
+
+    Return
+    ------
+    contacts : :py:class:`ContactsAccumulator`
+        Running sums of the contacts of all the models.
+    """
+    contacts: Optional[ContactsAccumulator] = None
+    for partial in partials:
+        if not Path(partial).exists():
+            raise RuntimeError(
+                f"Could not compute contacts of the models of {partial}"
+                )
+        with open(partial, 'rb') as fin:
+            chunk_contacts = pickle.load(fin)
+        Path(partial).unlink()
+        if contacts is None:
+            contacts = chunk_contacts
+        else:
+            contacts.merge(chunk_contacts)
+    return contacts  # type: ignore
+
+
+def contacts_to_records(
+        contacts: dict[str, Any],
+        ) -> tuple[list[dict], list[dict]]:
+    """Convert contacts arrays into lists of dictionaries.
+
+    Parameters
+    ----------
+    contacts : dict[str, Any]
+        Contacts data, as returned by `ContactsMap.compute_contacts()`.
+
+    Return
+    ------
+    res_res_contacts : list[dict]
+        List of residue-residue contacts.
+    all_heavy_interchain_contacts : list[dict]
+        List of heavy atoms interchain contacts.
+    """
+    resid_keys = contacts['resid_keys']
+    resnames = contacts['resnames']
+    has_ca = contacts['has_ca']
+    ca_ca_dists = contacts['ca-ca-dist']
+    shortest_dists = contacts['shortest-dist']
+    res_res_contacts = []
+    res_i, res_j = np.triu_indices(len(resid_keys), k=1)
+    for k, (ri, rj) in enumerate(zip(res_i, res_j)):
+        res_res_contacts.append({
+            'res1': resid_keys[ri],
+            'res2': resid_keys[rj],
+            'ca-ca-dist': (
+                ca_ca_dists[k] if has_ca[ri] and has_ca[rj] else 9999
+                ),
+            'shortest-dist': shortest_dists[k],
+            'contact-type': get_cont_type(resnames[ri], resnames[rj]),
+            })
+
+    all_heavy_interchain_contacts = [
+        {'atom1': atom1, 'atom2': atom2, 'dist': dist}
+        for atom1, atom2, dist in zip(*contacts['heavy_atoms'])
+        ]
+    return res_res_contacts, all_heavy_interchain_contacts
+
+
 def extract_pdb_dt(path: Path) -> dict:
     """Read and extract ATOM/HETATM records from a pdb file.
 
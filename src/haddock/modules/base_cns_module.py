@@ -5,10 +5,15 @@ from pathlib import Path
 
 from haddock import log
 from haddock import toppar_path as global_toppar
-from haddock.core.defaults import cns_exec as global_cns_exec
+from haddock.core.defaults import get_cns_exec
 from haddock.core.typing import Any, FilePath, Optional, Union
 from haddock.gear.expandable_parameters import populate_mol_parameters_in_module
+from haddock.gear.restraints_store import (
+    get_archive_prefix,
+    read_archive_index,
+    )
 from haddock.libs.libio import working_directory
+from haddock.libs.libperf import profile_step
 from haddock.libs.libutil import sort_numbered_paths
 from haddock.modules import BaseHaddockModule
 
@@ -41,24 +46,26 @@ class BaseCNSModule(BaseHaddockModule):
         """Execute the module."""
         log.info(f'Running [{self.name}] module')
 
-        self.update_params(**params)
+        with profile_step(self.name, self.path) as profile:
+            with profile.phase("setup"):
+                self.update_params(**params)
 
-        # the `mol_*` parameters exist only for CNS jobs.
-        if self._num_of_input_molecules:
-            populate_mol_parameters_in_module(
-                self._params,
-                self._num_of_input_molecules,
-                self._original_params,
-                )
+                # the `mol_*` parameters exist only for CNS jobs.
+                if self._num_of_input_molecules:
+                    populate_mol_parameters_in_module(
+                        self._params,
+                        self._num_of_input_molecules,
+                        self._original_params,
+                        )
 
-        self.add_parent_to_paths()
-        self.envvars = self.default_envvars()
+                self.add_parent_to_paths()
+                self.envvars = self.default_envvars()
 
-        if self.params['self_contained']:
-            self.make_self_contained()
+                if self.params['self_contained']:
+                    self.make_self_contained()
 
-        with working_directory(self.path):
-            self._run()
+            with working_directory(self.path), profile.module():
+                self._run()
 
         log.info(f'Module [{self.name}] finished.')
 
@@ -106,7 +113,7 @@ class BaseCNSModule(BaseHaddockModule):
         self.envvars = self.default_envvars()
         self.save_envvars()
 
-        _cns_exec = self.params["cns_exec"] or global_cns_exec
+        _cns_exec = self.params["cns_exec"] or get_cns_exec()
         new_cns = Path(".", Path(_cns_exec).name)
         if not new_cns.exists():
             self.params["cns_exec"] = shutil.copyfile(_cns_exec, new_cns)
@@ -132,18 +139,26 @@ class BaseCNSModule(BaseHaddockModule):
         ambig_fnames = None
         if ambig_fname:
             if ambig_fname.name.endswith("tgz"):
-                exp_name = ambig_fname.name.split(".tbl.tgz")[0]
+                exp_name = get_archive_prefix(ambig_fname)
                 exp_dir = ambig_fname.parent
-                self.log(f"Searching for {exp_name}*tbl files in {exp_dir}")
-                path = ambig_fname.parent
-                ambig_fnames = list(path.glob(f"{exp_name}*tbl"))
+                ambig_fnames = read_archive_index(ambig_fname)
+                if ambig_fnames is not None:
+                    self.log(f"Reading the {exp_name}*tbl files index")
+                else:
+                    # archives extracted by older versions
+                    self.log(f"Searching for {exp_name}*tbl files in {exp_dir}")
+                    ambig_fnames = sort_numbered_paths(
+                        *exp_dir.glob(f"{exp_name}*tbl")
+                        )
                 # abort execution if no files are found
                 if len(ambig_fnames) == 0:
                     raise Exception(
                         f"No {exp_name}*tbl files found in {exp_dir}"
                         )
-                self.log(f"Found {len(ambig_fnames)} compatible tbl files")
-                ambig_fnames = sort_numbered_paths(*ambig_fnames)
+                self.log(
+                    f"Found {len(ambig_fnames)} compatible tbl files, "
+                    f"{len(set(ambig_fnames))} distinct"
+                    )
         else:
             if self.params["previous_ambig"]:
                 # check if there is restraint information in all models
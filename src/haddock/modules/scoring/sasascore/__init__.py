@@ -29,6 +29,7 @@ from haddock.libs.libutil import parse_ncores
 from haddock.libs.libparallel import get_index_list, Scheduler
 from haddock.modules.scoring.sasascore.sasascore import (
     AccScore,
+    ChainSASACache,
     extract_data_from_accscore_class
     )
 
@@ -81,6 +82,13 @@ class HaddockModule(ScoringModule):
         buried_resdic.pop("_")
         acc_resdic.pop("_")
         
+        # cache of isolated chains accessibility, shared by the jobs
+        chain_cache = None
+        if self.params["rigid_chain_reuse"]:
+            chain_cache = ChainSASACache(
+                tolerance=self.params["rigid_chain_tolerance"],
+                )
+
         self.output_models: list[PDBFile] = []
         # initialize jobs
         sasascore_jobs: list[AccScore] = []
@@ -92,6 +100,7 @@ class HaddockModule(ScoringModule):
                 acc_resdic=acc_resdic,
                 cutoff=self.params["cutoff"],
                 probe_radius=self.params["probe_radius"],
+                chain_cache=chain_cache,
                 )
             sasascore_jobs.append(accscore_obj)
             # append model to output models
@@ -1,16 +1,219 @@
 """Accessibility scoring calculations."""
 import copy
+from functools import partial
 from pathlib import Path
 
 from typing import Optional
 
+import numpy as np
+from freesasa import Structure, calcCoord
+from scipy.spatial import cKDTree
+
 from haddock.libs.libio import write_nested_dic_to_file
 from haddock import log
-from haddock.core.typing import ParamDict
+from haddock.core.typing import NDFloat, ParamDict
 from haddock.clis.restraints.calc_accessibility import (
     apply_cutoff,
     get_accessibility,
+    get_sasa_parameters,
     )
+from haddock.libs.librestraints import DEFAULT_PROBE_RADIUS
+
+
+class ChainSASACache:
+    """Accessibility of isolated chains, reusable for their rigid copies.
+
+    The cache is local to a process: it is shared (not copied) by the
+    objects holding it and is emptied when pickled to another process.
+    """
+
+    def __init__(self, tolerance: float, max_references: int = 8) -> None:
+        """Initialise the cache.
+
+        Parameters
+        ----------
+        tolerance : float
+            Maximum deviation (in Angstrom) of any atom, after optimal
+            superimposition, for a chain to be considered a rigid copy of
+            a cached one.
+        max_references : int
+            Maximum number of cached conformations per chain composition.
+        """
+        self.tolerance = tolerance
+        self.max_references = max_references
+        self.entries: dict[int, list[tuple[NDFloat, NDFloat]]] = {}
+
+    def __deepcopy__(self, memo: dict) -> "ChainSASACache":
+        return self
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["entries"] = {}
+        return state
+
+    def lookup(self, key: int, coords: NDFloat) -> Optional[NDFloat]:
+        """Find the atomic areas of a cached rigid copy of a chain.
+
+        Parameters
+        ----------
+        key : int
+            Hash of the chain atomic composition.
+        coords : NDFloat
+            Coordinates of the chain atoms.
+
+        Returns
+        -------
+        areas : Optional[NDFloat]
+            Areas of the atoms of the isolated chain, or None if no rigid
+            copy of the chain is cached.
+        """
+        for ref_coords, ref_areas in self.entries.get(key, []):
+            deviation = max_superimposed_deviation(ref_coords, coords)
+            if deviation <= self.tolerance:
+                return ref_areas
+        return None
+
+    def add(self, key: int, coords: NDFloat, areas: NDFloat) -> None:
+        """Cache the atomic areas of an isolated chain conformation."""
+        references = self.entries.setdefault(key, [])
+        if len(references) < self.max_references:
+            references.append((coords, areas))
+
+    def is_full(self, key: int) -> bool:
+        """Check if no more conformations can be cached for a chain."""
+        return len(self.entries.get(key, [])) >= self.max_references
+
+
+def max_superimposed_deviation(ref_coords: NDFloat, coords: NDFloat) -> float:
+    """Compute the largest atomic deviation after optimal superimposition.
+
+    Parameters
+    ----------
+    ref_coords : NDFloat
+        Reference coordinates, shape (N, 3).
+    coords : NDFloat
+        Coordinates to superimpose onto the reference, shape (N, 3).
+
+    Returns
+    -------
+    max_dev : float
+        Largest distance between corresponding atoms after superimposition.
+    """
+    ref_centered = ref_coords - ref_coords.mean(axis=0)
+    centered = coords - coords.mean(axis=0)
+    # Kabsch algorithm
+    u, _s, vt = np.linalg.svd(centered.T @ ref_centered)
+    sign = np.sign(np.linalg.det(u @ vt))
+    rotation = u @ np.diag([1.0, 1.0, sign]) @ vt
+    deviations = np.linalg.norm(centered @ rotation - ref_centered, axis=1)
+    return float(deviations.max())
+
+
+def calc_coord_areas(
+        coords: NDFloat,
+        radii: NDFloat,
+        parameters,
+        ) -> NDFloat:
+    """Compute the atomic areas of a set of atoms with freesasa."""
+    result = calcCoord(coords.ravel(), radii, parameters)
+    return np.array([result.atomArea(i) for i in range(len(radii))])
+
+
+def get_rigid_reuse_atom_areas(
+        struct: Structure,
+        chain_cache: ChainSASACache,
+        probe_radius: float = DEFAULT_PROBE_RADIUS,
+        ) -> NDFloat:
+    """Compute atomic areas reusing the areas of rigid copies of chains.
+
+    If all chains of the structure are rigid copies of cached chains, the
+    areas of atoms far from any other chain are taken from the isolated
+    chains, and only atoms near the interface are recomputed, together
+    with their neighbours. Otherwise, the whole structure is computed and
+    its isolated chains are added to the cache.
+
+    Parameters
+    ----------
+    struct : :py:class:`freesasa.Structure`
+        The structure of interest.
+    chain_cache : ChainSASACache
+        The cache of isolated chains areas.
+    probe_radius : float
+        Probe radius for the accessibility calculation.
+
+    Returns
+    -------
+    atom_areas : NDFloat
+        Solvent accessible surface area of each atom of the structure.
+    """
+    parameters = get_sasa_parameters(probe_radius)
+    nb_atoms = struct.nAtoms()
+    coords = np.array([struct.coord(i) for i in range(nb_atoms)])
+    radii = np.array([struct.radius(i) for i in range(nb_atoms)])
+    chains = np.array([struct.chainLabel(i) for i in range(nb_atoms)])
+    atom_ids = [
+        (struct.residueName(i), struct.residueNumber(i), struct.atomName(i))
+        for i in range(nb_atoms)
+        ]
+
+    # Look for rigid copies of each chain
+    chains_masks = {chain: chains == chain for chain in np.unique(chains)}
+    chains_keys = {
+        chain: hash(tuple(atom_ids[i] for i in np.nonzero(mask)[0]))
+        for chain, mask in chains_masks.items()
+        }
+    atom_areas = np.zeros(nb_atoms)
+    missing_chains = []
+    for chain, mask in chains_masks.items():
+        cached_areas = chain_cache.lookup(chains_keys[chain], coords[mask])
+        if cached_areas is None:
+            missing_chains.append(chain)
+        else:
+            atom_areas[mask] = cached_areas
+
+    if missing_chains:
+        # Fall back to the full computation, and cache the new chains
+        for chain in missing_chains:
+            mask = chains_masks[chain]
+            if not chain_cache.is_full(chains_keys[chain]):
+                chain_cache.add(
+                    chains_keys[chain],
+                    coords[mask],
+                    calc_coord_areas(coords[mask], radii[mask], parameters),
+                    )
+        return calc_coord_areas(coords, radii, parameters)
+
+    # Atoms whose accessibility can be affected by other chains, i.e.
+    # closer than the sum of both atomic radii and the probe diameter
+    max_radius = radii.max()
+    interface = np.zeros(nb_atoms, dtype=bool)
+    for mask in chains_masks.values():
+        if mask.all():
+            continue
+        dists, _ = cKDTree(coords[~mask]).query(
+            coords[mask],
+            distance_upper_bound=2 * max_radius + 2 * probe_radius,
+            )
+        close = dists < radii[mask] + max_radius + 2 * probe_radius
+        interface[np.nonzero(mask)[0][close]] = True
+    if not interface.any():
+        return atom_areas
+
+    # Recompute interface atoms together with all their neighbours
+    neighbours = cKDTree(coords).query_ball_point(
+        coords[interface],
+        radii[interface] + max_radius + 2 * probe_radius,
+        )
+    local_atoms = np.unique(np.concatenate(neighbours))
+    local_areas = calc_coord_areas(
+        coords[local_atoms],
+        radii[local_atoms],
+        parameters,
+        )
+    atom_areas[interface] = local_areas[
+        np.searchsorted(local_atoms, np.nonzero(interface)[0])
+        ]
+    return atom_areas
 
 
 def calc_acc_score(result_dict, buried_resdic, acc_resdic):
@@ -65,6 +268,7 @@ class AccScore:
             acc_resdic,
             cutoff,
             probe_radius,
+            chain_cache=None,
             ):
         """Initialise AccScore class."""
         self.model = model
@@ -75,14 +279,25 @@ class AccScore:
         self.data = []
         self.violations = []
         self.probe_radius = probe_radius
+        self.chain_cache = chain_cache
         self.violations_data = [self.model.file_name]
 
     def run(self) -> None:
         """Run accessibility calculations."""
         mod_path = str(Path(self.model.path, self.model.file_name))
         try:
-            access_data = get_accessibility(mod_path,
-                                            probe_radius=self.probe_radius)
+            atom_areas_func = None
+            if self.chain_cache is not None:
+                atom_areas_func = partial(
+                    get_rigid_reuse_atom_areas,
+                    chain_cache=self.chain_cache,
+                    probe_radius=self.probe_radius,
+                    )
+            access_data = get_accessibility(
+                mod_path,
+                probe_radius=self.probe_radius,
+                atom_areas_func=atom_areas_func,
+                )
             result_dic = apply_cutoff(access_data, self.cutoff)
             acc_sc, b_viols, a_viols = calc_acc_score(result_dic,
                                                       self.buried_resdic,
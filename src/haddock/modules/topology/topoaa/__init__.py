@@ -29,7 +29,7 @@ import re
 from functools import partial
 from pathlib import Path
 
-from haddock.core.defaults import MODULE_DEFAULT_YAML, cns_exec
+from haddock.core.defaults import MODULE_DEFAULT_YAML, get_cns_exec
 from haddock.core.typing import FilePath, Optional, ParamDict, ParamMap, Union
 from haddock.libs import libpdb
 from haddock.libs.libcns import (
@@ -267,7 +267,7 @@ class HaddockModule(BaseCNSModule):
                     output_filename,
                     err_fname,
                     envvars=self.envvars,
-                    cns_exec=cns_exec,
+                    cns_exec=get_cns_exec(),
                 )
 
                 jobs.append(job)
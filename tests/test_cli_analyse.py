@@ -8,11 +8,13 @@ import pytest
 
 from haddock.clis.cli_analyse import (
     get_cluster_ranking,
+    get_models_folders,
     main,
     update_capri_dict,
     zip_top_ranked,
     )
 from haddock.gear.yaml2cfg import read_from_yaml_config
+from haddock.libs.libontology import ModuleIO, PDBFile
 from haddock.modules.analysis.caprieval import \
     DEFAULT_CONFIG as caprieval_params
 
@@ -148,3 +150,111 @@ def test_main_offline(example_capri_ss, example_capri_clt, tmp_path):
     assert (run_dir / "data/ui/report.bundle.js").is_file()
     assert (run_dir / "data/ui/index.css").is_file()
     assert (ana_dir / "2_caprieval_analysis/plotly_bundle.js").is_file()
+
+
+def test_main_parallel(
+        example_capri_ss,
+        example_capri_clt,
+        tmp_path,
+        monkeypatch,
+        ):
+    """Test cli_analyse main analysing several steps concurrently."""
+    # do not cap the cores to the ones available on the test machine
+    monkeypatch.setattr(
+        "haddock.clis.cli_analyse.parse_ncores",
+        lambda n: n,
+        )
+    run_dir = tmp_path / "example_dir"
+    good_steps = ["2_caprieval", "4_caprieval"]
+    for step_name in good_steps:
+        step_dir = run_dir / step_name
+        step_dir.mkdir(parents=True)
+        shutil.copy(example_capri_ss, step_dir / "capri_ss.tsv")
+        shutil.copy(example_capri_clt, step_dir / "capri_clt.tsv")
+    # a step without the capri files cannot be analysed
+    (run_dir / "6_caprieval").mkdir()
+
+    main(
+        run_dir,
+        [2, 4, 6],
+        5,
+        format=None,
+        scale=None,
+        is_cleaned=False,
+        inter=False,
+        ncores=6,
+        )
+
+    ana_dir = run_dir / "analysis"
+    for step_name in good_steps:
+        assert (ana_dir / f"{step_name}_analysis" / "report.html").is_file()
+    # the failed analysis is removed
+    assert not (ana_dir / "6_caprieval_analysis").exists()
+    assert not (run_dir / "6_caprieval_analysis").exists()
+
+
+def make_step_io(step_dir, models_dir):
+    """Write the `io.json` of a step giving the models of a folder."""
+    step_dir.mkdir(parents=True)
+    io = ModuleIO()
+    io.add([PDBFile("model_1.pdb", path=models_dir)], "o")
+    io.save(step_dir)
+
+
+def test_get_models_folders(example_capri_ss, example_capri_clt, tmp_path):
+    """Test the models folders of steps sharing them are given once."""
+    models_dir = tmp_path / "1_rigidbody"
+    models_dir.mkdir()
+    make_step_io(tmp_path / "2_seletop", models_dir)
+    make_step_io(tmp_path / "3_seletopclusts", models_dir)
+    # steps with caprieval data do not need their models
+    make_step_io(tmp_path / "4_flexref", tmp_path / "4_flexref")
+    shutil.copy(example_capri_ss, tmp_path / "4_flexref" / "capri_ss.tsv")
+    shutil.copy(example_capri_clt, tmp_path / "4_flexref" / "capri_clt.tsv")
+    steps = [
+        (step, Path(f"{step}_analysis"))
+        for step in ("2_seletop", "3_seletopclusts", "4_flexref")
+        ]
+    assert get_models_folders(steps, tmp_path) == [models_dir]
+
+
+def test_main_is_cleaned(tmp_path, monkeypatch):
+    """Test shared models are unpacked before and cleaned after analyses."""
+    events = []
+    monkeypatch.setattr(
+        "haddock.clis.cli_analyse.haddock3_unpack",
+        lambda folder, ncores: events.append(("unpack", folder)),
+        )
+    monkeypatch.setattr(
+        "haddock.clis.cli_analyse.haddock3_clean",
+        lambda folder, ncores: events.append(("clean", folder)),
+        )
+    monkeypatch.setattr(
+        "haddock.clis.cli_analyse._analyse_step_task",
+        lambda step, run_dir, capri_dict, target_path, *args, **kwargs: (
+            events.append(("analyse", step)) or (target_path, False)
+            ),
+        )
+    run_dir = tmp_path / "example_dir"
+    models_dir = run_dir / "1_rigidbody"
+    models_dir.mkdir(parents=True)
+    make_step_io(run_dir / "2_seletop", models_dir)
+    make_step_io(run_dir / "3_seletopclusts", models_dir)
+
+    main(
+        run_dir,
+        [2, 3],
+        5,
+        format=None,
+        scale=None,
+        is_cleaned=True,
+        inter=False,
+        ncores=1,
+        )
+
+    assert events == [
+        ("unpack", models_dir),
+        ("analyse", "2_seletop"),
+        ("analyse", "3_seletopclusts"),
+        ("clean", models_dir),
+        ]
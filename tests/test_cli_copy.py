@@ -1,10 +1,19 @@
 """Test client copy."""
+import gzip
+import json
 import shutil
+import tarfile
 from pathlib import Path
 
 from haddock.clis.cli_cp import main
+from haddock.core.defaults import REFERENCES_FILE
+from haddock.gear import extend_run
+from haddock.gear.restraints_store import STORE_DIR, index_archive
+from haddock.modules.refinement.flexref import \
+    DEFAULT_CONFIG as DEFAULT_FLEXREF_PARAMS
+from haddock.modules.refinement.flexref import HaddockModule as Flexref
 
-from . import tests_path
+from . import golden_data, tests_path
 
 
 def test_main():
@@ -21,6 +30,9 @@ def test_main():
 
 def compare_files(folder1, folder2):
     for file_folder in folder1.iterdir():
+        # the manifest of the references is specific to each copy
+        if file_folder.name == REFERENCES_FILE:
+            continue
         file_folder_2 = Path(folder2, file_folder.name)
         if file_folder.is_file():
             text1 = file_folder.read_text()
@@ -28,3 +40,71 @@ def compare_files(folder1, folder2):
             assert text1 == text2
         if file_folder.is_dir():
             compare_files(file_folder, file_folder_2)
+
+
+def test_main_links_and_manifest(tmp_path, mocker):
+    """Test files without references are linked, and the manifest reused."""
+    run1 = Path(tmp_path, "run1")
+    shutil.copytree(Path(tests_path, "clis", "hd3_copy", "run1"), run1)
+    flexref = Path(run1, "2_flexref")
+    with gzip.open(Path(flexref, "model_1.pdb.gz"), "wt") as fout:
+        fout.write("ATOM      1  N   ALA A   1\n")
+    with gzip.open(Path(flexref, "flexref_1.inp.gz"), "wt") as fout:
+        fout.write(f"eval ($input_pdb_filename_1={str(flexref)}/model_1.pdb)\n")
+
+    run2 = Path(tmp_path, "run2")
+    main(run1, [0, 2], run2, link="hardlink")
+    new_flexref = Path(run2, "1_flexref")
+    # compressed files stay compressed
+    model = Path(new_flexref, "model_1.pdb.gz")
+    assert model.stat().st_ino == Path(flexref, "model_1.pdb.gz").stat().st_ino
+    with gzip.open(Path(new_flexref, "flexref_1.inp.gz"), "rt") as fin:
+        assert str(Path(tmp_path, "run2", "1_flexref")) in fin.read()
+    # data files are linked too
+    air = Path("data", "1_flexref", "air.tbl")
+    assert (
+        Path(run2, air).stat().st_ino
+        == Path(run1, "data", "2_flexref", "air.tbl").stat().st_ino
+        )
+    manifest = json.loads(Path(new_flexref, REFERENCES_FILE).read_text())
+    assert manifest["files"] == ["flexref_1.inp.gz", "io.json", "other.file"]
+    assert manifest["patterns"] == ["0_topoaa", "1_flexref", "run2"]
+
+    # copying the copy reads the manifest instead of scanning the files
+    scan = mocker.spy(extend_run, "scan_references")
+    run3 = Path(tmp_path, "run3")
+    main(run2, [1], run3, link="copy")
+    scan.assert_not_called()
+    assert "run3/0_flexref" in Path(run3, "0_flexref", "other.file").read_text()
+
+
+def test_main_restraints_store(tmp_path):
+    """Test the copied run keeps the restraint files of its archives."""
+    run1 = Path(tmp_path, "run1")
+    shutil.copytree(Path(tests_path, "clis", "hd3_copy", "run1"), run1)
+    archive = Path(run1, "data", "2_flexref", "ambig.tbl.tgz")
+    with tarfile.open(archive, "w:gz") as tar:
+        for i in range(1, 4):
+            tar.add(Path(golden_data, "example_ambig_1.tbl"), f"ambig_{i}.tbl")
+    index_archive(archive, Path(run1, "data", STORE_DIR))
+
+    run2 = Path(tmp_path, "run2")
+    main(run1, [0, 2], run2)
+    shutil.rmtree(run1)
+    assert Path(run2, "data", STORE_DIR).exists()
+
+    flexref = Flexref(
+        order=1,
+        path=Path(run2, "1_flexref"),
+        initial_params=DEFAULT_FLEXREF_PARAMS,
+        )
+    flexref.params["ambig_fname"] = Path(
+        run2, "data", "1_flexref", "ambig.tbl.tgz"
+        )
+    ambig_fnames = flexref.get_ambig_fnames([None])
+    assert len(ambig_fnames) == 3
+    assert all(
+        Path(p).parent.parent == Path(run2, "data", STORE_DIR)
+        for p in ambig_fnames
+        )
+    assert all(Path(p).exists() for p in ambig_fnames)
@@ -0,0 +1,127 @@
+"""Test haddock3-dmn client."""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from haddock.clis import cli_dmn
+from haddock.clis.cli_dmn import (
+    Job,
+    SimulatedQueue,
+    WorkloadQueue,
+    main,
+    run_daemon,
+    simulate_daemon,
+    )
+
+
+def make_target(bm_path, name, size, status="AVAILABLE"):
+    """Create a benchmark target as prepared by `haddock3-bm`."""
+    target = Path(bm_path, name)
+    Path(target, "jobs").mkdir(parents=True)
+    Path(target, "input").mkdir()
+    run_folder = Path(target, f"run-{name}")
+    run_folder.mkdir()
+    Path(run_folder, status).touch()
+    ca_line = "ATOM      2  CA  ALA A   1       0.000   0.000   0.000"
+    Path(target, "input", "target.pdb").write_text(
+        os.linesep.join([ca_line] * size)
+        )
+    job_f = Path(target, "jobs", f"{name}.job")
+    job_f.touch()
+    return job_f
+
+
+@pytest.fixture
+def benchmark(tmp_path):
+    """Benchmark folder with one big and several small targets."""
+    make_target(tmp_path, "T0", 1)
+    make_target(tmp_path, "T1", 1)
+    make_target(tmp_path, "T2", 1)
+    make_target(tmp_path, "T3", 8)
+    make_target(tmp_path, "T4", 2, status="DONE")
+    return tmp_path
+
+
+def test_job_status(benchmark):
+    """Test status files are only checked again when the folder changes."""
+    job = Job(Path(benchmark, "T0", "jobs", "T0.job"), "sbatch")
+    assert job.get_status() == "AVAILABLE"
+    run_folder = job.job_run_folder
+    # pretend the folder was not modified since long ago
+    past = run_folder.stat().st_mtime - 10
+    os.utime(run_folder, (past, past))
+    assert job.get_status() == "AVAILABLE"
+    job.check_available.unlink()
+    job.check_running.touch()
+    os.utime(run_folder, (past, past))
+    # same modification time: the cached status is returned
+    assert job.get_status() == "AVAILABLE"
+    # the folder changed
+    os.utime(run_folder, (past + 1, past + 1))
+    assert job.get_status() == "RUNNING"
+
+
+def test_workload_queue_count_jobs(monkeypatch):
+    """Test the jobs in the queue are counted with one query."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        stdout = "BM5-T0\nBM5-T1\nother\n"
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    assert WorkloadQueue("slurm").count_jobs() == 2
+    assert calls == [["squeue", "--noheader", "--format=%j"]]
+
+
+def test_run_daemon_simulated(benchmark):
+    """Test the daemon respects the job limit and never resubmits."""
+    jobs = [
+        Job(Path(benchmark, name, "jobs", f"{name}.job"), "sbatch")
+        for name in ("T0", "T1", "T2", "T3")
+        ]
+    for job, size in zip(jobs, (1, 1, 1, 8)):
+        job.size = size
+    queue = SimulatedQueue(cost=10)
+    submitted = run_daemon(
+        jobs,
+        queue,
+        job_limit=2,
+        poll_interval=5,
+        submit_delay=0,
+        )
+    assert submitted == jobs
+    # T0 and T1 end at 10, then T2 and T3 are submitted together
+    assert queue.end_times[jobs[2]] == 20
+    assert queue.makespan == 90
+
+
+def test_simulate_daemon_largest_first(benchmark):
+    """Test sending the largest jobs first reduces the makespan."""
+    jobs = [
+        Job(Path(benchmark, name, "jobs", f"{name}.job"), "sbatch")
+        for name in ("T0", "T1", "T2", "T3")
+        ]
+    for job, size in zip(jobs, (1, 1, 1, 8)):
+        job.size = size
+    params = {"job_limit": 2, "poll_interval": 1, "submit_delay": 0}
+    folder_order = simulate_daemon(jobs, **params)
+    largest_first = simulate_daemon(jobs[::-1], **params)
+    assert largest_first < folder_order
+
+
+def test_main_dry_run(benchmark, monkeypatch, capsys):
+    """Test the dry-run does not submit jobs nor modify status files."""
+    def fail(*args, **kwargs):
+        raise AssertionError("no command should be run")
+
+    monkeypatch.setattr(cli_dmn.subprocess, "run", fail)
+    main(benchmark, job_limit=2, dry_run=True, restart=True, sim_cost=60)
+    captured = capsys.readouterr().out
+    assert "Simulating 4 jobs." in captured
+    assert "Simulated makespan: 0.13 h" in captured
+    assert "Simulated makespan in folder order: 0.17 h" in captured
+    assert Path(benchmark, "T0", "run-T0", "AVAILABLE").exists()
@@ -0,0 +1,71 @@
+"""Test haddock3-perf client."""
+import json
+
+import pytest
+
+from haddock.clis.cli_perf import main, summarise_run, summarise_step
+from haddock.core.defaults import PERF_FILE
+
+
+def make_profile(wall, engine, tasks, mean, utilisation):
+    """Make the content of a `perf.json` file."""
+    return {
+        "module": "dummy",
+        "wall_time": wall,
+        "phases": {"setup": 0.5, "engine": engine},
+        "tasks": {"count": tasks, "mean": mean, "max": mean * 2},
+        "task_phases": {},
+        "workers": {"count": 2, "utilisation": utilisation},
+        "peak_rss_mb": {"main": 100.0, "children": 50.0},
+        "io": {"bytes_read": 1024 ** 2, "bytes_written": 2 * 1024 ** 2},
+        "files": {"count": 10, "bytes": 100},
+        }
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    """Run directory with two profiled steps."""
+    for step, profile in (
+            ("0_topoaa", make_profile(10.0, 4.0, 2, 2.0, 0.5)),
+            ("1_rigidbody", make_profile(30.0, 12.0, 6, 4.0, 1.0)),
+            ):
+        tmp_path.joinpath(step).mkdir()
+        tmp_path.joinpath(step, PERF_FILE).write_text(json.dumps(profile))
+    # steps without profile are ignored
+    tmp_path.joinpath("2_caprieval").mkdir()
+    return tmp_path
+
+
+def test_summarise_run(run_dir):
+    """Test the aggregation of the steps."""
+    rows = [
+        summarise_step(step, json.loads(run_dir.joinpath(step, PERF_FILE).read_text()))  # noqa: E501
+        for step in ("0_topoaa", "1_rigidbody")
+        ]
+    assert rows[0]["rss_mb"] == 100.0
+    assert rows[0]["read_mb"] == 1.0
+    total = summarise_run(rows)
+    assert total["wall"] == 40.0
+    assert total["setup"] == 1.0
+    assert total["tasks"] == 8
+    assert total["task_mean"] == 3.5
+    assert total["task_max"] == 8.0
+    assert total["util"] == pytest.approx(0.875)
+    assert total["files"] == 20
+    assert total["write_mb"] == 4.0
+
+
+def test_main(run_dir, tmp_path, capsys):
+    """Test the summary table and JSON file."""
+    json_file = tmp_path / "summary.json"
+    main(run_dir, json_file=json_file)
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 4
+    assert lines[1].startswith("0_topoaa")
+    assert lines[3].startswith("total")
+    summary = json.loads(json_file.read_text())
+    assert [row["step"] for row in summary["steps"]] == [
+        "0_topoaa",
+        "1_rigidbody",
+        ]
+    assert summary["total"]["tasks"] == 8
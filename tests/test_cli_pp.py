@@ -1,10 +1,11 @@
 """Test preprocessing client."""
+import json
 import os
 from pathlib import Path
 
 import pytest
 
-from haddock.clis.cli_pp import ap, main
+from haddock.clis.cli_pp import REPORT_DEFAULT, ap, main
 
 from . import broken_pdb, corrected_pdb
 
@@ -26,6 +27,17 @@ def test_pp_cli():
     output.unlink()
 
 
+def test_pp_cli_dry(tmp_path):
+    """Test `haddock-pp` saves the report of a dry run."""
+    with pytest.raises(SystemExit) as exit:
+        main(broken_pdb, dry=True, output_directory=tmp_path)
+    assert exit.value.code == 0
+
+    assert list(tmp_path.iterdir()) == [Path(tmp_path, REPORT_DEFAULT)]
+    report = json.loads(Path(tmp_path, REPORT_DEFAULT).read_text())
+    assert report[0]["input"] == str(broken_pdb)
+
+
 @pytest.mark.parametrize(
     "arg,key,value",
     [
@@ -37,6 +49,8 @@ def test_pp_cli():
         ('--suffix somesuffix', 'suffix', 'somesuffix'),
         ('-odir somedir', 'output_directory', Path('somedir')),
         ('--output-directory somedir', 'output_directory', Path('somedir')),
+        ('-r report.json', 'report', Path('report.json')),
+        ('--report report.json', 'report', Path('report.json')),
         ]
     )
 def test_cli_args(arg, key, value):
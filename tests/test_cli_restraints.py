@@ -13,6 +13,8 @@ from haddock.clis.restraints.active_passive_to_ambig import (
 from haddock.clis.restraints.calc_accessibility import (
     REL_ASA,
     calc_accessibility,
+    get_accessibility,
+    get_accessibility_calculator,
     )
 from haddock.clis.restraints.passive_from_active import passive_from_active
 from haddock.clis.restraints.restrain_bodies import restrain_bodies
@@ -36,6 +38,12 @@ from haddock.libs.libpdb import (
     slc_y,
     slc_z,
     )
+from haddock.libs.librestraints import (
+    StructureSession,
+    build_restraints,
+    get_bodies,
+    passive_from_active_raw,
+    )
 
 from . import golden_data
 
@@ -119,6 +127,30 @@ def test_passive_from_active(example_pdb_file, capsys):
     assert captured.out == "2 3\n"
 
 
+def test_passive_from_active_several_lists(example_pdb_file, capsys):
+    """Test passive_from_active prints the passive residues of each list."""
+    passive_from_active(example_pdb_file, ["1", "2", "1,3"])
+    captured = capsys.readouterr()
+    assert captured.out == "2 3\n1 3 4\n2 4 5\n"
+
+
+def test_structure_session(example_pdb_file):
+    """Test a session gives the passive residues of each active set."""
+    session = StructureSession(example_pdb_file)
+    active_sets = [[1], [2], [1, 3], [], [9999]]
+    observed = session.passive_batch(active_sets)
+    assert observed == [
+        passive_from_active_raw(example_pdb_file, active)
+        for active in active_sets
+        ]
+    assert observed[:3] == [[2, 3], [1, 3, 4], [2, 4, 5]]
+    # the surface residues are computed once per cutoff
+    assert session.get_surface_resids() is session.get_surface_resids()
+    assert session.passive([1], surface=[3]) == [3]
+    with pytest.raises(KeyError):
+        session.passive([1], chain_id="Z")
+
+
 def test_restrain_bodies(protdna_input_list, capsys):  # noqa : F811
     """Test restrain_bodies function."""
     restrain_bodies(protdna_input_list[0].rel_path)
@@ -148,6 +180,46 @@ def test_restrain_bodies_exclude(protdna_input_list, capsys):  # noqa : F811
     )  # noqa : E501
 
 
+def test_restrain_bodies_seed(protdna_input_list, capsys):  # noqa : F811
+    """Test restrain_bodies gives the same restraints for the same seed."""
+    outputs = []
+    for seed in (917, 917, 42):
+        restrain_bodies(protdna_input_list[0].rel_path, seed=seed)
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1]
+    assert outputs[0] != outputs[2]
+
+
+def test_get_bodies():
+    """Test gaps and changes of chain split the bodies."""
+    atoms = [
+        ("A", 1, "CA", (0.0, 0.0, 0.0)),
+        ("A", 2, "CA", (3.8, 0.0, 0.0)),
+        ("A", 4, "CA", (11.4, 0.0, 0.0)),
+        ("A", 5, "CA", (15.2, 0.0, 0.0)),
+        ("B", 1, "P", (15.2, 6.0, 0.0)),
+        ("B", 2, "P", (15.2, 12.0, 0.0)),
+        ]
+    assert get_bodies(atoms) == [(0, 1), (2, 3), (4, 5)]
+    assert get_bodies(atoms[:2]) == [(0, 2)]
+
+
+def test_build_restraints():
+    """Test two restraints are made per pair of bodies, within the bodies."""
+    bodies = [(0, 9), (10, 10), (11, 30)]
+    restraints = build_restraints(bodies, seed=917)
+    assert restraints == build_restraints(bodies, seed=917)
+    assert len(restraints) == 6
+    for (i, j), (body_i, body_j) in zip(
+            restraints,
+            [(0, 1), (0, 1), (0, 2), (0, 2), (1, 2), (1, 2)],
+            ):
+        assert bodies[body_i][0] <= i <= bodies[body_i][1]
+        assert bodies[body_j][0] <= j <= bodies[body_j][1]
+    # one-sized body
+    assert restraints[0][1] == restraints[1][1] == 10
+
+
 def test_calc_accessibility_rel_asa_data():
     """Test content matching in REL_ASA."""
     all_entries = set([k for d in REL_ASA.values() for k in d.keys()])
@@ -175,6 +247,23 @@ def test_calc_accessibility(protdna_input_list, caplog):  # noqa : F811
     )  # noqa : E501
 
 
+def test_accessibility_calculator_cached():
+    """Test the accessibility calculator is shared per probe radius."""
+    calculator = get_accessibility_calculator(1.4)
+    assert get_accessibility_calculator(1.4) is calculator
+    assert get_accessibility_calculator(2.0) is not calculator
+    assert get_accessibility_calculator(2.0).parameters is not None
+
+
+def test_get_accessibility_from_lines(protdna_input_list):  # noqa : F811
+    """Test accessibility of in-memory PDB lines matches the file one."""
+    pdb_f = protdna_input_list[0].rel_path
+    access_data = get_accessibility(pdb_f)
+    assert access_data == get_accessibility(
+        Path(pdb_f).read_text().splitlines()
+        )
+    assert list(access_data) == ["A", "B"]
+
 def test_step_coords():
     """Test small size versus spacing."""
     coords = [coord for coord in step_coords(20, 2)]
@@ -10,8 +10,10 @@ import pytest
 
 from haddock.clis.cli_traceback import (
     main,
+    get_ranks,
     get_steps_without_pdbs,
     subset_traceback,
+    traceback_dataframe,
 )
 
 from . import golden_data
@@ -139,4 +141,30 @@ def test_subset_traceback(expected_traceback):
                   ["flexref_2.pdb", 2, 2, 4]]  # noqa: E501
         exp_tr_df = pd.DataFrame(exp_tr[1:], columns=exp_tr[0])
         assert obs_tr.columns.tolist() == exp_tr_df.columns.tolist()
-        assert obs_tr.equals(exp_tr_df)
\ No newline at end of file
+        assert obs_tr.equals(exp_tr_df)
+
+def test_get_ranks():
+    """Test get_ranks."""
+    obs_ranks = get_ranks([4.5, -10.2, 0.3, 12.0])
+    assert obs_ranks.tolist() == [3, 1, 2, 4]
+
+
+def test_traceback_dataframe():
+    """Test traceback_dataframe with discarded models."""
+    sel_step = ["1_rigidbody", "4_flexref"]
+    data_dict = {
+        "flexref_1.pdb": ["rigidbody_2.pdb", "mol1.psf", "mol2.psf"],
+        "unk0": ["rigidbody_1.pdb", "mol1.psf", "mol2.psf"],
+        }
+    rank_dict = {
+        "flexref_1.pdb": [1, 2],
+        "unk0": ["-", 1],
+        }
+    obs_df = traceback_dataframe(data_dict, rank_dict, sel_step, 2)
+    assert obs_df.columns.tolist() == [
+        "00_topo1", "00_topo2", "1_rigidbody", "1_rigidbody_rank",
+        "4_flexref", "4_flexref_rank",
+        ]
+    assert obs_df["4_flexref"].tolist() == ["flexref_1.pdb", "-"]
+    assert obs_df["1_rigidbody_rank"].tolist() == [2, 1]
+    assert obs_df["4_flexref_rank"].tolist() == [1, "-"]
@@ -1,12 +1,17 @@
 """Test clean steps."""
 import shutil
+import tempfile
 from pathlib import Path
 
+from haddock.gear import clean_steps
 from haddock.gear.clean_steps import (
+    BackgroundCleaner,
     clean_output,
+    get_referenced_folders,
     unpack_compressed_and_archived_files,
     update_unpacked_names,
     )
+from haddock.libs.libontology import ModuleIO, PDBFile, TopologyFile
 
 from . import clean_steps_folder
 
@@ -264,3 +269,90 @@ def test_update_unpacked_names():
     new = ['run_dir/0_topoaa', '1_flexref', 'run_dir/2_seletopclusts']
     update_unpacked_names(prev, new, original)
     assert original == ['0_topoaa', Path('1_flexref'), '2_seletopclusts']
+
+
+def test_get_referenced_folders():
+    """Test folders referenced by the output of a step."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        step_folder = Path(tmpdir, "2_caprieval")
+        step_folder.mkdir()
+        assert get_referenced_folders(step_folder) is None
+
+        topology = TopologyFile("model_1.psf", path=Path(tmpdir, "0_topoaa"))
+        model = PDBFile(
+            "model_1.pdb",
+            topology=[topology],
+            path=Path(tmpdir, "1_flexref"),
+            )
+        io = ModuleIO()
+        io.add([model], "o")
+        io.save(step_folder)
+        assert get_referenced_folders(step_folder) == {
+            "0_topoaa",
+            "1_flexref",
+            "2_caprieval",
+            }
+
+
+def test_background_cleaner():
+    """Test step folders are cleaned in the background."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outdir = Path(tmpdir, "run1")
+        shutil.copytree(Path(clean_steps_folder, "run1"), outdir)
+        pdb_f = Path(outdir, "1_rigidbody", "structure_1.pdb")
+        pdb_f.write_text("ATOM" + " " * 76 + "\n" * 1000)
+        rigidbody = Path(outdir, "1_rigidbody")
+        cleaner = BackgroundCleaner()
+        size = cleaner.record_disk_usage(rigidbody)
+        assert size > 0
+        assert cleaner.peak_size == size
+
+        cleaner.clean(rigidbody)
+        cleaner.wait()
+        assert cleaner.nb_cleaned == 1
+        assert Path(rigidbody, "seed.tgz").exists()
+        assert Path(rigidbody, "structure_1.pdb.gz").exists()
+        assert not Path(rigidbody, "structure_1.pdb").exists()
+        # the cleaned step is measured again
+        assert cleaner.step_sizes[str(rigidbody)] < size
+        # only the given step folder is measured, the peak is kept
+        topoaa_size = cleaner.record_disk_usage(Path(outdir, "0_topoaa"))
+        assert topoaa_size == sum(cleaner.step_sizes.values())
+        assert cleaner.peak_size == max(size, topoaa_size)
+
+
+def test_background_cleaner_single_process(monkeypatch):
+    """Test folders are cleaned by one process at a time, with one core."""
+    started = []
+    cleaned = []
+
+    class FakeProcess:
+        def __init__(self, target, args):
+            self.target = target
+            self.args = args
+
+        def start(self):
+            started.append(list(self.args[0]))
+
+        def is_alive(self):
+            return True
+
+        def join(self):
+            self.target(*self.args)
+
+    monkeypatch.setattr(clean_steps, "Process", FakeProcess)
+    monkeypatch.setattr(
+        clean_steps,
+        "clean_output",
+        lambda path, ncores: cleaned.append((path, ncores)),
+        )
+    cleaner = BackgroundCleaner()
+    for step in ("0_topoaa", "1_rigidbody", "2_caprieval"):
+        cleaner.clean(step)
+    # the folders given while the process runs wait for it to end
+    assert started == [["0_topoaa"]]
+    assert cleaner.pending == ["1_rigidbody", "2_caprieval"]
+    cleaner.wait()
+    assert started == [["0_topoaa"], ["1_rigidbody", "2_caprieval"]]
+    assert cleaned == [("0_topoaa", 1), ("1_rigidbody", 1), ("2_caprieval", 1)]
+    assert cleaner.nb_cleaned == 3
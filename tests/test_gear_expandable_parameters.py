@@ -9,6 +9,7 @@ from haddock.gear.expandable_parameters import (
     belongs_to_single_index,
     extract_multiple_index_params,
     extract_single_index_params,
+    get_default_groups,
     get_mol_parameters,
     get_multiple_index_groups,
     get_single_index_groups,
@@ -732,6 +733,27 @@ def test_read_mol_params(inp, default, expected):
     assert isinstance(result, set)
 
 
+def test_get_default_groups():
+    """Test all expandable groups of a defaults are identified at once."""
+    defaults = {
+        "param_some_1": 1,
+        "param_other_1": 1,
+        "fle_sta_1_1": 1,
+        "fle_end_1_1": 1,
+        "mol_fix_origin_1": False,
+        "ncores": 1,
+        }
+    groups = get_default_groups(defaults)
+    assert groups.single_index == {("param", "1"): {"some", "other"}}
+    assert groups.multiple_index == {("fle1", "1"): {"sta", "end"}}
+    assert groups.mol == {"mol_fix_origin_1"}
+    assert groups == (
+        get_single_index_groups(defaults),
+        get_multiple_index_groups(defaults),
+        get_mol_parameters(defaults),
+        )
+
+
 @pytest.mark.parametrize(
     "param, expected",
     [
@@ -1,4 +1,5 @@
 """Test preprocessing operations."""
+import json
 import os
 from itertools import zip_longest
 from pathlib import Path
@@ -6,8 +7,9 @@ from pathlib import Path
 import pytest
 
 from haddock.gear import preprocessing as pp
+from haddock.libs.libfunc import chainf
 
-from . import broken_pdb, corrected_pdb, residues_top
+from . import broken_pdb, corrected_pdb, golden_data, residues_top
 
 
 def test_open_or_give():
@@ -408,3 +410,174 @@ def test_process_pdbs():
 
     for i, (rline, eline) in enumerate(zip_longest(result[0], expected)):
         assert rline == eline, i
+
+
+def remove_altlocs(lines):
+    """Blank the alternative location of the atoms."""
+    return [
+        line[:16] + " " + line[17:]
+        if line.startswith(("ATOM", "HETATM")) and len(line) > 16
+        else line
+        for line in lines
+        ]
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        pp._open_or_give([broken_pdb])[0],
+        remove_altlocs(pp._open_or_give([broken_pdb])[0]),
+        pp._open_or_give([Path(golden_data, "protprot_complex_1.pdb")])[0],
+        pp._open_or_give([Path(golden_data, "protdna_complex_1.pdb")])[0],
+        # MSE, HSD, ion, water, insertion code and chain break
+        [
+            "ATOM      1  N   ALA A   1      11.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "ATOM      2  CA  ALA A   1      11.639   6.071  -5.147  1.00  0.00           C",  # noqa: E501
+            "HETATM    3  N   MSE A   2      12.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "HETATM    4  CA  MSE A   2      12.639   6.071  -5.147  1.00  0.00           C",  # noqa: E501
+            "ATOM      5  N   HSD A   2A     13.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "ATOM      6  CA  HSD A   2A     13.639   6.071  -5.147  1.00  0.00           C",  # noqa: E501
+            "ATOM      7  N   GLY A   7      14.104   6.134  -6.504  0.50  0.00           N",  # noqa: E501
+            "ATOM      8  N   GLY B   1      15.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "TER",
+            "HETATM    9 ZN    ZN B 300      16.104   6.134  -6.504  1.00  0.00          ZN+2",  # noqa: E501
+            "HETATM   10  O   HOH B 301      17.104   6.134  -6.504  1.00  0.00           O",  # noqa: E501
+            "HETATM   11  C   LIG B 302      18.104   6.134  -6.504  1.00  0.00           C",  # noqa: E501
+            "END",
+            ],
+        ],
+    )
+@pytest.mark.parametrize("residues", [None, ("LIG",)])
+def test_process_pdb_lines(lines, residues):
+    """Test the single pass is the same as the line-by-line steps."""
+    steps = pp.get_line_by_line_steps(residues)
+    expected = list(chainf(lines, *steps))
+    assert pp.process_pdb_lines(lines, residues) == expected
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        # alternative location
+        [
+            "ATOM      1  N  AALA A   1      11.104   6.134  -6.504  0.60  0.00           N",  # noqa: E501
+            "ATOM      2  N  BALA A   1      11.639   6.071  -5.147  0.40  0.00           N",  # noqa: E501
+            ],
+        # repeated atom
+        [
+            "ATOM      1  N   ALA A   1      11.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "ATOM      2  N   ALA A   1      11.639   6.071  -5.147  1.00  0.00           N",  # noqa: E501
+            ],
+        # unsorted atoms
+        [
+            "ATOM      2  N   ALA A   1      11.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+            "ATOM      1  CA  ALA A   1      11.639   6.071  -5.147  1.00  0.00           C",  # noqa: E501
+            ],
+        ],
+    )
+def test_check_single_pass(lines):
+    """Test PDBs not handled by the single pass."""
+    with pytest.raises(pp._FallbackError):
+        pp._check_single_pass(lines)
+    steps = pp.get_line_by_line_steps()
+    assert pp.process_pdb_lines(lines) == list(chainf(lines, *steps))
+
+
+def test_process_pdb_lines_unparsed():
+    """Test records the line-by-line steps do not parse either."""
+    lines = [
+        "ATOM  A0000  N   ALA A   1      11.104   6.134  -6.504  1.00  0.00           N",  # noqa: E501
+        ]
+    with pytest.raises(pp._FallbackError):
+        pp._check_single_pass(lines)
+    # the error is the one of the line-by-line steps, not hidden
+    with pytest.raises(ValueError):
+        pp.process_pdb_lines(lines)
+
+
+def test_process_pdbs_ncores():
+    """Test processing PDBs in parallel."""
+    pdbs = [
+        broken_pdb,
+        Path(golden_data, "protprot_complex_1.pdb"),
+        Path(golden_data, "protprot_complex_2.pdb"),
+        ]
+    assert pp.process_pdbs(*pdbs, ncores=2) == pp.process_pdbs(*pdbs)
+
+
+def test_process_pdbs_ensemble():
+    """Test the models of an ensemble are processed independently."""
+    lines = pp._open_or_give([Path(golden_data, "protprot_complex_1.pdb")])[0]
+    atoms = [line for line in lines if line.startswith(("ATOM", "HETATM"))]
+    model = pp.process_pdbs(atoms)[0]
+    ensemble = [
+        "MODEL        1", *atoms, "ENDMDL",
+        "MODEL        2", *atoms, "ENDMDL",
+        "END",
+        ]
+    assert len(pp.split_models(ensemble)) == 2
+
+    result = pp.process_pdbs(ensemble)[0]
+    assert pp.split_models(result) == [model[:-1], model[:-1]]
+    assert pp.process_pdbs(ensemble, ncores=2) == [result]
+    assert pp.process_pdbs(ensemble, dry=True) == [result]
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        ["ATOM      1  N   ALA A   1", "END"],
+        ["MODEL        1", "ATOM      1  N   ALA A   1", "END"],
+        ["ATOM      1  N   ALA A   1", "MODEL        1", "ENDMDL"],
+        ],
+    )
+def test_split_models_no_ensemble(lines):
+    """Test PDBs that are not split into models."""
+    assert pp.split_models(lines) == []
+
+
+def test_process_pdbs_not_combined():
+    """Test processing PDBs independently."""
+    pdbs = [
+        Path(golden_data, "protprot_complex_1.pdb"),
+        Path(golden_data, "protprot_complex_2.pdb"),
+        ]
+    result = pp.process_pdbs(*pdbs, combine=False)
+    assert result == [pp.process_pdbs(pdb)[0] for pdb in pdbs]
+    # both PDBs have chains A and B
+    assert result != pp.process_pdbs(*pdbs)
+
+
+def test_diff_lines():
+    """Test lines are compared as multisets."""
+    before = ["a", "b", "b", "b", "c"]
+    after = ["b", "d", "a", "b", "d"]
+    added, removed = pp.diff_lines(before, after)
+    assert added == ["d", "d"]
+    assert removed == ["b", "c"]
+
+
+def test_process_pdbs_dry_report(tmp_path):
+    """Test the report of the changes of a dry run."""
+    report_file = Path(tmp_path, "report.json")
+    result = pp.process_pdbs(
+        broken_pdb,
+        dry=True,
+        report_file=report_file,
+        report_max_lines=2,
+        )
+    assert result == pp.process_pdbs(broken_pdb)
+
+    report = json.loads(report_file.read_text())
+    assert len(report) == 1
+    assert report[0]["input"] == str(broken_pdb)
+
+    stages = report[0]["stages"]
+    # the line-by-line steps and the whole PDB steps
+    assert len(stages) == len(pp.get_line_by_line_steps()) + 3
+    assert stages[0]["stage"] == "pdb_keepcoord"
+    assert stages[0]["added"] == 0
+    assert stages[0]["removed"] > 2
+    assert len(stages[0]["removed_lines"]) == 2
+    for stage in stages:
+        assert len(stage["added_lines"]) == min(stage["added"], 2)
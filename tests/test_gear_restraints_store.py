@@ -0,0 +1,99 @@
+"""Test the restraints store."""
+import io
+import json
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from haddock.gear.prepare_run import copy_input_files_to_data_dir
+from haddock.gear.restraints_store import (
+    STORE_DIR,
+    get_index_path,
+    index_archive,
+    read_archive_index,
+    store_archive,
+    )
+
+from . import golden_data
+
+
+@pytest.fixture(name="archive")
+def fixture_archive(tmp_path):
+    """Archive of 12 restraint files, with 2 distinct contents."""
+    contents = [
+        Path(golden_data, f"example_ambig_{i}.tbl").read_bytes() for i in (1, 2)
+        ]
+    archive = Path(tmp_path, "ambig.tbl.tgz")
+    with tarfile.open(archive, "w:gz") as tar:
+        members = [(f"ambig_{i}.tbl", contents[i % 2]) for i in range(1, 13)]
+        members.append(("other_1.tbl", contents[0]))
+        members.append(("sub/ambig_13.tbl", contents[0]))
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return archive
+
+
+def test_store_archive(archive, tmp_path):
+    """Test the distinct restraint files are stored once, in order."""
+    store_dir = Path(tmp_path, "store")
+    index = store_archive(archive, store_dir)
+    assert list(index) == [f"ambig_{i}.tbl" for i in range(1, 13)]
+    assert len(set(index.values())) == 2
+    assert index["ambig_3.tbl"] == index["ambig_1.tbl"]
+    assert index["ambig_4.tbl"] == index["ambig_2.tbl"]
+    archive_dir = Path(store_dir, Path(index["ambig_1.tbl"]).parent)
+    assert sorted(p.name for p in archive_dir.glob("*.tbl")) == [
+        "ambig_1.tbl",
+        "ambig_2.tbl",
+        ]
+    assert Path(store_dir, index["ambig_4.tbl"]).read_bytes() == Path(
+        golden_data, "example_ambig_1.tbl"
+        ).read_bytes()
+
+
+def test_store_archive_once(archive, tmp_path, monkeypatch):
+    """Test an archive already in the store is not read again."""
+    store_dir = Path(tmp_path, "store")
+    index = store_archive(archive, store_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("archive read again")
+
+    monkeypatch.setattr(tarfile, "open", fail)
+    assert store_archive(archive, store_dir) == index
+
+
+def test_index_archive(archive, tmp_path):
+    """Test the index gives the store files relative to the archive."""
+    index_path = index_archive(archive, Path(tmp_path, "store"))
+    assert index_path == get_index_path(archive)
+    assert json.loads(index_path.read_text())["archive"] == archive.name
+    ambig_fnames = read_archive_index(archive)
+    assert len(ambig_fnames) == 12
+    assert all(p.parent.parent == Path(tmp_path, "store") for p in ambig_fnames)
+    assert ambig_fnames[0] == ambig_fnames[2]
+
+
+def test_read_archive_index_not_indexed(archive):
+    """Test archives without index."""
+    assert read_archive_index(archive) is None
+
+
+def test_copy_input_files_to_data_dir(archive, tmp_path):
+    """Test modules given the same archive share the store files."""
+    data_dir = Path(tmp_path, "run", "data")
+    data_dir.mkdir(parents=True)
+    modules_params = {
+        "rigidbody": {"ambig_fname": archive},
+        "flexref": {"ambig_fname": archive},
+        }
+    copy_input_files_to_data_dir(data_dir, modules_params)
+    rb_archive = Path(tmp_path, "run", modules_params["rigidbody"]["ambig_fname"])
+    fr_archive = Path(tmp_path, "run", modules_params["flexref"]["ambig_fname"])
+    assert rb_archive.exists() and fr_archive.exists()
+    assert not list(rb_archive.parent.glob("*.tbl"))
+    assert read_archive_index(rb_archive) == read_archive_index(fr_archive)
+    assert len(list(Path(data_dir, STORE_DIR).glob("*/*.tbl"))) == 2
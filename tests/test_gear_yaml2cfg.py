@@ -1,13 +1,22 @@
 """Test yaml2cfg gear."""
 import filecmp
+import os
 import pytest
 from pathlib import Path
 
+import haddock
+from haddock.core.exceptions import ConfigurationError
 from haddock.libs.libio import read_from_yaml
 from haddock.gear.yaml2cfg import (
+    DEFAULTS_CACHE_ENV,
+    _get_cache_file,
+    clear_compiled_defaults,
+    compile_defaults,
     flat_yaml_cfg,
+    read_from_yaml_config,
     yaml2cfg_text,
     )
+from haddock.modules.sampling.rigidbody import DEFAULT_CONFIG
 
 from . import (
     haddock3_yaml_cfg_examples,
@@ -101,3 +110,91 @@ def test_yaml2cfg_test_no_header():
         shallow=False,
         )
     p.unlink()
+
+
+@pytest.fixture
+def defaults_yaml(tmp_path, monkeypatch):
+    """A defaults.yaml file, read from scratch."""
+    monkeypatch.delenv(DEFAULTS_CACHE_ENV, raising=False)
+    clear_compiled_defaults()
+    yaml_file = Path(tmp_path, "defaults.yaml")
+    yaml_file.write_text(Path(DEFAULT_CONFIG).read_text())
+    yield yaml_file
+    clear_compiled_defaults()
+
+
+def test_compile_defaults(defaults_yaml):
+    """Test a YAML file is read once and copied on each access."""
+    compiled = compile_defaults(defaults_yaml, validate=True)
+    assert compiled.validated
+    assert compile_defaults(defaults_yaml) is compiled
+
+    # compared as text, the defaults have NaN values
+    config = compiled.config
+    assert repr(config) == repr(read_from_yaml(DEFAULT_CONFIG))
+    assert repr(compiled.defaults) == repr(flat_yaml_cfg(config))
+
+    # callers are free to edit what they get
+    defaults = read_from_yaml_config(defaults_yaml)
+    defaults["sampling"] = -1
+    config["sampling"]["default"] = -1
+    assert compiled.defaults["sampling"] != -1
+    assert compiled.config["sampling"]["default"] != -1
+
+    groups = compiled.expandable()
+    assert ("c2sym", "1") in groups.single_index
+    assert compiled.expandable() is groups
+
+
+def test_compile_defaults_changed_file(defaults_yaml):
+    """Test the YAML file is read again when it changes."""
+    compiled = compile_defaults(defaults_yaml)
+    defaults_yaml.write_text(
+        "sampling:\n  default: 3\n  explevel: easy\n"
+        )
+    os.utime(defaults_yaml, ns=(0, 0))
+    assert compile_defaults(defaults_yaml) is not compiled
+    assert read_from_yaml_config(defaults_yaml) == {"sampling": 3}
+
+
+def test_compile_defaults_invalid(defaults_yaml):
+    """Test invalid defaults raise a configuration error."""
+    defaults_yaml.write_text("sampling:\n  default: 3\n  explevel: easy\n")
+    assert read_from_yaml_config(defaults_yaml) == {"sampling": 3}
+    with pytest.raises(ConfigurationError):
+        compile_defaults(defaults_yaml, validate=True)
+
+
+def test_compile_defaults_cache(defaults_yaml, tmp_path, monkeypatch):
+    """Test the compiled defaults are kept on disk for other processes."""
+    cache_dir = Path(tmp_path, "cache")
+    monkeypatch.setenv(DEFAULTS_CACHE_ENV, str(cache_dir))
+    compiled = compile_defaults(defaults_yaml, validate=True)
+    cache_file = _get_cache_file(compiled.digest)
+    assert cache_file.parent == cache_dir
+    assert cache_file.exists()
+
+    # a new process finds the validated defaults in the cache
+    clear_compiled_defaults()
+    cached = compile_defaults(defaults_yaml)
+    assert cached is not compiled
+    assert cached.validated
+    assert repr(cached.config) == repr(compiled.config)
+
+    # a corrupted cache file is replaced
+    cache_file.write_bytes(b"not a pickle")
+    clear_compiled_defaults()
+    assert compile_defaults(defaults_yaml).digest == compiled.digest
+    assert cache_file.read_bytes() != b"not a pickle"
+
+
+def test_compile_defaults_cache_version(defaults_yaml, tmp_path, monkeypatch):
+    """Test the defaults cached by another haddock3 version are not read."""
+    monkeypatch.setenv(DEFAULTS_CACHE_ENV, str(tmp_path))
+    compiled = compile_defaults(defaults_yaml)
+    cache_file = _get_cache_file(compiled.digest)
+    clear_compiled_defaults()
+    monkeypatch.setattr(haddock, "version", "0.0.0", raising=False)
+    assert _get_cache_file(compiled.digest) != cache_file
+    compile_defaults(defaults_yaml)
+    assert len(list(tmp_path.glob("*.pickle"))) == 2
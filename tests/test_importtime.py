@@ -0,0 +1,80 @@
+"""Test the import time of the command-line clients and workers."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ("pandas", "plotly", "scipy", "jsonpickle")
+"""Modules that must not be imported to start a client or a worker."""
+
+
+def import_times(module):
+    """
+    Import a module in a new interpreter with ``-X importtime``.
+
+    Returns
+    -------
+    dict
+        The cumulative import time, in microseconds, of each module
+        imported.
+    """
+    env = dict(os.environ)
+    env.setdefault("CNS_EXEC", sys.executable)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "haddock.clis.cli",
+        "haddock.clis.cli_mpi",
+        "haddock.libs.libworkflow",
+        "haddock.libs.libparallel",
+        "haddock.modules",
+        ],
+    )
+def test_import_is_lazy(module):
+    """Test clients and workers do not import the heavy libraries."""
+    times = import_times(module)
+    assert module in times
+    assert not set(HEAVY_MODULES) & set(times)
+
+
+def test_version_is_lazy():
+    """Test the package metadata is only read when the version is used."""
+    import haddock
+
+    assert "importlib.metadata" not in import_times("haddock")
+    assert haddock.version.startswith(haddock.v_major)
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["haddock.core.defaults", "haddock.modules", "haddock.clis.cli"],
+    )
+def test_cns_lookup_is_lazy(module):
+    """Test CNS is only looked up when used, not on import."""
+    env = dict(os.environ)
+    env.pop("CNS_EXEC", None)
+    code = (
+        f"import {module}; "
+        "from haddock.core import defaults; "
+        "assert defaults.get_cns_exec.cache_info().currsize == 0; "
+        "assert defaults.get_max_molecules_allowed.cache_info().currsize == 0"
+        )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
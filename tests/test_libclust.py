@@ -5,9 +5,15 @@ import pytest
 import random
 import tempfile
 
+import numpy as np
+from scipy.spatial.distance import squareform
+
 from haddock.libs.libclust import (
     MAX_NB_ENTRY_HTML_MATRIX,
+    get_cluster_matrix_plot_clt_dt,
+    get_matrix_bins,
     plot_cluster_matrix,
+    read_binned_matrix,
     write_structure_list,
     )
 from haddock.libs.libontology import PDBFile
@@ -74,7 +80,7 @@ def test_write_structure_list(protprot_input_models):
 def test_plot_cluster_matrix_big(big_distance_matrix_data):
     """Test test_plot_cluster_matrix_big function with big matrix."""
     with tempfile.TemporaryDirectory(dir=".") as tmpdir:
-        # Write matrix
+        # Write matrix
         matrix_path = f'{tmpdir}bigmatrix.mat'
         with open(matrix_path, 'w') as f:
             f.write('\n'.join(big_distance_matrix_data))
@@ -88,13 +94,75 @@ def test_plot_cluster_matrix_big(big_distance_matrix_data):
             color_scale="Blues",
             reverse=False,
             output_fname="clust_matrix_test_big",
+            cluster_ids=[1] * 500 + [2] * (MAX_NB_ENTRY_HTML_MATRIX - 499),
             )
-        # Check output
-        assert figure_path is None
-        assert not Path("clust_matrix_test_big.html").exists()
+        # Check output, the matrix is drawn by blocks
+        assert figure_path == "clust_matrix_test_big.html"
+        html_content = Path(figure_path).read_text()
+        assert '"1 to 2"' in html_content
+        assert "Cluster 2" in html_content
+        Path(figure_path).unlink(missing_ok=False)
         Path(matrix_path).unlink(missing_ok=False)
 
 
+def test_read_binned_matrix(small_distance_matrix_data):
+    """Test reading a matrix file averaged by blocks."""
+    with tempfile.TemporaryDirectory(dir=".") as tmpdir:
+        matrix_path = Path(tmpdir, "smallmatrix.mat")
+        matrix_path.write_text('\n'.join(small_distance_matrix_data))
+        values = [
+            float(line.split()[2]) for line in small_distance_matrix_data
+            ]
+        full_matrix = squareform(values)
+        np.fill_diagonal(full_matrix, 0.5)
+        order = [3, 0, 9, 5, 1]
+        # one entry per block
+        bins = get_matrix_bins(len(order), 10)
+        assert bins.tolist() == [0, 1, 2, 3, 4]
+        matrix = read_binned_matrix(
+            matrix_path, order, bins, 0.5, chunk_size=7
+            )
+        assert np.allclose(matrix, full_matrix[np.ix_(order, order)])
+        # blocks of entries
+        bins = get_matrix_bins(len(order), 2)
+        assert bins.tolist() == [0, 0, 0, 1, 1]
+        matrix = read_binned_matrix(
+            matrix_path, order, bins, 0.5, chunk_size=7
+            )
+        exp_matrix = [
+            [
+                full_matrix[np.ix_(order[:3], order[:3])].mean(),
+                full_matrix[np.ix_(order[:3], order[3:])].mean(),
+                ],
+            [
+                full_matrix[np.ix_(order[3:], order[:3])].mean(),
+                full_matrix[np.ix_(order[3:], order[3:])].mean(),
+                ],
+            ]
+        assert np.allclose(matrix, exp_matrix)
+
+
+def test_get_cluster_matrix_plot_clt_dt():
+    """Test the cluster annotations and limits of the matrix plot."""
+    cluster_ids = [1, 1, 1, 2, 2, 3]
+    annotations, cluster_limits = get_cluster_matrix_plot_clt_dt(cluster_ids)
+    assert [ann["x"] for ann in annotations] == [1.0, 3.5, 5.0]
+    assert [ann["text"] for ann in annotations] == [
+        "Cluster 1", "Cluster 2", "Cluster 3",
+        ]
+    assert [lim["x0"] for lim in cluster_limits[:2]] == [2.5, 4.5]
+    assert all(lim["y1"] == 5.5 for lim in cluster_limits[:2])
+    # by blocks of two entries
+    bins = get_matrix_bins(len(cluster_ids), 3)
+    annotations, cluster_limits = get_cluster_matrix_plot_clt_dt(
+        cluster_ids,
+        bins,
+        )
+    assert [ann["x"] for ann in annotations] == [0.5, 1.5, 2.0]
+    assert [lim["x0"] for lim in cluster_limits[:2]] == [0.5, 1.5]
+    assert all(lim["y1"] == 2.5 for lim in cluster_limits[:2])
+
+
 def test_plot_cluster_matrix(small_distance_matrix_data):
     """Test test_plot_cluster_matrix_big function with small matrix."""
     with tempfile.TemporaryDirectory(dir=".") as tmpdir:
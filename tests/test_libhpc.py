@@ -6,7 +6,9 @@ import pytest_mock  # noqa : F401
 from pathlib import Path
 from subprocess import CompletedProcess
 
+from haddock.core.exceptions import EngineAbortError
 from haddock.libs.libhpc import (
+    HPCScheduler,
     HPCWorker,
     extract_slurm_status,
     JOB_STATUS_DIC,
@@ -138,3 +140,31 @@ def test_hpcworker_update_status(
     status = hpcworker.update_status()
     assert status == hpcworker.job_status
     assert status == 'running'
+
+
+def test_hpcworker_find_task_errors(hpcworker, tmp_path, monkeypatch):
+    """Test the errors of the tasks are read from their output files."""
+    monkeypatch.chdir(tmp_path)
+    assert hpcworker.find_task_errors() == ["CNS output file not found"]
+    Path("rigidbody.out").write_text(f"output{os.linesep}")
+    assert hpcworker.find_task_errors() == [None]
+    Path("rigidbody.out").write_text(
+        f"output{os.linesep}SELRPN error encountered: parsing error{os.linesep}"
+        )
+    assert hpcworker.find_task_errors() == [
+        "SELRPN error encountered: parsing error"
+        ]
+
+
+def test_hpcscheduler_check_failures(hpcworker, tmp_path, monkeypatch, mocker):
+    """Test the scheduler aborts when the tolerance cannot be met."""
+    monkeypatch.chdir(tmp_path)
+    scheduler = HPCScheduler([hpcworker.tasks[0]] * 4, tolerance=20)
+    terminate = mocker.patch.object(scheduler, "terminate")
+    Path("rigidbody.out").write_text(f"output{os.linesep}")
+    scheduler.check_failures(hpcworker)
+    assert not terminate.called
+    Path("rigidbody.out").unlink()
+    with pytest.raises(EngineAbortError, match="CNS output file not found"):
+        scheduler.check_failures(hpcworker)
+    assert terminate.called
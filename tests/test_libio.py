@@ -9,6 +9,7 @@ from haddock.libs.libio import (
     dot_suffix,
     file_exists,
     folder_exists,
+    link_file,
     read_from_yaml,
     write_dic_to_file,
     write_nested_dic_to_file,
@@ -133,3 +134,24 @@ def test_folder_exists_wrong(i):
 def test_folder_exists_wrong_othererror():
     with pytest.raises(TypeError):
         folder_exists("some_bad_path", exception=TypeError)
+
+
+@pytest.mark.parametrize("mode", ["auto", "copy"])
+def test_link_file_never_shares(tmp_path, mode):
+    """Test the default modes never share the file with the source."""
+    src = Path(tmp_path, "src.txt")
+    src.write_text("model")
+    dest = Path(tmp_path, "dest.txt")
+    assert link_file(src, dest, mode) in ("reflink", "copy")
+    assert dest.stat().st_ino != src.stat().st_ino
+    dest.write_text("modified")
+    assert src.read_text() == "model"
+
+
+def test_link_file_hardlink(tmp_path):
+    """Test hard links are made when asked for."""
+    src = Path(tmp_path, "src.txt")
+    src.write_text("model")
+    dest = Path(tmp_path, "dest.txt")
+    assert link_file(src, dest, "hardlink") == "hardlink"
+    assert dest.stat().st_ino == src.stat().st_ino
@@ -7,7 +7,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from haddock.libs.libmpi import MPIScheduler
+from haddock.core.exceptions import EngineAbortError
+from haddock.libs.libmpi import ABORT_MESSAGE, MPIScheduler
 
 
 @pytest.fixture
@@ -68,6 +69,27 @@ def test_mpischduler_run(mocker, mpischeduler):
     mock_sys_exit.assert_called_once()
 
 
+def test_mpischeduler_run_aborted(mocker, mpischeduler):
+    mocker.patch.object(
+        mpischeduler, "_pickle_tasks", return_value="mocked_pkl_tasks"
+    )
+    mock_subprocess_run = mocker.patch("subprocess.run")
+    mock_process = MagicMock()
+    mock_process.stderr.decode.return_value = (
+        f"{ABORT_MESSAGE}The last 2 tasks failed with the same error: error\n"
+        "mpirun: abort\n"
+    )
+    mock_subprocess_run.return_value = mock_process
+    mpischeduler.tolerance = 5.0
+    mpischeduler.max_consecutive_errors = 2
+
+    with pytest.raises(EngineAbortError, match="same error: error"):
+        mpischeduler.run()
+
+    cmd = mock_subprocess_run.call_args.args[0]
+    assert cmd[-4:] == ["--tolerance", "5.0", "--max-consecutive-errors", "2"]
+
+
 def test__pickle_tasks(mpischeduler):
 
     result = mpischeduler._pickle_tasks()
@@ -1,10 +1,13 @@
+import time
 import uuid
 from multiprocessing import Queue
 from pathlib import Path
 
 import pytest
 
+from haddock.core.exceptions import EngineAbortError
 from haddock.libs.libparallel import (
+    FailureTracker,
     GenericTask,
     Scheduler,
     Worker,
@@ -44,6 +47,16 @@ class FileTask:
     def run(self):
         Path(self.input_file).touch()
 
+
+class FailingFileTask(FileTask):
+    """Dummy task that creates its file, then reports an error."""
+
+    def run(self):
+        super().run()
+        time.sleep(0.05)
+        self.error = "unknown CNS error"
+
+
 class TaskWithException:
 
     def __init__(self):
@@ -168,6 +181,77 @@ def test_scheduler_with_exception(scheduler_with_exception):
     assert scheduler_with_exception.results[2] == 4
 
 
+def test_failure_tracker_tolerance():
+    tracker = FailureTracker(10, tolerance=20)
+    assert tracker.add(None) is None
+    assert tracker.add("error 1") is None
+    assert tracker.add("error 2") is None
+    reason = tracker.add("error 3")
+    assert reason.startswith("3 of 10 tasks failed (30.00%)")
+    assert reason.endswith("First error: error 1")
+
+
+def test_failure_tracker_consecutive():
+    tracker = FailureTracker(100, max_consecutive=3)
+    assert tracker.add("error") is None
+    assert tracker.add("error") is None
+    assert tracker.add(None) is None
+    assert tracker.add("error") is None
+    assert tracker.add("other error") is None
+    assert tracker.add("other error") is None
+    reason = tracker.add("other error")
+    assert reason == "The last 3 tasks failed with the same error: other error"
+
+
+def test_failure_tracker_full_tolerance():
+    tracker = FailureTracker(100, tolerance=100, max_consecutive=3)
+    assert not tracker.active
+    for _ in range(100):
+        assert tracker.add("error") is None
+
+
+def test_failure_tracker_inactive():
+    tracker = FailureTracker(2)
+    assert not tracker.active
+    assert tracker.add("error") is None
+    assert tracker.add("error") is None
+
+
+def test_scheduler_aborts(tmp_path):
+    tasks = [FailingFileTask(Path(tmp_path, f"task_{i}")) for i in range(50)]
+    scheduler = Scheduler(tasks, ncores=1, max_consecutive_errors=3)
+    with pytest.raises(EngineAbortError, match="unknown CNS error"):
+        scheduler.run()
+    assert 3 <= len(list(tmp_path.iterdir())) < 50
+
+
+def test_scheduler_full_tolerance(tmp_path):
+    tasks = [FailingFileTask(Path(tmp_path, f"task_{i}")) for i in range(50)]
+    scheduler = Scheduler(
+        tasks,
+        ncores=1,
+        tolerance=100,
+        max_consecutive_errors=3,
+    )
+    scheduler.run()
+    assert len(list(tmp_path.iterdir())) == 50
+
+
+@pytest.mark.parametrize("tolerance", [10, 50])
+def test_scheduler_tolerance(tolerance):
+    scheduler = Scheduler(
+        [Task(1), TaskWithException(), Task(3)],
+        ncores=1,
+        tolerance=tolerance,
+    )
+    if tolerance < 100 / 3:
+        with pytest.raises(EngineAbortError, match="ValueError: Test error"):
+            scheduler.run()
+    else:
+        _ = scheduler.run()
+        assert scheduler.results == [2, None, 4]
+
+
 def test_generic_task_init():
     def sample_function(a, b, c=3):
         return a + b + c
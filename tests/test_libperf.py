@@ -0,0 +1,137 @@
+"""Test the performance profile of the steps."""
+import json
+import time
+
+import pytest
+
+from haddock.core.defaults import PERF_FILE
+from haddock.libs import libperf
+from haddock.libs.libparallel import GenericTask, Scheduler
+from haddock.libs.libperf import (
+    StepProfile,
+    count_files,
+    phase,
+    profile_step,
+    record_engine_run,
+    summarise_times,
+    )
+
+
+class TimedTask:
+    """Task reporting the time spent in its own phases."""
+
+    def run(self):
+        self.timings = {"compute": 0.5}
+        return 1
+
+
+def test_summarise_times():
+    """Test the summary of the task run times."""
+    summary = summarise_times([3, 1, 2, 4])
+    assert summary["count"] == 4
+    assert summary["total"] == 10
+    assert summary["min"] == 1
+    assert summary["max"] == 4
+    assert summary["mean"] == 2.5
+    assert summary["median"] == 2.5
+    assert summary["p90"] == 4
+    assert summarise_times([]) == {}
+
+
+def test_count_files(tmp_path):
+    """Test files are counted recursively."""
+    tmp_path.joinpath("a.txt").write_text("abc")
+    tmp_path.joinpath("sub").mkdir()
+    tmp_path.joinpath("sub", "b.txt").write_text("de")
+    assert count_files(tmp_path) == {"count": 2, "bytes": 5}
+
+
+def test_get_phases():
+    """Test the module time is split around the engine runs."""
+    profile = StepProfile("dummy")
+    profile.phases["setup"] = 1.0
+    profile.phases["io_export"] = 2.0
+    profile.module_span = (10.0, 30.0)
+    profile.add_engine_run(12.0, 15.0)
+    profile.add_engine_run(16.0, 20.0)
+    phases = profile.get_phases()
+    assert phases == {
+        "setup": 1.0,
+        "input_preparation": 2.0,
+        "engine": 7.0,
+        "output_parsing": 8.0,
+        "io_export": 2.0,
+        "processing": 1.0,
+        }
+
+
+def test_get_phases_no_engine():
+    """Test modules without engine spend their time in processing."""
+    profile = StepProfile("dummy")
+    profile.module_span = (10.0, 30.0)
+    phases = profile.get_phases()
+    assert phases["processing"] == 20.0
+    assert phases["engine"] == 0.0
+
+
+def test_add_engine_run():
+    """Test the worker utilisation."""
+    profile = StepProfile("dummy")
+    profile.add_engine_run(
+        0.0,
+        10.0,
+        task_times=[4.0, 4.0, 5.0],
+        worker_busy=[8.0, 5.0],
+        task_phases={"cns": 12.0},
+        )
+    summary = profile.summary()
+    assert summary["tasks"]["count"] == 3
+    assert summary["workers"] == {
+        "count": 2,
+        "busy_time": 13.0,
+        "utilisation": 0.65,
+        }
+    assert summary["task_phases"] == {"cns": 12.0}
+
+
+def test_profile_step(tmp_path):
+    """Test the profile is saved, and the scheduler records in it."""
+    with profile_step("dummy", tmp_path) as profile:
+        assert libperf.get_current_profile() is profile
+        with profile.module():
+            with phase("io_export"):
+                tmp_path.joinpath("io.json").write_text("{}")
+                time.sleep(0.01)
+            scheduler = Scheduler(
+                [GenericTask(sum, [1, 2]), TimedTask()],
+                ncores=1,
+                )
+            scheduler.run()
+
+    assert libperf.get_current_profile() is None
+    perf = json.loads(tmp_path.joinpath(PERF_FILE).read_text())
+    assert perf["module"] == "dummy"
+    assert perf["tasks"]["count"] == 2
+    assert perf["task_phases"] == {"compute": 0.5}
+    assert perf["workers"]["count"] == 1
+    assert perf["phases"]["engine"] > 0
+    assert perf["phases"]["io_export"] >= 0.01
+    assert perf["files"]["count"] == 1
+    assert set(perf["io"]) == {"bytes_read", "bytes_written"}
+    assert perf["peak_rss_mb"]["main"] > 0
+
+
+def test_profile_step_saved_on_error(tmp_path):
+    """Test the profile of a failed module is saved."""
+    with pytest.raises(RuntimeError):
+        with profile_step("dummy", tmp_path):
+            raise RuntimeError("Module has failed.")
+    assert tmp_path.joinpath(PERF_FILE).exists()
+
+
+def test_record_outside_profile():
+    """Test nothing is recorded outside a profiled module."""
+    record_engine_run(0.0, 1.0, task_times=[1.0])
+    with phase("setup"):
+        pass
+    assert libperf.get_current_profile() is None
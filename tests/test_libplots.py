@@ -1,16 +1,24 @@
 """Test finding the best structures in libplots."""
 
+import base64
+import json
 import os
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import pytest
 import tempfile
 
 from haddock.libs.libplots import (
+    MODELS_DATA_JS,
+    MODELS_HOVER_META,
     box_plot_handler,   
     create_other_cluster,
+    encode_typed_array,
+    figure_to_json,
     find_best_struct,
     make_alascan_plot,
     offline_js_manager,
@@ -351,3 +359,63 @@ def test_scatter_plot_handler_format(example_capri_ss, cluster_ranking):
         assert len(list(Path(".").glob("*.html"))) > 0
         assert len(list(Path(".").glob("*.png"))) > 0
     os.chdir(initdir)
+
+
+def test_encode_typed_array():
+    """Test the encoding of plotly typed arrays."""
+    typed_array = encode_typed_array([0.5, -1.25, 3.0, 0.3])
+    assert typed_array["dtype"] == "f8"
+    assert "shape" not in typed_array
+    values = np.frombuffer(base64.b64decode(typed_array["bdata"]), "<f8")
+    # floats keep their exact value, 0.3 is not shown as 0.30000001
+    assert values.tolist() == [0.5, -1.25, 3.0, 0.3]
+    # integers
+    typed_array = encode_typed_array(np.array([[1, 2, 3], [4, 5, 6]]))
+    assert typed_array["dtype"] == "i4"
+    assert typed_array["shape"] == "2,3"
+    values = np.frombuffer(base64.b64decode(typed_array["bdata"]), "<i4")
+    assert values.tolist() == [1, 2, 3, 4, 5, 6]
+    # non numerical arrays are not encoded
+    assert encode_typed_array(["a", "b"]) is None
+    assert encode_typed_array([True, False]) is None
+    assert encode_typed_array([[1, 2], [3]]) is None
+    assert encode_typed_array([]) is None
+    assert encode_typed_array(None) is None
+
+
+def test_figure_to_json():
+    """Test the compact serialization of figures."""
+    fig = go.Figure(go.Scatter(x=[1.5, 2.5], y=[3, 4], text=["a", "b"]))
+    fig_dict = json.loads(figure_to_json(fig))
+    trace = fig_dict["data"][0]
+    assert trace["x"]["dtype"] == "f8"
+    assert trace["y"]["dtype"] == "i4"
+    assert trace["text"] == ["a", "b"]
+    # the figure itself is not modified
+    assert list(fig.data[0].x) == [1.5, 2.5]
+
+
+def test_scatter_plot_handler_models_data(example_capri_ss, cluster_ranking):
+    """Test the scatter plots refer to the shared table of models."""
+    initdir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        figures = scatter_plot_handler(
+            example_capri_ss.resolve(),
+            cluster_ranking,
+            None,
+            1.0,
+            )
+        models_js = Path(MODELS_DATA_JS).read_text()
+        os.chdir(initdir)
+    assert models_js.startswith("window.HADDOCK_MODELS = ")
+    models = json.loads(models_js.split(" = ", 1)[1].split(";", 1)[0])
+    capri_df = read_capri_table(example_capri_ss)
+    assert len(models["model"]) == len(capri_df)
+    assert models["model"][0] == capri_df["model"][0].split("/")[-1]
+    # points hold their row in the table
+    trace = figures[0].data[0]
+    assert trace.meta == MODELS_HOVER_META
+    assert trace.text is None
+    rows = list(trace.customdata)
+    assert list(trace.x) == capri_df["irmsd"][rows].tolist()
@@ -40,7 +40,10 @@ def cnsjob(mocker):
         f.file.seek(0)
         os.chmod(f.name, 0o755)
 
-        mocker.patch("haddock.libs.libsubprocess.global_cns_exec", f.name)
+        mocker.patch(
+            "haddock.libs.libsubprocess.get_cns_exec",
+            return_value=f.name,
+            )
 
         yield CNSJob(
             input_file=Path("input"),
@@ -109,7 +112,10 @@ def test_cnsjob_cns_exec_setter(cnsjob, mocker):
         f.file.seek(0)
         os.chmod(f.name, 0o755)
 
-        mocker.patch("haddock.libs.libsubprocess.global_cns_exec", f.name)
+        mocker.patch(
+            "haddock.libs.libsubprocess.get_cns_exec",
+            return_value=f.name,
+            )
 
         cnsjob.cns_exec = f.name
 
@@ -137,3 +143,41 @@ def test_cnsjob_run(cnsjob, mocker):
         )
 
         assert result == b"output"
+        assert cnsjob.error is None
+
+
+def test_cnsjob_run_error(cnsjob, mocker):
+
+    mock_popen = mocker.patch("subprocess.Popen")
+    mock_popen_instance = MagicMock()
+    mock_popen.return_value = mock_popen_instance
+    mock_popen_instance.communicate.return_value = (
+        b"output\n SELRPN error encountered: parsing error\n",
+        None,
+    )
+
+    mocker.patch("builtins.open", mocker.mock_open())
+    mocker.patch("haddock.libs.libsubprocess.gzip_files", return_value=None)
+
+    cnsjob.run()
+    assert cnsjob.error == "SELRPN error encountered: parsing error"
+
+
+@pytest.mark.parametrize(
+    "out,expected",
+    [
+        (b"output\nend\n", None),
+        (b"output\n ^^^^^^\n", "unknown CNS error"),
+        (
+            b"exceeded allocation for NOE-restraints\n^^^^^\n",
+            "unknown CNS error",
+        ),
+        (
+            b"^^^^^\nexceeded allocation for NOE-restraints\n",
+            "exceeded allocation for NOE-restraints",
+        ),
+    ],
+)
+def test_find_cns_stdout_error(out, expected):
+    assert CNSJob.find_cns_stdout_error(out) == expected
+    assert CNSJob.contains_cns_stdout_error(out) is (expected is not None)
@@ -1,7 +1,17 @@
 """Uni-test functions for the Workflow Manager."""
 
 import tempfile
-from haddock.libs.libworkflow import WorkflowManager
+import time
+from pathlib import Path
+
+import pytest
+
+from haddock.libs.libontology import ModuleIO, PDBFile, TopologyFile
+from haddock.libs.libworkflow import (
+    Step,
+    WorkflowManager,
+    get_background_cores,
+    )
 from haddock.core.typing import Any
 
 
@@ -29,3 +39,202 @@ def test_WorkflowManager(caplog):
         second_log_line = str(caplog.records[1].message)
         assert first_log_line == "Reading instructions step 0_topoaa"
         assert second_log_line == "Running haddock3-analyse on ./, modules [], with top_cluster = 10"  # noqa : E501
+
+
+class MockModule:
+    """Mock an executed module."""
+
+    params = {"clean": True, "ncores": 1}
+
+
+def test_WorkflowManager_clean_consumed_steps(mocker, monkeypatch):
+    """Test steps are cleaned once the next steps do not need them."""
+    ParamDict = {
+        "topoaa.1": {"molecules": ["fake.pdb"]},
+        "rigidbody.1": {},
+        "caprieval.1": {},
+        "flexref.1": {},
+        }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.chdir(tmpdir)
+        workflow = WorkflowManager(ParamDict, start=0)
+        mock_clean = mocker.patch.object(workflow.cleaner, "clean")
+        steps = workflow.recipe.steps
+        for step, models_step in zip(steps, (0, 1, 1, 3)):
+            step.working_path.mkdir()
+            step.module = MockModule()
+            io = ModuleIO()
+            model = PDBFile(
+                "model.pdb",
+                topology=TopologyFile("model.psf", path=steps[0].working_path),
+                path=steps[models_step].working_path,
+                )
+            io.add(model, "o")
+            io.save(step.working_path)
+
+        # caprieval passes the rigidbody models on
+        workflow.clean_consumed_steps(steps[2])
+        mock_clean.assert_not_called()
+        # flexref makes new models, with the same topologies
+        workflow.clean_consumed_steps(steps[3])
+        assert [call.args[0] for call in mock_clean.call_args_list] == [
+            Path("1_rigidbody"),
+            Path("2_caprieval"),
+            ]
+        assert not steps[0].cleaned
+        assert steps[1].cleaned and steps[2].cleaned
+        # steps are not cleaned twice
+        workflow.clean_consumed_steps(steps[3])
+        assert mock_clean.call_count == 2
+
+
+def fake_execute(step, background=False):
+    """Save the `io.json` of a step, then log when it starts and ends."""
+    step.working_path.mkdir()
+    with open("steps.log", "a") as fout:
+        fout.write(f"start {step.working_path.name}\n")
+    if step.config.get("fail"):
+        # before the io.json is saved, as a failing module
+        raise ValueError("contactmap failed")
+    ModuleIO().save(step.working_path)
+    if step.config.get("wait"):
+        # the next step must start before this one ends
+        for _ in range(100):
+            if Path("2_contactmap").exists():
+                break
+            time.sleep(0.05)
+    step.module = MockModule()
+    with open("steps.log", "a") as fout:
+        fout.write(f"end {step.working_path.name}\n")
+
+
+def read_steps_log():
+    """Read the log of the fake steps."""
+    return Path("steps.log").read_text().splitlines()
+
+
+def test_WorkflowManager_run_steps_concurrently(monkeypatch, tmp_path):
+    """Test a step passing its models on runs alongside the next step."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Step, "execute", fake_execute)
+    ParamDict = {
+        "topoaa.1": {"ncores": 2, "clean": False},
+        "caprieval.1": {"ncores": 1, "clean": False, "wait": True},
+        "contactmap.1": {"ncores": 1, "clean": False},
+        "seletop.1": {"ncores": 2, "clean": False},
+        }
+    workflow = WorkflowManager(ParamDict, start=0)
+    workflow.run_steps(workflow.recipe.steps, poll_interval=0.01)
+    steps_log = read_steps_log()
+    assert steps_log[:5] == [
+        "start 0_topoaa",
+        "end 0_topoaa",
+        "start 1_caprieval",
+        "start 2_contactmap",
+        "end 2_contactmap",
+        ]
+    assert set(steps_log[5:]) == {
+        "end 1_caprieval",
+        "start 3_seletop",
+        "end 3_seletop",
+        }
+    # the parameters of the background step are known
+    assert workflow.recipe.steps[1].module_params == MockModule.params
+
+
+def test_WorkflowManager_run_steps_sequentially(monkeypatch, tmp_path):
+    """Test steps run one after the other if the cores do not allow it."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Step, "execute", fake_execute)
+    ParamDict = {
+        "caprieval.1": {"ncores": 2, "clean": False},
+        "flexref.1": {"ncores": 2, "clean": False},
+        }
+    workflow = WorkflowManager(ParamDict, start=0)
+    workflow.run_steps(workflow.recipe.steps, poll_interval=0.01)
+    assert read_steps_log() == [
+        "start 0_caprieval",
+        "end 0_caprieval",
+        "start 1_flexref",
+        "end 1_flexref",
+        ]
+
+
+def test_WorkflowManager_run_steps_share_cores(monkeypatch, tmp_path):
+    """Test consecutive analysis steps share the cores by default."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Step, "execute", fake_execute)
+    ParamDict = {
+        "topoaa.1": {"ncores": 4, "clean": False},
+        "caprieval.1": {"ncores": 4, "clean": False, "wait": True},
+        "contactmap.1": {"ncores": 4, "clean": False},
+        }
+    workflow = WorkflowManager(ParamDict, start=0)
+    workflow.run_steps(workflow.recipe.steps, poll_interval=0.01)
+    assert read_steps_log()[2:5] == [
+        "start 1_caprieval",
+        "start 2_contactmap",
+        "end 2_contactmap",
+        ]
+    assert [step.ncores for step in workflow.recipe.steps] == [4, 2, 2]
+
+
+@pytest.mark.parametrize(
+    "module,ncores,next_module,free_cores,expected",
+    [
+        # the next step has cores left
+        ("caprieval", 1, "flexref", 4, 1),
+        # analysis steps share the cores
+        ("caprieval", 4, "rmsdmatrix", 4, 2),
+        ("caprieval", 4, "contactmap", 3, 1),
+        # the next step needs the cores
+        ("caprieval", 4, "flexref", 4, 0),
+        ("caprieval", 1, "rmsdmatrix", 1, 0),
+        # the step writes new models
+        ("rmsdmatrix", 1, "clustrmsd", 4, 0),
+        # last step
+        ("caprieval", 1, None, 4, 0),
+        ],
+    )
+def test_get_background_cores(
+        module,
+        ncores,
+        next_module,
+        free_cores,
+        expected,
+        ):
+    """Test the cores of the steps run in the background."""
+    step = Step(module, order=1, ncores=ncores)
+    next_step = Step(next_module, order=2) if next_module else None
+    assert get_background_cores(step, next_step, free_cores) == expected
+
+
+@pytest.mark.parametrize(
+    "module,params,expected",
+    [
+        ("caprieval", {}, True),
+        ("alascan", {}, True),
+        ("alascan", {"output": False}, True),
+        ("alascan", {"output": True}, False),
+        ("seletop", {}, False),
+        ],
+    )
+def test_Step_passes_models(module, params, expected):
+    """Test which steps pass their input models on."""
+    assert Step(module, order=1, **params).passes_models() is expected
+
+
+def test_WorkflowManager_run_steps_error(monkeypatch, tmp_path):
+    """Test a failing step stops the workflow."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Step, "execute", fake_execute)
+    ParamDict = {
+        "caprieval.1": {"ncores": 1, "clean": False},
+        "contactmap.1": {"ncores": 1, "clean": False, "fail": True},
+        "seletop.1": {"ncores": 2, "clean": False},
+        }
+    workflow = WorkflowManager(ParamDict, start=0)
+    with pytest.raises(ValueError, match="contactmap failed"):
+        workflow.run_steps(workflow.recipe.steps, poll_interval=0.01)
+    assert "end 0_caprieval" in read_steps_log()
+    assert not Path("2_seletop").exists()
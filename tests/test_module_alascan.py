@@ -20,8 +20,12 @@ from haddock.modules.analysis.alascan.scan import (
     alascan_cluster_analysis,
     calc_score,
     create_alascan_plots,
+    create_scan_tasks,
     generate_alascan_output,
+    has_interchain_disulphides,
+    merge_scan_tasks,
     mutate,
+    read_chains,
     )
 
 from . import golden_data
@@ -58,6 +62,7 @@ def fixture_params():
         "plot": False,
         "scan_residue": "ALA",
         "resdic_A": [19, 20],
+        "reuse_topology": False,
     }
 
 
@@ -264,6 +269,10 @@ def test_run(
 
     alascan.previous_io = MockPreviousIO()
     mocker.patch("haddock.libs.libparallel.Scheduler.run", return_value=None)
+    mocker.patch(
+        "haddock.modules.analysis.alascan.scan.get_scan_residues",
+        return_value=[],
+    )
     mocker.patch(
         "haddock.modules.BaseHaddockModule.export_io_models", return_value=None
     )
@@ -310,6 +319,137 @@ def test_scan_run_interface(mocker, scan_obj):
     assert scan_obj.df_scan.shape[0] == 5
 
 
+def mock_calc_score(pdb_f, run_dir):
+    """Give different scores to the native model and each mutant."""
+    value = float(sum(ord(char) for char in Path(pdb_f).name))
+    return value, value / 2, value / 3, value / 4, value / 5
+
+
+def test_scan_tasks(mocker, scan_obj, params):
+    """Test the (model, residue) tasks give the same output as Scan."""
+    params["resdic_B"] = [33, 47]
+    scan_obj.filter_resdic = {"A": [19, 20], "B": [33, 47]}
+    mocker.patch(
+        "haddock.modules.analysis.alascan.scan.calc_score",
+        side_effect=mock_calc_score,
+    )
+    scan_obj.run()
+    scan_fname = Path(scan_obj.path, "scan_protprot_complex_1.csv")
+    expected = scan_fname.read_text()
+    scan_fname.unlink()
+
+    scan_tasks, scan_plan = create_scan_tasks(
+        scan_obj.model_list,
+        params,
+        scan_obj.path,
+    )
+    assert len(scan_tasks) == 5
+    assert [(c, r) for c, r, *_ in scan_plan[0][2]] == [
+        ("A", 19), ("A", 20), ("B", 33), ("B", 47)
+    ]
+    # tasks can run in any order
+    for task in reversed(scan_tasks):
+        task.run()
+    merge_scan_tasks(scan_plan, "ALA", scan_obj.path)
+    assert scan_fname.read_text() == expected
+    assert not any(Path(scan_obj.path).glob("*.out"))
+
+
+def test_merge_scan_tasks_failed(mocker, scan_obj, params):
+    """Test failed tasks are skipped when merging."""
+    mocker.patch(
+        "haddock.modules.analysis.alascan.scan.calc_score",
+        side_effect=mock_calc_score,
+    )
+    scan_tasks, scan_plan = create_scan_tasks(
+        scan_obj.model_list,
+        params,
+        scan_obj.path,
+    )
+    scan_fname = Path(scan_obj.path, "scan_protprot_complex_1.csv")
+    # the second mutation failed
+    for task in scan_tasks[:2]:
+        task.run()
+    merge_scan_tasks(scan_plan, "ALA", scan_obj.path)
+    df_scan = pd.read_csv(scan_fname, sep="\t", comment="#")
+    assert df_scan["res"].tolist() == [19]
+    # no native score, no output
+    scan_fname.unlink()
+    merge_scan_tasks(scan_plan, "ALA", scan_obj.path)
+    assert not scan_fname.exists()
+
+
+def test_read_chains(complex_pdb):
+    """Test chains are read in order of appearance."""
+    chain_lines = read_chains(complex_pdb)
+    assert list(chain_lines) == ["A", "B"]
+    assert all(line[21] == "B" for line in chain_lines["B"])
+
+
+def test_has_interchain_disulphides(complex_pdb, tmp_path):
+    """Test the detection of inter-chain disulphide bridges."""
+    assert not has_interchain_disulphides(complex_pdb)
+    sg_a = "ATOM      1  SG  CYS A   1      10.000  10.000  10.000  1.00  0.00           S\n"  # noqa: E501
+    sg_b = "ATOM      2  SG  CYS B   1      10.000  10.000  12.050  1.00  0.00           S\n"  # noqa: E501
+    pdb_f = Path(tmp_path, "bridged.pdb")
+    pdb_f.write_text(sg_a + sg_b + "END\n")
+    assert has_interchain_disulphides(pdb_f)
+    # same SG atoms, in the same chain
+    pdb_f.write_text(sg_a + sg_b.replace(" B ", " A ") + "END\n")
+    assert not has_interchain_disulphides(pdb_f)
+
+
+def test_scan_tasks_reuse_topology_bridged(mocker, scan_obj, params):
+    """Test models with inter-chain bridges do not reuse their topology."""
+    params["reuse_topology"] = True
+    mocker.patch(
+        "haddock.modules.analysis.alascan.scan.has_interchain_disulphides",
+        return_value=True,
+    )
+    scan_tasks, _ = create_scan_tasks(
+        scan_obj.model_list,
+        params,
+        scan_obj.path,
+    )
+    assert all(task.native_topology is None for task in scan_tasks)
+
+
+def test_scan_tasks_reuse_topology(mocker, scan_obj, params):
+    """Test mutants reuse the native topology."""
+    params["reuse_topology"] = True
+    mock_build = mocker.patch(
+        "haddock.modules.analysis.alascan.scan.NativeTopology.build",
+    )
+    mocker.patch(
+        "haddock.modules.analysis.alascan.scan.NativeTopology.score",
+        side_effect=lambda run_dir: mock_calc_score("native.pdb", run_dir),
+    )
+    mock_score_mutant = mocker.patch(
+        "haddock.modules.analysis.alascan.scan.NativeTopology.score_mutant",
+        side_effect=lambda mut_pdb, chain, run_dir: mock_calc_score(
+            mut_pdb, run_dir
+        ),
+    )
+    scan_tasks, scan_plan = create_scan_tasks(
+        scan_obj.model_list,
+        params,
+        scan_obj.path,
+    )
+    native_topology = scan_plan[0][1].native_topology
+    assert all(task.native_topology is native_topology for task in scan_tasks)
+    for task in scan_tasks:
+        task.run()
+    mock_build.assert_called_once()
+    assert mock_score_mutant.call_args_list[0].args[1] == "A"
+    merge_scan_tasks(scan_plan, "ALA", scan_obj.path)
+    df_scan = pd.read_csv(
+        Path(scan_obj.path, "scan_protprot_complex_1.csv"),
+        sep="\t",
+        comment="#",
+    )
+    assert df_scan["res"].tolist() == [19, 20]
+    assert not native_topology.path.exists()
+
 def test_calc_score(mocker):
     """Test the run_scan method."""
     mocker.patch(
@@ -1,6 +1,7 @@
 """Test the CONTact MAP module."""
 
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Callable
@@ -10,6 +11,7 @@ import pytest
 from scipy.spatial.distance import pdist, squareform
 
 from haddock.libs.libontology import PDBFile
+from haddock.libs.libparallel import Scheduler
 from haddock.modules.analysis.contactmap import DEFAULT_CONFIG
 from haddock.modules.analysis.contactmap import \
     HaddockModule as ContactMapModule
@@ -17,23 +19,28 @@ from haddock.modules.analysis.contactmap.contmap import (
     PI,
     ClusteredContactMap,
     ContactsMap,
+    accumulate_contacts,
     check_square_matrix,
     compute_distance_matrix,
     control_pts,
     ctrl_rib_chords,
     datakey_to_colorscale,
     extract_pdb_coords,
+    extract_pdb_dt,
     extract_submatrix,
     gen_contact_dt,
+    get_ordered_coords,
     invPerm,
     make_chordchart,
     make_ideogram_arc,
     make_q_bezier,
     make_ribbon_arc,
+    merge_partial_contacts,
     min_dist,
     moduloAB,
     topX_models,
     within_2PI,
+    write_partial_contacts,
     write_res_contacts,
     )
 
@@ -349,6 +356,53 @@ def test_contactmap_run(contactmap, mocker):
     assert module_sucess is None
 
 
+class MockPreviousIOCluster:
+    """Provide the models of a single cluster."""
+
+    def __init__(self, models):
+        self.models = models
+
+    def retrieve_models(self, individualize: bool = False):
+        """Provide the models."""
+        return self.models
+
+
+def test_contactmap_run_chunks(contactmap, mocker):
+    """Test contacts of a large cluster are accumulated by chunks."""
+    # models are found relative to the sibling step folders
+    input_dir = Path("input")
+    input_dir.mkdir()
+    Path("1_contactmap").mkdir()
+    models = []
+    for i in range(4):
+        fname = f"model_{i}.pdb"
+        shutil.copy(
+            Path(golden_data, f"protprot_complex_{i % 2 + 1}.pdb"),
+            Path(input_dir, fname),
+            )
+        model = PDBFile(fname, path=input_dir.resolve())
+        model.clt_id = 1
+        models.append(model)
+    contactmap.previous_io = MockPreviousIOCluster(models)
+    contactmap.params["ncores"] = 2
+    contactmap.params["generate_heatmap"] = False
+    contactmap.params["generate_chordchart"] = False
+    mocker.patch(
+        "haddock.modules.BaseHaddockModule.export_io_models",
+        return_value=None,
+    )
+    engine = mocker.spy(Scheduler, "__init__")
+    os.chdir("1_contactmap")
+    contactmap._run()
+    chunk_tasks = engine.call_args_list[0].args[1]
+    assert [task.function for task in chunk_tasks] == [
+        write_partial_contacts,
+        write_partial_contacts,
+        ]
+    assert Path("cluster1_contmap_contacts.tsv").exists()
+    assert not list(Path(".").glob("*.pkl"))
+
+
 #########################################
 # Testing of previous_io errors handles #
 #########################################
@@ -404,6 +458,71 @@ def test_clustercontactmap_run(clustercontactmap, contactmap_output_ext):
         Path(fpath).unlink(missing_ok=False)
 
 
+def test_compute_contacts(protprot_contactmap):
+    """Test vectorized contacts match the residue by residue extraction."""
+    contacts = protprot_contactmap.compute_contacts()
+    pdb_dt = extract_pdb_dt(protprot_contactmap.model)
+    _coords, resid_keys, resid_dt = get_ordered_coords(pdb_dt)
+    dist_matrix = compute_distance_matrix(_coords)
+    assert contacts["resid_keys"] == resid_keys
+    k = 0
+    for ri, reskey_1 in enumerate(resid_keys):
+        for reskey_2 in resid_keys[ri + 1:]:
+            cont_dt = gen_contact_dt(dist_matrix, resid_dt, reskey_1, reskey_2)
+            assert contacts["ca-ca-dist"][k] == cont_dt["ca-ca-dist"]
+            assert contacts["shortest-dist"][k] == cont_dt["shortest-dist"]
+            k += 1
+    assert k == len(contacts["shortest-dist"])
+
+
+def test_accumulate_contacts(protprot_input_list, params):
+    """Test running sums of contacts and their ordering."""
+    models = [Path(m.rel_path) for m in protprot_input_list]
+    models_contacts = [
+        ContactsMap(model, Path("dummy"), params).compute_contacts()
+        for model in models
+        ]
+    contacts = accumulate_contacts(
+        models,
+        [f"contmap_{model.stem}" for model in models],
+        params,
+        )
+    assert list(contacts.res_indices) == models_contacts[0]["resid_keys"]
+    combined = contacts.res_contacts()
+    first, second = models_contacts
+    for k, contact in enumerate(combined):
+        # average of the two distances, rounded half up
+        tenths = round(first["ca-ca-dist"][k] * 10)
+        tenths += round(second["ca-ca-dist"][k] * 10)
+        assert contact["ca-ca-dist"] == (tenths + 1) // 2 / 10
+    heavy = ClusteredContactMap.aggregate_heavyatoms_contacts(
+        contacts.heavy_atoms,
+        )
+    nb_contacts = sum(len(c["heavy_atoms"][2]) for c in models_contacts)
+    assert sum(h["nb_dists"] for h in heavy) == nb_contacts
+
+
+def test_merge_partial_contacts(protprot_input_list, params):
+    """Test contacts accumulated by chunks are merged in models order."""
+    models = [Path(m.rel_path) for m in protprot_input_list] * 2
+    outputs = [f"contmap_{model.stem}" for model in models]
+    ref_contacts = accumulate_contacts(models, outputs, params)
+    with tempfile.TemporaryDirectory() as tempdir:
+        partials = [
+            write_partial_contacts(
+                models[start:start + 3],
+                outputs[start:start + 3],
+                params,
+                Path(tempdir, f"part{start}.pkl"),
+                )
+            for start in (0, 3)
+            ]
+        contacts = merge_partial_contacts(partials)
+        assert not any(partial.exists() for partial in partials)
+    assert contacts.res_contacts() == ref_contacts.res_contacts()
+    assert len(contacts.heavy_atoms) == len(models)
+
+
 def test_write_res_contacts(res_res_contacts):
     """Test list of dict to tsv generation."""
 
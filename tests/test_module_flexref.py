@@ -1,11 +1,13 @@
 """Test the flexref module."""
 
 import os
+import tarfile
 import tempfile
 from pathlib import Path
 
 import pytest
 
+from haddock.gear.restraints_store import index_archive
 from haddock.modules.refinement.flexref import \
     DEFAULT_CONFIG as DEFAULT_FLEXREF_PARAMS
 from haddock.modules.refinement.flexref import HaddockModule as Flexref
@@ -45,3 +47,21 @@ def test_prev_fnames(flexref, protdna_input_list):
     # FIXME: this should be a more specific exception
     with pytest.raises(Exception):  # noqa: B017
         obs_ambig_fnames = flexref.get_ambig_fnames(prev_ambig_fnames)
+
+
+def test_archive_fnames(flexref):
+    """Tests the ambiguous restraints of an archive are read from its index."""
+    archive = Path("ambig.tbl.tgz")
+    with tarfile.open(archive, "w:gz") as tar:
+        for i in range(1, 4):
+            tar.add(Path(golden_data, "example_ambig_1.tbl"), f"ambig_{i}.tbl")
+    flexref.params["ambig_fname"] = archive
+    # abort when no restraint file is found
+    with pytest.raises(Exception):  # noqa: B017
+        flexref.get_ambig_fnames([None])
+    index_archive(archive, "store")
+    obs_ambig_fnames = flexref.get_ambig_fnames([None])
+    assert len(obs_ambig_fnames) == 3
+    assert len(set(obs_ambig_fnames)) == 1
+    assert obs_ambig_fnames[0].parts[0] == "store"
+    assert obs_ambig_fnames[0].name == "ambig_1.tbl"
@@ -1,14 +1,20 @@
 """Test the sasascore module."""
+import pickle
 import tempfile
 import os
 from pathlib import Path
 
+import numpy as np
 import pytest
+from freesasa import Structure, calc
 
 from haddock.libs.libontology import PDBFile
 from haddock.modules.scoring.sasascore.sasascore import (
     AccScore,
+    ChainSASACache,
     calc_acc_score,
+    get_rigid_reuse_atom_areas,
+    max_superimposed_deviation,
     )
 
 from . import golden_data
@@ -93,3 +99,57 @@ def test_get_calc_acc_score(buried_resdic, acc_resdic):
     assert acc_score == 2
     assert b_viols == {"A": set([17])}
     assert a_viols == {"A": set([43]), "B": set()}
+
+
+def test_max_superimposed_deviation():
+    """Test rigid copies are superimposed without deviation."""
+    rng = np.random.default_rng(42)
+    coords = rng.uniform(-10, 10, (50, 3))
+    angle = 0.9
+    rotation = np.array([
+        [1, 0, 0],
+        [0, np.cos(angle), -np.sin(angle)],
+        [0, np.sin(angle), np.cos(angle)],
+        ])
+    moved = coords @ rotation.T + np.array([3.0, -1.0, 12.0])
+    assert max_superimposed_deviation(coords, moved) == pytest.approx(0.0)
+    moved[0] += 1.0
+    assert max_superimposed_deviation(coords, moved) > 0.5
+
+
+def test_rigid_reuse_atom_areas():
+    """Test reuse of cached chains gives the same areas as freesasa."""
+    struct = Structure(str(Path(golden_data, "protprot_complex_1.pdb")))
+    ref_result = calc(struct)
+    ref_areas = [ref_result.atomArea(i) for i in range(struct.nAtoms())]
+    chain_cache = ChainSASACache(tolerance=0.01)
+    # first call fills the cache
+    first_areas = get_rigid_reuse_atom_areas(struct, chain_cache)
+    assert len(chain_cache.entries) == 2
+    # second call reuses the isolated chains
+    second_areas = get_rigid_reuse_atom_areas(struct, chain_cache)
+    assert np.allclose(first_areas, ref_areas)
+    assert np.allclose(second_areas, ref_areas)
+    # the cache is not transferred to other processes
+    assert pickle.loads(pickle.dumps(chain_cache)).entries == {}
+
+
+def test_accscore_chain_cache(scoring_models, buried_resdic, acc_resdic):
+    """Test accscore output is unchanged when reusing chains."""
+    chain_cache = ChainSASACache(tolerance=0.01)
+    for _ in range(2):
+        accscore = AccScore(
+            model=scoring_models[0],
+            path=Path("."),
+            buried_resdic=buried_resdic,
+            acc_resdic=acc_resdic,
+            cutoff=0.1,
+            probe_radius=1.4,
+            chain_cache=chain_cache,
+            )
+        result = accscore.run()
+        assert result.chain_cache is chain_cache
+        assert accscore.data[-1] == 1
+        assert accscore.violations_data == [
+            scoring_models[0].file_name, '29', None, None,
+            ]
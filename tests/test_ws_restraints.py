@@ -1,4 +1,6 @@
+import asyncio
 from base64 import b64encode
+from functools import partial
 import gzip
 from pathlib import Path
 from textwrap import dedent
@@ -6,6 +8,7 @@ from textwrap import dedent
 from fastapi.testclient import TestClient
 import pytest
 
+from haddock.clis.restraints import webservice
 from haddock.clis.restraints.webservice import app
 
 from . import golden_data
@@ -109,3 +112,85 @@ def test_preprocess_pdb(client: TestClient, example_pdb_file_gzipped_base64: str
     assert response.status_code == 200
     assert response.headers["content-type"].startswith("text/plain")
     assert 'Z' in response.text
+
+def test_restrain_bodies_no_atoms(client: TestClient):
+    structure = b64encode(gzip.compress(b"END\n")).decode()
+    response = client.post("/restrain_bodies", json={"structure": structure})
+    assert response.status_code == 422
+
+def test_requests_in_threads(
+        client: TestClient,
+        example_pdb_file_gzipped_base64: str,
+        monkeypatch,
+        ):
+    monkeypatch.setenv(webservice.WORKERS_ENV, "0")
+    monkeypatch.setattr(webservice, "_cache", webservice.ResultCache())
+    body = {"structure": example_pdb_file_gzipped_base64, "exclude": ["B"]}
+    first = client.post("/restrain_bodies", json=body)
+    second = client.post("/restrain_bodies", json=body)
+    assert first.status_code == 200
+    assert first.text == second.text
+    assert len(webservice._cache) == 1
+
+def test_result_cache():
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value is None:
+            raise ValueError("failed")
+        return value
+
+    async def main():
+        cache = webservice.ResultCache(maxsize=2)
+        # identical requests received together are computed once
+        results = await asyncio.gather(
+            *(cache.get("a", partial(compute, 1)) for _ in range(3))
+            )
+        assert results == [1, 1, 1]
+        assert await cache.get("a", partial(compute, 1)) == 1
+        assert calls == [1]
+        # failures are not cached
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await cache.get("b", partial(compute, None))
+        assert calls == [1, None, None]
+        # the least recently used result is dropped
+        await cache.get("c", partial(compute, 3))
+        await cache.get("a", partial(compute, 1))
+        await cache.get("d", partial(compute, 4))
+        await cache.get("c", partial(compute, 3))
+        assert calls == [1, None, None, 3, 4, 3]
+        assert len(cache) == 2
+
+    asyncio.run(main())
+
+def test_cache_key():
+    key = webservice.ResultCache.make_key
+    assert key("f", b"pdb", a=1, b=[2]) == key("f", "pdb", b=[2], a=1)
+    assert key("f", b"pdb", a=1) != key("f", b"pdb", a=2)
+    assert key("f", b"pdb", a=1) != key("g", b"pdb", a=1)
+    assert key("f", b"pdb", a=1) != key("f", b"pdb2", a=1)
+
+def test_passive_from_active_batch(client: TestClient, example_pdb_file_gzipped_base64: str):
+    body = {
+        "structure": example_pdb_file_gzipped_base64,
+        "active_sets": [[31, 32, 33], [36], []],
+        "chain": "A",
+        "surface": [31, 32, 33, 34, 35, 36],
+    }
+    response = client.post("/passive_from_active_batch", json=body)
+    assert response.status_code == 200
+    assert response.json() == [[34, 35, 36], [31, 32, 33, 34, 35], []]
+
+def test_passive_from_active_unknown_chain(client: TestClient, example_pdb_file_gzipped_base64: str):
+    body = {
+        "structure": example_pdb_file_gzipped_base64,
+        "active": [31],
+        "chain": "Z",
+        "surface": [31, 32],
+    }
+    response = client.post("/passive_from_active", json=body)
+    assert response.status_code == 422
+    assert "Chain Z does not exist" in response.json()["detail"]